@@ -1,8 +1,12 @@
 #!/usr/bin/env python
 """Desktop app entrypoint for PocketSage."""
 
+import multiprocessing
+
 import flet as ft
 from pocketsage.desktop.app import main
 
 if __name__ == "__main__":
+    # Chart workers re-launch this executable in the PyInstaller build.
+    multiprocessing.freeze_support()
     ft.app(target=main)
@@ -23,8 +23,12 @@ print("All button clicks, dialog operations, and errors will be logged below")
 print("=" * 80)
 print()
 
+import multiprocessing
+
 import flet as ft
 from pocketsage.desktop.app import main
 
 if __name__ == "__main__":
+    # Chart workers re-launch this executable in the PyInstaller build.
+    multiprocessing.freeze_support()
     ft.app(target=main)
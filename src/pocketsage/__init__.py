@@ -1,8 +1,24 @@
-"""PocketSage desktop application package."""
+"""PocketSage desktop application package.
+
+``create_app_context`` resolves on first access: importing any
+``pocketsage`` submodule would otherwise pull in Flet and the whole
+repository layer through ``desktop.context``.
+"""
 
 from __future__ import annotations
 
+from typing import Any
+
 from .config import BaseConfig, DevConfig
-from .desktop.context import create_app_context
+
+
+def __getattr__(name: str) -> Any:
+    if name == "create_app_context":
+        from .desktop.context import create_app_context
+
+        globals()[name] = create_app_context
+        return create_app_context
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["BaseConfig", "DevConfig", "create_app_context"]
@@ -28,6 +28,15 @@ class BaseConfig:
     APP_NAME = "PocketSage"
     DB_FILENAME = "pocketsage.db"
     EXPORT_RETENTION = 5
+    EXPORT_FULL_INTERVAL = 6
+    EXPORT_COMPRESSLEVEL = 6
+    BACKUP_CHUNK_PAGES = 64
+    BACKUP_IN_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+    BACKUP_KEEP_LAST = 0
+    BACKUP_KEEP_DAILY = 7
+    BACKUP_KEEP_WEEKLY = 4
+    BACKUP_KEEP_MONTHLY = 6
+    CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024
     SQLCIPHER_FLAG = "POCKETSAGE_USE_SQLCIPHER"
     SQLCIPHER_KEY_ENV = "POCKETSAGE_SQLCIPHER_KEY"
     SQLITE_PRAGMAS = {"journal_mode": "wal", "foreign_keys": "on"}
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import importlib
+import multiprocessing
 import time
 from pathlib import Path
 
@@ -13,26 +14,27 @@ from ..logging_config import setup_logging
 from ..scheduler import create_scheduler
 from . import controllers
 from .context import create_app_context
-from .navigation import Router
-from .views.add_data import build_add_data_view
-from .views.admin import build_admin_view
-from .views.dashboard import build_dashboard_view
-from .views.debts import build_debts_view
-from .views.debt_timeline import build_debt_timeline_view
-from .views.habits import build_habits_view
-from .views.help import build_help_view
-from .views.ledger import build_ledger_view
-from .views.report_chart import build_report_chart_view
-from .views.edit_data import build_edit_data_view
-from .views.edit_debt import build_edit_debt_view
-from .views.edit_habit import build_edit_habit_view
-from .views.portfolio import build_portfolio_view
-from .views.reports import build_reports_view
-from .views.settings import build_settings_view
+from .navigation import Router, ViewBuilder
 from ..config import BaseConfig
 from sqlalchemy.exc import DatabaseError
 
 
+def _lazy_view(module: str, builder: str) -> ViewBuilder:
+    """Route builder that imports ``views.<module>`` on first navigation to it.
+
+    Importing every view up front costs a noticeable part of a cold start
+    (each one pulls in its services and chart backend); most sessions only
+    open a few of them.
+    """
+
+    def _build(ctx, page: ft.Page) -> ft.View:
+        view_builder = getattr(importlib.import_module(f".views.{module}", __package__), builder)
+        return view_builder(ctx, page)
+
+    _build.__name__ = builder
+    return _build
+
+
 def main(page: ft.Page) -> None:
     """Main entry point for the Flet desktop app."""
 
@@ -131,6 +133,7 @@ def main(page: ft.Page) -> None:
         def on_page_close(_):
             logger.info("Application closing, shutting down scheduler")
             scheduler.stop()
+            ctx.shutdown()
             # Export session log location for user reference
             from ..logging_config import session_log_path
 
@@ -182,28 +185,26 @@ def main(page: ft.Page) -> None:
         router = Router(page, ctx)
 
         # Register routes and aliases
-        from .views.about import build_about_view
-        from .views.auth import build_auth_view
-
+        dashboard = _lazy_view("dashboard", "build_dashboard_view")
         route_builders = {
-            "/login": build_auth_view,
-            "/dashboard": build_dashboard_view,
-            "/": build_dashboard_view,
-            "/ledger": build_ledger_view,
-            "/habits": build_habits_view,
-            "/debts": build_debts_view,
-            "/debts/timeline": build_debt_timeline_view,
-            "/portfolio": build_portfolio_view,
-            "/reports": build_reports_view,
-            "/reports/chart": build_report_chart_view,
-            "/help": build_help_view,
-            "/about": build_about_view,
-            "/settings": build_settings_view,
-            "/admin": build_admin_view,
-            "/add-data": build_add_data_view,
-            "/edit-data": build_edit_data_view,
-            "/edit-habit": build_edit_habit_view,
-            "/edit-debt": build_edit_debt_view,
+            "/login": _lazy_view("auth", "build_auth_view"),
+            "/dashboard": dashboard,
+            "/": dashboard,
+            "/ledger": _lazy_view("ledger", "build_ledger_view"),
+            "/habits": _lazy_view("habits", "build_habits_view"),
+            "/debts": _lazy_view("debts", "build_debts_view"),
+            "/debts/timeline": _lazy_view("debt_timeline", "build_debt_timeline_view"),
+            "/portfolio": _lazy_view("portfolio", "build_portfolio_view"),
+            "/reports": _lazy_view("reports", "build_reports_view"),
+            "/reports/chart": _lazy_view("report_chart", "build_report_chart_view"),
+            "/help": _lazy_view("help", "build_help_view"),
+            "/about": _lazy_view("about", "build_about_view"),
+            "/settings": _lazy_view("settings", "build_settings_view"),
+            "/admin": _lazy_view("admin", "build_admin_view"),
+            "/add-data": _lazy_view("add_data", "build_add_data_view"),
+            "/edit-data": _lazy_view("edit_data", "build_edit_data_view"),
+            "/edit-habit": _lazy_view("edit_habit", "build_edit_habit_view"),
+            "/edit-debt": _lazy_view("edit_debt", "build_edit_debt_view"),
         }
         for route, builder in route_builders.items():
             router.register(route, builder)
@@ -290,4 +291,5 @@ def main(page: ft.Page) -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     ft.app(target=main)
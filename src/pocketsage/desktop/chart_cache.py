@@ -0,0 +1,293 @@
+"""On-disk cache of rendered chart PNGs.
+
+Rendering a matplotlib chart costs hundreds of milliseconds; the inputs that
+drive it (a handful of aggregated totals) are tiny. Export renders are keyed
+by chart type, parameters, theme and a hash of the aggregated series, so any
+change in the data produces a new key. On top of that, the cache remembers
+which key each ``(chart, params, theme)`` resolved to at a given data
+generation (the newest ``change_log`` seq); while the generation is
+unchanged a single-chart export skips even the aggregation queries.
+
+Export renders live under ``DATA_DIR/cache/charts`` (``get_chart_cache``);
+the path-returning chart helpers use a per-process instance as scratch space
+(see ``charts.scratch``). Entries are evicted least recently used first once
+their total size exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CHART_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_caches: dict[Path, "ChartCache"] = {}
+_caches_lock = threading.Lock()
+
+
+@dataclass
+class ChartCacheStats:
+    """Hit/miss counters and cumulative render time."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    render_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def avg_render_ms(self) -> float:
+        return self.render_seconds / self.misses * 1000 if self.misses else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "avg_render_ms": round(self.avg_render_ms, 1),
+        }
+
+
+def _canonical(value: Any) -> Any:
+    """Make ``value`` JSON-stable (mapping keys may mix ints, strings and None)."""
+
+    if is_dataclass(value) and not isinstance(value, type):
+        return [type(value).__name__, _canonical(asdict(value))]
+    if isinstance(value, Mapping):
+        items = sorted(value.items(), key=lambda pair: repr(pair[0]))
+        return [[repr(key), _canonical(item)] for key, item in items]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, float):
+        return round(value, 6)
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    return str(value)
+
+
+def series_digest(value: Any) -> str:
+    """Stable hash of an aggregated chart series."""
+
+    payload = json.dumps(_canonical(value), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _slot(chart: str, params: Mapping[str, Any] | None, theme: str) -> str:
+    return json.dumps([chart, _canonical(params or {}), theme])
+
+
+class ChartCache:
+    """LRU, size-bounded PNG cache rooted at ``root``."""
+
+    def __init__(self, root: Path, *, max_bytes: int = CHART_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.stats = ChartCacheStats()
+        self._lock = threading.Lock()
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._total = 0
+        self._generations: dict[str, tuple[int, str]] = {}
+
+    def _load(self) -> OrderedDict[str, int]:
+        if self._entries is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.root.glob("*.png"), key=lambda path: path.stat().st_mtime)
+            self._entries = OrderedDict((path.stem, path.stat().st_size) for path in files)
+            self._total = sum(self._entries.values())
+        return self._entries
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.png"
+
+    def key_for(
+        self, chart: str, *, series: Any, params: Mapping[str, Any] | None = None, theme: str = ""
+    ) -> str:
+        payload = [chart, _canonical(params or {}), theme, series_digest(series)]
+        return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()[:40]
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached PNG for ``key`` (marking it recently used)."""
+
+        with self._lock:
+            entries = self._load()
+            if key not in entries:
+                return None
+            path = self._path(key)
+            if not path.exists():
+                self._total -= entries.pop(key)
+                return None
+            entries.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:  # pragma: no cover - best effort for LRU on restart
+            pass
+        return path
+
+    def put(self, key: str, png: bytes) -> Path:
+        """Store ``png`` under ``key`` and evict old entries beyond ``max_bytes``."""
+
+        path = self._path(key)
+        with self._lock:
+            entries = self._load()
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(png)
+            tmp.replace(path)
+            self._total += len(png) - entries.pop(key, 0)
+            entries[key] = len(png)
+            while self._total > self.max_bytes and len(entries) > 1:
+                old_key, size = entries.popitem(last=False)
+                self._path(old_key).unlink(missing_ok=True)
+                self._total -= size
+                self.stats.evictions += 1
+        return path
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Like ``get``, but counted as a hit or a miss in ``stats``.
+
+        Callers that render misses elsewhere (e.g. in the chart pool) hand
+        the PNG back through ``store``.
+        """
+
+        path = self.get(key)
+        if path is not None:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return path
+
+    def store(self, key: str, png: bytes, *, render_seconds: float) -> Path:
+        """``put`` a PNG rendered after a ``lookup`` miss and record its render time."""
+
+        path = self.put(key, png)
+        self.stats.render_seconds += render_seconds
+        return path
+
+    def peek(
+        self,
+        chart: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        theme: str = "",
+        generation: Optional[int] = None,
+    ) -> Optional[Path]:
+        """Return the PNG ``chart`` resolved to at ``generation``, without any work."""
+
+        if generation is None:
+            return None
+        known = self._generations.get(_slot(chart, params, theme))
+        if known is None or known[0] != generation:
+            return None
+        path = self.get(known[1])
+        if path is not None:
+            self.stats.hits += 1
+        return path
+
+    def get_or_render(
+        self,
+        chart: str,
+        *,
+        series: Callable[[], Any],
+        render: Callable[[Any], bytes],
+        params: Mapping[str, Any] | None = None,
+        theme: str = "",
+        generation: Optional[int] = None,
+    ) -> Path:
+        """Return a PNG path for ``chart``, rendering only on a miss.
+
+        ``series`` computes the aggregated input and is skipped entirely when
+        ``generation`` matches the one this chart was last resolved at;
+        ``render`` turns that series into PNG bytes.
+        """
+
+        path = self.peek(chart, params=params, theme=theme, generation=generation)
+        if path is not None:
+            return path
+
+        data = series()
+        key = self.key_for(chart, series=data, params=params, theme=theme)
+        path = self.lookup(key)
+        if path is None:
+            started = time.perf_counter()
+            png = render(data)
+            elapsed = time.perf_counter() - started
+            path = self.store(key, png, render_seconds=elapsed)
+            logger.debug("Rendered chart %s in %.0f ms", chart, elapsed * 1000)
+        if generation is not None:
+            self._generations[_slot(chart, params, theme)] = (generation, key)
+        return path
+
+    def forget_generations(self) -> None:
+        """Drop generation shortcuts (e.g. after the database file was swapped)."""
+
+        self._generations.clear()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load()
+            return self._total
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._load():
+                self._path(key).unlink(missing_ok=True)
+            self._entries = OrderedDict()
+            self._total = 0
+            self._generations.clear()
+
+
+def get_chart_cache(config: object, *, max_bytes: int | None = None) -> ChartCache:
+    """Shared cache under ``DATA_DIR/cache/charts`` for ``config``."""
+
+    root = Path(getattr(config, "DATA_DIR")) / "cache" / "charts"
+    limit = max_bytes or int(getattr(config, "CHART_CACHE_MAX_BYTES", CHART_CACHE_MAX_BYTES))
+    with _caches_lock:
+        cache = _caches.get(root)
+        if cache is None:
+            cache = _caches[root] = ChartCache(root, max_bytes=limit)
+        return cache
+
+
+def data_generation(session_factory: Callable[[], Any]) -> Optional[int]:
+    """Newest ``change_log`` seq, or ``None`` if it cannot be read."""
+
+    from ..services.incremental_export import current_seq
+
+    try:
+        with session_factory() as session:
+            return current_seq(session)
+    except Exception:  # pragma: no cover - cache must never break an export
+        return None
+
+
+def theme_key(ctx: object) -> str:
+    """Theme component of cache keys (charts may be styled per theme)."""
+
+    mode = getattr(ctx, "theme_mode", None)
+    return str(getattr(mode, "value", mode) or "")
+
+
+__all__ = [
+    "CHART_CACHE_MAX_BYTES",
+    "ChartCache",
+    "ChartCacheStats",
+    "data_generation",
+    "get_chart_cache",
+    "series_digest",
+    "theme_key",
+]
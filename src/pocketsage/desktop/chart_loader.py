@@ -0,0 +1,124 @@
+"""Load view charts in the background so views appear immediately.
+
+A view shows a placeholder for each chart and submits a ``load`` callable
+(the aggregation queries, or a payoff projection) to a ``ChartLoader``. The
+loader runs loads on a single worker thread, so they never compete with each
+other for the database, and hands each finished ``ChartLoad`` to the view's
+``on_ready`` callback, which swaps the chart in.
+
+``cancel()`` starts a new epoch: queued loads from earlier epochs never start
+and loads already running are discarded when they finish. The router cancels
+on every route change and views cancel before submitting a fresh set, so a
+slow chart for a page the user already left never overwrites anything.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ChartLoad:
+    """Outcome of one background chart load; ``value`` is ``None`` on failure."""
+
+    name: str
+    value: Any
+    seconds: float
+    error: Optional[str] = None
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-loader")
+        return _executor
+
+
+def shutdown_chart_loader() -> None:
+    """Stop the shared worker thread (called when the app closes)."""
+
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ChartLoader:
+    """Runs chart loads off the UI thread and drops results that went stale."""
+
+    def __init__(self, *, executor: Optional[ThreadPoolExecutor] = None):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._pending: list[Future] = []
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def cancel(self) -> int:
+        """Invalidate every outstanding load; returns how many never started."""
+
+        with self._lock:
+            self._epoch += 1
+            pending, self._pending = self._pending, []
+        return sum(1 for future in pending if future.cancel())
+
+    def submit(
+        self,
+        name: str,
+        load: Callable[[], Any],
+        on_ready: Callable[[ChartLoad], None],
+        *,
+        background: bool = True,
+    ) -> Optional[Future]:
+        """Run ``load`` and pass its timed result to ``on_ready`` unless stale.
+
+        With ``background=False`` the load runs inline (headless pages and
+        tests, where there is no event loop to keep responsive).
+        """
+
+        epoch = self._epoch
+
+        def _run() -> None:
+            if epoch != self._epoch:
+                return
+            started = time.perf_counter()
+            value: Any = None
+            error: Optional[str] = None
+            try:
+                value = load()
+            except Exception as exc:
+                logger.warning("Chart %s failed to load: %s", name, exc)
+                error = str(exc)
+            seconds = time.perf_counter() - started
+            if epoch != self._epoch:
+                logger.debug("Discarded stale chart %s (%.0f ms)", name, seconds * 1000)
+                return
+            logger.debug("Chart %s ready in %.0f ms", name, seconds * 1000)
+            on_ready(ChartLoad(name=name, value=value, seconds=seconds, error=error))
+
+        if not background:
+            _run()
+            return None
+        future = (self._executor or _shared_executor()).submit(_run)
+        with self._lock:
+            self._pending = [item for item in self._pending if not item.done()]
+            self._pending.append(future)
+        return future
+
+
+__all__ = ["ChartLoad", "ChartLoader", "shutdown_chart_loader"]
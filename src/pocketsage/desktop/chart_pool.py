@@ -0,0 +1,167 @@
+"""Render matplotlib charts in worker processes.
+
+Matplotlib holds the GIL while drawing, so threads do not help; a handful of
+charts for a report bundle render side by side in a process pool instead.
+Workers are started with ``spawn`` (forking a process that runs the Flet UI
+threads is not safe), use the Agg backend via ``desktop.charts`` and are kept
+warm between bundles. In the PyInstaller build a spawned worker re-runs the
+executable, so every entry point calls ``multiprocessing.freeze_support()``
+before starting the app. Anything that prevents a pool from working — sandboxed
+platforms without ``sem_open``, a crashed worker, unpicklable input — falls
+back to rendering in the calling process.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+CHART_POOL_MAX_WORKERS = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ChartJob:
+    """One chart to render: ``render(**kwargs)`` must return PNG bytes.
+
+    ``render`` has to be a module-level function and ``kwargs`` plain data so
+    the job can be pickled into a worker process.
+    """
+
+    name: str
+    render: Callable[..., bytes]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ChartRender:
+    """Outcome of one job; ``png`` is empty when ``error`` is set."""
+
+    name: str
+    png: bytes
+    seconds: float
+    mode: str
+    error: Optional[str] = None
+
+
+def _run_job(render: Callable[..., bytes], kwargs: dict[str, Any]) -> tuple[bytes, float]:
+    started = time.perf_counter()
+    png = render(**kwargs)
+    return png, time.perf_counter() - started
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _discard_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_chart_pool() -> None:
+    """Stop the worker processes (called when the app closes)."""
+
+    _discard_pool()
+
+
+def _render_serial(job: ChartJob) -> ChartRender:
+    try:
+        png, seconds = _run_job(job.render, job.kwargs)
+    except Exception as exc:
+        logger.warning("Chart %s failed: %s", job.name, exc)
+        return ChartRender(name=job.name, png=b"", seconds=0.0, mode="serial", error=str(exc))
+    return ChartRender(name=job.name, png=png, seconds=seconds, mode="serial")
+
+
+def render_charts(
+    jobs: Sequence[ChartJob],
+    *,
+    on_result: Callable[[ChartRender], None] | None = None,
+    use_processes: bool = True,
+    max_workers: int | None = None,
+) -> list[ChartRender]:
+    """Render ``jobs`` and return their results in completion order.
+
+    ``on_result`` is called in the calling thread as each chart finishes, so
+    callers can stream results (e.g. into a zip) without waiting for the rest.
+    A job that raises is retried in-process and, if it fails again, reported
+    with ``error`` set rather than aborting the others.
+    """
+
+    results: list[ChartRender] = []
+
+    def _emit(result: ChartRender) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    workers = max_workers or min(CHART_POOL_MAX_WORKERS, os.cpu_count() or 1)
+    pending = list(jobs)
+    if use_processes and len(pending) > 1 and workers > 1:
+        try:
+            pool: Executor = _get_pool(workers)
+            futures = {pool.submit(_run_job, job.render, job.kwargs): job for job in pending}
+        except (OSError, NotImplementedError, RuntimeError, BrokenProcessPool) as exc:
+            logger.info("Chart process pool unavailable (%s); rendering serially", exc)
+            _discard_pool()
+        else:
+            pending = []
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    png, seconds = future.result()
+                except BrokenProcessPool:
+                    _discard_pool()
+                    pending.append(job)
+                    continue
+                except Exception:
+                    # Includes pickling problems; the serial retry reports the
+                    # render's own error if it really fails.
+                    pending.append(job)
+                    continue
+                _emit(ChartRender(name=job.name, png=png, seconds=seconds, mode="process"))
+
+    for job in pending:
+        _emit(_render_serial(job))
+    return results
+
+
+def format_render_times(results: Sequence[ChartRender]) -> str:
+    """Summarise per-chart render times, e.g. ``"spending 0.41s, trend 0.38s"``."""
+
+    parts = []
+    for result in results:
+        label = f"{result.name} failed" if result.error else f"{result.name} {result.seconds:.2f}s"
+        parts.append(label)
+    return ", ".join(parts)
+
+
+__all__ = [
+    "CHART_POOL_MAX_WORKERS",
+    "ChartJob",
+    "ChartRender",
+    "format_render_times",
+    "render_charts",
+    "shutdown_chart_pool",
+]
@@ -0,0 +1,156 @@
+"""Chart helpers for Flet views and exports.
+
+Charts are drawn from the compact series in ``charts.data`` by one of two
+``ChartRenderer`` backends:
+
+* ``charts.native.FletChartRenderer`` builds ``ft.PieChart``/``LineChart``/
+  ``BarChart`` controls for on-screen charts;
+* ``charts.mpl.MatplotlibChartRenderer`` (and the ``*_png`` helpers) render
+  PNGs for file exports; ``charts.batch.BatchChartRenderer`` renders many
+  PNGs of the same kinds, as report bundles do, on reusable figures.
+
+This package imports neither backend up front. The matplotlib helpers are
+still reachable under their old names here, but resolve on first access,
+so matplotlib is only imported once an export actually asks for it.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from importlib import import_module
+from typing import Any, Iterable, Protocol, TypeVar
+
+from pocketsage.models.portfolio import Holding
+from pocketsage.models.transaction import Transaction
+
+from .data import (
+    CashflowSeries,
+    CategorySeries,
+    PayoffSeries,
+    StackedSeries,
+    account_cashflow_from_transactions,
+    allocation_from_holdings,
+    cashflow_from_transactions,
+    category_trend_from_transactions,
+    payoff_from_schedule,
+)
+from .scratch import CHART_SCRATCH_MAX_BYTES, chart_image_base64, cleanup_chart_scratch
+
+ChartOutput = TypeVar("ChartOutput", covariant=True)
+
+
+class ChartRenderer(Protocol[ChartOutput]):
+    """Draws each kind of chart from its aggregated series."""
+
+    def spending(self, series: CategorySeries) -> ChartOutput:  # pragma: no cover - interface
+        ...
+
+    def cashflow(self, series: CashflowSeries) -> ChartOutput:  # pragma: no cover - interface
+        ...
+
+    def category_trend(self, series: StackedSeries) -> ChartOutput:  # pragma: no cover
+        ...
+
+    def account_cashflow(self, series: CategorySeries) -> ChartOutput:  # pragma: no cover
+        ...
+
+    def allocation(self, series: CategorySeries) -> ChartOutput:  # pragma: no cover - interface
+        ...
+
+    def debt_payoff(self, series: PayoffSeries) -> ChartOutput:  # pragma: no cover - interface
+        ...
+
+
+def cashflow_trend_series(
+    transactions: Iterable[Transaction], months: int = 6, today: date | None = None
+) -> tuple[list[str], list[float], list[float]]:
+    """Monthly income and expense totals for the last ``months`` months.
+
+    Returns empty lists when there are no transactions at all, so the chart
+    can show its "no data yet" placeholder.
+    """
+
+    series = cashflow_from_transactions(transactions, months=months, today=today)
+    return list(series.months), list(series.income), list(series.expense)
+
+
+def allocation_totals(holdings: Iterable[Holding]) -> dict[str, float]:
+    """Market value per symbol (falling back to average cost when unpriced)."""
+
+    return allocation_from_holdings(holdings).as_dict()
+
+
+def debt_payoff_series(schedule: Iterable[dict]) -> tuple[list[str], list[float]]:
+    """Reduce a payoff schedule to month labels and total remaining balance."""
+
+    series = payoff_from_schedule(schedule)
+    return list(series.months), list(series.remaining)
+
+
+def category_trend_series(
+    transactions: Iterable[Transaction],
+    *,
+    category_lookup: dict[int, str] | None = None,
+    months: int = 6,
+    today: date | None = None,
+) -> tuple[list[str], dict[str, list[float]]]:
+    """Sum expenses per category label for each of the last ``months`` months."""
+
+    series = category_trend_from_transactions(
+        transactions, category_lookup=category_lookup, months=months, today=today
+    )
+    return list(series.months), series.as_dict()
+
+
+def account_cashflow_totals(
+    transactions: Iterable[Transaction], account_lookup: dict[int, str] | None = None
+) -> dict[str, float]:
+    """Net amount per account label."""
+
+    return account_cashflow_from_transactions(transactions, account_lookup=account_lookup).as_dict()
+
+
+_LAZY = {
+    "BatchChartRenderer": ".batch",
+    "FletChartRenderer": ".native",
+    "MatplotlibChartRenderer": ".mpl",
+    "allocation_chart_png": ".mpl",
+    "allocation_png_bytes": ".mpl",
+    "cashflow_by_account_png": ".mpl",
+    "cashflow_by_account_png_bytes": ".mpl",
+    "cashflow_trend_png": ".mpl",
+    "cashflow_trend_png_bytes": ".mpl",
+    "category_trend_png": ".mpl",
+    "category_trend_png_bytes": ".mpl",
+    "debt_payoff_chart_png": ".mpl",
+    "debt_payoff_png_bytes": ".mpl",
+    "spending_chart_png": ".mpl",
+    "spending_png_bytes": ".mpl",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = [
+    "CHART_SCRATCH_MAX_BYTES",
+    "ChartRenderer",
+    "account_cashflow_totals",
+    "allocation_totals",
+    "cashflow_trend_series",
+    "category_trend_series",
+    "chart_image_base64",
+    "cleanup_chart_scratch",
+    "debt_payoff_series",
+    *_LAZY,
+]
@@ -0,0 +1,611 @@
+"""Batch PNG rendering from reusable figure templates.
+
+The ``*_png_bytes`` helpers in ``charts.mpl`` build a fresh pyplot figure
+per chart: figure and axes creation, fonts, formatters, titles and the
+tight-layout pass are paid every time. Report bundles draw the same chart
+types over and over (e.g. a spending donut for each of the last twelve
+months), so ``BatchChartRenderer`` keeps one prepared figure per chart type
+and only updates the data-bearing artists before each save: line data,
+wedge angles and colours, tick labels and the summary text are set in
+place, while artists whose count varies with the data (fills, bars, value
+labels) are removed and redrawn.
+
+Only the object-oriented API is used (``Figure`` with an Agg canvas, no
+pyplot state), so renderers in different threads never share anything.
+A renderer itself is not thread-safe; ``batch_renderer()`` hands out one
+per thread, and ``render_png`` is a picklable entry point for
+``chart_pool`` jobs, whose worker processes keep their templates warm
+between bundles.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from io import BytesIO
+from typing import Any, Iterable, Iterator
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch, Wedge
+from matplotlib.ticker import FuncFormatter
+
+from ..downsample import CHART_LABEL_BUDGET, CHART_POINT_BUDGET, downsample_indices, tick_step
+from .data import CashflowSeries, CategorySeries, PayoffSeries, StackedSeries
+
+_currency = FuncFormatter(lambda value, _pos: f"${value:,.0f}")
+
+
+class FigureTemplate:
+    """A prepared figure for one chart type; ``render`` swaps in new data."""
+
+    figsize: tuple[float, float] = (10, 6)
+    dpi = 100
+    placeholder = "No data"
+    show_axes = True
+
+    def __init__(self) -> None:
+        self.figure = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self._transient: list[Any] = []
+        self._placeholder = self.ax.text(
+            0.5,
+            0.5,
+            self.placeholder,
+            transform=self.ax.transAxes,
+            ha="center",
+            va="center",
+            fontsize=14,
+            color="#666",
+            visible=False,
+        )
+        self.setup()
+
+    def setup(self) -> None:
+        """Create the artists every chart of this type shares."""
+
+    def update(self, series: Any) -> bool:
+        """Point the artists at ``series``; return ``False`` when it is empty."""
+
+        raise NotImplementedError
+
+    def _keep(self, artist: Any) -> Any:
+        """Register an artist to be removed before the next render."""
+
+        self._transient.append(artist)
+        return artist
+
+    def render(self, series: Any) -> bytes:
+        for artist in self._transient:
+            artist.remove()
+        self._transient.clear()
+        has_data = self.update(series)
+        self._placeholder.set_visible(not has_data)
+        if has_data and self.show_axes:
+            self.ax.set_axis_on()
+        else:
+            self.ax.set_axis_off()
+        buffer = BytesIO()
+        self.figure.savefig(buffer, format="png", dpi=self.dpi)
+        return buffer.getvalue()
+
+
+def _month_ticks(ax, labels: tuple[str, ...] | list[str]) -> None:
+    positions = list(range(0, len(labels), tick_step(len(labels))))
+    ax.set_xticks(positions, [labels[i] for i in positions], rotation=45, ha="right")
+    ax.set_xlim(-0.5, max(len(labels) - 0.5, 0.5))
+
+
+class CashflowTemplate(FigureTemplate):
+    placeholder = "No transaction data yet\nAdd transactions to see your cashflow"
+
+    def setup(self) -> None:
+        ax = self.ax
+        ax.set_position((0.08, 0.17, 0.88, 0.75))
+        (self.income,) = ax.plot([], [], marker="o", linewidth=2.5, color="#22C55E")
+        (self.expense,) = ax.plot([], [], marker="s", linewidth=2.5, color="#EF4444")
+        ax.grid(True, linestyle="--", alpha=0.3)
+        ax.set_axisbelow(True)
+        ax.set_ylabel("Amount ($)", fontsize=11)
+        ax.set_xlabel("Month", fontsize=11)
+        ax.yaxis.set_major_formatter(_currency)
+        self.legend = ax.legend(
+            handles=[
+                self.income,
+                self.expense,
+                Patch(color="#DCFCE7", alpha=0.4),
+                Patch(color="#FEE2E2", alpha=0.4),
+            ],
+            labels=["Income", "Expenses", "Surplus", "Deficit"],
+            loc="upper left",
+            framealpha=0.9,
+        )
+        self.stats = ax.text(
+            0.98,
+            0.98,
+            "",
+            transform=ax.transAxes,
+            fontsize=9,
+            va="top",
+            ha="right",
+            bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.8),
+        )
+
+    def update(self, series: CashflowSeries) -> bool:
+        ax = self.ax
+        has_data = bool(series)
+        for artist in (self.income, self.expense, self.legend, self.stats):
+            artist.set_visible(has_data)
+        ax.set_title("Cashflow by Month" if has_data else "", fontsize=14, fontweight="bold")
+        if not has_data:
+            return False
+
+        kept = downsample_indices(series.income, series.expense, max_points=CHART_POINT_BUDGET)
+        xs = kept.tolist()
+        income = [series.income[i] for i in xs]
+        expense = [series.expense[i] for i in xs]
+        marker_size = 8 if len(xs) <= CHART_LABEL_BUDGET else 3
+        for line, values in ((self.income, income), (self.expense, expense)):
+            line.set_data(xs, values)
+            line.set_markersize(marker_size)
+
+        surplus = [inc >= exp for inc, exp in zip(income, expense)]
+        self._keep(ax.fill_between(xs, income, expense, where=surplus, color="#DCFCE7", alpha=0.4))
+        self._keep(
+            ax.fill_between(
+                xs, income, expense, where=[not s for s in surplus], color="#FEE2E2", alpha=0.4
+            )
+        )
+        labelled = downsample_indices(income, expense, max_points=CHART_LABEL_BUDGET)
+        for pos in labelled.tolist():
+            for value, offset, color in (
+                (income[pos], 10, "#22C55E"),
+                (expense[pos], -15, "#EF4444"),
+            ):
+                if value > 0:
+                    self._keep(
+                        ax.annotate(
+                            f"${value:,.0f}",
+                            (xs[pos], value),
+                            textcoords="offset points",
+                            xytext=(0, offset),
+                            ha="center",
+                            fontsize=8,
+                            color=color,
+                            fontweight="bold",
+                        )
+                    )
+
+        _month_ticks(ax, series.months)
+        top = max(max(series.income), max(series.expense), 1.0)
+        ax.set_ylim(-top * 0.05, top * 1.15)
+        total_income, total_expense = sum(series.income), sum(series.expense)
+        self.stats.set_text(
+            f"Total Income: ${total_income:,.0f}\nTotal Expenses: ${total_expense:,.0f}\n"
+            f"Net: ${total_income - total_expense:,.0f}"
+        )
+        return True
+
+
+class DebtPayoffTemplate(FigureTemplate):
+    placeholder = "No payoff schedule"
+
+    def setup(self) -> None:
+        ax = self.ax
+        ax.set_position((0.1, 0.17, 0.86, 0.75))
+        (self.line,) = ax.plot([], [], marker="o", color="#4F46E5", linewidth=2.5)
+        ax.grid(True, linestyle="--", alpha=0.3)
+        ax.set_axisbelow(True)
+        ax.set_ylabel("Remaining Balance ($)", fontsize=11)
+        ax.set_xlabel("Month", fontsize=11)
+        ax.yaxis.set_major_formatter(_currency)
+        self.stats = ax.text(
+            0.02,
+            0.98,
+            "",
+            transform=ax.transAxes,
+            fontsize=9,
+            va="top",
+            bbox=dict(boxstyle="round", facecolor="lavender", alpha=0.8),
+        )
+
+    def _milestone(
+        self, remaining: tuple[float, ...], share: float, label: str, color: str
+    ) -> None:
+        target = remaining[0] * share
+        for i, total in enumerate(remaining):
+            if total <= target:
+                self._keep(
+                    self.ax.axvline(x=i, color=color, linestyle="--", alpha=0.6, linewidth=1.5)
+                )
+                self._keep(
+                    self.ax.annotate(
+                        label,
+                        (i, total),
+                        xytext=(10, 30),
+                        textcoords="offset points",
+                        fontsize=9,
+                        color=color,
+                        fontweight="bold",
+                    )
+                )
+                return
+
+    def update(self, series: PayoffSeries) -> bool:
+        ax = self.ax
+        has_data = bool(series)
+        self.line.set_visible(has_data)
+        self.stats.set_visible(has_data)
+        ax.set_title("Debt Payoff Projection" if has_data else "", fontsize=14, fontweight="bold")
+        if not has_data:
+            return False
+
+        remaining = series.remaining
+        kept = downsample_indices(remaining, max_points=CHART_POINT_BUDGET).tolist()
+        values = [remaining[i] for i in kept]
+        self.line.set_data(kept, values)
+        self.line.set_markersize(6 if len(kept) <= CHART_LABEL_BUDGET * 2 else 3)
+        self._keep(ax.fill_between(kept, values, color="#E0E7FF", alpha=0.5))
+        if len(remaining) > 1 and remaining[0] > 0:
+            self._milestone(remaining, 0.5, "50% Paid!", "#22C55E")
+            self._milestone(remaining, 0.25, "75% Paid!", "#16A34A")
+        if remaining[-1] < 1:
+            last = len(remaining) - 1
+            self._keep(
+                ax.scatter([last], [0], s=200, c="gold", marker="*", zorder=5, edgecolors="#F59E0B")
+            )
+            self._keep(
+                ax.annotate(
+                    "DEBT FREE!",
+                    (last, 0),
+                    xytext=(0, 25),
+                    textcoords="offset points",
+                    ha="center",
+                    fontsize=12,
+                    fontweight="bold",
+                    color="#16A34A",
+                )
+            )
+
+        positions = list(range(0, len(remaining), max(1, len(remaining) // 8)))
+        ax.set_xticks(positions, [series.months[i] for i in positions], rotation=45, ha="right")
+        ax.set_xlim(-0.5, max(len(remaining) - 0.5, 0.5))
+        top = max(max(remaining), 1.0)
+        ax.set_ylim(-top * 0.05, top * 1.1)
+        months_to_payoff = sum(1 for total in remaining if total > 0)
+        self.stats.set_text(
+            f"Starting Debt: ${remaining[0]:,.0f}\nMonths to Payoff: {months_to_payoff}"
+        )
+        return True
+
+
+class DonutTemplate(FigureTemplate):
+    """Donut with a pooled set of wedges; unused wedges are hidden, not deleted."""
+
+    figsize = (10, 7)
+    dpi = 120
+    show_axes = False
+    placeholder = "No expense data"
+    title = "Spending by Category"
+    legend_title = "Categories"
+    center_label = "Total Spending"
+    colormap = "tab20c"
+    ring_width = 0.45
+    max_legend_items = 12
+
+    def setup(self) -> None:
+        ax = self.ax
+        ax.set_position((0.02, 0.04, 0.56, 0.86))
+        ax.set_axis_off()
+        ax.set_xlim(-1.2, 1.2)
+        ax.set_ylim(-1.2, 1.2)
+        ax.set_aspect("equal")
+        self.cmap = matplotlib.colormaps[self.colormap]
+        self.wedges: list[Wedge] = []
+        self.labels: list[Any] = []
+        self.center_title = ax.text(
+            0, 0.08, self.center_label, ha="center", va="center", fontsize=11, color="#666"
+        )
+        self.center_total = ax.text(
+            0, -0.08, "", ha="center", va="center", fontsize=18, fontweight="bold", color="#1F2937"
+        )
+
+    def _wedge(self, index: int) -> tuple[Wedge, Any]:
+        while len(self.wedges) <= index:
+            wedge = Wedge(
+                (0, 0), 1.0, 0, 0, width=self.ring_width, edgecolor="white", linewidth=1.5
+            )
+            self.ax.add_patch(wedge)
+            label = self.ax.text(
+                0, 0, "", ha="center", va="center", fontsize=9, fontweight="bold", color="white"
+            )
+            self.wedges.append(wedge)
+            self.labels.append(label)
+        return self.wedges[index], self.labels[index]
+
+    def update(self, series: CategorySeries) -> bool:
+        values = [max(value, 0.0) for value in series.values]
+        total = sum(values)
+        has_data = total > 0
+        for artist in (self.center_title, self.center_total):
+            artist.set_visible(has_data)
+        self.ax.set_title(self.title if has_data else "", fontsize=16, fontweight="bold")
+        for wedge, label in zip(self.wedges[len(values) :], self.labels[len(values) :]):
+            wedge.set_visible(False)
+            label.set_visible(False)
+        if not has_data:
+            for wedge, label in zip(self.wedges, self.labels):
+                wedge.set_visible(False)
+                label.set_visible(False)
+            return False
+
+        angle = 90.0
+        radius = 1.0 - self.ring_width / 2
+        count = len(values)
+        for i, value in enumerate(values):
+            wedge, label = self._wedge(i)
+            sweep = 360.0 * value / total
+            wedge.set_theta1(angle)
+            wedge.set_theta2(angle + sweep)
+            wedge.set_facecolor(self.cmap(i / max(count, 1)))
+            wedge.set_visible(True)
+            middle = math.radians(angle + sweep / 2)
+            label.set_position((radius * math.cos(middle), radius * math.sin(middle)))
+            label.set_text(f"{value / total:.1%}" if value / total > 0.04 else "")
+            label.set_visible(True)
+            angle += sweep
+
+        shown = min(count, self.max_legend_items)
+        legend_labels = [
+            f"{series.labels[i]}: ${values[i]:,.0f} ({values[i] / total:.1%})" for i in range(shown)
+        ]
+        handles = self.wedges[:shown]
+        if count > shown:
+            rest = sum(values[shown:])
+            legend_labels.append(f"Other ({count - shown} more): ${rest:,.0f} ({rest / total:.1%})")
+            handles = handles + [self.wedges[count - 1]]
+        self._keep(
+            self.figure.legend(
+                handles,
+                legend_labels,
+                title=self.legend_title,
+                loc="center left",
+                bbox_to_anchor=(0.6, 0.5),
+                fontsize=9,
+                framealpha=0.9,
+            )
+        )
+        self.center_total.set_text(f"${total:,.0f}")
+        return True
+
+
+class AllocationTemplate(DonutTemplate):
+    figsize = (8, 6)
+    dpi = 100
+    placeholder = "No holdings"
+    title = "Portfolio Allocation"
+    legend_title = "Holdings"
+    center_label = "Total"
+    colormap = "tab20"
+    ring_width = 0.5
+
+
+class CategoryTrendTemplate(FigureTemplate):
+    placeholder = "No expense data"
+
+    def setup(self) -> None:
+        ax = self.ax
+        ax.set_position((0.08, 0.17, 0.7, 0.75))
+        self.cmap = matplotlib.colormaps["tab20"]
+        ax.grid(True, linestyle="--", alpha=0.3, axis="y")
+        ax.set_axisbelow(True)
+        ax.set_ylabel("Amount ($)", fontsize=11)
+        ax.set_xlabel("Month", fontsize=11)
+        ax.yaxis.set_major_formatter(_currency)
+        self.stats = ax.text(
+            0.02,
+            0.98,
+            "",
+            transform=ax.transAxes,
+            fontsize=9,
+            va="top",
+            bbox=dict(boxstyle="round", facecolor="lightyellow", alpha=0.8),
+        )
+
+    def update(self, series: StackedSeries) -> bool:
+        ax = self.ax
+        has_data = bool(series.stacks)
+        self.stats.set_visible(has_data)
+        ax.set_title(
+            "Expense Trend by Category" if has_data else "", fontsize=14, fontweight="bold"
+        )
+        if not has_data:
+            return False
+
+        stacks = sorted(series.stacks, key=lambda item: sum(item[1]), reverse=True)
+        xs = list(range(len(series.months)))
+        bottom = [0.0] * len(xs)
+        for i, (name, values) in enumerate(stacks):
+            self._keep(
+                ax.bar(
+                    xs,
+                    values,
+                    bottom=bottom,
+                    label=name,
+                    color=self.cmap(i / len(stacks)),
+                    edgecolor="white",
+                    linewidth=0.5,
+                )
+            )
+            bottom = [b + v for b, v in zip(bottom, values)]
+        for i in downsample_indices(bottom, max_points=CHART_LABEL_BUDGET).tolist():
+            if bottom[i] > 0:
+                self._keep(
+                    ax.annotate(
+                        f"${bottom[i]:,.0f}",
+                        (i, bottom[i]),
+                        textcoords="offset points",
+                        xytext=(0, 5),
+                        ha="center",
+                        fontsize=8,
+                        fontweight="bold",
+                    )
+                )
+        self._keep(
+            ax.legend(bbox_to_anchor=(1.02, 1), loc="upper left", fontsize=8, title="Categories")
+        )
+        _month_ticks(ax, series.months)
+        ax.set_ylim(0, max(max(bottom), 1.0) * 1.12)
+        grand_total = sum(bottom)
+        self.stats.set_text(f"Total: ${grand_total:,.0f}\nAvg/Month: ${grand_total / len(xs):,.0f}")
+        return True
+
+
+class AccountCashflowTemplate(FigureTemplate):
+    placeholder = "No transaction data"
+
+    def setup(self) -> None:
+        ax = self.ax
+        ax.set_position((0.1, 0.2, 0.86, 0.72))
+        self.zero = ax.axhline(0, color="black", linewidth=0.8)
+        ax.grid(True, linestyle="--", alpha=0.3, axis="y")
+        ax.set_axisbelow(True)
+        ax.set_ylabel("Net Amount ($)", fontsize=11)
+        ax.set_xlabel("Account", fontsize=11)
+        ax.yaxis.set_major_formatter(_currency)
+        self.stats = ax.text(
+            0.98,
+            0.98,
+            "",
+            transform=ax.transAxes,
+            fontsize=10,
+            va="top",
+            ha="right",
+            fontweight="bold",
+            bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.8),
+        )
+
+    def update(self, series: CategorySeries) -> bool:
+        ax = self.ax
+        has_data = bool(series)
+        self.stats.set_visible(has_data)
+        self.zero.set_visible(has_data)
+        ax.set_title("Net Cashflow by Account" if has_data else "", fontsize=14, fontweight="bold")
+        if not has_data:
+            return False
+
+        items = sorted(
+            zip(series.labels, series.values), key=lambda item: abs(item[1]), reverse=True
+        )
+        labels = [label for label, _ in items]
+        values = [value for _, value in items]
+        colors = ["#22C55E" if value >= 0 else "#EF4444" for value in values]
+        xs = list(range(len(values)))
+        self._keep(ax.bar(xs, values, color=colors, edgecolor="white", linewidth=0.5))
+        for x, value, color in zip(xs, values, colors):
+            self._keep(
+                ax.annotate(
+                    f"${value:,.0f}",
+                    xy=(x, value),
+                    xytext=(0, 5 if value >= 0 else -5),
+                    textcoords="offset points",
+                    ha="center",
+                    va="bottom" if value >= 0 else "top",
+                    fontsize=9,
+                    fontweight="bold",
+                    color=color,
+                )
+            )
+        ax.set_xticks(xs, labels, rotation=45, ha="right")
+        ax.set_xlim(-0.5, len(xs) - 0.5)
+        top, low = max(max(values), 0.0), min(min(values), 0.0)
+        span = max(top - low, 1.0)
+        ax.set_ylim(low - span * 0.1, top + span * 0.12)
+        total = sum(values)
+        self.stats.set_text(f"Total Net: ${total:,.0f}")
+        self.stats.set_color("#22C55E" if total >= 0 else "#EF4444")
+        return True
+
+
+TEMPLATES: dict[str, type[FigureTemplate]] = {
+    "spending": DonutTemplate,
+    "allocation": AllocationTemplate,
+    "cashflow": CashflowTemplate,
+    "category_trend": CategoryTrendTemplate,
+    "account_cashflow": AccountCashflowTemplate,
+    "debt_payoff": DebtPayoffTemplate,
+}
+
+
+class BatchChartRenderer:
+    """``ChartRenderer`` backend that reuses one prepared figure per chart type."""
+
+    def __init__(self) -> None:
+        self._templates: dict[str, FigureTemplate] = {}
+
+    def template(self, kind: str) -> FigureTemplate:
+        template = self._templates.get(kind)
+        if template is None:
+            try:
+                template_type = TEMPLATES[kind]
+            except KeyError:
+                raise ValueError(f"Unknown chart type: {kind}") from None
+            template = self._templates[kind] = template_type()
+        return template
+
+    def render(self, kind: str, series: Any) -> bytes:
+        return self.template(kind).render(series)
+
+    def render_many(self, kind: str, series: Iterable[Any]) -> Iterator[bytes]:
+        """Render each of ``series`` in turn on the same figure."""
+
+        template = self.template(kind)
+        for item in series:
+            yield template.render(item)
+
+    def spending(self, series: CategorySeries) -> bytes:
+        return self.render("spending", series)
+
+    def cashflow(self, series: CashflowSeries) -> bytes:
+        return self.render("cashflow", series)
+
+    def category_trend(self, series: StackedSeries) -> bytes:
+        return self.render("category_trend", series)
+
+    def account_cashflow(self, series: CategorySeries) -> bytes:
+        return self.render("account_cashflow", series)
+
+    def allocation(self, series: CategorySeries) -> bytes:
+        return self.render("allocation", series)
+
+    def debt_payoff(self, series: PayoffSeries) -> bytes:
+        return self.render("debt_payoff", series)
+
+
+_local = threading.local()
+
+
+def batch_renderer() -> BatchChartRenderer:
+    """The calling thread's renderer (templates are never shared across threads)."""
+
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = _local.renderer = BatchChartRenderer()
+    return renderer
+
+
+def render_png(kind: str, series: Any) -> bytes:
+    """Render one chart with this thread's templates (a ``ChartJob`` target)."""
+
+    return batch_renderer().render(kind, series)
+
+
+__all__ = [
+    "BatchChartRenderer",
+    "FigureTemplate",
+    "TEMPLATES",
+    "batch_renderer",
+    "render_png",
+]
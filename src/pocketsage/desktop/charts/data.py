@@ -0,0 +1,409 @@
+"""Chart-ready series and the SQL aggregates that fill them.
+
+Renderers in ``desktop.charts`` only draw; they take these compact series
+(a handful of labels and values) rather than transactions. The query helpers
+below group and sum in SQLite, so building a chart costs the same whether
+the ledger holds a hundred rows or a million. The ``*_from_*`` helpers build
+the same series from objects already in memory, for views that have them
+loaded anyway and for the legacy ``Iterable[Transaction]`` chart functions.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from sqlalchemy import case, func
+from sqlmodel import Session, select
+
+from ...models.account import Account
+from ...models.category import Category
+from ...models.portfolio import Holding
+from ...models.transaction import Transaction
+
+SessionFactory = Callable[[], Session]
+
+UNCATEGORIZED = "Uncategorized"
+UNASSIGNED = "Unassigned"
+
+
+@dataclass(frozen=True)
+class CategorySeries:
+    """One value per label: spending by category, allocation, per-account net."""
+
+    labels: tuple[str, ...] = ()
+    values: tuple[float, ...] = ()
+
+    @classmethod
+    def from_totals(cls, totals: Mapping[Any, float]) -> "CategorySeries":
+        items = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+        return cls(tuple(str(key) for key, _ in items), tuple(float(v) for _, v in items))
+
+    def as_dict(self) -> dict[str, float]:
+        return dict(zip(self.labels, self.values))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+@dataclass(frozen=True)
+class CashflowSeries:
+    """Income and expense per month; empty when the user has no transactions."""
+
+    months: tuple[str, ...] = ()
+    income: tuple[float, ...] = ()
+    expense: tuple[float, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+
+@dataclass(frozen=True)
+class StackedSeries:
+    """Per-month values for several named stacks (expenses by category)."""
+
+    months: tuple[str, ...] = ()
+    stacks: tuple[tuple[str, tuple[float, ...]], ...] = field(default_factory=tuple)
+
+    def as_dict(self) -> dict[str, list[float]]:
+        return {name: list(values) for name, values in self.stacks}
+
+    def at(self, index: int) -> CategorySeries:
+        """The non-zero stack values for one month, e.g. that month's spending."""
+
+        return CategorySeries.from_totals(
+            {name: values[index] for name, values in self.stacks if values[index] > 0}
+        )
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+
+@dataclass(frozen=True)
+class PayoffSeries:
+    """Total remaining debt balance after each month of a payoff schedule."""
+
+    months: tuple[str, ...] = ()
+    remaining: tuple[float, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+
+def month_keys(months: int, today: date | None = None) -> list[str]:
+    """``YYYY-MM`` keys for the last ``months`` months, oldest first."""
+
+    today = today or date.today()
+    keys: list[str] = []
+    for offset in range(months - 1, -1, -1):
+        month = (today.month - offset - 1) % 12 + 1
+        year = today.year + ((today.month - offset - 1) // 12)
+        keys.append(f"{year}-{month:02d}")
+    return keys
+
+
+def _month_bounds(keys: list[str]) -> tuple[datetime, datetime]:
+    first_year, first_month = (int(part) for part in keys[0].split("-"))
+    last_year, last_month = (int(part) for part in keys[-1].split("-"))
+    end = datetime(last_year + last_month // 12, last_month % 12 + 1, 1)
+    return datetime(first_year, first_month, 1), end
+
+
+def _month_expr():
+    return func.strftime("%Y-%m", Transaction.occurred_at)
+
+
+def _in_range(stmt, start: Optional[datetime], end: Optional[datetime]):
+    if start is not None:
+        stmt = stmt.where(Transaction.occurred_at >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.occurred_at < end)
+    return stmt
+
+
+# -- SQL aggregates --------------------------------------------------------
+
+
+def spending_by_category(
+    session_factory: SessionFactory,
+    *,
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> CategorySeries:
+    """Total expenses per category name in ``[start, end)``."""
+
+    stmt = (
+        select(Category.name, func.sum(-Transaction.amount))
+        .select_from(Transaction)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id, Transaction.amount < 0)
+        .group_by(Transaction.category_id)
+    )
+    stmt = _in_range(stmt, start, end)
+    totals: dict[str, float] = defaultdict(float)
+    with session_factory() as session:
+        for name, total in session.exec(stmt).all():
+            totals[name or UNCATEGORIZED] += float(total or 0.0)
+    return CategorySeries.from_totals(totals)
+
+
+def monthly_cashflow(
+    session_factory: SessionFactory,
+    *,
+    user_id: int,
+    months: int = 6,
+    today: date | None = None,
+) -> CashflowSeries:
+    """Income and expenses for each of the last ``months`` months."""
+
+    keys = month_keys(months, today)
+    start, end = _month_bounds(keys)
+    month = _month_expr()
+    stmt = (
+        select(
+            month,
+            func.sum(case((Transaction.amount > 0, Transaction.amount), else_=0.0)),
+            func.sum(case((Transaction.amount < 0, -Transaction.amount), else_=0.0)),
+        )
+        .where(Transaction.user_id == user_id)
+        .group_by(month)
+    )
+    stmt = _in_range(stmt, start, end)
+    with session_factory() as session:
+        has_any = session.exec(
+            select(Transaction.id).where(Transaction.user_id == user_id).limit(1)
+        ).first()
+        if has_any is None:
+            return CashflowSeries()
+        rows = {key: (float(inc or 0.0), float(exp or 0.0)) for key, inc, exp in session.exec(stmt)}
+    return CashflowSeries(
+        months=tuple(keys),
+        income=tuple(rows.get(key, (0.0, 0.0))[0] for key in keys),
+        expense=tuple(rows.get(key, (0.0, 0.0))[1] for key in keys),
+    )
+
+
+def category_trend(
+    session_factory: SessionFactory,
+    *,
+    user_id: int,
+    months: int = 6,
+    today: date | None = None,
+) -> StackedSeries:
+    """Expenses per category name for each of the last ``months`` months."""
+
+    keys = month_keys(months, today)
+    start, end = _month_bounds(keys)
+    month = _month_expr()
+    stmt = (
+        select(month, Category.name, func.sum(-Transaction.amount))
+        .select_from(Transaction)
+        .outerjoin(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id, Transaction.amount < 0)
+        .group_by(month, Transaction.category_id)
+    )
+    stmt = _in_range(stmt, start, end)
+    index = {key: i for i, key in enumerate(keys)}
+    stacks: dict[str, list[float]] = {}
+    with session_factory() as session:
+        for key, name, total in session.exec(stmt).all():
+            values = stacks.setdefault(name or UNCATEGORIZED, [0.0] * len(keys))
+            values[index[key]] += float(total or 0.0)
+    return StackedSeries(
+        months=tuple(keys),
+        stacks=tuple((name, tuple(values)) for name, values in stacks.items()),
+    )
+
+
+def cashflow_by_account(
+    session_factory: SessionFactory,
+    *,
+    user_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> CategorySeries:
+    """Net amount per account name in ``[start, end)``."""
+
+    stmt = (
+        select(Account.name, func.sum(Transaction.amount))
+        .select_from(Transaction)
+        .outerjoin(Account, Account.id == Transaction.account_id)
+        .where(Transaction.user_id == user_id)
+        .group_by(Transaction.account_id)
+    )
+    stmt = _in_range(stmt, start, end)
+    totals: dict[str, float] = defaultdict(float)
+    with session_factory() as session:
+        for name, total in session.exec(stmt).all():
+            totals[name or UNASSIGNED] += float(total or 0.0)
+    return CategorySeries.from_totals(totals)
+
+
+def allocation_by_symbol(session_factory: SessionFactory, *, user_id: int) -> CategorySeries:
+    """Market value per symbol (average cost for unpriced holdings)."""
+
+    price = case((Holding.market_price > 0, Holding.market_price), else_=Holding.avg_price)
+    value = Holding.quantity * price
+    total = func.sum(case((value > 0, value), else_=0.0))
+    stmt = (
+        select(Holding.symbol, total)
+        .where(Holding.user_id == user_id)
+        .group_by(Holding.symbol)
+        .having(total > 0)
+    )
+    with session_factory() as session:
+        totals = {symbol: float(amount) for symbol, amount in session.exec(stmt).all()}
+    return CategorySeries.from_totals(totals)
+
+
+# -- In-memory equivalents -------------------------------------------------
+
+
+def spending_from_transactions(
+    transactions: Iterable[Transaction], *, category_lookup: Mapping[Any, str] | None = None
+) -> CategorySeries:
+    totals: dict[str, float] = defaultdict(float)
+    for tx in transactions:
+        amount = float(getattr(tx, "amount", 0) or 0)
+        if amount >= 0:
+            continue
+        cid = getattr(tx, "category_id", None)
+        if cid is None:
+            label = UNCATEGORIZED
+        else:
+            label = (category_lookup or {}).get(cid, str(cid))
+        totals[label] += abs(amount)
+    return CategorySeries.from_totals(totals)
+
+
+def cashflow_from_transactions(
+    transactions: Iterable[Transaction], *, months: int = 6, today: date | None = None
+) -> CashflowSeries:
+    keys = month_keys(months, today)
+    index = {key: i for i, key in enumerate(keys)}
+    income = [0.0] * len(keys)
+    expense = [0.0] * len(keys)
+    seen_any = False
+    for tx in transactions:
+        seen_any = True
+        occurred = getattr(tx, "occurred_at", None)
+        if occurred is None:
+            continue
+        pos = index.get(f"{occurred.year}-{occurred.month:02d}")
+        if pos is None:
+            continue
+        amount = float(getattr(tx, "amount", 0.0) or 0.0)
+        if amount >= 0:
+            income[pos] += amount
+        else:
+            expense[pos] += abs(amount)
+    if not seen_any:
+        return CashflowSeries()
+    return CashflowSeries(months=tuple(keys), income=tuple(income), expense=tuple(expense))
+
+
+def category_trend_from_transactions(
+    transactions: Iterable[Transaction],
+    *,
+    category_lookup: Mapping[Any, str] | None = None,
+    months: int = 6,
+    today: date | None = None,
+) -> StackedSeries:
+    keys = month_keys(months, today)
+    index = {key: i for i, key in enumerate(keys)}
+    stacks: dict[str, list[float]] = {}
+    for tx in transactions:
+        occurred = getattr(tx, "occurred_at", None)
+        amount = float(getattr(tx, "amount", 0.0) or 0.0)
+        if occurred is None or amount >= 0:
+            continue
+        pos = index.get(f"{occurred.year}-{occurred.month:02d}")
+        if pos is None:
+            continue
+        cid = getattr(tx, "category_id", None)
+        if cid is None:
+            label = UNCATEGORIZED
+        elif category_lookup and cid in category_lookup:
+            label = category_lookup[cid]
+        else:
+            label = f"Category {cid}"
+        stacks.setdefault(label, [0.0] * len(keys))[pos] += abs(amount)
+    return StackedSeries(
+        months=tuple(keys), stacks=tuple((name, tuple(values)) for name, values in stacks.items())
+    )
+
+
+def account_cashflow_from_transactions(
+    transactions: Iterable[Transaction], *, account_lookup: Mapping[Any, str] | None = None
+) -> CategorySeries:
+    totals: dict[str, float] = defaultdict(float)
+    for tx in transactions:
+        aid = getattr(tx, "account_id", None)
+        if aid is None:
+            label = UNASSIGNED
+        elif account_lookup and aid in account_lookup:
+            label = account_lookup[aid]
+        else:
+            label = f"Account {aid}"
+        totals[label] += float(getattr(tx, "amount", 0.0) or 0.0)
+    return CategorySeries.from_totals(totals)
+
+
+def allocation_from_holdings(holdings: Iterable[Holding]) -> CategorySeries:
+    totals: dict[str, float] = defaultdict(float)
+    for holding in holdings:
+        price = float(getattr(holding, "market_price", 0.0) or 0.0)
+        if price <= 0:
+            price = float(getattr(holding, "avg_price", 0.0) or 0.0)
+        value = float(getattr(holding, "quantity", 0.0) or 0.0) * price
+        if value <= 0:
+            continue
+        totals[getattr(holding, "symbol", "Unknown")] += value
+    return CategorySeries.from_totals(totals)
+
+
+def payoff_from_schedule(schedule: Iterable[Mapping[str, Any]]) -> PayoffSeries:
+    """Sum ``remaining_balance`` across debts for each schedule entry."""
+
+    from ...services.debts import PayoffSchedule
+
+    if isinstance(schedule, PayoffSchedule):
+        return PayoffSeries(
+            tuple(schedule.dates()), tuple((schedule.remaining_totals / 100).tolist())
+        )
+    months: list[str] = []
+    remaining: list[float] = []
+    for idx, entry in enumerate(schedule):
+        payments = entry.get("payments", {}) if isinstance(entry, Mapping) else {}
+        total = 0.0
+        for payment in payments.values():
+            try:
+                total += float(payment.get("remaining_balance", 0.0) or 0.0)
+            except Exception:
+                continue
+        months.append(str(entry.get("date", f"M{idx + 1}")))
+        remaining.append(total)
+    return PayoffSeries(tuple(months), tuple(remaining))
+
+
+__all__ = [
+    "CashflowSeries",
+    "CategorySeries",
+    "PayoffSeries",
+    "StackedSeries",
+    "account_cashflow_from_transactions",
+    "allocation_by_symbol",
+    "allocation_from_holdings",
+    "cashflow_by_account",
+    "cashflow_from_transactions",
+    "category_trend",
+    "category_trend_from_transactions",
+    "monthly_cashflow",
+    "month_keys",
+    "payoff_from_schedule",
+    "spending_by_category",
+    "spending_from_transactions",
+]
@@ -1,12 +1,22 @@
-"""Chart helpers for Flet views."""
+"""matplotlib backend: PNG bytes and files for exports.
+
+Importing this module imports matplotlib (on the Agg backend), so only
+export paths and the chart worker processes do; on-screen charts use the
+Flet-native backend in ``charts.native``. ``pocketsage.desktop.charts``
+re-exports everything here lazily under the old names.
+
+Each call builds and closes a fresh figure; for many charts in a row use
+``charts.batch``, which reuses prepared figures. The ``*_png`` helpers that
+return a path write to ``output_path`` when given, otherwise into the
+per-process scratch directory (see ``charts.scratch``).
+"""
 
 from __future__ import annotations
 
-from collections import defaultdict
-from datetime import date
+import hashlib
+from io import BytesIO
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Iterable
+from typing import Iterable, Mapping
 
 import matplotlib
 
@@ -16,93 +26,147 @@ import matplotlib.ticker as mticker
 
 from pocketsage.models.portfolio import Holding
 from pocketsage.models.transaction import Transaction
-from pocketsage.services.reports import build_spending_chart
+from pocketsage.services.reports import build_spending_chart, build_spending_chart_from_totals
+
+from ..downsample import CHART_LABEL_BUDGET, CHART_POINT_BUDGET, downsample_indices, tick_step
+from . import (
+    account_cashflow_totals,
+    allocation_totals,
+    cashflow_trend_series,
+    category_trend_series,
+    debt_payoff_series,
+)
+from .data import CashflowSeries, CategorySeries, PayoffSeries, StackedSeries
+from .scratch import scratch_store
+
+
+def _figure_png_bytes(fig, *, dpi: int = 100) -> bytes:
+    """Encode ``fig`` as PNG bytes and close it."""
+
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _figure_temp_png(fig, output_path: Path | None = None) -> Path:
+    """Write ``fig`` to ``output_path``, or to the managed scratch directory."""
+
+    png = _figure_png_bytes(fig)
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(png)
+        return output_path
+    # Content-addressed, so re-rendering an unchanged chart reuses its file.
+    return scratch_store().put(hashlib.sha256(png).hexdigest()[:40], png)
+
+
+def _placeholder_figure(message: str, *, figsize: tuple[float, float] = (8, 5)):
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.text(0.5, 0.5, message, ha="center", va="center", fontsize=14, color="#666")
+    ax.axis("off")
+    return fig
 
 
 def spending_chart_png(
-    transactions: Iterable[Transaction], *, category_lookup: dict[int, str] | None = None
+    transactions: Iterable[Transaction],
+    *,
+    category_lookup: dict[int, str] | None = None,
+    output_path: Path | None = None,
 ) -> Path:
     """Render spending donut using existing reports helper and return PNG path."""
     txs = list(transactions)
     if not txs:
-        fig, ax = plt.subplots(figsize=(6, 5))
-        ax.text(0.5, 0.5, "No spending data", ha="center", va="center", fontsize=14, color="#666")
-        ax.axis("off")
-        with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-            path = Path(tmp.name)
-        plt.close(fig)
-        return path
-    fig = build_spending_chart(transactions=transactions, category_lookup=category_lookup)
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
+        placeholder = _placeholder_figure("No spending data", figsize=(6, 5))
+        return _figure_temp_png(placeholder, output_path)
+    fig = build_spending_chart(transactions=txs, category_lookup=category_lookup)
+    return _figure_temp_png(fig, output_path)
 
 
-def cashflow_trend_png(transactions: Iterable[Transaction], months: int = 6) -> Path:
+def spending_png_bytes(
+    totals: Mapping[object, float], *, category_lookup: dict | None = None
+) -> bytes:
+    """Render the spending donut from pre-aggregated ``{category_id: spent}`` totals."""
+
+    if not totals:
+        return _figure_png_bytes(_placeholder_figure("No spending data", figsize=(6, 5)))
+    fig = build_spending_chart_from_totals(totals=totals, category_lookup=category_lookup)
+    return _figure_png_bytes(fig, dpi=120)
+
+
+def cashflow_trend_png(
+    transactions: Iterable[Transaction], months: int = 6, *, output_path: Path | None = None
+) -> Path:
     """Render an enhanced cashflow line chart for the last ``months`` months."""
 
-    txs = list(transactions)
+    labels, income, expense = cashflow_trend_series(transactions, months=months)
+    return _figure_temp_png(_cashflow_trend_figure(labels, income, expense), output_path)
+
+
+def cashflow_trend_png_bytes(
+    labels: list[str],
+    income: list[float],
+    expense: list[float],
+    *,
+    max_points: int | None = CHART_POINT_BUDGET,
+) -> bytes:
+    """Render the cashflow chart from ``cashflow_trend_series`` output.
 
+    Series longer than ``max_points`` are downsampled (``None`` plots all).
+    """
+
+    return _figure_png_bytes(
+        _cashflow_trend_figure(labels, income, expense, max_points=max_points)
+    )
+
+
+def _cashflow_trend_figure(
+    labels: list[str],
+    income: list[float],
+    expense: list[float],
+    *,
+    max_points: int | None = CHART_POINT_BUDGET,
+):
     # Show placeholder if no transactions
-    if not txs:
+    if not labels:
         fig, ax = plt.subplots(figsize=(8, 5))
         ax.text(0.5, 0.5, "No transaction data yet\nAdd transactions to see your cashflow",
                 ha="center", va="center", fontsize=12, color="#999")
         ax.axis("off")
-        with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-            path = Path(tmp.name)
-        plt.close(fig)
-        return path
-
-    today = date.today()
-    month_keys: list[tuple[int, int]] = []
-    for offset in range(months - 1, -1, -1):
-        month = (today.month - offset - 1) % 12 + 1
-        year = today.year + ((today.month - offset - 1) // 12)
-        month_keys.append((year, month))
-
-    totals = defaultdict(lambda: {"income": 0.0, "expense": 0.0})
-    for tx in txs:
-        dt = getattr(tx, "occurred_at", None)
-        if dt is None:
-            continue
-        key = (dt.year, dt.month)
-        if key not in month_keys:
-            continue
-        amt = float(getattr(tx, "amount", 0.0) or 0.0)
-        if amt >= 0:
-            totals[key]["income"] += amt
-        else:
-            totals[key]["expense"] += abs(amt)
-
-    income = [totals[key]["income"] for key in month_keys]
-    expense = [totals[key]["expense"] for key in month_keys]
-    labels = [f"{y}-{m:02d}" for y, m in month_keys]
+        return fig
 
-    x_positions = list(range(len(labels)))
+    # Long histories are reduced to the points that carry the shape; x stays
+    # in month positions so tick labels line up.
+    kept = downsample_indices(income, expense, max_points=max_points)
+    x_positions = kept.tolist()
+    income_pts = [income[i] for i in x_positions]
+    expense_pts = [expense[i] for i in x_positions]
+    marker_size = 8 if len(x_positions) <= CHART_LABEL_BUDGET else 3
 
     fig, ax = plt.subplots(figsize=(10, 6))
 
     # Plot lines with better styling
-    ax.plot(x_positions, income, marker="o", linewidth=2.5, markersize=8,
+    ax.plot(x_positions, income_pts, marker="o", linewidth=2.5, markersize=marker_size,
             label="Income", color="#22C55E")
-    ax.plot(x_positions, expense, marker="s", linewidth=2.5, markersize=8,
+    ax.plot(x_positions, expense_pts, marker="s", linewidth=2.5, markersize=marker_size,
             label="Expenses", color="#EF4444")
 
     # Fill between for visual clarity
-    ax.fill_between(x_positions, income, expense,
-                    where=[i >= e for i, e in zip(income, expense)],
+    ax.fill_between(x_positions, income_pts, expense_pts,
+                    where=[i >= e for i, e in zip(income_pts, expense_pts)],
                     color="#DCFCE7", alpha=0.4, label="Surplus")
-    ax.fill_between(x_positions, income, expense,
-                    where=[i < e for i, e in zip(income, expense)],
+    ax.fill_between(x_positions, income_pts, expense_pts,
+                    where=[i < e for i, e in zip(income_pts, expense_pts)],
                     color="#FEE2E2", alpha=0.4, label="Deficit")
 
-    # Add value labels on data points
-    for i, (inc, exp) in enumerate(zip(income, expense)):
+    # Add value labels on a legible subset of the plotted points
+    label_budget = CHART_LABEL_BUDGET if max_points is not None else None
+    labelled = downsample_indices(income_pts, expense_pts, max_points=label_budget)
+    for pos in labelled.tolist():
+        i, inc, exp = x_positions[pos], income_pts[pos], expense_pts[pos]
         if inc > 0:
             ax.annotate(f'${inc:,.0f}', (i, inc),
                        textcoords="offset points", xytext=(0, 10),
@@ -122,8 +186,9 @@ def cashflow_trend_png(transactions: Iterable[Transaction], months: int = 6) ->
     ax.set_xlabel("Month", fontsize=11)
 
     # FIX: Set ticks BEFORE setting tick labels
-    ax.set_xticks(x_positions)
-    ax.set_xticklabels(labels, rotation=45, ha="right")
+    tick_positions = list(range(0, len(labels), tick_step(len(labels))))
+    ax.set_xticks(tick_positions)
+    ax.set_xticklabels([labels[i] for i in tick_positions], rotation=45, ha="right")
 
     # Format y-axis as currency
     ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, p: f'${x:,.0f}'))
@@ -143,31 +208,25 @@ def cashflow_trend_png(transactions: Iterable[Transaction], months: int = 6) ->
             verticalalignment='top', horizontalalignment='right', bbox=props)
 
     plt.tight_layout()
-
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
+    return fig
 
 
-def allocation_chart_png(holdings: Iterable[Holding]) -> Path:
+def allocation_chart_png(
+    holdings: Iterable[Holding], *, output_path: Path | None = None
+) -> Path:
     """Render enhanced allocation donut chart for holdings."""
 
-    totals = defaultdict(float)
-    grand_total = 0.0
+    return _figure_temp_png(_allocation_figure(allocation_totals(holdings)), output_path)
+
 
-    for h in holdings:
-        price = float(getattr(h, "market_price", 0.0) or 0.0)
-        if price <= 0:
-            price = float(getattr(h, "avg_price", 0.0) or 0.0)
-        value = float(getattr(h, "quantity", 0.0) or 0.0) * price
-        if value <= 0:
-            continue
-        key = getattr(h, "symbol", "Unknown")
-        totals[key] += value
-        grand_total += value
+def allocation_png_bytes(totals: Mapping[str, float]) -> bytes:
+    """Render the allocation donut from ``allocation_totals`` output."""
 
+    return _figure_png_bytes(_allocation_figure(totals))
+
+
+def _allocation_figure(totals: Mapping[str, float]):
+    grand_total = float(sum(totals.values()))
     labels = list(totals.keys())
     sizes = list(totals.values())
 
@@ -216,40 +275,45 @@ def allocation_chart_png(holdings: Iterable[Holding]) -> Path:
         ax.axis("off")
 
     plt.tight_layout()
+    return fig
 
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
 
-
-def debt_payoff_chart_png(schedule: Iterable[dict]) -> Path:
+def debt_payoff_chart_png(
+    schedule: Iterable[dict], *, output_path: Path | None = None
+) -> Path:
     """Render an enhanced debt payoff projection chart."""
 
-    schedule_list = list(schedule)
-    timeline: list[str] = []
-    totals: list[float] = []
-
-    for idx, entry in enumerate(schedule_list):
-        payments = entry.get("payments", {}) if isinstance(entry, dict) else {}
-        remaining = 0.0
-        for payment in payments.values():
-            try:
-                remaining += float(payment.get("remaining_balance", 0.0) or 0.0)
-            except Exception:
-                continue
-        timeline.append(str(entry.get("date", f"M{idx+1}")))
-        totals.append(remaining)
+    timeline, totals = debt_payoff_series(schedule)
+    return _figure_temp_png(_debt_payoff_figure(timeline, totals), output_path)
+
+
+def debt_payoff_png_bytes(
+    timeline: list[str], totals: list[float], *, max_points: int | None = CHART_POINT_BUDGET
+) -> bytes:
+    """Render the payoff chart from ``debt_payoff_series`` output.
+
+    Schedules longer than ``max_points`` are downsampled (``None`` plots all).
+    """
+
+    return _figure_png_bytes(_debt_payoff_figure(timeline, totals, max_points=max_points))
 
+
+def _debt_payoff_figure(
+    timeline: list[str], totals: list[float], *, max_points: int | None = CHART_POINT_BUDGET
+):
     fig, ax = plt.subplots(figsize=(10, 6))
 
     if totals:
         x_vals = list(range(len(totals)))
 
-        # Main line with gradient fill
-        ax.plot(x_vals, totals, marker="o", color="#4F46E5", linewidth=2.5, markersize=6)
-        ax.fill_between(x_vals, totals, color="#E0E7FF", alpha=0.5)
+        # Main line with gradient fill, drawn through the downsampled points;
+        # milestones below still use the full schedule.
+        kept = downsample_indices(totals, max_points=max_points).tolist()
+        kept_totals = [totals[i] for i in kept]
+        marker_size = 6 if len(kept) <= CHART_LABEL_BUDGET * 2 else 3
+        ax.plot(kept, kept_totals, marker="o", color="#4F46E5", linewidth=2.5,
+                markersize=marker_size)
+        ax.fill_between(kept, kept_totals, color="#E0E7FF", alpha=0.5)
 
         # Add milestone markers
         if len(totals) > 1 and totals[0] > 0:
@@ -314,12 +378,7 @@ def debt_payoff_chart_png(schedule: Iterable[dict]) -> Path:
         ax.axis("off")
 
     plt.tight_layout()
-
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
+    return fig
 
 
 def category_trend_png(
@@ -327,51 +386,26 @@ def category_trend_png(
     *,
     category_lookup: dict[int, str] | None = None,
     months: int = 6,
+    output_path: Path | None = None,
 ) -> Path:
     """Render enhanced stacked expenses by category over the last N months."""
 
     txs = list(transactions)
 
     if not txs:
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.text(0.5, 0.5, "No transaction data", ha="center", va="center", fontsize=14, color="#666")
-        ax.axis("off")
-        with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-            path = Path(tmp.name)
-        plt.close(fig)
-        return path
-
-    today = date.today()
-    month_keys: list[tuple[int, int]] = []
-    for offset in range(months - 1, -1, -1):
-        month = (today.month - offset - 1) % 12 + 1
-        year = today.year + ((today.month - offset - 1) // 12)
-        month_keys.append((year, month))
-
-    totals: dict[str, list[float]] = {}
-    labels = [f"{y}-{m:02d}" for y, m in month_keys]
-
-    def label_for_category(cid: int | None) -> str:
-        if cid is None:
-            return "Uncategorized"
-        if category_lookup and cid in category_lookup:
-            return category_lookup[cid]
-        return f"Category {cid}"
-
-    idx_lookup = {key: i for i, key in enumerate(month_keys)}
-    for tx in txs:
-        dt = getattr(tx, "occurred_at", None)
-        amt = float(getattr(tx, "amount", 0.0) or 0.0)
-        if dt is None or amt >= 0:
-            continue
-        key = (dt.year, dt.month)
-        if key not in idx_lookup:
-            continue
-        cat_label = label_for_category(getattr(tx, "category_id", None))
-        totals.setdefault(cat_label, [0.0] * len(month_keys))
-        totals[cat_label][idx_lookup[key]] += abs(amt)
+        return _figure_temp_png(_placeholder_figure("No transaction data"), output_path)
+
+    labels, totals = category_trend_series(txs, category_lookup=category_lookup, months=months)
+    return _figure_temp_png(_category_trend_figure(labels, totals), output_path)
+
+
+def category_trend_png_bytes(labels: list[str], totals: dict[str, list[float]]) -> bytes:
+    """Render the stacked trend from ``category_trend_series`` output."""
 
+    return _figure_png_bytes(_category_trend_figure(labels, totals))
+
+
+def _category_trend_figure(labels: list[str], totals: dict[str, list[float]]):
     fig, ax = plt.subplots(figsize=(10, 6))
 
     if totals:
@@ -382,15 +416,17 @@ def category_trend_png(
         cmap = plt.get_cmap("tab20")
 
         x_positions = list(range(len(labels)))
-        bottom = [0.0] * len(month_keys)
+        bottom = [0.0] * len(labels)
 
         for i, (cat, values) in enumerate(sorted_cats):
             color = cmap(i / len(sorted_cats))
             ax.bar(x_positions, values, bottom=bottom, label=cat, color=color, edgecolor='white', linewidth=0.5)
             bottom = [b + v for b, v in zip(bottom, values)]
 
-        # Add total labels on top of each bar
-        for i, total in enumerate(bottom):
+        # Add total labels on top of a legible subset of the bars
+        labelled = downsample_indices(bottom, max_points=CHART_LABEL_BUDGET).tolist()
+        for i in labelled:
+            total = bottom[i]
             if total > 0:
                 ax.annotate(f'${total:,.0f}', (i, total),
                            textcoords="offset points", xytext=(0, 5),
@@ -405,8 +441,9 @@ def category_trend_png(
         ax.set_xlabel("Month", fontsize=11)
 
         # FIX: Set ticks BEFORE labels
-        ax.set_xticks(x_positions)
-        ax.set_xticklabels(labels, rotation=45, ha="right")
+        tick_positions = x_positions[:: tick_step(len(labels))]
+        ax.set_xticks(tick_positions)
+        ax.set_xticklabels([labels[i] for i in tick_positions], rotation=45, ha="right")
 
         # Y-axis currency format
         ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, p: f'${x:,.0f}'))
@@ -416,7 +453,7 @@ def category_trend_png(
 
         # Summary stats
         grand_total = sum(bottom)
-        avg_monthly = grand_total / len(month_keys) if month_keys else 0
+        avg_monthly = grand_total / len(labels) if labels else 0
         textstr = f'Total: ${grand_total:,.0f}\nAvg/Month: ${avg_monthly:,.0f}'
         props = dict(boxstyle='round', facecolor='lightyellow', alpha=0.8)
         ax.text(0.02, 0.98, textstr, transform=ax.transAxes, fontsize=9,
@@ -426,46 +463,35 @@ def category_trend_png(
         ax.axis("off")
 
     plt.tight_layout()
-
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
+    return fig
 
 
 def cashflow_by_account_png(
-    transactions: Iterable[Transaction], account_lookup: dict[int, str] | None = None
+    transactions: Iterable[Transaction],
+    account_lookup: dict[int, str] | None = None,
+    *,
+    output_path: Path | None = None,
 ) -> Path:
     """Render enhanced bar chart of net cashflow by account."""
 
     txs = list(transactions)
 
     if not txs:
-        fig, ax = plt.subplots(figsize=(8, 5))
-        ax.text(0.5, 0.5, "No transaction data", ha="center", va="center", fontsize=14, color="#666")
-        ax.axis("off")
-        with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-            fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-            path = Path(tmp.name)
-        plt.close(fig)
-        return path
+        return _figure_temp_png(_placeholder_figure("No transaction data"), output_path)
+
+    totals = account_cashflow_totals(txs, account_lookup)
+    return _figure_temp_png(_cashflow_by_account_figure(totals), output_path)
 
-    totals: dict[str, float] = defaultdict(float)
 
-    def label_for_account(aid: int | None) -> str:
-        if aid is None:
-            return "Unassigned"
-        if account_lookup and aid in account_lookup:
-            return account_lookup[aid]
-        return f"Account {aid}"
+def cashflow_by_account_png_bytes(totals: Mapping[str, float]) -> bytes:
+    """Render the per-account bars from ``account_cashflow_totals`` output."""
 
-    for tx in txs:
-        aid = getattr(tx, "account_id", None)
-        amt = float(getattr(tx, "amount", 0.0) or 0.0)
-        key = label_for_account(aid)
-        totals[key] += amt
+    if not totals:
+        return _figure_png_bytes(_placeholder_figure("No transaction data"))
+    return _figure_png_bytes(_cashflow_by_account_figure(totals))
 
+
+def _cashflow_by_account_figure(totals: Mapping[str, float]):
     # Sort by absolute value
     sorted_items = sorted(totals.items(), key=lambda x: abs(x[1]), reverse=True)
     labels = [item[0] for item in sorted_items]
@@ -517,9 +543,45 @@ def cashflow_by_account_png(
             color=net_color, fontweight='bold')
 
     plt.tight_layout()
+    return fig
+
+
+class MatplotlibChartRenderer:
+    """``ChartRenderer`` backend producing PNG bytes, for files and bundles."""
+
+    def spending(self, series: CategorySeries) -> bytes:
+        return spending_png_bytes(series.as_dict())
+
+    def cashflow(self, series: CashflowSeries) -> bytes:
+        return cashflow_trend_png_bytes(
+            list(series.months), list(series.income), list(series.expense)
+        )
 
-    with NamedTemporaryFile(delete=False, suffix=".png") as tmp:
-        fig.savefig(tmp.name, bbox_inches="tight", dpi=100)
-        path = Path(tmp.name)
-    plt.close(fig)
-    return path
+    def category_trend(self, series: StackedSeries) -> bytes:
+        return category_trend_png_bytes(list(series.months), series.as_dict())
+
+    def account_cashflow(self, series: CategorySeries) -> bytes:
+        return cashflow_by_account_png_bytes(series.as_dict())
+
+    def allocation(self, series: CategorySeries) -> bytes:
+        return allocation_png_bytes(series.as_dict())
+
+    def debt_payoff(self, series: PayoffSeries) -> bytes:
+        return debt_payoff_png_bytes(list(series.months), list(series.remaining))
+
+
+__all__ = [
+    "MatplotlibChartRenderer",
+    "allocation_chart_png",
+    "allocation_png_bytes",
+    "cashflow_by_account_png",
+    "cashflow_by_account_png_bytes",
+    "cashflow_trend_png",
+    "cashflow_trend_png_bytes",
+    "category_trend_png",
+    "category_trend_png_bytes",
+    "debt_payoff_chart_png",
+    "debt_payoff_png_bytes",
+    "spending_chart_png",
+    "spending_png_bytes",
+]
@@ -0,0 +1,298 @@
+"""Flet-native backend: on-screen charts as ``ft.PieChart``/``LineChart``/``BarChart``.
+
+Building these controls is plain Python object construction, a few
+milliseconds for a dashboard, and the client draws them with hover
+tooltips. They take the same aggregated series as the matplotlib export
+backend (``charts.mpl``), and long line series go through the same LTTB
+downsampling.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import flet as ft
+
+from ..downsample import CHART_POINT_BUDGET, downsample_indices, tick_step
+from .data import CashflowSeries, CategorySeries, PayoffSeries, StackedSeries
+
+# Close to matplotlib's tab10, so exports and the screen use similar colours.
+PALETTE = (
+    "#4E79A7",
+    "#F28E2B",
+    "#E15759",
+    "#76B7B2",
+    "#59A14F",
+    "#EDC948",
+    "#B07AA1",
+    "#FF9DA7",
+    "#9C755F",
+    "#BAB0AC",
+)
+INCOME_COLOR = "#22C55E"
+EXPENSE_COLOR = "#EF4444"
+PAYOFF_COLOR = "#4F46E5"
+
+# Slices beyond this many are folded into "Other" so the donut stays legible.
+MAX_SLICES = 8
+
+
+def _money(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+def _empty(message: str, height: int) -> ft.Control:
+    return ft.Container(
+        content=ft.Text(message, color=ft.Colors.ON_SURFACE_VARIANT),
+        height=height,
+        alignment=ft.alignment.center,
+    )
+
+
+def _legend(items: Sequence[tuple[str, str]]) -> ft.Control:
+    return ft.Row(
+        controls=[
+            ft.Row(
+                controls=[
+                    ft.Container(width=10, height=10, bgcolor=color, border_radius=2),
+                    ft.Text(label, size=11),
+                ],
+                spacing=4,
+                tight=True,
+            )
+            for label, color in items
+        ],
+        wrap=True,
+        spacing=12,
+        run_spacing=4,
+    )
+
+
+def _label_axis(labels: Sequence[str]) -> ft.ChartAxis:
+    step = tick_step(len(labels))
+    return ft.ChartAxis(
+        labels=[
+            ft.ChartAxisLabel(value=i, label=ft.Text(labels[i], size=10))
+            for i in range(0, len(labels), step)
+        ],
+        labels_size=28,
+    )
+
+
+def _money_axis(top: float) -> ft.ChartAxis:
+    interval = max(top / 4, 1.0)
+    return ft.ChartAxis(
+        labels=[
+            ft.ChartAxisLabel(value=interval * i, label=ft.Text(_money(interval * i), size=10))
+            for i in range(5)
+        ],
+        labels_size=56,
+    )
+
+
+def _grid(top: float) -> ft.ChartGridLines:
+    return ft.ChartGridLines(interval=max(top / 4, 1.0), color=ft.Colors.OUTLINE_VARIANT, width=1)
+
+
+class FletChartRenderer:
+    """``ChartRenderer`` backend producing Flet controls for views."""
+
+    def __init__(self, *, height: int = 260, max_points: int | None = CHART_POINT_BUDGET):
+        self.height = height
+        self.max_points = max_points
+
+    def _donut(self, series: CategorySeries, empty: str) -> ft.Control:
+        if not series or sum(series.values) <= 0:
+            return _empty(empty, self.height)
+        labels = list(series.labels[:MAX_SLICES])
+        values = list(series.values[:MAX_SLICES])
+        if len(series) > MAX_SLICES:
+            labels.append("Other")
+            values.append(sum(series.values[MAX_SLICES:]))
+        total = sum(values)
+        colors = [PALETTE[i % len(PALETTE)] for i in range(len(values))]
+        radius = self.height * 0.22
+        sections = [
+            ft.PieChartSection(
+                value=value,
+                color=color,
+                radius=radius,
+                title=f"{value / total:.0%}" if value / total >= 0.05 else "",
+                title_style=ft.TextStyle(size=11, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+            )
+            for value, color in zip(values, colors)
+        ]
+        chart = ft.PieChart(
+            sections=sections,
+            center_space_radius=radius * 0.9,
+            sections_space=1,
+            height=self.height,
+            expand=True,
+        )
+        legend = _legend(
+            [
+                (f"{label} {_money(value)}", color)
+                for label, value, color in zip(labels, values, colors)
+            ]
+        )
+        return ft.Column(controls=[chart, legend], spacing=8, tight=True)
+
+    def spending(self, series: CategorySeries) -> ft.Control:
+        return self._donut(series, "No spending data")
+
+    def allocation(self, series: CategorySeries) -> ft.Control:
+        return self._donut(series, "No holdings")
+
+    def cashflow(self, series: CashflowSeries) -> ft.Control:
+        if not series:
+            return _empty("No transaction data yet", self.height)
+        kept = downsample_indices(series.income, series.expense, max_points=self.max_points)
+        top = max(max(series.income), max(series.expense), 1.0) * 1.1
+
+        def _line(values: Sequence[float], color: str) -> ft.LineChartData:
+            return ft.LineChartData(
+                data_points=[
+                    ft.LineChartDataPoint(
+                        i, values[i], tooltip=f"{series.months[i]}: {_money(values[i])}"
+                    )
+                    for i in kept.tolist()
+                ],
+                color=color,
+                stroke_width=2.5,
+                curved=False,
+            )
+
+        chart = ft.LineChart(
+            data_series=[
+                _line(series.income, INCOME_COLOR),
+                _line(series.expense, EXPENSE_COLOR),
+            ],
+            interactive=True,
+            horizontal_grid_lines=_grid(top),
+            left_axis=_money_axis(top),
+            bottom_axis=_label_axis(series.months),
+            min_x=0,
+            max_x=max(len(series) - 1, 1),
+            min_y=0,
+            max_y=top,
+            height=self.height,
+            expand=True,
+        )
+        legend = _legend([("Income", INCOME_COLOR), ("Expenses", EXPENSE_COLOR)])
+        return ft.Column(controls=[chart, legend], spacing=8, tight=True)
+
+    def debt_payoff(self, series: PayoffSeries) -> ft.Control:
+        if not series:
+            return _empty("No payoff schedule", self.height)
+        kept = downsample_indices(series.remaining, max_points=self.max_points)
+        top = max(max(series.remaining), 1.0) * 1.05
+        line = ft.LineChartData(
+            data_points=[
+                ft.LineChartDataPoint(
+                    i,
+                    series.remaining[i],
+                    tooltip=f"{series.months[i]}: {_money(series.remaining[i])}",
+                )
+                for i in kept.tolist()
+            ],
+            color=PAYOFF_COLOR,
+            stroke_width=2.5,
+            below_line_bgcolor=ft.Colors.with_opacity(0.2, PAYOFF_COLOR),
+        )
+        return ft.LineChart(
+            data_series=[line],
+            interactive=True,
+            horizontal_grid_lines=_grid(top),
+            left_axis=_money_axis(top),
+            bottom_axis=_label_axis(series.months),
+            min_x=0,
+            max_x=max(len(series) - 1, 1),
+            min_y=0,
+            max_y=top,
+            height=self.height,
+            expand=True,
+        )
+
+    def category_trend(self, series: StackedSeries) -> ft.Control:
+        if not series.stacks:
+            return _empty("No expense data", self.height)
+        stacks = sorted(series.stacks, key=lambda item: sum(item[1]), reverse=True)
+        colors = [PALETTE[i % len(PALETTE)] for i in range(len(stacks))]
+        totals = [sum(values[i] for _, values in stacks) for i in range(len(series))]
+        top = max(max(totals), 1.0) * 1.1
+        groups = []
+        for i, month in enumerate(series.months):
+            items = []
+            base = 0.0
+            for (_, values), color in zip(stacks, colors):
+                if values[i] > 0:
+                    items.append(
+                        ft.BarChartRodStackItem(from_y=base, to_y=base + values[i], color=color)
+                    )
+                    base += values[i]
+            groups.append(
+                ft.BarChartGroup(
+                    x=i,
+                    bar_rods=[
+                        ft.BarChartRod(
+                            from_y=0,
+                            to_y=base,
+                            rod_stack_items=items,
+                            width=14,
+                            border_radius=2,
+                            tooltip=f"{month}: {_money(base)}",
+                        )
+                    ],
+                )
+            )
+        chart = ft.BarChart(
+            bar_groups=groups,
+            interactive=True,
+            horizontal_grid_lines=_grid(top),
+            left_axis=_money_axis(top),
+            bottom_axis=_label_axis(series.months),
+            max_y=top,
+            height=self.height,
+            expand=True,
+        )
+        legend = _legend([(name, color) for (name, _), color in zip(stacks, colors)])
+        return ft.Column(controls=[chart, legend], spacing=8, tight=True)
+
+    def account_cashflow(self, series: CategorySeries) -> ft.Control:
+        if not series:
+            return _empty("No transaction data", self.height)
+        items = sorted(
+            zip(series.labels, series.values), key=lambda item: abs(item[1]), reverse=True
+        )
+        top = max(max((value for _, value in items), default=0.0), 0.0)
+        bottom = min(min((value for _, value in items), default=0.0), 0.0)
+        span = max(top - bottom, 1.0)
+        groups = [
+            ft.BarChartGroup(
+                x=i,
+                bar_rods=[
+                    ft.BarChartRod(
+                        from_y=min(value, 0.0),
+                        to_y=max(value, 0.0),
+                        width=18,
+                        border_radius=2,
+                        color=INCOME_COLOR if value >= 0 else EXPENSE_COLOR,
+                        tooltip=f"{label}: {_money(value)}",
+                    )
+                ],
+            )
+            for i, (label, value) in enumerate(items)
+        ]
+        return ft.BarChart(
+            bar_groups=groups,
+            interactive=True,
+            horizontal_grid_lines=_grid(span),
+            bottom_axis=_label_axis([label for label, _ in items]),
+            min_y=bottom - span * 0.05,
+            max_y=top + span * 0.05,
+            height=self.height,
+            expand=True,
+        )
+
+
+__all__ = ["FletChartRenderer", "PALETTE"]
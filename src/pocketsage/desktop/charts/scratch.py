@@ -0,0 +1,58 @@
+"""Scratch storage and encoding for rendered chart PNGs.
+
+Kept apart from the matplotlib backend so views and the app shutdown path
+can use these helpers without importing matplotlib.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ..chart_cache import ChartCache
+
+CHART_SCRATCH_MAX_BYTES = 32 * 1024 * 1024
+
+_scratch: Optional[ChartCache] = None
+_scratch_lock = threading.Lock()
+
+
+def chart_image_base64(png: bytes) -> str:
+    """Encode PNG bytes for ``ft.Image(src_base64=...)``."""
+
+    return base64.b64encode(png).decode("ascii")
+
+
+def scratch_store() -> ChartCache:
+    """Per-process, size-bounded directory for path-returning chart helpers."""
+
+    global _scratch
+    with _scratch_lock:
+        if _scratch is None:
+            root = Path(tempfile.mkdtemp(prefix="pocketsage-charts-"))
+            _scratch = ChartCache(root, max_bytes=CHART_SCRATCH_MAX_BYTES)
+            atexit.register(cleanup_chart_scratch)
+        return _scratch
+
+
+def cleanup_chart_scratch() -> None:
+    """Remove the scratch directory used by path-returning chart helpers."""
+
+    global _scratch
+    with _scratch_lock:
+        scratch, _scratch = _scratch, None
+    if scratch is not None:
+        shutil.rmtree(scratch.root, ignore_errors=True)
+
+
+__all__ = [
+    "CHART_SCRATCH_MAX_BYTES",
+    "chart_image_base64",
+    "cleanup_chart_scratch",
+    "scratch_store",
+]
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from typing import Any, Callable, Optional
 
 import flet as ft
+from sqlalchemy.engine import Engine
 from sqlmodel import Session
 
 from ..config import BaseConfig
@@ -22,6 +23,8 @@ from ..infra.repositories import (
     SQLModelTransactionRepository,
 )
 from ..models.user import User
+from .chart_loader import ChartLoader, shutdown_chart_loader
+from .payoff_cache import PayoffCache
 
 
 @dataclass
@@ -63,10 +66,23 @@ class AppContext:
 
     current_user: Optional[User] = None
 
+    # Engine behind session_factory; disposed when the database file is swapped
+    engine: Optional[Engine] = None
+
+    # Background chart loads for the current view; cancelled on navigation
+    chart_loader: ChartLoader = field(default_factory=ChartLoader)
+
+    # Payoff projections shared by the debts, timeline and report views
+    payoff_cache: PayoffCache = field(default_factory=PayoffCache)
+
     # Optional watcher for auto-imports
     watcher_observer: Optional[Any] = None
+    watcher_service: Optional[Any] = None
     watched_folder: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        self.liability_repo.add_write_listener(self.payoff_cache.invalidate)
+
     def require_user_id(self) -> int:
         """Return the current user id or raise if not set."""
 
@@ -77,6 +93,83 @@ class AppContext:
             self.current_user = auth.ensure_local_user(self.session_factory)
         return self.current_user.id  # type: ignore[return-value]
 
+    def stop_watcher(self) -> None:
+        """Stop the watched-folder service (and any bare observer) if running."""
+
+        for running in (self.watcher_service, self.watcher_observer):
+            if running is None:
+                continue
+            try:
+                running.stop()
+            except Exception:
+                pass
+        self.watcher_service = None
+        self.watcher_observer = None
+        self.watched_folder = None
+
+    def reload_database(self) -> None:
+        """Reconnect to the database file after it was replaced (e.g. a restore).
+
+        Builds a fresh engine, session factory and repositories in place, so
+        views holding this context see the new data without an app restart.
+        The signed-in user is reloaded by id, or cleared if the restored
+        database does not have them.
+        """
+
+        if self.engine is not None:
+            self.engine.dispose()
+        # The watcher captured the old session factory; it is restarted from
+        # Settings like after a fresh launch.
+        self.stop_watcher()
+        engine = create_db_engine(self.config)
+        init_database(engine)
+        session_factory = create_session_factory(engine)
+        self.engine = engine
+        self.session_factory = session_factory
+        for name, repo in _build_repositories(session_factory).items():
+            setattr(self, name, repo)
+        self.liability_repo.add_write_listener(self.payoff_cache.invalidate)
+        self.payoff_cache.clear()
+
+        from .chart_cache import get_chart_cache
+
+        # Change-log seqs restart with the new file; cached charts stay valid
+        # by content hash but generation shortcuts do not.
+        get_chart_cache(self.config).forget_generations()
+
+        user_id = self.current_user.id if self.current_user is not None else None
+        self.current_user = None
+        if user_id is not None:
+            with session_factory() as session:
+                self.current_user = session.get(User, user_id)
+
+    def shutdown(self) -> None:
+        """Release background resources before the window closes."""
+
+        self.stop_watcher()
+        self.chart_loader.cancel()
+        from .chart_pool import shutdown_chart_pool
+        from .charts import cleanup_chart_scratch
+
+        shutdown_chart_loader()
+        shutdown_chart_pool()
+        cleanup_chart_scratch()
+
+
+def _build_repositories(session_factory: Callable[[], Session]) -> dict[str, Any]:
+    """Repositories keyed by their ``AppContext`` field name."""
+
+    return {
+        "transaction_repo": SQLModelTransactionRepository(session_factory),
+        "account_repo": SQLModelAccountRepository(session_factory),
+        "category_repo": SQLModelCategoryRepository(session_factory),
+        "budget_repo": SQLModelBudgetRepository(session_factory),
+        "habit_repo": SQLModelHabitRepository(session_factory),
+        "liability_repo": SQLModelLiabilityRepository(session_factory),
+        "holding_repo": SQLModelHoldingRepository(session_factory),
+        "settings_repo": SQLModelSettingsRepository(session_factory),
+    }
+
 
 def create_app_context(config: Optional[BaseConfig] = None) -> AppContext:
     """Create and initialize the application context."""
@@ -97,16 +190,6 @@ def create_app_context(config: Optional[BaseConfig] = None) -> AppContext:
     # Ensure default accounts exist
     auth.ensure_default_accounts(session_factory)
 
-    # Initialize repositories
-    transaction_repo = SQLModelTransactionRepository(session_factory)
-    account_repo = SQLModelAccountRepository(session_factory)
-    category_repo = SQLModelCategoryRepository(session_factory)
-    budget_repo = SQLModelBudgetRepository(session_factory)
-    habit_repo = SQLModelHabitRepository(session_factory)
-    liability_repo = SQLModelLiabilityRepository(session_factory)
-    holding_repo = SQLModelHoldingRepository(session_factory)
-    settings_repo = SQLModelSettingsRepository(session_factory)
-
     # Initialize UI state
     current_date = date.today()
 
@@ -116,14 +199,8 @@ def create_app_context(config: Optional[BaseConfig] = None) -> AppContext:
         admin_mode=False,
         guest_mode=False,
         session_factory=session_factory,
-        transaction_repo=transaction_repo,
-        account_repo=account_repo,
-        category_repo=category_repo,
-        budget_repo=budget_repo,
-        habit_repo=habit_repo,
-        liability_repo=liability_repo,
-        holding_repo=holding_repo,
-        settings_repo=settings_repo,
+        engine=engine,
+        **_build_repositories(session_factory),
         theme_mode=ft.ThemeMode.DARK,
         current_account_id=None,
         current_month=current_date.replace(day=1),
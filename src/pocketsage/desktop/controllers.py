@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 import flet as ft
 
 from datetime import datetime
 
-from ..services import admin_tasks, auth, export_csv, importers
+from ..services import admin_tasks, auth, export_csv, importers, jobs, ledger_service
 from ..devtools import dev_log
 from .navigation_helpers import handle_navigation_selection, resolve_shortcut_route
 
@@ -109,6 +109,164 @@ def reset_demo_data(ctx: AppContext, page: ft.Page) -> None:
         _show_snack(page, f"Demo data reset ({summary.transactions} transactions)")
 
 
+def format_import_progress(name: str, progress: importers.ImportProgress) -> str:
+    """Human-friendly one-liner for a running import."""
+
+    eta = progress.eta_seconds
+    eta_text = f", ETA {eta:,.0f}s" if eta is not None else ""
+    return (
+        f"Importing {name}: {progress.rows_processed:,} rows "
+        f"({progress.rows_per_second:,.0f} rows/s{eta_text})"
+    )
+
+
+def _run_progress_job(
+    page: ft.Page,
+    label: str,
+    fn: Callable[[jobs.Job, Callable[..., None]], Any],
+    on_done: Callable[[Any], str],
+    *,
+    on_error: Callable[[Exception], str],
+    name: str,
+    metadata: Optional[dict[str, Any]] = None,
+) -> jobs.Job:
+    """Run ``fn`` as a background job behind a SnackBar with a progress bar and Cancel.
+
+    ``fn(job, report)`` does the work, polling ``job.cancel_requested``; it
+    calls ``report(text, fraction, **counters)`` to update the bar and merge
+    ``counters`` into the job's progress. ``on_done`` turns the result, and
+    ``on_error`` an exception (cancellation included), into the message shown
+    when the bar closes; the exception still reaches the job status.
+    """
+
+    status = ft.Text(label)
+    bar = ft.ProgressBar(value=0, width=320)
+    snack = ft.SnackBar(
+        content=ft.Column([status, bar], tight=True, spacing=6),
+        action="Cancel",
+        duration=24 * 60 * 60 * 1000,  # stays up until the job finishes
+    )
+
+    def _refresh() -> None:
+        try:
+            page.update()
+        except Exception:
+            pass
+
+    def _run(job: jobs.Job) -> None:
+        def report(text: str, fraction: Optional[float], **counters: Any) -> None:
+            job.report_progress(**counters)
+            status.value = text
+            bar.value = fraction
+            _refresh()
+
+        try:
+            result = fn(job, report)
+        except Exception as exc:
+            snack.open = False
+            _show_snack(page, on_error(exc))
+            raise
+        snack.open = False
+        _show_snack(page, on_done(result))
+
+    holder: dict[str, jobs.Job] = {}
+
+    def _cancel(_e) -> None:
+        if "job" in holder:
+            jobs.cancel_job(holder["job"].id)
+
+    snack.on_action = _cancel
+    page.snack_bar = snack
+    snack.open = True
+    _refresh()
+    holder["job"] = jobs.enqueue(name, _run, metadata=metadata or {}, pass_job=True)
+    return holder["job"]
+
+
+def start_import_job(
+    ctx: AppContext,
+    page: ft.Page,
+    *,
+    mode: str,
+    csv_path: Path,
+) -> jobs.Job:
+    """Run a CSV import through the jobs system with a live, cancellable progress bar."""
+
+    def _import(job: jobs.Job, report: Callable[..., None]) -> int:
+        if mode != "ledger":
+            return importers.import_portfolio_holdings(
+                csv_path=csv_path,
+                session_factory=ctx.session_factory,
+                user_id=ctx.require_user_id(),
+            )
+
+        def _on_progress(progress: importers.ImportProgress) -> None:
+            text = format_import_progress(csv_path.name, progress)
+            report(text, progress.fraction, **progress.to_dict())
+
+        return importers.import_ledger_transactions(
+            csv_path=csv_path,
+            session_factory=ctx.session_factory,
+            user_id=ctx.require_user_id(),
+            progress=_on_progress,
+            should_cancel=lambda: job.cancel_requested,
+        )
+
+    def _done(created: int) -> str:
+        if mode == "ledger":
+            dev_log(
+                _ctx_config(ctx),
+                "Ledger import completed",
+                context={"path": csv_path, "created": created},
+            )
+            msg = (
+                f"Imported {created} transactions from {csv_path.name}"
+                if created
+                else f"No new transactions from {csv_path.name} (duplicates or invalid rows)"
+            )
+            route = "/ledger"
+        else:
+            dev_log(
+                _ctx_config(ctx),
+                "Portfolio import completed",
+                context={"path": csv_path, "created": created},
+            )
+            msg = (
+                f"Imported {created} holdings"
+                if created
+                else "No holdings imported (empty file or invalid rows)"
+            )
+            route = "/portfolio"
+        setattr(ctx, "pending_refresh_route", route)
+        navigate(page, route)
+        return msg
+
+    def _failed(exc: Exception) -> str:
+        if isinstance(exc, importers.ImportCancelled):
+            dev_log(_ctx_config(ctx), "Import cancelled", context={"path": csv_path})
+            return (
+                f"Import cancelled after {exc.rows_committed:,} rows; "
+                f"import {csv_path.name} again to resume."
+            )
+        dev_log(
+            _ctx_config(ctx),
+            "Import failed",
+            exc=exc,
+            context={"path": csv_path, "mode": mode},
+        )
+        return f"Import failed: {exc}"
+
+    return _run_progress_job(
+        page,
+        f"Importing {csv_path.name}...",
+        _import,
+        _done,
+        on_error=_failed,
+        name=f"{mode}-import",
+        metadata={"path": str(csv_path), "mode": mode},
+    )
+
+
 def attach_file_picker(ctx: AppContext, page: ft.Page) -> ft.FilePicker:
     """Create and attach a shared file picker for imports."""
 
@@ -126,55 +284,10 @@ def attach_file_picker(ctx: AppContext, page: ft.Page) -> ft.FilePicker:
             "Import picker selected",
             context={"mode": mode, "path": csv_path},
         )
-        try:
-            if mode == "ledger":
-                created = importers.import_ledger_transactions(
-                    csv_path=csv_path,
-                    session_factory=ctx.session_factory,
-                    user_id=ctx.require_user_id(),
-                )
-                dev_log(
-                    _ctx_config(ctx),
-                    "Ledger import completed",
-                    context={"path": csv_path, "created": created},
-                )
-                msg = (
-                    f"Imported {created} transactions from {csv_path.name}"
-                    if created
-                    else f"No new transactions from {csv_path.name} (duplicates or invalid rows)"
-                )
-                setattr(ctx, "pending_refresh_route", "/ledger")
-                _show_snack(page, msg)
-                navigate(page, "/ledger")
-            elif mode == "portfolio":
-                created = importers.import_portfolio_holdings(
-                    csv_path=csv_path,
-                    session_factory=ctx.session_factory,
-                    user_id=ctx.require_user_id(),
-                )
-                dev_log(
-                    _ctx_config(ctx),
-                    "Portfolio import completed",
-                    context={"path": csv_path, "created": created},
-                )
-                msg = (
-                    f"Imported {created} holdings"
-                    if created
-                    else "No holdings imported (empty file or invalid rows)"
-                )
-                setattr(ctx, "pending_refresh_route", "/portfolio")
-                _show_snack(page, msg)
-                navigate(page, "/portfolio")
-            else:
-                _show_snack(page, "No import action configured.")
-        except Exception as exc:  # pragma: no cover - user-facing guard
-            dev_log(
-                _ctx_config(ctx),
-                "Import failed",
-                exc=exc,
-                context={"path": csv_path, "mode": mode},
-            )
-            _show_snack(page, f"Import failed: {exc}")
+        if mode in {"ledger", "portfolio"}:
+            start_import_job(ctx, page, mode=mode, csv_path=csv_path)
+        else:
+            _show_snack(page, "No import action configured.")
 
     picker = ft.FilePicker(on_result=_import_result)
     ctx.file_picker = picker
@@ -295,23 +408,137 @@ def resolve_export_dir(ctx: AppContext) -> Path:
         return fallback.resolve()
 
 
+def format_export_progress(name: str, progress: export_csv.ExportProgress) -> str:
+    """Human-friendly one-liner for a running export."""
+
+    eta = progress.eta_seconds
+    eta_text = f", ETA {eta:,.0f}s" if eta is not None else ""
+    return (
+        f"Exporting {name}: {progress.rows_written:,} of {progress.total_rows:,} rows "
+        f"({progress.rows_per_second:,.0f} rows/s{eta_text})"
+    )
+
+
+def start_ledger_export_job(
+    ctx: AppContext,
+    page: ft.Page,
+    *,
+    filters: ledger_service.LedgerFilters,
+    output_path: Path,
+) -> jobs.Job:
+    """Stream the filtered ledger to ``output_path`` as a cancellable background job."""
+
+    def _export(job: jobs.Job, report: Callable[..., None]) -> int:
+        def _on_progress(progress: export_csv.ExportProgress) -> None:
+            text = format_export_progress(output_path.name, progress)
+            report(text, progress.fraction, **progress.to_dict())
+
+        return export_csv.export_filtered_ledger(
+            session_factory=ctx.session_factory,
+            filters=filters,
+            output_path=output_path,
+            progress=_on_progress,
+            should_cancel=lambda: job.cancel_requested,
+        )
+
+    def _done(written: int) -> str:
+        dev_log(
+            _ctx_config(ctx),
+            "Ledger export completed",
+            context={"path": str(output_path), "count": written},
+        )
+        if written:
+            return f"Exported {written:,} transactions to {output_path}"
+        output_path.unlink(missing_ok=True)
+        return "No transactions to export for this filter"
+
+    def _failed(exc: Exception) -> str:
+        if isinstance(exc, export_csv.ExportCancelled):
+            dev_log(_ctx_config(ctx), "Ledger export cancelled", context={"path": output_path})
+            return f"Export cancelled after {exc.rows_written:,} rows."
+        dev_log(_ctx_config(ctx), "Ledger export failed", exc=exc)
+        return f"Export failed: {exc}"
+
+    return _run_progress_job(
+        page,
+        f"Exporting {output_path.name}...",
+        _export,
+        _done,
+        on_error=_failed,
+        name="ledger-export",
+        metadata={"path": str(output_path)},
+    )
+
+
+def start_backup_job(
+    ctx: AppContext,
+    page: ft.Page,
+    *,
+    output_dir: Optional[Path] = None,
+) -> jobs.Job:
+    """Run an online database backup as a cancellable background job."""
+
+    def _backup(job: jobs.Job, report: Callable[..., None]) -> Path:
+        def _on_progress(progress: admin_tasks.BackupProgress) -> None:
+            report(
+                f"Backing up database: {progress.fraction:.0%}",
+                progress.fraction,
+                pages_copied=progress.pages_copied,
+                total_pages=progress.total_pages,
+            )
+
+        return admin_tasks.backup_database(
+            output_dir,
+            config=ctx.config,
+            progress=_on_progress,
+            should_cancel=lambda: job.cancel_requested,
+        )
+
+    def _done(path: Path) -> str:
+        dev_log(_ctx_config(ctx), "Backup completed", context={"path": str(path)})
+        return f"Backup saved: {path}"
+
+    def _failed(exc: Exception) -> str:
+        if isinstance(exc, jobs.JobCancelled):
+            return "Backup cancelled."
+        dev_log(_ctx_config(ctx), "Backup failed", exc=exc)
+        return f"Backup failed: {exc}"
+
+    return _run_progress_job(
+        page,
+        "Backing up database...",
+        _backup,
+        _done,
+        on_error=_failed,
+        name="database-backup",
+        metadata={"output_dir": str(output_dir) if output_dir else None},
+    )
+
+
+def restore_database_and_reload(ctx: AppContext, backup_path: Path) -> Path:
+    """Swap in ``backup_path`` as the live database and reconnect ``ctx`` to it."""
+
+    target = admin_tasks.restore_database(
+        backup_path, config=ctx.config, engine=getattr(ctx, "engine", None)
+    )
+    reload_database = getattr(ctx, "reload_database", None)
+    if callable(reload_database):
+        reload_database()
+    dev_log(_ctx_config(ctx), "Database restored", context={"path": str(backup_path)})
+    return target
+
+
 def export_ledger_to_csv(ctx: AppContext, page: ft.Page) -> None:
     """Export all ledger transactions to CSV and surface the path."""
 
     try:
         user_id = ctx.require_user_id()
         dev_log(_ctx_config(ctx), "Ledger export requested", context={"user_id": user_id})
-        txs = ctx.transaction_repo.list_all(user_id=user_id)
         stamp = datetime.now().strftime("%Y%m%d%H%M%S")
         output_dir = resolve_export_dir(ctx)
         output_path = output_dir / f"ledger-{stamp}.csv"
-        export_csv.export_transactions_csv(transactions=txs, output_path=output_path)
-        dev_log(
-            _ctx_config(ctx),
-            "Ledger export completed",
-            context={"path": str(output_path), "count": len(txs)},
-        )
-        _show_snack(page, f"Exported to {output_path}")
+        filters = ledger_service.LedgerFilters(user_id=user_id)
+        start_ledger_export_job(ctx, page, filters=filters, output_path=output_path)
     except Exception as exc:  # pragma: no cover - user-facing guard
         dev_log(_ctx_config(ctx), "Ledger export failed", exc=exc)
         _show_snack(page, f"Export failed: {exc}")
@@ -320,11 +547,17 @@ def export_ledger_to_csv(ctx: AppContext, page: ft.Page) -> None:
 __all__ = [
     "attach_file_picker",
     "export_ledger_to_csv",
+    "format_export_progress",
+    "format_import_progress",
     "go_to_help",
     "handle_nav_selection",
     "handle_shortcut",
     "navigate",
     "resolve_export_dir",
+    "restore_database_and_reload",
+    "start_backup_job",
+    "start_import_job",
+    "start_ledger_export_job",
     "start_edit",
     "reset_demo_data",
     "run_demo_seed",
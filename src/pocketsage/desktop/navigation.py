@@ -61,6 +61,11 @@ class Router:
             self.page.go("/dashboard")
             return
 
+        # Charts still loading for the previous view would only be discarded.
+        loader = getattr(self.context, "chart_loader", None)
+        if loader is not None:
+            loader.cancel()
+
         try:
             logger.debug(f"Building view for route: {route}")
             view = builder(self.context, self.page)
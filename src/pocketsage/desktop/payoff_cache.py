@@ -0,0 +1,160 @@
+"""In-memory cache of debt payoff projections.
+
+The debts screen, the payoff timeline and several reports project the same
+liabilities with the same strategy within seconds of each other. A
+projection depends only on each debt's ``(id, balance, apr, minimum,
+due_day)``, the strategy and the monthly surplus, so that tuple is the key:
+any edit to a liability produces a different key and can never be served a
+stale schedule. On top of that, the liability repository drops a user's
+entries whenever it writes one of their liabilities, so superseded
+projections do not linger, and at most ``max_entries`` projections are kept,
+least recently used first out.
+
+Cached schedules are shared between callers, so their arrays are made
+read-only. The debt engine (and NumPy) is imported on the first miss, so the
+app context can own a cache without slowing startup.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Hashable, Optional, Sequence
+
+from ..logging_config import get_logger
+
+if TYPE_CHECKING:
+    from ..services.debts import DebtAccount, PayoffSchedule
+
+logger = get_logger(__name__)
+
+PAYOFF_CACHE_MAX_ENTRIES = 32
+
+STRATEGIES = ("snowball", "avalanche")
+
+
+@dataclass
+class PayoffCacheStats:
+    """Hit/miss counters and cumulative simulation time."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    compute_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hit_ratio, 3),
+        }
+
+
+def debts_fingerprint(debts: Sequence[DebtAccount]) -> tuple[tuple[Any, ...], ...]:
+    """The inputs of ``debts`` that a payoff projection depends on."""
+
+    return tuple(
+        (debt.id, debt.balance, debt.apr, debt.minimum_payment, debt.statement_due_day)
+        for debt in debts
+    )
+
+
+class PayoffCache:
+    """LRU cache of ``PayoffSchedule`` objects keyed by their inputs."""
+
+    def __init__(self, *, max_entries: int = PAYOFF_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.stats = PayoffCacheStats()
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, PayoffSchedule] = OrderedDict()
+
+    def key_for(
+        self,
+        debts: Sequence[DebtAccount],
+        *,
+        strategy: str,
+        surplus: float,
+        user_id: Optional[int] = None,
+    ) -> tuple[Any, ...]:
+        return (user_id, strategy, round(float(surplus), 2), debts_fingerprint(debts))
+
+    def schedule(
+        self,
+        debts: Sequence[DebtAccount],
+        *,
+        strategy: str = "snowball",
+        surplus: float = 0.0,
+        user_id: Optional[int] = None,
+    ) -> PayoffSchedule:
+        """Return the ``strategy`` schedule for ``debts``, simulating only on a miss."""
+
+        if strategy not in STRATEGIES:
+            raise ValueError("Invalid debt payoff strategy.")
+        debts = list(debts)
+        key = self.key_for(debts, strategy=strategy, surplus=surplus, user_id=user_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return cached
+
+        from ..services import debts as debt_service
+
+        project = getattr(debt_service, f"{strategy}_schedule")
+        started = time.perf_counter()
+        schedule = project(debts=debts, surplus=surplus)
+        elapsed = time.perf_counter() - started
+        for array in (schedule.payments, schedule.interest, schedule.balances, schedule.active):
+            array.flags.writeable = False
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            self.stats.misses += 1
+            self.stats.compute_seconds += elapsed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        logger.debug("Projected %s payoff in %.1f ms", strategy, elapsed * 1000)
+        return schedule
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        """Drop the projections of ``user_id`` (every user's when ``None``)."""
+
+        with self._lock:
+            stale = [key for key in self._entries if user_id is None or key[0] == user_id]
+            for key in stale:
+                del self._entries[key]
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidate(None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def payoff_cache_for(ctx: object) -> PayoffCache:
+    """The context's shared cache, or a throwaway one for bare test contexts."""
+
+    cache = getattr(ctx, "payoff_cache", None)
+    return cache if isinstance(cache, PayoffCache) else PayoffCache()
+
+
+__all__ = [
+    "PAYOFF_CACHE_MAX_ENTRIES",
+    "PayoffCache",
+    "PayoffCacheStats",
+    "debts_fingerprint",
+    "payoff_cache_for",
+]
@@ -17,15 +17,15 @@ from sqlalchemy import func, select
 
 from ...logging_config import get_logger
 from ...models import Account, Habit, Transaction, Category, Budget
-from ...services import auth
+from ...services import auth, import_registry
 from ...services.admin_tasks import (
     backup_database,
     reset_demo_database,
-    restore_database,
     run_demo_seed,
     run_export,
 )
 from ...services.heavy_seed import run_heavy_seed
+from .. import controllers
 from ..components import build_app_bar, build_main_layout
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -167,6 +167,7 @@ def build_admin_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 session_factory=ctx.session_factory,
                 user_id=uid,
                 retention=ctx.config.EXPORT_RETENTION,
+                compresslevel=getattr(ctx.config, "EXPORT_COMPRESSLEVEL", 6),
             )
             logger.info(f"Export completed: {path}")
             _notify(f"Export ready: {path}")
@@ -175,13 +176,12 @@ def build_admin_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
     def backup_action(_):
         logger.info("Backup button clicked")
-        def _task():
-            logger.info("Starting database backup")
+        if page is None:
             path = backup_database(config=ctx.config)
             logger.info(f"Backup completed: {path}")
-            _notify(f"Backup saved: {path}")
-
-        _with_spinner(_task, "Creating backup...")
+            return
+        # Online backup runs as a job; writers keep working while it copies.
+        controllers.start_backup_job(ctx, page)
 
     def restore_action(_):
         logger.info("Restore button clicked")
@@ -223,9 +223,9 @@ def build_admin_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
         def _task():
             logger.info("Starting database restore")
-            target = restore_database(file_path, config=ctx.config)
+            target = controllers.restore_database_and_reload(ctx, file_path)
             logger.info(f"Restore completed: {target}")
-            _notify(f"Database restored to {target}; restart app to reload.")
+            _notify(f"Database restored from {file_path.name}; data reloaded.")
             _refresh_user_views()
 
         _with_spinner(_task, "Restoring database...")
@@ -451,11 +451,85 @@ def build_admin_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
     actions_card = ft.Card(content=ft.Container(padding=16, content=actions))
 
+    registry_table = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("File")),
+            ft.DataColumn(ft.Text("Rows"), numeric=True),
+            ft.DataColumn(ft.Text("Size"), numeric=True),
+            ft.DataColumn(ft.Text("Seen"), numeric=True),
+            ft.DataColumn(ft.Text("Last seen")),
+            ft.DataColumn(ft.Text("")),
+        ],
+        rows=[],
+    )
+    registry_summary = ft.Text("", size=12, color=ft.Colors.ON_SURFACE_VARIANT)
+
+    def _refresh_registry():
+        entries = import_registry.list_entries(ctx.session_factory, user_id=uid)
+        registry_table.rows = [
+            ft.DataRow(
+                cells=[
+                    ft.DataCell(ft.Text(entry.source_name, tooltip=entry.source_path)),
+                    ft.DataCell(ft.Text(str(entry.rows))),
+                    ft.DataCell(ft.Text(f"{entry.file_size / 1024:.1f} KB")),
+                    ft.DataCell(ft.Text(str(entry.times_seen))),
+                    ft.DataCell(ft.Text(entry.last_seen_at.strftime("%Y-%m-%d %H:%M"))),
+                    ft.DataCell(
+                        ft.IconButton(
+                            icon=ft.Icons.DELETE_OUTLINE,
+                            tooltip="Forget this file",
+                            on_click=lambda _, entry_id=entry.id: _purge_registry([entry_id]),
+                        )
+                    ),
+                ]
+            )
+            for entry in entries
+        ]
+        registry_summary.value = (
+            f"{len(entries)} imported file(s) remembered; identical files are skipped and "
+            "appended files resume after the last unchanged chunk."
+            if entries
+            else "No imported files remembered yet."
+        )
+        _safe_update(registry_table)
+        _safe_update(registry_summary)
+
+    def _purge_registry(entry_ids: list[int] | None):
+        removed = import_registry.purge_entries(
+            ctx.session_factory, user_id=uid, entry_ids=entry_ids
+        )
+        logger.info("Purged import registry entries", extra={"removed": removed})
+        _refresh_registry()
+        _notify(f"Forgot {removed} imported file(s)")
+
+    _refresh_registry()
+
+    registry_card = ft.Card(
+        content=ft.Container(
+            padding=16,
+            content=ft.Column(
+                controls=[
+                    ft.Text("Import registry", size=16, weight=ft.FontWeight.BOLD),
+                    registry_summary,
+                    registry_table,
+                    ft.TextButton(
+                        "Purge all",
+                        icon=ft.Icons.DELETE_SWEEP,
+                        on_click=lambda _: _purge_registry(None),
+                    ),
+                ],
+                spacing=10,
+            ),
+        ),
+        elevation=1,
+    )
+
     content = ft.Column(
         controls=[
             overview_card,
             ft.Container(height=12),
             ft.Row(controls=[actions_card, profile_card, user_card], spacing=12, wrap=True),
+            registry_card,
         ],
         spacing=12,
         scroll=ft.ScrollMode.AUTO,
@@ -8,7 +8,8 @@ from typing import TYPE_CHECKING
 import flet as ft
 
 from ...models.habit import HabitEntry
-from ..charts import cashflow_trend_png, spending_chart_png
+from ..charts.data import monthly_cashflow, spending_by_category
+from ..charts.native import FletChartRenderer
 from ..components import build_app_bar, build_main_layout, build_stat_card
 
 if TYPE_CHECKING:
@@ -261,19 +262,25 @@ def build_dashboard_view(ctx: AppContext, page: ft.Page) -> ft.View:
     # Charts
     month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     next_month = (month_start + timedelta(days=32)).replace(day=1)
-    month_txs = ctx.transaction_repo.filter_by_date_range(month_start, next_month, user_id=uid)
-    spending_png = None
+    # Native Flet charts straight from the SQL aggregates: no rasterising,
+    # so the dashboard redraws in milliseconds and keeps hover tooltips.
+    renderer = FletChartRenderer()
     try:
-        spending_png = spending_chart_png(month_txs)
+        spending_chart: ft.Control = renderer.spending(
+            spending_by_category(
+                ctx.session_factory, user_id=uid, start=month_start, end=next_month
+            )
+        )
     except Exception:
-        spending_png = None
+        spending_chart = ft.Text("Chart unavailable")
 
     # Cashflow trend: pull a wider slice
-    all_recent = ctx.transaction_repo.list_all(limit=500, user_id=uid)
     try:
-        cashflow_png = cashflow_trend_png(all_recent, months=6)
+        cashflow_chart: ft.Control = renderer.cashflow(
+            monthly_cashflow(ctx.session_factory, user_id=uid, months=6)
+        )
     except Exception:
-        cashflow_png = None
+        cashflow_chart = ft.Text("Chart unavailable")
 
     charts_row = ft.ResponsiveRow(
         controls=[
@@ -281,11 +288,7 @@ def build_dashboard_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 content=ft.Column(
                     controls=[
                         ft.Text("Spending by Category (This Month)", weight=ft.FontWeight.BOLD),
-                        (
-                            ft.Image(src=str(spending_png), height=260)
-                            if spending_png
-                            else ft.Text("Chart unavailable")
-                        ),
+                        spending_chart,
                     ],
                     spacing=8,
                 ),
@@ -295,11 +298,7 @@ def build_dashboard_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 content=ft.Column(
                     controls=[
                         ft.Text("Cashflow (Last 6 months)", weight=ft.FontWeight.BOLD),
-                        (
-                            ft.Image(src=str(cashflow_png), height=260)
-                            if cashflow_png
-                            else ft.Text("Chart unavailable")
-                        ),
+                        cashflow_chart,
                     ],
                     spacing=8,
                 ),
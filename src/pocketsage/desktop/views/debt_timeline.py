@@ -10,9 +10,11 @@ import flet as ft
 from ...devtools import dev_log
 from .. import controllers
 from ..components import build_app_bar, build_main_layout
+from ..payoff_cache import payoff_cache_for
 from .debts import PAYMENT_MODE_SURPLUS, project_payoff_schedule
 
 if TYPE_CHECKING:
+    from ...services.debts import PayoffSchedule
     from ..context import AppContext
 
 
@@ -47,7 +49,7 @@ def build_debt_timeline_view(ctx: AppContext, page: ft.Page) -> ft.View:
         if interest_ref.current:
             interest_ref.current.value = f"${total_interest:,.2f}"
 
-    def _build_rows(schedule: list[dict]) -> list[ft.Control]:
+    def _build_rows(schedule: PayoffSchedule) -> list[ft.Control]:
         if not schedule:
             return [
                 ft.Text(
@@ -60,12 +62,8 @@ def build_debt_timeline_view(ctx: AppContext, page: ft.Page) -> ft.View:
             indices.append(len(schedule) - 1)
         rows: list[ft.Control] = []
         for idx in indices:
-            entry = schedule[idx] if idx < len(schedule) else schedule[-1]
-            payments = entry.get("payments", {}) if isinstance(entry, dict) else {}
-            payment_total = sum(float(p.get("payment_amount", 0.0) or 0.0) for p in payments.values())
-            remaining_total = sum(float(p.get("remaining_balance", 0.0) or 0.0) for p in payments.values())
-            interest_total = sum(float(p.get("interest_paid", 0.0) or 0.0) for p in payments.values())
-            month_label = _format_month(str(entry.get("date", "")))
+            month = schedule.month(idx)
+            month_label = _format_month(month.date)
             rows.append(
                 ft.Card(
                     content=ft.Container(
@@ -82,9 +80,9 @@ def build_debt_timeline_view(ctx: AppContext, page: ft.Page) -> ft.View:
                                 ),
                                 ft.Row(
                                     [
-                                        ft.Text(f"Payment: ${payment_total:,.2f}"),
-                                        ft.Text(f"Interest: ${interest_total:,.2f}"),
-                                        ft.Text(f"Remaining: ${remaining_total:,.2f}", weight=ft.FontWeight.BOLD),
+                                        ft.Text(f"Payment: ${month.payment:,.2f}"),
+                                        ft.Text(f"Interest: ${month.interest:,.2f}"),
+                                        ft.Text(f"Remaining: ${month.remaining:,.2f}", weight=ft.FontWeight.BOLD),
                                     ],
                                     alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                                     wrap=True,
@@ -101,7 +99,11 @@ def build_debt_timeline_view(ctx: AppContext, page: ft.Page) -> ft.View:
         liabilities = ctx.liability_repo.list_all(user_id=uid)
         try:
             schedule, payoff, total_interest, months = project_payoff_schedule(
-                liabilities, strategy=state["strategy"], mode=state["mode"]
+                liabilities,
+                strategy=state["strategy"],
+                mode=state["mode"],
+                cache=payoff_cache_for(ctx),
+                user_id=uid,
             )
             ctx.payoff_preferences = {"strategy": state["strategy"], "mode": state["mode"]}
             _set_summary(payoff, total_interest, months)
@@ -19,14 +19,16 @@ import flet as ft
 from .. import controllers
 from ...devtools import dev_log
 from ...models.liability import Liability
-from ...services.debts import DebtAccount, avalanche_schedule, schedule_summary, snowball_schedule
-from ..charts import debt_payoff_chart_png
+from ...services.debts import DebtAccount, PayoffSchedule, schedule_summary
+from ..charts.data import payoff_from_schedule
+from ..charts.native import FletChartRenderer
 from ..components import (
     build_app_bar,
     build_main_layout,
     show_confirm_dialog,
     show_error_dialog,
 )
+from ..payoff_cache import PayoffCache, payoff_cache_for
 
 if TYPE_CHECKING:
     from ..context import AppContext
@@ -40,9 +42,18 @@ PAYMENT_MODE_SURPLUS = {
 
 
 def project_payoff_schedule(
-    liabilities: list[Liability], *, strategy: str = "snowball", mode: str = "balanced"
-) -> tuple[list[dict], str | None, float, int]:
-    """Compute payoff schedule and summary based on strategy and mode."""
+    liabilities: list[Liability],
+    *,
+    strategy: str = "snowball",
+    mode: str = "balanced",
+    cache: PayoffCache | None = None,
+    user_id: int | None = None,
+) -> tuple[PayoffSchedule, str | None, float, int]:
+    """Compute payoff schedule and summary based on strategy and mode.
+
+    Pass the context's ``cache`` to reuse a projection another view already
+    made from the same liabilities.
+    """
     debts = [
         DebtAccount(
             id=lb.id or 0,
@@ -54,12 +65,15 @@ def project_payoff_schedule(
         for lb in liabilities
     ]
     if not debts:
-        return [], None, 0.0, 0
+        return PayoffSchedule.empty(), None, 0.0, 0
     surplus = PAYMENT_MODE_SURPLUS.get(mode, PAYMENT_MODE_SURPLUS["balanced"])
-    schedule = (
-        avalanche_schedule(debts=debts, surplus=surplus)
-        if strategy == "avalanche"
-        else snowball_schedule(debts=debts, surplus=surplus)
+    if cache is None:
+        cache = PayoffCache()
+    schedule = cache.schedule(
+        debts,
+        strategy="avalanche" if strategy == "avalanche" else "snowball",
+        surplus=surplus,
+        user_id=user_id,
     )
     payoff, total_interest, months = schedule_summary(schedule)
     return schedule, payoff, total_interest, months
@@ -78,14 +92,14 @@ def build_debts_view(ctx: AppContext, page: ft.Page) -> ft.View:
     interest_text = ft.Ref[ft.Text]()
     table_ref = ft.Ref[ft.DataTable]()
     schedule_ref = ft.Ref[ft.Column]()
-    payoff_chart_ref = ft.Ref[ft.Image]()
+    payoff_chart_ref = ft.Ref[ft.Container]()
     selected_label = ft.Ref[ft.Text]()
     edit_selected_ref = ft.Ref[ft.FilledButton]()
     delete_selected_ref = ft.Ref[ft.TextButton]()
     selected_liability: int | None = None
 
     def _update_schedule(
-        schedule: list[dict], payoff: str | None, total_interest: float, months: int
+        schedule: PayoffSchedule, payoff: str | None, total_interest: float, months: int
     ) -> None:
         if payoff_text.current:
             payoff_text.current.value = (
@@ -95,18 +109,14 @@ def build_debts_view(ctx: AppContext, page: ft.Page) -> ft.View:
             interest_text.current.value = f"Projected interest: ${total_interest:,.2f}"
         rows: list[ft.Control] = []
         # Show first 6 months for brevity
-        for entry in schedule[:6]:
-            payments = entry.get("payments", {}) if isinstance(entry, dict) else {}
-            remaining = sum(
-                float(p.get("remaining_balance", 0.0) or 0.0) for p in payments.values()
-            )
-            total_payment = sum(float(p.get("payment_amount", 0.0) or 0.0) for p in payments.values())
+        for index in range(min(len(schedule), 6)):
+            month = schedule.month(index)
             rows.append(
                 ft.Row(
                     [
-                        ft.Text(str(entry.get("date", "")), width=110),
-                        ft.Text(f"Payment: ${total_payment:,.2f}", width=160),
-                        ft.Text(f"Remaining: ${remaining:,.2f}", width=160),
+                        ft.Text(month.date, width=110),
+                        ft.Text(f"Payment: ${month.payment:,.2f}", width=160),
+                        ft.Text(f"Remaining: ${month.remaining:,.2f}", width=160),
                     ],
                     alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 )
@@ -123,10 +133,12 @@ def build_debts_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
         if payoff_chart_ref.current is not None:
             try:
-                chart_path = debt_payoff_chart_png(schedule) if schedule else None
-                payoff_chart_ref.current.src = str(chart_path) if chart_path else ""
-                payoff_chart_ref.current.visible = bool(chart_path)
-                payoff_chart_ref.current.fit = ft.ImageFit.CONTAIN
+                payoff_chart_ref.current.content = (
+                    FletChartRenderer(height=240).debt_payoff(payoff_from_schedule(schedule))
+                    if schedule
+                    else None
+                )
+                payoff_chart_ref.current.visible = bool(schedule)
             except Exception as exc:
                 dev_log(ctx.config, "Payoff chart render failed", exc=exc)
                 payoff_chart_ref.current.visible = False
@@ -181,6 +193,8 @@ def build_debts_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 liabilities,
                 strategy=strategy_state["value"],
                 mode=strategy_state.get("mode", "balanced"),
+                cache=payoff_cache_for(ctx),
+                user_id=uid,
             )
             ctx.payoff_preferences = {
                 "strategy": strategy_state["value"],
@@ -454,7 +468,7 @@ def build_debts_view(ctx: AppContext, page: ft.Page) -> ft.View:
                                 content=ft.Column(
                                     controls=[
                                         ft.Text("Payoff chart", weight=ft.FontWeight.BOLD),
-                                        ft.Image(ref=payoff_chart_ref, height=240),
+                                        ft.Container(ref=payoff_chart_ref, visible=False),
                                         ft.Text(
                                             "Line chart shows projected remaining balance over time.",
                                             color=ft.Colors.ON_SURFACE_VARIANT,
@@ -21,11 +21,12 @@ from ...logging_config import get_logger
 from ...models.account import Account
 from ...models.category import Category
 from ...models.transaction import Transaction
-from ...services import export_csv, ledger_service
+from ...services import ledger_service
 from .. import controllers
+from ..charts.data import spending_from_transactions
+from ..charts.native import FletChartRenderer
 
 logger = get_logger(__name__)
-from ..charts import spending_chart_png
 from ..components import (
     build_app_bar,
     build_main_layout,
@@ -109,7 +110,7 @@ def build_ledger_view(ctx: AppContext, page: ft.Page) -> ft.View:
     income_text = ft.Ref[ft.Text]()
     expense_text = ft.Ref[ft.Text]()
     net_text = ft.Ref[ft.Text]()
-    spending_image_ref = ft.Ref[ft.Image]()
+    spending_chart_ref = ft.Ref[ft.Container]()
     spending_empty_ref = ft.Ref[ft.Text]()
     spending_label_ref = ft.Ref[ft.Text]()
     budget_progress_ref = ft.Ref[ft.Column]()
@@ -299,32 +300,33 @@ def build_ledger_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
     def _render_spending_chart(transactions: Iterable[Transaction]) -> None:
         expenses = [t for t in transactions if t.amount < 0]
-        image = spending_image_ref.current
+        chart = spending_chart_ref.current
         empty_state = spending_empty_ref.current
-        if not image or not empty_state:
+        if not chart or not empty_state:
             return
         if not expenses:
-            image.visible = False
+            chart.visible = False
             empty_state.visible = True
-            if image.page:
-                image.update()
+            if chart.page:
+                chart.update()
             if empty_state.page:
                 empty_state.update()
             return
         try:
             categories = ctx.category_repo.list_all(user_id=uid)
             lookup = {c.id: c.name for c in categories if c.id is not None}
-            path = spending_chart_png(expenses, category_lookup=lookup)
-            image.src = path.as_posix()
-            image.visible = True
+            chart.content = FletChartRenderer(height=220).spending(
+                spending_from_transactions(expenses, category_lookup=lookup)
+            )
+            chart.visible = True
             empty_state.visible = False
-            if image.page:
-                image.update()
+            if chart.page:
+                chart.update()
             if empty_state.page:
                 empty_state.update()
         except Exception as exc:  # pragma: no cover - user-facing guard
             dev_log(ctx.config, "Spending chart refresh failed", exc=exc)
-            image.visible = False
+            chart.visible = False
             empty_state.visible = True
             page.snack_bar = ft.SnackBar(
                 content=ft.Text("Saved, but spending chart failed to render"),
@@ -767,24 +769,14 @@ def build_ledger_view(ctx: AppContext, page: ft.Page) -> ft.View:
             text=(search_field.value or "").strip() or None,
             txn_type=type_field.value or "all",
         )
-        txs = ledger_service.filtered_transactions(ctx.transaction_repo, filters)
-        if not txs:
-            _snack("No transactions to export for this filter")
-            return
-
         stamp = datetime.now().strftime("%Y%m%d%H%M%S")
         export_dir = controllers.resolve_export_dir(ctx)
         output_path = export_dir / f"ledger_export_{stamp}.csv"
         try:
-            export_csv.export_transactions_csv(transactions=txs, output_path=output_path)
-            dev_log(ctx.config, "Ledger CSV exported", context={"path": str(output_path), "count": len(txs)})
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"Exported {len(txs)} transactions to {output_path}", selectable=True),
-                show_close_icon=True,
-                bgcolor=ft.Colors.GREEN_100,
+            # Streams every matching row from SQL; no page/limit truncation.
+            controllers.start_ledger_export_job(
+                ctx, page, filters=filters, output_path=output_path
             )
-            page.snack_bar.open = True
-            page.update()
         except Exception as exc:  # pragma: no cover - user-facing guard
             dev_log(ctx.config, "Ledger export failed", exc=exc)
             show_error_dialog(page, "Export failed", str(exc))
@@ -992,12 +984,7 @@ def build_ledger_view(ctx: AppContext, page: ft.Page) -> ft.View:
                         size=12,
                         color=ft.Colors.ON_SURFACE_VARIANT,
                     ),
-                    ft.Image(
-                        ref=spending_image_ref,
-                        height=220,
-                        fit=ft.ImageFit.CONTAIN,
-                        visible=False,
-                    ),
+                    ft.Container(ref=spending_chart_ref, visible=False),
                     ft.Text(
                         "No expense data for this period",
                         ref=spending_empty_ref,
@@ -23,7 +23,8 @@ from ...devtools import dev_log
 from ...models.account import Account
 from ...models.portfolio import Holding
 from .. import controllers
-from ..charts import allocation_chart_png
+from ..charts.data import allocation_from_holdings
+from ..charts.native import FletChartRenderer
 from ..components import (
     build_app_bar,
     build_main_layout,
@@ -54,7 +55,7 @@ def build_portfolio_view(ctx: AppContext, page: ft.Page) -> ft.View:
     delete_selected_ref = ft.Ref[ft.TextButton]()
     selected_holding_id: int | None = None
     current_holdings: list[Holding] = []
-    chart_ref = ft.Ref[ft.Image]()
+    chart_ref = ft.Ref[ft.Container]()
     total_holdings_text = ft.Ref[ft.Text]()
     cost_basis_text = ft.Ref[ft.Text]()
     market_value_text = ft.Ref[ft.Text]()
@@ -325,8 +326,10 @@ def build_portfolio_view(ctx: AppContext, page: ft.Page) -> ft.View:
         if chart_ref.current:
             try:
                 chart_ref.current.visible = bool(holdings)
-                chart_ref.current.src = (
-                    str(allocation_chart_png(holdings)) if holdings else ""
+                chart_ref.current.content = (
+                    FletChartRenderer(height=160).allocation(allocation_from_holdings(holdings))
+                    if holdings
+                    else None
                 )
             except Exception as exc:
                 dev_log(ctx.config, "Allocation chart render failed", exc=exc)
@@ -431,7 +434,7 @@ def build_portfolio_view(ctx: AppContext, page: ft.Page) -> ft.View:
                         ],
                         spacing=4,
                     ),
-                    ft.Image(ref=chart_ref, height=160),
+                    ft.Container(ref=chart_ref, width=320, visible=False),
                 ],
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             ),
@@ -6,32 +6,46 @@ from __future__ import annotations
 import csv
 import shutil
 from datetime import datetime, timedelta
+from io import TextIOWrapper
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Sized
 from zipfile import ZipFile
 
 import flet as ft
 
+from ...logging_config import get_logger
 from ...services.admin_tasks import run_export
-from ...services.debts import DebtAccount, avalanche_schedule, snowball_schedule
-from ...services.reports import export_spending_png, export_transactions_csv
+from ...services.debts import DebtAccount
+from ...services.export_csv import iter_ledger_rows, write_ledger_csv
+from ...services.ledger_service import LedgerFilters
+from ...services.reports import write_spending_png
 from .. import controllers
-from ..charts import (
-    allocation_chart_png,
-    cashflow_by_account_png,
-    category_trend_png,
-    debt_payoff_chart_png,
-    spending_chart_png,
+from ..chart_cache import data_generation, get_chart_cache, theme_key
+from ..chart_loader import ChartLoad
+from ..chart_pool import ChartJob, ChartRender, format_render_times, render_charts
+from ..charts.data import (
+    CategorySeries,
+    PayoffSeries,
+    allocation_by_symbol,
+    cashflow_by_account,
+    category_trend,
+    payoff_from_schedule,
+    spending_by_category,
 )
+from ..charts.native import FletChartRenderer
 from ..components import build_app_bar, build_main_layout, empty_state
 from ..context import AppContext
+from ..payoff_cache import payoff_cache_for
+
+logger = get_logger(__name__)
 
 
 def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
     """Build the reports/export view."""
 
     uid = ctx.require_user_id()
+    payoff_cache = payoff_cache_for(ctx)
+    chart_cache = get_chart_cache(ctx.config)
 
     # FilePicker for export destination
     export_dir_picker = ft.FilePicker()
@@ -53,12 +67,32 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
             end = datetime(month.year + 1, 1, 1)
         else:
             end = datetime(month.year, month.month + 1, 1)
-        txs_month = ctx.transaction_repo.search(
-            start_date=start, end_date=end, user_id=uid, category_id=None, account_id=None, text=None  # type: ignore[arg-type]
-        )
         categories = {c.id: c.name for c in ctx.category_repo.list_all(user_id=uid) if c.id}
 
-        spending_png = spending_chart_png(txs_month, category_lookup=categories)
+        # Snapshot charts are native Flet controls drawn from SQL aggregates.
+        # The queries (and the payoff projection) run in the background
+        # behind a placeholder so the view itself appears immediately.
+        loader = ctx.chart_loader
+        loader.cancel()
+        background = isinstance(page, ft.Page)
+
+        def _deferred_chart_card(title: str, load, draw, drill_route: str) -> ft.Container:
+            slot = ft.Container(content=_chart_placeholder())
+
+            def _ready(result: ChartLoad) -> None:
+                slot.content = _chart_body(
+                    title, result.value, draw, page=page, ctx=ctx, drill_route=drill_route
+                )
+                try:
+                    page.update()
+                except Exception:
+                    pass
+
+            loader.submit(title, load, _ready, background=background)
+            return _chart_card(title, page=page, ctx=ctx, drill_route=drill_route, body=slot)
+
+        def _load_spending() -> CategorySeries:
+            return spending_by_category(ctx.session_factory, user_id=uid, start=start, end=end)
 
         # Budget usage progress snapshot
         budget = ctx.budget_repo.get_for_month(month.year, month.month, user_id=uid)
@@ -122,41 +156,37 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
         if not habit_rows:
             habit_rows.append(ft.Text("No habits yet", color=ft.Colors.ON_SURFACE_VARIANT))
 
-        # Debt payoff chart snapshot - with comprehensive error guards
-        payoff_png = None
-        try:
-            liabilities = ctx.liability_repo.list_all(user_id=uid)
-            if liabilities:
-                debts = [
-                    DebtAccount(
-                        id=lb.id or 0,
-                        balance=float(lb.balance) if lb.balance else 0.0,
-                        apr=float(lb.apr) if lb.apr else 0.0,
-                        minimum_payment=float(lb.minimum_payment) if lb.minimum_payment else 0.0,
-                        statement_due_day=getattr(lb, "due_day", 1) or 1,
-                    )
-                    for lb in liabilities
-                    if lb.balance and lb.balance > 0
-                ]
-                if debts:
-                    schedule = snowball_schedule(debts=debts, surplus=0.0)
-                    if schedule and len(schedule) > 0:
-                        payoff_png = debt_payoff_chart_png(schedule)
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Debt payoff chart generation failed: {e}")
-            payoff_png = None
+        # Debt payoff chart snapshot
+        def _load_debt_payoff() -> PayoffSeries | None:
+            debts = [
+                DebtAccount(
+                    id=lb.id or 0,
+                    balance=float(lb.balance) if lb.balance else 0.0,
+                    apr=float(lb.apr) if lb.apr else 0.0,
+                    minimum_payment=float(lb.minimum_payment) if lb.minimum_payment else 0.0,
+                    statement_due_day=getattr(lb, "due_day", 1) or 1,
+                )
+                for lb in ctx.liability_repo.list_all(user_id=uid)
+                if lb.balance and lb.balance > 0
+            ]
+            if not debts:
+                return None
+            return payoff_from_schedule(payoff_cache.schedule(debts, surplus=0.0, user_id=uid))
 
         # Portfolio allocation snapshot
-        holdings = ctx.holding_repo.list_all(user_id=uid) if hasattr(ctx, "holding_repo") else []
-        allocation_png = allocation_chart_png(holdings) if holdings else None
+        def _load_allocation() -> CategorySeries:
+            return allocation_by_symbol(ctx.session_factory, user_id=uid)
 
         return ft.ResponsiveRow(
             controls=[
-                _chart_card("Spending by category", spending_png, page=page, ctx=ctx, drill_route="/ledger"),
+                _deferred_chart_card(
+                    "Spending by category",
+                    _load_spending,
+                    lambda series, height: FletChartRenderer(height=height).spending(series),
+                    "/ledger",
+                ),
                 _chart_card(
                     "Budget usage",
-                    None,
                     ft.Column(controls=budget_rows, spacing=6),
                     page=page,
                     ctx=ctx,
@@ -164,14 +194,23 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 ),
                 _chart_card(
                     "Habit completion (7d)",
-                    None,
                     ft.Column(controls=habit_rows, spacing=6),
                     page=page,
                     ctx=ctx,
                     drill_route="/habits",
                 ),
-                _chart_card("Debt payoff projection", payoff_png, page=page, ctx=ctx, drill_route="/debts"),
-                _chart_card("Portfolio allocation", allocation_png, page=page, ctx=ctx, drill_route="/portfolio"),
+                _deferred_chart_card(
+                    "Debt payoff projection",
+                    _load_debt_payoff,
+                    lambda series, height: FletChartRenderer(height=height).debt_payoff(series),
+                    "/debts",
+                ),
+                _deferred_chart_card(
+                    "Portfolio allocation",
+                    _load_allocation,
+                    lambda series, height: FletChartRenderer(height=height).allocation(series),
+                    "/portfolio",
+                ),
             ],
             spacing=12,
             run_spacing=12,
@@ -214,11 +253,8 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 month = ctx.current_month
                 start = datetime(month.year, month.month, 1)
                 end = datetime(month.year + (1 if month.month == 12 else 0), (month.month % 12) + 1, 1)
-                txs = ctx.transaction_repo.search(
-                    start_date=start, end_date=end, user_id=uid, category_id=None, account_id=None, text=None  # type: ignore[arg-type]
-                )
                 out = _exports_dir() / f"spending_{stamp}.png"
-                export_spending_png(transactions=txs, output_path=out)
+                _write_spending_chart(start, end, out)
                 if result_image.current:
                     result_image.current.src = str(out)
                     result_image.current.visible = True
@@ -262,17 +298,19 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                     return
 
                 # Generate payoff schedule
-                schedule = snowball_schedule(debts=debts, surplus=0.0)
+                schedule = payoff_cache.schedule(debts, surplus=0.0, user_id=uid)
                 if not schedule:
                     notify("Could not generate payoff schedule. Check that debts have valid balances and minimum payments.")
                     return
 
-                # Generate chart to temp file, then copy to destination
                 out = _exports_dir() / f"debt_{stamp}.png"
                 try:
-                    temp_chart_path = debt_payoff_chart_png(schedule)
-                    shutil.copy(temp_chart_path, out)
-                    chart_path = out
+                    chart_path = _export_chart(
+                        "debt_payoff",
+                        lambda: payoff_from_schedule(schedule),
+                        out,
+                        params={"strategy": "snowball"},
+                    )
                 except Exception as chart_exc:
                     notify(f"Chart generation failed: {chart_exc}")
                     return
@@ -289,8 +327,11 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                     notify("No holdings to export.")
                     return
                 out = _exports_dir() / f"allocation_{stamp}.png"
-                chart = allocation_chart_png(holdings, output_path=out) if "output_path" in allocation_chart_png.__code__.co_varnames else allocation_chart_png(holdings)
-                chart_path = out if out.exists() else chart
+                chart_path = _export_chart(
+                    "allocation",
+                    lambda: allocation_by_symbol(ctx.session_factory, user_id=uid),
+                    out,
+                )
                 if result_image.current:
                     result_image.current.src = str(chart_path)
                     result_image.current.visible = True
@@ -320,6 +361,48 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
         out.mkdir(parents=True, exist_ok=True)
         return out
 
+    def _write_spending_chart(start: datetime, end: datetime, output: Path) -> None:
+        # Totals come from the SQL GROUP BY; the month's rows are never loaded.
+        series = spending_by_category(ctx.session_factory, user_id=uid, start=start, end=end)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("wb") as handle:
+            write_spending_png(totals=series.as_dict(), output=handle)
+
+    def _chart_params(params: dict[str, Any] | None = None) -> dict[str, Any]:
+        return {"user_id": uid, **(params or {})}
+
+    def _export_chart(
+        kind: str,
+        series: Callable[[], Any],
+        dest: Path,
+        *,
+        params: dict[str, Any] | None = None,
+    ) -> Path:
+        """Copy the cached PNG for ``kind`` to ``dest``, rendering it only on a miss.
+
+        ``series`` is skipped as well while no tracked table has changed since
+        the chart was last exported.
+        """
+
+        from ..charts.batch import render_png
+
+        cached = chart_cache.get_or_render(
+            kind,
+            series=series,
+            render=lambda data: render_png(kind, data),
+            params=_chart_params(params),
+            theme=theme_key(ctx),
+            generation=data_generation(ctx.session_factory),
+        )
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(cached, dest)
+        logger.debug("Chart cache: %s", chart_cache.stats.to_dict())
+        return dest
+
+    def _ledger_filters() -> LedgerFilters:
+        # Full history for the current user; rows are streamed, never capped.
+        return LedgerFilters(user_id=uid)
+
     def _pick_export_dir(callback):
         """Show directory picker and call callback with selected path."""
         def on_result(e: ft.FilePickerResultEvent):
@@ -343,6 +426,7 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                     session_factory=ctx.session_factory,
                     user_id=uid,
                     retention=ctx.config.EXPORT_RETENTION,
+                    compresslevel=getattr(ctx.config, "EXPORT_COMPRESSLEVEL", 6),
                 )
                 notify(f"Export ready: {path}")
             except Exception as exc:
@@ -361,41 +445,42 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 end = datetime(month.year + 1, 1, 1)
             else:
                 end = datetime(month.year, month.month + 1, 1)
-            txs = ctx.transaction_repo.search(
-                start_date=start, end_date=end, user_id=uid, category_id=None, account_id=None, text=None  # type: ignore[arg-type]
-            )
             output = (
                 custom_path
                 if custom_path is not None
                 else _exports_dir() / f"spending_{month.strftime('%Y_%m')}.png"
             )
-            export_spending_png(transactions=txs, output_path=output, renderer=None)  # type: ignore[arg-type]
+            _write_spending_chart(start, end, output)
             notify(f"Monthly spending saved to {output}")
         except Exception as exc:
             notify(f"Spending report failed: {exc}")
 
+    def _write_ytd_summary(handle) -> None:
+        year = ctx.current_month.year
+        start = datetime(year, 1, 1)
+        end = datetime(year + 1, 1, 1)
+        txs = ctx.transaction_repo.search(
+            start_date=start, end_date=end, user_id=uid, category_id=None, account_id=None, text=None  # type: ignore[arg-type]
+        )
+        income = sum(t.amount for t in txs if t.amount > 0)
+        expenses = sum(abs(t.amount) for t in txs if t.amount < 0)
+        net = income - expenses
+        writer = csv.writer(handle)
+        writer.writerow(["metric", "amount"])
+        writer.writerow(["income", f"{income:.2f}"])
+        writer.writerow(["expenses", f"{expenses:.2f}"])
+        writer.writerow(["net", f"{net:.2f}"])
+
     def export_ytd_summary(custom_path: Path | None = None):
         try:
             year = ctx.current_month.year
-            start = datetime(year, 1, 1)
-            end = datetime(year + 1, 1, 1)
-            txs = ctx.transaction_repo.search(
-                start_date=start, end_date=end, user_id=uid, category_id=None, account_id=None, text=None  # type: ignore[arg-type]
-            )
-            income = sum(t.amount for t in txs if t.amount > 0)
-            expenses = sum(abs(t.amount) for t in txs if t.amount < 0)
-            net = income - expenses
             output = (
                 custom_path
                 if custom_path is not None
                 else _exports_dir() / f"ytd_summary_{year}.csv"
             )
             with output.open("w", newline="") as handle:
-                writer = csv.writer(handle)
-                writer.writerow(["metric", "amount"])
-                writer.writerow(["income", f"{income:.2f}"])
-                writer.writerow(["expenses", f"{expenses:.2f}"])
-                writer.writerow(["net", f"{net:.2f}"])
+                _write_ytd_summary(handle)
             notify(f"YTD summary saved to {output}")
         except Exception as exc:
             notify(f"YTD summary failed: {exc}")
@@ -417,8 +502,10 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 for lb in liabilities
             ]
             # Default to snowball but surface avalanche as well for comparison.
-            schedule = snowball_schedule(debts=debts, surplus=0.0)
-            alt_schedule = avalanche_schedule(debts=debts, surplus=0.0)
+            schedule = payoff_cache.schedule(debts, surplus=0.0, user_id=uid)
+            alt_schedule = payoff_cache.schedule(
+                debts, strategy="avalanche", surplus=0.0, user_id=uid
+            )
             stamp = datetime.now().strftime("%Y%m%d%H%M%S")
 
             output_csv = (
@@ -430,61 +517,63 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 writer = csv.writer(handle)
                 writer.writerow(["date", "strategy", "total_payment", "remaining_balance"])
                 for label, sched in (("snowball", schedule), ("avalanche", alt_schedule)):
-                    for entry in sched:
-                        payments = entry.get("payments", {}) if isinstance(entry, dict) else {}
-                        total_payment = sum(
-                            float(p.get("payment_amount", 0.0) or 0.0) for p in payments.values()
+                    for month in sched.monthly():
+                        writer.writerow(
+                            [month.date, label, f"{month.payment:.2f}", f"{month.remaining:.2f}"]
                         )
-                        remaining = sum(
-                            float(p.get("remaining_balance", 0.0) or 0.0) for p in payments.values()
-                        )
-                        writer.writerow([entry.get("date", ""), label, f"{total_payment:.2f}", f"{remaining:.2f}"])
 
-            chart_src = debt_payoff_chart_png(schedule)
             chart_dst = (
                 custom_chart
                 if custom_chart is not None
                 else _exports_dir() / f"debt_payoff_{stamp}.png"
             )
-            shutil.copy(chart_src, chart_dst)
+            _export_chart(
+                "debt_payoff",
+                lambda: payoff_from_schedule(schedule),
+                chart_dst,
+                params={"strategy": "snowball"},
+            )
             notify(f"Debt payoff report saved to {output_csv}")
         except Exception as exc:
             notify(f"Debt report failed: {exc}")
 
     def export_category_trend(custom_path: Path | None = None):
         try:
-            txs = ctx.transaction_repo.list_all(user_id=uid, limit=5000)
-            categories = {c.id: c.name for c in ctx.category_repo.list_all(user_id=uid) if c.id}
-            png = category_trend_png(txs, category_lookup=categories)
             stamp = datetime.now().strftime("%Y%m%d%H%M%S")
             dest = custom_path if custom_path is not None else _exports_dir() / f"category_trend_{stamp}.png"
-            shutil.copy(png, dest)
+            _export_chart(
+                "category_trend", lambda: category_trend(ctx.session_factory, user_id=uid), dest
+            )
             notify(f"Category trend saved to {dest}")
         except Exception as exc:
             notify(f"Category trend failed: {exc}")
 
     def export_cashflow_by_account(custom_path: Path | None = None):
         try:
-            txs = ctx.transaction_repo.list_all(user_id=uid, limit=5000)
-            accounts = {a.id: a.name for a in ctx.account_repo.list_all(user_id=uid) if a.id}
-            png = cashflow_by_account_png(txs, account_lookup=accounts)
             stamp = datetime.now().strftime("%Y%m%d%H%M%S")
             dest = custom_path if custom_path is not None else _exports_dir() / f"cashflow_accounts_{stamp}.png"
-            shutil.copy(png, dest)
+            _export_chart(
+                "account_cashflow",
+                lambda: cashflow_by_account(ctx.session_factory, user_id=uid),
+                dest,
+            )
             notify(f"Cashflow by account saved to {dest}")
         except Exception as exc:
             notify(f"Cashflow by account failed: {exc}")
 
     def export_portfolio_allocation(custom_path: Path | None = None):
         try:
-            holdings = ctx.holding_repo.list_all(user_id=uid) if hasattr(ctx, "holding_repo") else []
+            if not hasattr(ctx, "holding_repo"):
+                return None
+            holdings = ctx.holding_repo.list_all(user_id=uid)
             if not holdings:
                 notify("No holdings to export.")
                 return
-            png = allocation_chart_png(holdings)
             stamp = datetime.now().strftime("%Y%m%d%H%M%S")
             dest = custom_path if custom_path is not None else _exports_dir() / f"allocation_{stamp}.png"
-            shutil.copy(png, dest)
+            _export_chart(
+                "allocation", lambda: allocation_by_symbol(ctx.session_factory, user_id=uid), dest
+            )
             notify(f"Portfolio allocation saved to {dest}")
         except Exception as exc:
             notify(f"Portfolio allocation failed: {exc}")
@@ -496,60 +585,130 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
             bundle_path = (
                 custom_path if custom_path is not None else exports_dir / f"reports_bundle_{stamp}.zip"
             )
-            with TemporaryDirectory() as tmpdir:
-                tmp = Path(tmpdir)
-                # Transactions CSV
-                txs = ctx.transaction_repo.list_all(user_id=uid, limit=10000)
-                tx_csv = tmp / "transactions.csv"
-                export_transactions_csv(transactions=txs, output_path=tx_csv)
-                # Spending PNG
-                spending_png = tmp / "spending.png"
-                export_spending_png(transactions=txs, output_path=spending_png, renderer=None)  # type: ignore[arg-type]
-                # YTD CSV
-                export_ytd_summary(tmp / "ytd_summary.csv")
-                # Debt report
-                liabilities = ctx.liability_repo.list_all(user_id=uid)
-                debts = [
-                    DebtAccount(
-                        id=lb.id or 0,
-                        balance=lb.balance,
-                        apr=lb.apr,
-                        minimum_payment=lb.minimum_payment,
-                        statement_due_day=getattr(lb, "due_day", 1) or 1,
+            liabilities = ctx.liability_repo.list_all(user_id=uid)
+            debts = [
+                DebtAccount(
+                    id=lb.id or 0,
+                    balance=lb.balance,
+                    apr=lb.apr,
+                    minimum_payment=lb.minimum_payment,
+                    statement_due_day=getattr(lb, "due_day", 1) or 1,
+                )
+                for lb in liabilities
+            ]
+            schedule = payoff_cache.schedule(debts, surplus=0.0, user_id=uid)
+
+            # Aggregate in SQL; workers only receive the small chart series,
+            # never the transactions.
+            def _rows():
+                return iter_ledger_rows(
+                    session_factory=ctx.session_factory, filters=_ledger_filters()
+                )
+
+            # Every PNG is drawn by the batch renderer: each worker keeps one
+            # prepared figure per chart type, so the monthly spending charts
+            # after the first only swap data into an existing figure.
+            from ..charts.batch import render_png
+
+            trend = category_trend(ctx.session_factory, user_id=uid)
+            monthly = category_trend(ctx.session_factory, user_id=uid, months=12)
+            jobs = [
+                ChartJob(
+                    "spending.png",
+                    render_png,
+                    {
+                        "kind": "spending",
+                        "series": spending_by_category(ctx.session_factory, user_id=uid),
+                    },
+                ),
+                ChartJob(
+                    "category_trend.png",
+                    render_png,
+                    {"kind": "category_trend", "series": trend},
+                ),
+                ChartJob(
+                    "cashflow_by_account.png",
+                    render_png,
+                    {
+                        "kind": "account_cashflow",
+                        "series": cashflow_by_account(ctx.session_factory, user_id=uid),
+                    },
+                ),
+            ]
+            jobs.extend(
+                ChartJob(
+                    f"spending/{month}.png",
+                    render_png,
+                    {"kind": "spending", "series": monthly.at(index)},
+                )
+                for index, month in enumerate(monthly.months)
+            )
+            if debts:
+                jobs.append(
+                    ChartJob(
+                        "debt_payoff.png",
+                        render_png,
+                        {"kind": "debt_payoff", "series": payoff_from_schedule(schedule)},
                     )
-                    for lb in liabilities
-                ]
-                debt_csv = tmp / "debt_payoff.csv"
-                chart_png = tmp / "debt_payoff.png"
+                )
+
+            # Charts whose series is unchanged since an earlier export come
+            # straight from the chart cache; only the misses reach the pool.
+            theme = theme_key(ctx)
+            job_params = {"debt_payoff.png": {"strategy": "snowball"}}
+            keys = {
+                job.name: chart_cache.key_for(
+                    job.kwargs["kind"],
+                    series=job.kwargs["series"],
+                    params=_chart_params(job_params.get(job.name)),
+                    theme=theme,
+                )
+                for job in jobs
+            }
+            cached = {name: chart_cache.lookup(key) for name, key in keys.items()}
+            misses = [job for job in jobs if cached[job.name] is None]
+
+            with ZipFile(bundle_path, "w") as zipf:
+                with zipf.open("transactions.csv", "w") as raw, TextIOWrapper(
+                    raw, encoding="utf-8", newline=""
+                ) as handle:
+                    write_ledger_csv(rows=_rows(), stream=handle)
+                with zipf.open("ytd_summary.csv", "w") as raw, TextIOWrapper(
+                    raw, encoding="utf-8", newline=""
+                ) as handle:
+                    _write_ytd_summary(handle)
                 if debts:
-                    schedule = snowball_schedule(debts=debts, surplus=0.0)
-                    with debt_csv.open("w", newline="") as handle:
+                    with zipf.open("debt_payoff.csv", "w") as raw, TextIOWrapper(
+                        raw, encoding="utf-8", newline=""
+                    ) as handle:
                         writer = csv.writer(handle)
                         writer.writerow(["date", "total_payment", "remaining_balance"])
-                        for entry in schedule:
-                            payments = entry.get("payments", {}) if isinstance(entry, dict) else {}
-                            total_payment = sum(
-                                float(p.get("payment_amount", 0.0) or 0.0) for p in payments.values()
-                            )
-                            remaining = sum(
-                                float(p.get("remaining_balance", 0.0) or 0.0) for p in payments.values()
+                        for month in schedule.monthly():
+                            writer.writerow(
+                                [month.date, f"{month.payment:.2f}", f"{month.remaining:.2f}"]
                             )
-                            writer.writerow([entry.get("date", ""), f"{total_payment:.2f}", f"{remaining:.2f}"])
-                    shutil.copy(debt_payoff_chart_png(schedule), chart_png)
-                # Category trend
-                trend_png = category_trend_png(txs, category_lookup={c.id: c.name for c in ctx.category_repo.list_all(user_id=uid) if c.id})
-                trend_copy = tmp / "category_trend.png"
-                shutil.copy(trend_png, trend_copy)
-                # Cashflow by account
-                cf_png = cashflow_by_account_png(txs, account_lookup={a.id: a.name for a in ctx.account_repo.list_all(user_id=uid) if a.id})
-                cf_copy = tmp / "cashflow_by_account.png"
-                shutil.copy(cf_png, cf_copy)
-
-                # Build bundle
-                with ZipFile(bundle_path, "w") as zipf:
-                    for file in tmp.iterdir():
-                        zipf.write(file, arcname=file.name)
-            notify(f"Reports bundle saved to {bundle_path}")
+
+                for name, path in cached.items():
+                    if path is not None:
+                        zipf.write(path, name)
+
+                def _add_chart(result: ChartRender) -> None:
+                    if not result.error:
+                        zipf.writestr(result.name, result.png)
+                        chart_cache.store(
+                            keys[result.name], result.png, render_seconds=result.seconds
+                        )
+
+                renders = render_charts(misses, on_result=_add_chart)
+            timings = format_render_times(renders) or "no charts rendered"
+            reused = len(jobs) - len(misses)
+            logger.info(
+                "Reports bundle charts rendered: %s; %d from cache (%s)",
+                timings,
+                reused,
+                chart_cache.stats.to_dict(),
+            )
+            notify(f"Reports bundle saved to {bundle_path} ({timings}; {reused} cached)")
         except Exception as exc:
             notify(f"Bundle export failed: {exc}")
 
@@ -627,7 +786,7 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
             ),
             _report_card(
                 title="Combined bundle",
-                description="ZIP of transactions, spending, YTD, debt, trend, cashflow.",
+                description="ZIP of transactions, spending by month, YTD, debt, trend, cashflow.",
                 on_click=lambda _: controllers.pick_export_destination(
                     ctx,
                     page,
@@ -696,7 +855,7 @@ def build_reports_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 ]
                 if debts:
                     from ...services.debts import schedule_summary
-                    schedule = snowball_schedule(debts=debts, surplus=50.0)
+                    schedule = payoff_cache.schedule(debts, surplus=50.0, user_id=uid)
                     if schedule:
                         _, projected_interest, projected_months = schedule_summary(schedule)
             except Exception:
@@ -954,21 +1113,106 @@ def _open_chart_dialog(
     page.update()
 
 
+def _chart_placeholder() -> ft.Control:
+    """Lightweight stand-in shown while a chart loads in the background."""
+
+    return ft.Container(
+        content=ft.Column(
+            controls=[
+                ft.ProgressRing(width=28, height=28, stroke_width=3),
+                ft.Text("Rendering chart...", color=ft.Colors.ON_SURFACE_VARIANT, size=12),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            alignment=ft.MainAxisAlignment.CENTER,
+        ),
+        height=200,
+        alignment=ft.alignment.center,
+    )
+
+
+def _chart_body(
+    title: str,
+    series: Sized | None,
+    draw: Callable[[Any, int], ft.Control],
+    *,
+    page: ft.Page,
+    ctx: "AppContext",
+    drill_route: str | None = None,
+) -> ft.Control:
+    """Clickable native chart, or a note when there is no data to show.
+
+    ``draw(series, height)`` builds the chart; clicking opens the same series
+    drawn full size in the dedicated chart view.
+    """
+
+    if not series:
+        return ft.Container(
+            content=ft.Text("No data available", color=ft.Colors.ON_SURFACE_VARIANT),
+            height=200,
+            alignment=ft.alignment.center,
+        )
+
+    def _go_to_chart(_):
+        ctx.pending_chart = {
+            "title": title,
+            "image_path": None,
+            "content": draw(series, 600),
+            "drill_route": drill_route,
+        }
+        controllers.navigate(page, "/reports/chart")
+
+    return ft.Container(
+        content=ft.Column(
+            controls=[
+                draw(series, 200),
+                ft.Row(
+                    controls=[
+                        ft.Icon(
+                            ft.Icons.ZOOM_IN,
+                            size=16,
+                            color=ft.Colors.PRIMARY,
+                        ),
+                        ft.Text(
+                            "Click to expand",
+                            size=12,
+                            color=ft.Colors.PRIMARY,
+                        ),
+                    ],
+                    spacing=4,
+                    alignment=ft.MainAxisAlignment.CENTER,
+                ),
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=4,
+        ),
+        on_click=_go_to_chart,
+        ink=True,
+        border_radius=8,
+        tooltip="Click to expand chart",
+        border=ft.border.all(1, ft.Colors.OUTLINE),
+        padding=8,
+    )
+
+
 def _chart_card(
     title: str,
-    image_path: Path | None,
     extra_content: ft.Control | None = None,
     *,
     page: ft.Page,
     ctx: "AppContext",
     drill_route: str | None = None,
+    body: ft.Control | None = None,
 ) -> ft.Container:
-    """Create a chart card that navigates to a dedicated full-size chart view."""
+    """Create a chart card that navigates to a dedicated full-size chart view.
+
+    ``body`` replaces the chart area, e.g. a container whose placeholder is
+    swapped for the chart once a background load finishes.
+    """
 
     def _go_to_chart(_):
         ctx.pending_chart = {
             "title": title,
-            "image_path": str(image_path) if image_path else None,
+            "image_path": None,
             "content": extra_content,
             "drill_route": drill_route,
         }
@@ -979,65 +1223,8 @@ def _chart_card(
         ft.Text(title, weight=ft.FontWeight.BOLD, size=14),
     ]
 
-    if image_path:
-        path_exists = False
-        try:
-            path_exists = image_path.exists()
-        except Exception:
-            pass
-
-        if path_exists:
-            image_container = ft.Container(
-                content=ft.Column(
-                    controls=[
-                        ft.Image(
-                            src=str(image_path),
-                            height=200,
-                            fit=ft.ImageFit.CONTAIN,
-                        ),
-                        ft.Row(
-                            controls=[
-                                ft.Icon(
-                                    ft.Icons.ZOOM_IN,
-                                    size=16,
-                                    color=ft.Colors.PRIMARY,
-                                ),
-                                ft.Text(
-                                    "Click to expand",
-                                    size=12,
-                                    color=ft.Colors.PRIMARY,
-                                ),
-                            ],
-                            spacing=4,
-                            alignment=ft.MainAxisAlignment.CENTER,
-                        ),
-                    ],
-                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                    spacing=4,
-                ),
-                on_click=_go_to_chart,
-                ink=True,
-                border_radius=8,
-                tooltip="Click to expand chart",
-                border=ft.border.all(1, ft.Colors.OUTLINE),
-                padding=8,
-            )
-            content_controls.append(image_container)
-        else:
-            content_controls.append(
-                ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            ft.Icon(ft.Icons.IMAGE_NOT_SUPPORTED, size=40, color=ft.Colors.OUTLINE),
-                            ft.Text("Chart not available", color=ft.Colors.ON_SURFACE_VARIANT, size=12),
-                        ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        alignment=ft.MainAxisAlignment.CENTER,
-                    ),
-                    height=200,
-                    alignment=ft.alignment.center,
-                )
-            )
+    if body is not None:
+        content_controls.append(body)
     elif extra_content:
         content_controls.append(
             ft.Container(
@@ -1050,14 +1237,6 @@ def _chart_card(
                 tooltip="Click to view details",
             )
         )
-    else:
-        content_controls.append(
-            ft.Container(
-                content=ft.Text("No data available", color=ft.Colors.ON_SURFACE_VARIANT),
-                height=200,
-                alignment=ft.alignment.center,
-            )
-        )
 
     if drill_route:
         content_controls.append(
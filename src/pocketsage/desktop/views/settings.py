@@ -11,9 +11,8 @@ import flet as ft
 
 from ...devtools import dev_log
 from ...infra.database import rekey_database
-from ...services import importers
-from ...services.admin_tasks import backup_database, restore_database, run_export
-from ...services.watcher import start_watcher
+from ...services import importers, watcher
+from ...services.admin_tasks import run_export
 from .. import controllers
 from ..components import build_app_bar, build_main_layout
 
@@ -102,6 +101,7 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
                 session_factory=ctx.session_factory,
                 user_id=ctx.require_user_id(),
                 retention=ctx.config.EXPORT_RETENTION if hasattr(ctx.config, "EXPORT_RETENTION") else 5,
+                compresslevel=getattr(ctx.config, "EXPORT_COMPRESSLEVEL", 6),
             )
             _notify(f"Export ready: {path}")
         except Exception as exc:
@@ -110,9 +110,7 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
 
     def backup_db(_):
         try:
-            backups_dir = ctx.config.DATA_DIR / "backups"
-            path = backup_database(backups_dir, config=ctx.config)
-            _notify(f"Backup saved: {path}")
+            controllers.start_backup_job(ctx, page, output_dir=ctx.config.DATA_DIR / "backups")
         except Exception as exc:
             dev_log(ctx.config, "Backup failed", exc=exc)
             _notify(f"Backup failed: {exc}")
@@ -130,8 +128,8 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
         if not selected or not selected.path:
             return
         try:
-            target = restore_database(Path(selected.path), config=ctx.config)
-            _notify(f"Database restored to {target}; restart app to reload.")
+            controllers.restore_database_and_reload(ctx, Path(selected.path))
+            _notify(f"Database restored from {selected.path}; data reloaded.")
         except Exception as exc:
             dev_log(ctx.config, "Restore failed", exc=exc, context={"path": selected.path})
             _notify(f"Restore failed: {exc}")
@@ -147,16 +145,13 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
         page.overlay = []
     page.overlay.append(watcher_picker)
     watcher_label = ft.Ref[ft.Text]()
+    watcher_progress_label = ft.Ref[ft.Text]()
+    watcher_progress_bar = ft.Ref[ft.ProgressBar]()
     watch_target: dict[str, str | None] = {"target": None, "filename": None}
 
     def _stop_watcher():
-        if ctx.watcher_observer:
-            try:
-                ctx.watcher_observer.stop()
-            except Exception:
-                pass
-            ctx.watcher_observer = None
-            ctx.watched_folder = None
+        if ctx.watcher_service or ctx.watcher_observer:
+            ctx.stop_watcher()
             watch_target["target"] = None
             watch_target["filename"] = None
         if watcher_label.current:
@@ -164,40 +159,63 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
             watcher_label.current.update()
         dev_log(ctx.config, "Watcher stopped")
 
+    def _set_progress(text: str | None, value: float | None = None) -> None:
+        try:
+            if watcher_progress_label.current:
+                watcher_progress_label.current.value = text or ""
+                watcher_progress_label.current.update()
+            if watcher_progress_bar.current:
+                watcher_progress_bar.current.visible = value is not None
+                watcher_progress_bar.current.value = value
+                watcher_progress_bar.current.update()
+        except AssertionError:
+            # Controls not mounted (e.g., view already closed).
+            pass
+
     def _start_watcher(folder: Path):
         _stop_watcher()
         target_folder = folder if folder.is_dir() else folder.parent
         watch_filename = folder.name if folder.is_file() else None
 
-        def _import_file(csv_path: Path):
-            if watch_filename and csv_path.name != watch_filename:
-                dev_log(
-                    ctx.config,
-                    "Watcher ignored file",
-                    context={"expected": watch_filename, "seen": csv_path.name},
-                )
-                return
-            try:
-                created = importers.import_ledger_transactions(
-                    csv_path=csv_path,
-                    session_factory=ctx.session_factory,
-                    user_id=ctx.require_user_id(),
-                )
-                dev_log(
-                    ctx.config,
-                    "Watcher imported file",
-                    context={"path": csv_path, "created": created},
-                )
-            except Exception as exc:
+        def _on_progress(csv_path: Path, progress: importers.ImportProgress) -> None:
+            _set_progress(
+                controllers.format_import_progress(csv_path.name, progress),
+                progress.fraction,
+            )
+
+        def _on_batch(result: watcher.BatchResult) -> None:
+            dev_log(
+                ctx.config,
+                "Watcher imported batch",
+                context={
+                    "files": [path.name for path in result.paths],
+                    "created": result.total_created,
+                    "elapsed": round(result.elapsed, 3),
+                },
+            )
+            for csv_path, exc in result.errors.items():
                 dev_log(ctx.config, "Watcher import failed", exc=exc, context={"path": csv_path})
+            if result.errors:
+                failed = ", ".join(path.name for path in result.errors)
+                _set_progress(f"Auto-import failed for {failed}")
                 if ctx.dev_mode:
-                    _notify(f"Auto-import failed: {exc}")
+                    _notify(f"Auto-import failed: {failed}")
+            else:
+                names = ", ".join(path.name for path in result.paths)
+                _set_progress(f"Last import: {result.total_created} new transactions from {names}")
 
         try:
-            observer = start_watcher(
-                folder=target_folder, importer=_import_file, allowed_filename=watch_filename
-            )
-            ctx.watcher_observer = observer
+            service = watcher.WatcherIngestionService(
+                folder=target_folder,
+                batch_importer=watcher.make_ledger_batch_importer(
+                    session_factory=ctx.session_factory,
+                    user_id=ctx.require_user_id(),
+                    progress=_on_progress,
+                ),
+                allowed_filename=watch_filename,
+                on_batch=_on_batch,
+            ).start()
+            ctx.watcher_service = service
             ctx.watched_folder = str(target_folder)
             watch_target["target"] = str(target_folder)
             watch_target["filename"] = watch_filename
@@ -528,6 +546,8 @@ def build_settings_view(ctx: AppContext, page: ft.Page) -> ft.View:
                         ],
                         spacing=8,
                     ),
+                    ft.Text("", ref=watcher_progress_label, size=12, color=ft.Colors.ON_SURFACE_VARIANT),
+                    ft.ProgressBar(ref=watcher_progress_bar, value=0, width=320, visible=False),
                     ft.Row(
                         controls=[
                             ft.FilledButton(
@@ -55,6 +55,57 @@ def init_database(engine) -> None:
     from .. import models  # noqa: F401
 
     SQLModel.metadata.create_all(engine)
+    install_change_triggers(engine)
+
+
+def _change_trigger_sql(table) -> list[str]:
+    """Build the INSERT/UPDATE/DELETE triggers feeding ``change_log`` for ``table``."""
+
+    def row_key(alias: str) -> str:
+        parts = ", ".join(f"'{col.name}', {alias}.\"{col.name}\"" for col in table.primary_key)
+        return f"json_object({parts})"
+
+    def log(alias: str, op: str, where: str = "") -> str:
+        # Delete + insert rather than INSERT OR REPLACE: an outer statement's
+        # conflict clause (e.g. an upsert) would override the trigger's.
+        condition = f" AND {where}" if where else ""
+        return (
+            f"DELETE FROM change_log WHERE entity = '{table.name}' "
+            f"AND row_key = {row_key(alias)}{condition}; "
+            "INSERT INTO change_log (entity, row_key, user_id, op, changed_at) "
+            f"SELECT '{table.name}', {row_key(alias)}, {alias}.user_id, '{op}', "
+            f"CURRENT_TIMESTAMP{' WHERE ' + where if where else ''};"
+        )
+
+    name = f'"{table.name}"'
+    prefix = f"change_log_{table.name}"
+    key_moved = f"{row_key('OLD')} <> {row_key('NEW')}"
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_ins AFTER INSERT ON {name} "
+        f"BEGIN {log('NEW', 'upsert')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_upd AFTER UPDATE ON {name} "
+        f"BEGIN {log('OLD', 'delete', key_moved)} {log('NEW', 'upsert')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {prefix}_del AFTER DELETE ON {name} "
+        f"BEGIN {log('OLD', 'delete')} END",
+    ]
+
+
+def install_change_triggers(engine) -> None:
+    """Record writes to user-owned tables in ``change_log`` (idempotent).
+
+    Triggers rather than ORM events so bulk ``insert``/``update`` statements
+    and raw SQL are captured as well.
+    """
+
+    from ..models.changes import CHANGE_TRACKED_TABLES
+
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for table_name in CHANGE_TRACKED_TABLES:
+            table = SQLModel.metadata.tables[table_name]
+            for statement in _change_trigger_sql(table):
+                conn.exec_driver_sql(statement)
 
 
 @contextmanager
@@ -15,6 +15,15 @@ class SQLModelLiabilityRepository:
     def __init__(self, session_factory: Callable[[], Session]):
         """Initialize with a session factory."""
         self.session_factory = session_factory
+        self._write_listeners: list[Callable[[int], None]] = []
+
+    def add_write_listener(self, listener: Callable[[int], None]) -> None:
+        """Call ``listener(user_id)`` after each committed create, update or delete."""
+        self._write_listeners.append(listener)
+
+    def _notify_write(self, user_id: int) -> None:
+        for listener in self._write_listeners:
+            listener(user_id)
 
     def get_by_id(self, liability_id: int, *, user_id: int) -> Optional[Liability]:
         """Retrieve a liability by ID."""
@@ -59,7 +68,8 @@ class SQLModelLiabilityRepository:
             session.add(liability)
             session.commit()
             session.refresh(liability)
-            return liability
+        self._notify_write(user_id)
+        return liability
 
     def update(self, liability: Liability, *, user_id: int) -> Liability:
         """Update an existing liability."""
@@ -68,7 +78,8 @@ class SQLModelLiabilityRepository:
             session.add(liability)
             session.commit()
             session.refresh(liability)
-            return liability
+        self._notify_write(user_id)
+        return liability
 
     def delete(self, liability_id: int, *, user_id: int) -> None:
         """Delete a liability by ID."""
@@ -76,9 +87,11 @@ class SQLModelLiabilityRepository:
             liability = session.exec(
                 select(Liability).where(Liability.id == liability_id, Liability.user_id == user_id)
             ).first()
-            if liability:
-                session.delete(liability)
-                session.commit()
+            if liability is None:
+                return
+            session.delete(liability)
+            session.commit()
+        self._notify_write(user_id)
 
     def get_total_debt(self, *, user_id: int) -> float:
         """Calculate total outstanding debt."""
@@ -3,7 +3,9 @@
 from .account import Account
 from .budget import Budget, BudgetLine
 from .category import Category
+from .changes import CHANGE_TRACKED_TABLES, ChangeLogEntry, ExportWatermark
 from .habit import Habit, HabitEntry
+from .imports import ImportCheckpoint, ImportRegistryChunk, ImportRegistryEntry
 from .liability import Liability
 from .portfolio import Holding
 from .settings import AppSetting
@@ -14,8 +16,14 @@ __all__ = [
     "Budget",
     "BudgetLine",
     "Category",
+    "CHANGE_TRACKED_TABLES",
+    "ChangeLogEntry",
+    "ExportWatermark",
     "Habit",
     "HabitEntry",
+    "ImportCheckpoint",
+    "ImportRegistryChunk",
+    "ImportRegistryEntry",
     "Liability",
     "AppSetting",
     "Transaction",
@@ -0,0 +1,65 @@
+"""Change tracking tables used by incremental exports."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import ClassVar, Optional
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+# User-owned tables whose inserts, updates and deletes are recorded in
+# ``change_log`` by SQLite triggers (installed by ``init_database``).
+CHANGE_TRACKED_TABLES: tuple[str, ...] = (
+    "account",
+    "category",
+    "budget",
+    "budget_line",
+    "habit",
+    "habit_entry",
+    "liability",
+    "holding",
+    "transaction",
+)
+
+
+class ChangeLogEntry(SQLModel, table=True):
+    """Latest change to one row of a tracked table.
+
+    There is at most one entry per ``(entity, row_key)``: every write replaces
+    it with a fresh, strictly increasing ``seq``. ``row_key`` is the row's
+    primary key as a JSON object and ``op`` is ``"upsert"`` or ``"delete"``
+    (a tombstone).
+    """
+
+    __tablename__: ClassVar[str] = "change_log"
+    __table_args__ = (
+        UniqueConstraint("entity", "row_key", name="uq_change_log_entity_row"),
+        Index("ix_change_log_user_seq", "user_id", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    entity: str = Field(nullable=False, max_length=64)
+    row_key: str = Field(nullable=False, max_length=255)
+    user_id: int = Field(nullable=False)
+    op: str = Field(default="upsert", nullable=False, max_length=8)
+    changed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class ExportWatermark(SQLModel, table=True):
+    """Highest change ``seq`` covered by a user's most recent export bundle."""
+
+    __tablename__: ClassVar[str] = "export_watermark"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    seq: int = Field(nullable=False, default=0)
+    kind: str = Field(default="full", nullable=False, max_length=16)
+    path: str = Field(default="", nullable=False, max_length=1024)
+    exported_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
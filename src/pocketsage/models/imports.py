@@ -0,0 +1,78 @@
+"""Bookkeeping tables for CSV imports."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import ClassVar, Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class ImportCheckpoint(SQLModel, table=True):
+    """Last committed position of a (possibly interrupted) CSV import.
+
+    A checkpoint is written in the same transaction as each batch of imported
+    rows, so after a crash or cancellation the next run for the same unchanged
+    file can seek straight to ``byte_offset`` instead of starting over.
+    """
+
+    __tablename__: ClassVar[str] = "import_checkpoint"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", nullable=False, index=True)
+    kind: str = Field(default="ledger", nullable=False, max_length=32)
+    source_path: str = Field(nullable=False, index=True, max_length=1024)
+    file_size: int = Field(nullable=False, default=0)
+    file_mtime_ns: int = Field(nullable=False, default=0)
+    byte_offset: int = Field(nullable=False, default=0)
+    rows_committed: int = Field(nullable=False, default=0)
+    created: int = Field(nullable=False, default=0)
+    status: str = Field(default="running", nullable=False, max_length=16)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class ImportRegistryEntry(SQLModel, table=True):
+    """Content fingerprint of a file that was imported to completion.
+
+    ``file_size`` plus the ordered ``ImportRegistryChunk`` hashes let a
+    byte-identical file be skipped without parsing and an appended file
+    (rolling bank exports) resume after the last chunk whose bytes are
+    unchanged. ``content_sha256`` is the hash of the whole imported file.
+    """
+
+    __tablename__: ClassVar[str] = "import_registry"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", nullable=False, index=True)
+    kind: str = Field(default="ledger", nullable=False, max_length=32)
+    source_name: str = Field(nullable=False, max_length=255)
+    source_path: str = Field(nullable=False, max_length=1024)
+    content_sha256: str = Field(nullable=False, index=True, max_length=64)
+    file_size: int = Field(nullable=False, default=0)
+    rows: int = Field(nullable=False, default=0)
+    created: int = Field(nullable=False, default=0)
+    times_seen: int = Field(nullable=False, default=1)
+    imported_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+    last_seen_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+class ImportRegistryChunk(SQLModel, table=True):
+    """SHA-256 of one run of whole CSV records, ending at ``end_offset``."""
+
+    __tablename__: ClassVar[str] = "import_registry_chunk"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entry_id: int = Field(foreign_key="import_registry.id", nullable=False, index=True)
+    seq: int = Field(nullable=False)
+    end_offset: int = Field(nullable=False)
+    rows: int = Field(nullable=False, default=0)
+    sha256: str = Field(nullable=False, max_length=64)
@@ -83,24 +83,51 @@ class BackgroundScheduler:
         return False  # Default: disabled
 
     def _run_backup(self) -> None:
-        """Execute the backup task."""
+        """Execute the backup task.
+
+        Writes only the rows changed since the previous backup, so nightly
+        cost tracks the day's edits, but starts a new full export every
+        ``EXPORT_FULL_INTERVAL`` nights and then prunes ``exports/auto`` to
+        the configured ``EXPORT_RETENTION`` chains. Then adds a deduplicated
+        database snapshot to ``DATA_DIR/backups``, kept by the configured
+        ``BACKUP_KEEP_*`` policy.
+        """
         try:
-            from .services.admin_tasks import run_export
+            from .services.incremental_export import export_rolling
 
             logger.info("Starting scheduled backup")
             uid = self.ctx.require_user_id()
 
-            backup_path = run_export(
+            result = export_rolling(
+                Path(self.ctx.config.DATA_DIR) / "exports" / "auto",
                 session_factory=self.ctx.session_factory,
                 user_id=uid,
-                output_dir=Path(self.ctx.config.DATA_DIR) / "exports" / "auto",
+                full_every=self.ctx.config.EXPORT_FULL_INTERVAL,
+                keep=self.ctx.config.EXPORT_RETENTION,
             )
 
-            logger.info(f"Scheduled backup completed: {backup_path}")
+            if result.path is None:
+                logger.info("Scheduled backup skipped: no changes since last export")
+            else:
+                logger.info(
+                    f"Scheduled {result.manifest.kind} backup completed: {result.path} "
+                    f"({result.manifest.changes} changes)"
+                )
 
         except Exception as exc:
             logger.error(f"Scheduled backup failed: {exc}", exc_info=True)
 
+        try:
+            from .services.admin_tasks import snapshot_database
+
+            snapshot = snapshot_database(self.ctx.config, label="nightly")
+            logger.info(
+                f"Database snapshot {snapshot.manifest.id} stored: "
+                f"{snapshot.new_chunks} new chunks, {snapshot.reused_chunks} reused"
+            )
+        except Exception as exc:
+            logger.error(f"Scheduled database snapshot failed: {exc}", exc_info=True)
+
     def _rotate_logs(self) -> None:
         """Check and rotate logs if needed."""
         try:
@@ -1,23 +1,21 @@
-"""Service module exports."""
-
-from . import (
-    budgeting,
-    debts,
-    export_csv,
-    habits,
-    import_csv,
-    jobs,
-    ledger_service,
-    liabilities,
-    reports,
-    watcher,
-)
+"""Service module exports.
+
+Submodules are imported on first attribute access, so ``import
+pocketsage.services.auth`` does not also load pandas (``import_csv``) or
+every other service.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
 
 __all__ = [
     "budgeting",
     "debts",
     "habits",
     "import_csv",
+    "incremental_export",
     "ledger_service",
     "liabilities",
     "reports",
@@ -25,3 +23,13 @@ __all__ = [
     "export_csv",
     "jobs",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return import_module(f".{name}", __name__)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -15,27 +15,43 @@ from __future__ import annotations
 
 import os
 import random
+import shutil
+import sqlite3
 import time
 from calendar import monthrange
 from contextlib import AbstractContextManager, contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
+from io import TextIOWrapper
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from typing import Callable, Iterator, Optional
-from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
 
 from sqlalchemy import func
 from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.exc import OperationalError
-from sqlmodel import Session, select
+from sqlmodel import Session, SQLModel, select
 
 from ..config import BaseConfig
 from ..infra.database import create_db_engine, init_database
 from ..infra.database import session_scope as infra_session_scope
-from ..models import Account, Budget, BudgetLine, Category, Habit, HabitEntry, Holding, Liability, Transaction
-from .export_csv import export_transactions_csv
-from .reports import export_spending_png
+from ..models import (
+    Account,
+    Budget,
+    BudgetLine,
+    Category,
+    Habit,
+    HabitEntry,
+    Holding,
+    ImportCheckpoint,
+    Liability,
+    Transaction,
+)
+from . import import_registry
+from .backup_store import BackupStore, RetentionPolicy, SnapshotResult, select_retained
+from .export_csv import write_transactions_csv
+from .jobs import JobCancelled
+from .reports import write_spending_png
 
 SessionFactory = Callable[[], AbstractContextManager[Session]]
 
@@ -1210,12 +1226,15 @@ def reset_demo_database(
             Holding,
             Account,
             Category,
+            ImportCheckpoint,
         )
         for model in models:
             rows = session.exec(select(model).where(getattr(model, "user_id") == user_id)).all()  # type: ignore[attr-defined]
             for row in rows:
                 session.delete(row)
         session.commit()
+    # Registered files must be parsed again once their transactions are gone.
+    import_registry.purge_entries(lambda: _get_session(session_factory), user_id=user_id)
     if reseed:
         return run_demo_seed(session_factory=session_factory, user_id=user_id, force=True)
     return SeedSummary(transactions=0, categories=0, accounts=0, habits=0, liabilities=0, budgets=0)
@@ -1314,6 +1333,11 @@ def _build_seed_summary(session: Session, *, user_id: int) -> SeedSummary:
 
 
 EXPORT_RETENTION = 5
+EXPORT_COMPRESSLEVEL = 6
+EXPORT_YIELD_PER = 1000
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+BACKUP_IN_MEMORY_MAX_BYTES = 64 * 1024 * 1024
 
 
 def _ensure_secure_directory(directory: Path) -> None:
@@ -1329,25 +1353,52 @@ def _ensure_secure_directory(directory: Path) -> None:
 def _prune_old_exports(directory: Path, keep: int = EXPORT_RETENTION) -> None:
     """Remove export archives beyond the retention count."""
 
-    archives = sorted(
-        directory.glob("pocketsage_export_*.zip"),
-        key=lambda file: file.stat().st_mtime,
-        reverse=True,
-    )
-    for old in archives[keep:]:
+    archives = {
+        file: datetime.fromtimestamp(file.stat().st_mtime)
+        for file in directory.glob("pocketsage_export_*.zip")
+    }
+    policy = RetentionPolicy(last=keep, daily=0, weekly=0, monthly=0)
+    retained = select_retained(archives.items(), policy) if keep > 0 else set()
+    for old in archives.keys() - retained:
         try:
             old.unlink()
         except OSError:  # pragma: no cover - best-effort cleanup
             pass
 
 
+def _spending_totals(session: Session, user_id: Optional[int]) -> dict[object, float]:
+    """Aggregate expenses per category in SQL for the export chart."""
+
+    stmt = select(Transaction.category_id, func.sum(Transaction.amount)).where(
+        Transaction.amount < 0
+    )
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    stmt = stmt.group_by(Transaction.category_id)
+    totals: dict[object, float] = {}
+    for category_id, total in session.exec(stmt).all():
+        key = category_id or "uncategorized"
+        totals[key] = totals.get(key, 0.0) + abs(float(total or 0.0))
+    return totals
+
+
 def run_export(
     output_dir: Path | None = None,
     session_factory: Optional[SessionFactory] = None,
     user_id: Optional[int] = None,
     retention: int = EXPORT_RETENTION,
+    *,
+    compresslevel: int = EXPORT_COMPRESSLEVEL,
 ) -> Path:
-    """Generate export bundle for download and return path to zip file."""
+    """Generate export bundle for download and return path to zip file.
+
+    Transactions are streamed from the database in ``EXPORT_YIELD_PER`` batches
+    directly into the zip entry, and the spending chart is drawn from a SQL
+    aggregate, so memory use does not grow with the size of the ledger.
+    ``compresslevel`` 0 stores entries uncompressed; 1-9 deflates them. The
+    zip is written under a ``.part`` name and only moved into place once
+    complete, so a failed export never counts toward retention.
+    """
 
     write_to_instance = output_dir is not None
     out_dir: Path | None = None
@@ -1355,50 +1406,180 @@ def run_export(
         out_dir = Path(output_dir) if not isinstance(output_dir, Path) else output_dir
         _ensure_secure_directory(out_dir)
 
-    with TemporaryDirectory() as tmpdir:
-        tmp = Path(tmpdir)
-        safe_stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-        csv_path = tmp / f"transactions-{safe_stamp}.csv"
-        png_path = tmp / f"spending-{safe_stamp}.png"
+    safe_stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    csv_name = f"transactions-{safe_stamp}.csv"
+    png_name = f"spending-{safe_stamp}.png"
+    zip_name = f"pocketsage_export_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.zip"
+    zip_path = (Path.cwd() / zip_name) if not out_dir else out_dir / zip_name
+
+    if compresslevel <= 0:
+        zip_options: dict = {"compression": ZIP_STORED}
+    else:
+        zip_options = {"compression": ZIP_DEFLATED, "compresslevel": min(compresslevel, 9)}
+
+    partial = zip_path.with_name(zip_path.name + ".part")
+    try:
+        with ZipFile(partial, "w", **zip_options) as archive, _get_session(
+            session_factory
+        ) as session:
+            stmt = select(
+                Transaction.id,
+                Transaction.occurred_at,
+                Transaction.amount,
+                Transaction.memo,
+                Transaction.external_id,
+                Transaction.category_id,
+            )
+            if user_id is not None:
+                stmt = stmt.where(Transaction.user_id == user_id)
+            stmt = stmt.order_by(Transaction.id).execution_options(yield_per=EXPORT_YIELD_PER)
+            with archive.open(csv_name, "w") as raw, TextIOWrapper(
+                raw, encoding="utf-8", newline=""
+            ) as fh:
+                try:
+                    rows = session.exec(stmt)
+                except OperationalError:
+                    rows = []
+                write_transactions_csv(transactions=rows, stream=fh)
 
-        with _get_session(session_factory) as session:
             try:
-                stmt = select(Transaction)
-                if user_id is not None:
-                    stmt = stmt.where(Transaction.user_id == user_id)
-                txs = session.exec(stmt).all()
+                totals = _spending_totals(session, user_id)
             except OperationalError:
-                txs = []
+                totals = {}
+            with archive.open(png_name, "w") as fh:
+                try:
+                    write_spending_png(totals=totals, output=fh)
+                except Exception:
+                    # Keep the bundle usable even if chart rendering fails.
+                    pass
+        partial.replace(zip_path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
 
-            try:
-                export_transactions_csv(transactions=txs, output_path=csv_path)
-            except Exception:
-                csv_path.write_text("id,occurred_at,amount,memo\n")
+    if write_to_instance and out_dir is not None:
+        _prune_old_exports(out_dir, keep=retention)
 
-            try:
-                export_spending_png(transactions=txs, output_path=png_path, renderer=None)  # type: ignore[arg-type]
-            except Exception:
-                png_path.write_bytes(b"")
+    return zip_path
+
+
+@dataclass(frozen=True)
+class BackupProgress:
+    """Pages copied so far by an online backup."""
+
+    pages_copied: int
+    total_pages: int
 
-        zip_name = f"pocketsage_export_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}.zip"
-        zip_path = (Path.cwd() / zip_name) if not out_dir else out_dir / zip_name
+    @property
+    def fraction(self) -> float:
+        if self.total_pages <= 0:
+            return 1.0
+        return min(1.0, self.pages_copied / self.total_pages)
 
-        with ZipFile(zip_path, "w") as archive:
-            if csv_path.exists():
-                archive.write(csv_path, arcname=csv_path.name)
-            if png_path.exists():
-                archive.write(png_path, arcname=png_path.name)
 
-        if write_to_instance and out_dir is not None:
-            _prune_old_exports(out_dir, keep=retention)
+def _sqlite_module(config: BaseConfig):
+    if not config.USE_SQLCIPHER:
+        return sqlite3
+    import sqlcipher3  # guarded by BaseConfig when encryption is enabled
 
-        return zip_path
+    return sqlcipher3
+
+
+def _connect_for_backup(path: Path, config: BaseConfig):
+    conn = _sqlite_module(config).connect(str(path), timeout=30)
+    if config.USE_SQLCIPHER:
+        key = (config.SQLCIPHER_KEY or "").replace("'", "''")
+        conn.execute(f"PRAGMA key='{key}'")
+    return conn
+
+
+def _quick_check(path: Path, config: BaseConfig) -> None:
+    conn = _connect_for_backup(path, config)
+    try:
+        rows = [row[0] for row in conn.execute("PRAGMA quick_check").fetchall()]
+    finally:
+        conn.close()
+    if rows != ["ok"]:
+        raise ValueError(f"Backup failed integrity check: {'; '.join(map(str, rows[:5]))}")
+
+
+def _backup_step(
+    progress: Callable[[BackupProgress], None] | None,
+    should_cancel: Callable[[], bool] | None,
+) -> Callable[[int, int, int], None]:
+    """``Connection.backup`` progress callback that reports and honours cancellation."""
+
+    def _on_step(_status: int, remaining: int, total: int) -> None:
+        if should_cancel is not None and should_cancel():
+            raise JobCancelled("Backup cancelled")
+        if progress is not None:
+            progress(BackupProgress(pages_copied=total - remaining, total_pages=total))
+
+    return _on_step
+
+
+def _backup_image(
+    config: BaseConfig,
+    *,
+    progress: Callable[[BackupProgress], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> Optional[bytes]:
+    """Online backup into an in-memory database, returned as its file image.
+
+    Returns ``None`` when the copy has to be staged on disk instead: for
+    SQLCipher databases (no backup API) and for databases larger than
+    ``BACKUP_IN_MEMORY_MAX_BYTES``, since the image is held in memory.
+    """
+
+    if config.USE_SQLCIPHER:
+        return None
+    db_path = config.DATA_DIR / config.DB_FILENAME
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found at {db_path}")
+    limit = int(getattr(config, "BACKUP_IN_MEMORY_MAX_BYTES", BACKUP_IN_MEMORY_MAX_BYTES))
+
+    src = _connect_for_backup(db_path, config)
+    try:
+        page_count = src.execute("PRAGMA page_count").fetchone()[0]
+        page_size = src.execute("PRAGMA page_size").fetchone()[0]
+        if page_count * page_size > limit:
+            return None
+        dst = sqlite3.connect(":memory:")
+        try:
+            src.backup(
+                dst,
+                pages=BACKUP_PAGES_PER_STEP,
+                progress=_backup_step(progress, should_cancel),
+                sleep=BACKUP_STEP_SLEEP,
+            )
+            rows = [row[0] for row in dst.execute("PRAGMA quick_check").fetchall()]
+            if rows != ["ok"]:
+                raise ValueError(f"Backup failed integrity check: {'; '.join(map(str, rows[:5]))}")
+            return dst.serialize()
+        finally:
+            dst.close()
+    finally:
+        src.close()
 
 
 def backup_database(
-    output_dir: Path | None = None, config: Optional[BaseConfig] = None
+    output_dir: Path | None = None,
+    config: Optional[BaseConfig] = None,
+    *,
+    progress: Callable[[BackupProgress], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    pages_per_step: int = BACKUP_PAGES_PER_STEP,
+    step_sleep: float = BACKUP_STEP_SLEEP,
 ) -> Path:
-    """Copy the current database file (all users) to a backup location."""
+    """Take an online, consistent copy of the database (all users).
+
+    Uses SQLite's backup API, ``pages_per_step`` pages at a time with a short
+    sleep in between, so other connections can keep writing and memory stays
+    flat regardless of database size; committed WAL content is included.
+    SQLCipher databases are copied with ``sqlcipher_export`` under the same
+    key. The copy is verified with ``PRAGMA quick_check`` before it is moved
+    into place; a failed or cancelled backup leaves no file behind.
+    """
 
     config = config or BaseConfig()
     db_path = config.DATA_DIR / config.DB_FILENAME
@@ -1411,16 +1592,219 @@ def backup_database(
 
     stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
     backup_path = dest_dir / f"pocketsage_backup_{stamp}.db"
-    with db_path.open("rb") as src, backup_path.open("wb") as dst:
-        dst.write(src.read())
+    partial = backup_path.with_name(backup_path.name + ".part")
+    partial.unlink(missing_ok=True)
+
+    _on_step = _backup_step(progress, should_cancel)
+    src = _connect_for_backup(db_path, config)
+    try:
+        if config.USE_SQLCIPHER:
+            # The backup API cannot copy between encrypted databases; export
+            # into an attached database using the same key instead.
+            src.execute(
+                "ATTACH DATABASE ? AS backup KEY ?", (str(partial), config.SQLCIPHER_KEY or "")
+            )
+            src.execute("SELECT sqlcipher_export('backup')")
+            src.execute("DETACH DATABASE backup")
+            _on_step(0, 0, 1)
+        else:
+            dst = sqlite3.connect(str(partial))
+            try:
+                src.backup(dst, pages=max(1, pages_per_step), progress=_on_step, sleep=step_sleep)
+            finally:
+                dst.close()
+        _quick_check(partial, config)
+        partial.replace(backup_path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
     return backup_path
 
 
+def backup_store_for(config: Optional[BaseConfig] = None) -> BackupStore:
+    """The deduplicating snapshot repository under ``DATA_DIR/backups``."""
+
+    config = config or BaseConfig()
+    root = config.DATA_DIR / "backups"
+    _ensure_secure_directory(root)
+    return BackupStore(root, chunk_pages=getattr(config, "BACKUP_CHUNK_PAGES", 64))
+
+
+def snapshot_database(
+    config: Optional[BaseConfig] = None,
+    *,
+    store: Optional[BackupStore] = None,
+    policy: Optional[RetentionPolicy] = None,
+    label: Optional[str] = None,
+    progress: Callable[[BackupProgress], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> SnapshotResult:
+    """Add an online snapshot of the database to the backup repository.
+
+    The backup API copies the database into memory and the chunker reads
+    that image directly, so the snapshot costs one pass over the database.
+    SQLCipher databases and files over ``BACKUP_IN_MEMORY_MAX_BYTES`` are
+    still copied to a staging file with ``backup_database`` and chunked
+    from there. Only the chunks that changed since earlier snapshots are
+    stored; then ``policy`` (the configured daily/weekly/monthly retention
+    by default) is applied and unreferenced chunks are collected.
+    """
+
+    config = config or BaseConfig()
+    store = store or backup_store_for(config)
+    image = _backup_image(config, progress=progress, should_cancel=should_cancel)
+    if image is not None:
+        result = store.add_snapshot_image(image, label=label)
+    else:
+        staging = store.root / "staging"
+        copy = backup_database(staging, config, progress=progress, should_cancel=should_cancel)
+        try:
+            result = store.add_snapshot(copy, label=label)
+        finally:
+            copy.unlink(missing_ok=True)
+    store.apply_retention(policy or RetentionPolicy.from_config(config))
+    store.collect_garbage()
+    return result
+
+
+def restore_snapshot(
+    snapshot_id: str,
+    *,
+    config: Optional[BaseConfig] = None,
+    store: Optional[BackupStore] = None,
+    engine: Optional[Engine] = None,
+) -> Path:
+    """Restore the database from a snapshot in the backup repository."""
+
+    config = config or BaseConfig()
+    store = store or backup_store_for(config)
+    staged = store.restore_to(snapshot_id, store.root / "staging" / f"restore_{snapshot_id}.db")
+    try:
+        return restore_database(staged, config=config, engine=engine)
+    finally:
+        staged.unlink(missing_ok=True)
+
+
+RESTORE_COPY_BUFFER = 1 << 20
+_SIDECAR_SUFFIXES = ("-wal", "-shm", "-journal")
+
+
+def _schema_problems(tables: dict[str, set[str]]) -> list[str]:
+    """Compare a database's tables/columns against the current models.
+
+    Tables the backup lacks are fine (``init_database`` creates them); a known
+    table missing model columns is not, since there are no migrations.
+    """
+
+    if not {"user", "transaction"} <= tables.keys():
+        return ["not a PocketSage database (no user/transaction tables)"]
+    problems = []
+    for table in SQLModel.metadata.sorted_tables:
+        present = tables.get(table.name)
+        if present is None:
+            continue
+        missing = sorted({column.name for column in table.columns} - present)
+        if missing:
+            problems.append(f"{table.name} is missing {', '.join(missing)}")
+    return problems
+
+
+def _validate_restore_candidate(path: Path, config: BaseConfig) -> None:
+    """Integrity-check ``path`` and make sure this app version can use it."""
+
+    driver = _sqlite_module(config)
+    conn = _connect_for_backup(path, config)
+    try:
+        try:
+            rows = [row[0] for row in conn.execute("PRAGMA integrity_check").fetchall()]
+        except driver.DatabaseError as exc:
+            hint = " with the configured SQLCipher key" if config.USE_SQLCIPHER else ""
+            raise ValueError(f"Backup cannot be opened{hint}: {exc}") from exc
+        if rows != ["ok"]:
+            raise ValueError(f"Backup failed integrity check: {'; '.join(map(str, rows[:5]))}")
+        names = [
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        ]
+        tables = {
+            name: {row[1] for row in conn.execute(f'PRAGMA table_info("{name}")')}
+            for name in names
+        }
+    finally:
+        conn.close()
+    problems = _schema_problems(tables)
+    if problems:
+        raise ValueError(f"Backup schema is incompatible: {'; '.join(problems)}")
+
+
+def _stage_backup_copy(source: Path, staged: Path, config: BaseConfig) -> None:
+    """Copy ``source`` next to the target without loading it into memory."""
+
+    if source.with_name(source.name + "-wal").exists():
+        # The backup has committed pages still in its WAL; let SQLite fold
+        # them in rather than copying an incomplete main file.
+        src = _connect_for_backup(source, config)
+        try:
+            if config.USE_SQLCIPHER:
+                src.execute(
+                    "ATTACH DATABASE ? AS staged KEY ?", (str(staged), config.SQLCIPHER_KEY or "")
+                )
+                src.execute("SELECT sqlcipher_export('staged')")
+                src.execute("DETACH DATABASE staged")
+            else:
+                dst = sqlite3.connect(str(staged))
+                try:
+                    src.backup(dst, pages=BACKUP_PAGES_PER_STEP)
+                finally:
+                    dst.close()
+        finally:
+            src.close()
+        return
+    with source.open("rb") as src_fh, staged.open("wb") as dst_fh:
+        shutil.copyfileobj(src_fh, dst_fh, RESTORE_COPY_BUFFER)
+        dst_fh.flush()
+        os.fsync(dst_fh.fileno())
+
+
+def _retire_live_database(target: Path, config: BaseConfig) -> None:
+    """Checkpoint the live database and drop its -wal/-shm/-journal files.
+
+    A stale WAL left beside the swapped-in file would be replayed into it, so
+    it has to go; checkpointing first means the old database is complete on
+    disk should anything fail before the swap.
+    """
+
+    if target.exists() and target.with_name(target.name + "-wal").exists():
+        conn = _connect_for_backup(target, config)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    for suffix in _SIDECAR_SUFFIXES:
+        target.with_name(target.name + suffix).unlink(missing_ok=True)
+
+
 def restore_database(
-    backup_file: Path, *, config: Optional[BaseConfig] = None, overwrite: bool = True
+    backup_file: Path,
+    *,
+    config: Optional[BaseConfig] = None,
+    overwrite: bool = True,
+    engine: Optional[Engine] = None,
 ) -> Path:
-    """Restore the database from a provided backup file."""
+    """Replace the live database with ``backup_file``, atomically.
+
+    The backup is stream-copied into a temporary file beside the target and
+    validated (``PRAGMA integrity_check``, schema compatibility, and the
+    SQLCipher key when encryption is on) before anything live is touched.
+    ``engine`` (and this module's cached engine) is then disposed so no pooled
+    connection points at the old file, the old -wal/-shm files are retired,
+    and the new file is moved into place with ``os.replace``. Callers should
+    rebuild their engine/session factory afterwards (see
+    ``AppContext.reload_database``).
+    """
 
+    global _ENGINE
     config = config or BaseConfig()
     source = backup_file if isinstance(backup_file, Path) else Path(backup_file)
     if not source.exists():
@@ -1430,9 +1814,20 @@ def restore_database(
         raise FileExistsError(f"Target database already exists at {target}")
 
     _ensure_secure_directory(config.DATA_DIR)
-    with source.open("rb") as src, target.open("wb") as dst:
-        dst.write(src.read())
-    # Hint: caller should trigger app restart to reload connections.
+    staged = target.with_name(f"{target.name}.restore-{os.getpid()}")
+    try:
+        _stage_backup_copy(source, staged, config)
+        _validate_restore_candidate(staged, config)
+        if engine is not None:
+            engine.dispose()
+        if _ENGINE is not None:
+            _ENGINE.dispose()
+            _ENGINE = None
+        _retire_live_database(target, config)
+        os.replace(staged, target)
+    except BaseException:
+        staged.unlink(missing_ok=True)
+        raise
     return target
 
 
@@ -1441,6 +1836,11 @@ __all__ = [
     "run_demo_seed",
     "run_export",
     "EXPORT_RETENTION",
+    "EXPORT_COMPRESSLEVEL",
+    "BackupProgress",
     "backup_database",
+    "backup_store_for",
     "restore_database",
+    "restore_snapshot",
+    "snapshot_database",
 ]
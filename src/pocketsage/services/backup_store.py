@@ -0,0 +1,343 @@
+"""Deduplicating backup repository for database snapshots.
+
+A snapshot is stored as a manifest listing the hashes of fixed-size chunks of
+the database file (a whole number of SQLite pages each). Chunks are
+content-addressed, so pages that did not change since an earlier snapshot are
+never written again. Layout under the repository root::
+
+    chunks/ab/<sha256>      zlib-compressed chunk bodies
+    snapshots/<id>.json     one manifest per snapshot
+
+Retention (keep N last/daily/weekly/monthly) only removes manifests;
+``collect_garbage`` then deletes chunks no manifest references.
+
+SQLCipher re-encrypts every page with a fresh IV, so encrypted databases
+still back up correctly but deduplicate poorly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+BACKUP_CHUNK_PAGES = 64
+BACKUP_CHUNK_COMPRESSLEVEL = 1
+DEFAULT_PAGE_SIZE = 4096
+MANIFEST_VERSION = 1
+
+# Snapshots and garbage collection must not interleave, otherwise a chunk
+# written for an in-flight snapshot could be collected before its manifest
+# lands.
+_store_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How many snapshots to keep; ``0`` disables a rule.
+
+    ``last`` keeps the newest N outright; ``daily``/``weekly``/``monthly``
+    keep the newest snapshot in each of the most recent N days, ISO weeks and
+    months. The newest snapshot is always kept.
+    """
+
+    last: int = 0
+    daily: int = 7
+    weekly: int = 4
+    monthly: int = 6
+
+    @classmethod
+    def from_config(cls, config: object) -> "RetentionPolicy":
+        return cls(
+            last=int(getattr(config, "BACKUP_KEEP_LAST", cls.last)),
+            daily=int(getattr(config, "BACKUP_KEEP_DAILY", cls.daily)),
+            weekly=int(getattr(config, "BACKUP_KEEP_WEEKLY", cls.weekly)),
+            monthly=int(getattr(config, "BACKUP_KEEP_MONTHLY", cls.monthly)),
+        )
+
+
+def select_retained(
+    items: Iterable[tuple[str, datetime]], policy: RetentionPolicy
+) -> set[str]:
+    """Return the keys of ``(key, timestamp)`` items that ``policy`` keeps."""
+
+    ordered = sorted(items, key=lambda item: item[1], reverse=True)
+    if not ordered:
+        return set()
+    keep = {ordered[0][0]}
+    keep.update(key for key, _ in ordered[: max(policy.last, 0)])
+    rules = (
+        (policy.daily, lambda when: when.date()),
+        (policy.weekly, lambda when: tuple(when.isocalendar()[:2])),
+        (policy.monthly, lambda when: (when.year, when.month)),
+    )
+    for count, bucket_of in rules:
+        buckets: set[Any] = set()
+        for key, when in ordered:
+            if len(buckets) >= count:
+                break
+            bucket = bucket_of(when)
+            if bucket not in buckets:
+                buckets.add(bucket)
+                keep.add(key)
+    return keep
+
+
+@dataclass(frozen=True)
+class SnapshotManifest:
+    """Metadata and chunk list for one snapshot."""
+
+    id: str
+    created_at: str
+    size: int
+    page_size: int
+    chunk_size: int
+    sha256: str
+    chunks: list[str] = field(default_factory=list)
+    label: Optional[str] = None
+    version: int = MANIFEST_VERSION
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromisoformat(self.created_at)
+
+
+@dataclass(frozen=True)
+class SnapshotResult:
+    """Outcome of adding a snapshot: how much was new versus reused."""
+
+    manifest: SnapshotManifest
+    new_chunks: int
+    reused_chunks: int
+    bytes_written: int
+
+
+@dataclass(frozen=True)
+class GarbageReport:
+    """Chunks removed by ``collect_garbage``."""
+
+    chunks_removed: int
+    bytes_freed: int
+
+
+def _page_size_of(path: Path) -> int:
+    with path.open("rb") as fh:
+        return _page_size_from_header(fh.read(18))
+
+
+def _page_size_from_header(header: bytes) -> int:
+    if len(header) < 18 or not header.startswith(b"SQLite format 3\x00"):
+        # Encrypted or foreign files: chunk on the default page size.
+        return DEFAULT_PAGE_SIZE
+    size = int.from_bytes(header[16:18], "big")
+    return 65536 if size == 1 else size or DEFAULT_PAGE_SIZE
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+class BackupStore:
+    """Content-addressed snapshot repository rooted at ``root``."""
+
+    def __init__(self, root: Path, *, chunk_pages: int = BACKUP_CHUNK_PAGES):
+        self.root = Path(root)
+        self.chunk_pages = chunk_pages
+        self.chunks_dir = self.root / "chunks"
+        self.snapshots_dir = self.root / "snapshots"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.snapshots_dir / f"{snapshot_id}.json"
+
+    def _new_snapshot_id(self, created: datetime) -> str:
+        base = created.strftime("%Y%m%dT%H%M%S%fZ")
+        snapshot_id, suffix = base, 1
+        while self._manifest_path(snapshot_id).exists():
+            suffix += 1
+            snapshot_id = f"{base}-{suffix}"
+        return snapshot_id
+
+    def add_snapshot(self, source: Path, *, label: Optional[str] = None) -> SnapshotResult:
+        """Chunk ``source`` (a consistent database copy) into a new snapshot.
+
+        The file is read one chunk at a time, so memory stays at one chunk
+        regardless of database size; only chunks the store has not seen are
+        written.
+        """
+
+        page_size = _page_size_of(source)
+        chunk_size = page_size * self.chunk_pages
+        with source.open("rb") as fh:
+            return self._add_chunks(
+                iter(lambda: fh.read(chunk_size), b""),
+                page_size=page_size,
+                chunk_size=chunk_size,
+                label=label,
+            )
+
+    def add_snapshot_image(self, image: bytes, *, label: Optional[str] = None) -> SnapshotResult:
+        """Chunk an in-memory database image (e.g. ``Connection.serialize()``)."""
+
+        page_size = _page_size_from_header(image[:18])
+        chunk_size = page_size * self.chunk_pages
+        view = memoryview(image)
+        return self._add_chunks(
+            (view[offset : offset + chunk_size] for offset in range(0, len(view), chunk_size)),
+            page_size=page_size,
+            chunk_size=chunk_size,
+            label=label,
+        )
+
+    def _add_chunks(
+        self,
+        chunks: Iterable[bytes | memoryview],
+        *,
+        page_size: int,
+        chunk_size: int,
+        label: Optional[str],
+    ) -> SnapshotResult:
+        created = datetime.now(timezone.utc)
+        digests: list[str] = []
+        whole = hashlib.sha256()
+        new_chunks = reused = written = size = 0
+        with _store_lock:
+            for chunk in chunks:
+                size += len(chunk)
+                whole.update(chunk)
+                digest = hashlib.sha256(chunk).hexdigest()
+                digests.append(digest)
+                target = self._chunk_path(digest)
+                if target.exists():
+                    reused += 1
+                    continue
+                body = zlib.compress(chunk, BACKUP_CHUNK_COMPRESSLEVEL)
+                _write_atomic(target, body)
+                new_chunks += 1
+                written += len(body)
+            manifest = SnapshotManifest(
+                id=self._new_snapshot_id(created),
+                created_at=created.isoformat(),
+                size=size,
+                page_size=page_size,
+                chunk_size=chunk_size,
+                sha256=whole.hexdigest(),
+                chunks=digests,
+                label=label,
+            )
+            _write_atomic(
+                self._manifest_path(manifest.id), json.dumps(asdict(manifest)).encode("utf-8")
+            )
+        return SnapshotResult(
+            manifest=manifest, new_chunks=new_chunks, reused_chunks=reused, bytes_written=written
+        )
+
+    def list_snapshots(self) -> list[SnapshotManifest]:
+        """All snapshots, oldest first."""
+
+        manifests = [self.get_snapshot(path.stem) for path in self.snapshots_dir.glob("*.json")]
+        return sorted(manifests, key=lambda manifest: (manifest.created, manifest.id))
+
+    def get_snapshot(self, snapshot_id: str) -> SnapshotManifest:
+        path = self._manifest_path(snapshot_id)
+        if not path.exists():
+            raise FileNotFoundError(f"Backup snapshot not found: {snapshot_id}")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return SnapshotManifest(**data)
+
+    def iter_snapshot_bytes(self, snapshot_id: str) -> Iterator[bytes]:
+        """Yield the snapshot's chunks in order, verifying each hash."""
+
+        for digest in self.get_snapshot(snapshot_id).chunks:
+            path = self._chunk_path(digest)
+            if not path.exists():
+                raise ValueError(f"Backup snapshot {snapshot_id} is missing chunk {digest}")
+            try:
+                chunk = zlib.decompress(path.read_bytes())
+            except zlib.error as exc:
+                raise ValueError(f"Backup chunk {digest} is corrupt") from exc
+            if hashlib.sha256(chunk).hexdigest() != digest:
+                raise ValueError(f"Backup chunk {digest} is corrupt")
+            yield chunk
+
+    def restore_to(self, snapshot_id: str, target: Path) -> Path:
+        """Reassemble ``snapshot_id`` into ``target`` (written atomically)."""
+
+        manifest = self.get_snapshot(snapshot_id)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.name + ".part")
+        whole = hashlib.sha256()
+        try:
+            with partial.open("wb") as fh:
+                for chunk in self.iter_snapshot_bytes(snapshot_id):
+                    whole.update(chunk)
+                    fh.write(chunk)
+            if whole.hexdigest() != manifest.sha256:
+                raise ValueError(f"Backup snapshot {snapshot_id} failed its checksum")
+            partial.replace(target)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        return target
+
+    def apply_retention(self, policy: RetentionPolicy) -> list[str]:
+        """Delete manifests ``policy`` does not keep; returns the removed ids."""
+
+        with _store_lock:
+            snapshots = self.list_snapshots()
+            keep = select_retained(((s.id, s.created) for s in snapshots), policy)
+            removed = [s.id for s in snapshots if s.id not in keep]
+            for snapshot_id in removed:
+                self._manifest_path(snapshot_id).unlink(missing_ok=True)
+        return removed
+
+    def collect_garbage(self) -> GarbageReport:
+        """Remove chunks that no remaining snapshot references."""
+
+        with _store_lock:
+            referenced: set[str] = set()
+            for manifest in self.list_snapshots():
+                referenced.update(manifest.chunks)
+            removed = freed = 0
+            for path in self.chunks_dir.glob("*/*"):
+                if path.name in referenced or path.name.endswith(".tmp"):
+                    continue
+                freed += path.stat().st_size
+                path.unlink(missing_ok=True)
+                removed += 1
+        return GarbageReport(chunks_removed=removed, bytes_freed=freed)
+
+    def stored_bytes(self) -> int:
+        """Bytes currently used by chunk bodies."""
+
+        return sum(path.stat().st_size for path in self.chunks_dir.glob("*/*"))
+
+
+def prune_snapshots(store: BackupStore, policy: RetentionPolicy) -> tuple[list[str], GarbageReport]:
+    """Apply ``policy`` then garbage-collect unreferenced chunks."""
+
+    removed = store.apply_retention(policy)
+    return removed, store.collect_garbage()
+
+
+__all__ = [
+    "BACKUP_CHUNK_PAGES",
+    "BackupStore",
+    "GarbageReport",
+    "RetentionPolicy",
+    "SnapshotManifest",
+    "SnapshotResult",
+    "prune_snapshots",
+    "select_retained",
+]
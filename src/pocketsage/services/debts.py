@@ -11,10 +11,18 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from datetime import date
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Iterable, Protocol
+from typing import Callable, Iterable, Iterator, NamedTuple, Protocol, Sequence, overload
+
+import numpy as np
+
+# APRs are held as integer ten-thousandths of a percent (18.99% -> 189_900),
+# so a month's interest in cents is balance_cents * apr / INTEREST_DIVISOR.
+APR_SCALE = 10_000
+INTEREST_DIVISOR = 1200 * APR_SCALE
+# Every payment retires at least this much principal (cents).
+MINIMUM_PROGRESS_CENTS = 100
 
 
 @dataclass(slots=True)
@@ -38,84 +46,351 @@ class AmortizationWriter(Protocol):
         ...
 
 
-def _calculate_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> list[dict]:
-    """Helper function to perform the amortization math."""
-    debt_dicts: list[dict[str, Any]] = [asdict(d) for d in debts]  # Convert to mutable dicts
-    payoff_schedule: list[dict] = []
-    current_date = date.today().replace(day=1)
-    rolled_minimums = 0.0  # freed minimum payments from debts already cleared
-    total_interest = 0.0
-
-    def _next_month(value: date) -> date:
-        month = value.month + 1
-        year = value.year + (month - 1) // 12
-        month = ((month - 1) % 12) + 1
-        return value.replace(year=year, month=month, day=1)
-
-    previous_total_balance = sum(d["balance"] for d in debt_dicts)
-    stagnant_periods = 0  # used to detect non-decreasing balances
-
-    while any(d["balance"] > 0 for d in debt_dicts):
-        extra_pool = surplus + rolled_minimums
-        row = {"date": current_date.isoformat(), "payments": {}}
-
-        for debt in debt_dicts:
-            if debt["balance"] <= 0:
-                continue
-
-            monthly_interest = Decimal(debt["balance"]) * Decimal(debt["apr"]) / Decimal(1200)
-            monthly_interest_float = float(
-                monthly_interest.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+class PayoffMonth(NamedTuple):
+    """Totals across all debts for one month of a payoff schedule."""
+
+    date: str
+    payment: float
+    interest: float
+    remaining: float
+
+
+class PayoffDebt(NamedTuple):
+    """Totals for one debt over a whole payoff schedule."""
+
+    payment: float
+    interest: float
+    months: int
+
+
+class PayoffSchedule(Sequence[dict]):
+    """A payoff projection as (months x debts) arrays of integer cents.
+
+    Row ``m`` is the month starting ``start`` plus ``m`` months; column ``j``
+    is ``ids[j]`` in payment-priority order. ``active`` marks debts that
+    still had a balance at the start of the month (the others are zero in
+    ``payments`` and ``interest``); ``balances`` is what remains after the
+    month's payment.
+
+    Totals per month, per debt and overall are summed once on construction,
+    so :meth:`month`, :meth:`debt` and the ``total_*`` properties are O(1).
+    For existing callers the schedule is also a sequence of the legacy
+    ``{"date", "payments": {"debt_<id>": {...}}}`` rows, built only when
+    indexed or iterated.
+    """
+
+    __slots__ = (
+        "ids",
+        "start",
+        "payments",
+        "interest",
+        "balances",
+        "active",
+        "payment_totals",
+        "interest_totals",
+        "remaining_totals",
+        "_columns",
+        "_debt_payment",
+        "_debt_interest",
+        "_debt_months",
+        "_dates",
+    )
+
+    def __init__(
+        self,
+        ids: tuple[int, ...],
+        start: date,
+        payments: np.ndarray,
+        interest: np.ndarray,
+        balances: np.ndarray,
+        active: np.ndarray,
+    ):
+        self.ids = ids
+        self.start = start
+        self.payments = payments
+        self.interest = interest
+        self.balances = balances
+        self.active = active
+        self.payment_totals = payments.sum(axis=1)
+        self.interest_totals = interest.sum(axis=1)
+        self.remaining_totals = balances.sum(axis=1)
+        self._columns = {debt_id: j for j, debt_id in enumerate(ids)}
+        self._debt_payment = payments.sum(axis=0)
+        self._debt_interest = interest.sum(axis=0)
+        self._debt_months = active.sum(axis=0)
+        self._dates: tuple[str, ...] | None = None
+
+    @classmethod
+    def empty(cls, start: date | None = None) -> PayoffSchedule:
+        none = np.zeros((0, 0), dtype=np.int64)
+        return cls((), start or date.today().replace(day=1), none, none, none, none.astype(bool))
+
+    @property
+    def months(self) -> int:
+        return len(self.payments)
+
+    @property
+    def payoff_date(self) -> str | None:
+        """ISO date of the last month with a payment."""
+
+        return self._date(self.months - 1) if self.months else None
+
+    @property
+    def total_payment(self) -> float:
+        return int(self.payment_totals.sum()) / 100
+
+    @property
+    def total_interest(self) -> float:
+        return int(self.interest_totals.sum()) / 100
+
+    def summary(self) -> tuple[str | None, float, int]:
+        """Return (payoff_date_iso, total_interest, months)."""
+
+        return self.payoff_date, self.total_interest, self.months
+
+    def _iso_dates(self) -> tuple[str, ...]:
+        if self._dates is None:
+            first = self.start.year * 12 + self.start.month - 1
+            self._dates = tuple(
+                f"{month // 12:04d}-{month % 12 + 1:02d}-01"
+                for month in range(first, first + self.months)
             )
-            total_interest += monthly_interest_float
-
-            # Apply surplus to the first active debt each period
-            payment = debt["minimum_payment"]
-            if extra_pool > 0:
-                payment += extra_pool
-                extra_pool = 0.0
-
-            # Ensure payment always reduces principal
-            minimum_progress = monthly_interest_float + 1.0
-            if payment < minimum_progress:
-                payment = minimum_progress
-
-            new_balance = debt["balance"] + monthly_interest_float - payment
-
-            if new_balance <= 0:
-                payment_to_apply = debt["balance"] + monthly_interest_float
-                leftover = payment - payment_to_apply
-                debt["balance"] = 0.0
-                extra_pool += max(leftover, 0.0)
-                rolled_minimums += debt["minimum_payment"]
-            else:
-                debt["balance"] = new_balance
-
-            row["payments"][f"debt_{debt['id']}"] = {
-                "payment_amount": payment,
-                "interest_paid": monthly_interest_float,
-                "remaining_balance": debt["balance"],
-            }
-
-        payoff_schedule.append(row)
+        return self._dates
+
+    def _date(self, index: int) -> str:
+        return self._iso_dates()[index]
+
+    def dates(self) -> list[str]:
+        """ISO date of the first day of each simulated month."""
+
+        return list(self._iso_dates())
+
+    def month(self, index: int) -> PayoffMonth:
+        """Totals across all debts for month ``index`` (negative counts from the end)."""
+
+        index = range(self.months)[index]
+        return PayoffMonth(
+            self._date(index),
+            int(self.payment_totals[index]) / 100,
+            int(self.interest_totals[index]) / 100,
+            int(self.remaining_totals[index]) / 100,
+        )
+
+    def monthly(self) -> Iterator[PayoffMonth]:
+        """:meth:`month` for every month, in order."""
+
+        for fields in zip(
+            self._iso_dates(),
+            (self.payment_totals / 100).tolist(),
+            (self.interest_totals / 100).tolist(),
+            (self.remaining_totals / 100).tolist(),
+        ):
+            yield PayoffMonth(*fields)
+
+    def debt(self, debt_id: int) -> PayoffDebt:
+        """Totals for ``debt_id`` over the whole schedule."""
+
+        j = self._columns[debt_id]
+        return PayoffDebt(
+            int(self._debt_payment[j]) / 100,
+            int(self._debt_interest[j]) / 100,
+            int(self._debt_months[j]),
+        )
+
+    def _row(
+        self, index: int, active: list, payments: list, interest: list, balances: list
+    ) -> dict:
+        return {
+            "date": self._date(index),
+            "payments": {
+                f"debt_{debt_id}": {
+                    "payment_amount": payments[j] / 100,
+                    "interest_paid": interest[j] / 100,
+                    "remaining_balance": balances[j] / 100,
+                }
+                for j, debt_id in enumerate(self.ids)
+                if active[j]
+            },
+        }
+
+    def __len__(self) -> int:
+        return self.months
+
+    @overload
+    def __getitem__(self, index: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict]: ...
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(self.months)[index]]
+        index = range(self.months)[index]
+        return self._row(
+            index,
+            self.active[index].tolist(),
+            self.payments[index].tolist(),
+            self.interest[index].tolist(),
+            self.balances[index].tolist(),
+        )
+
+    def __iter__(self) -> Iterator[dict]:
+        arrays = (self.active, self.payments, self.interest, self.balances)
+        for index, values in enumerate(zip(*(array.tolist() for array in arrays))):
+            yield self._row(index, *values)
+
+    def rows(self) -> list[dict]:
+        """All legacy dict rows at once."""
+
+        return list(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PayoffSchedule):
+            return (
+                self.ids == other.ids
+                and self.start == other.start
+                and all(
+                    np.array_equal(mine, theirs)
+                    for mine, theirs in zip(
+                        (self.payments, self.interest, self.balances, self.active),
+                        (other.payments, other.interest, other.balances, other.active),
+                    )
+                )
+            )
+        if isinstance(other, list):
+            return self.rows() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"PayoffSchedule({self.months} months, {len(self.ids)} debts, "
+            f"payoff {self.payoff_date})"
+        )
+
+
+def _cents(values: Iterable[float]) -> np.ndarray:
+    return np.array([round(value * 100) for value in values], dtype=np.int64)
+
+
+def simulate_payoff(
+    debts: Sequence[DebtAccount], *, surplus: float, start: date | None = None
+) -> PayoffSchedule:
+    """Pay ``debts`` down month by month, in the given priority order.
+
+    Each month every active debt accrues interest (rounded half up to the
+    cent) and gets its minimum payment, raised where needed so at least $1
+    of principal is retired. The extra pool (``surplus`` plus the minimums
+    of debts already paid off) goes to the first active debt, and whatever
+    overpays a debt that is cleared that month flows on to the next one.
+
+    The active debts are stepped together with array operations on integer
+    cents. Only months in which a debt is cleared walk the overpayment from
+    debt to debt, and then only across the cleared ones.
+    """
+
+    debts = list(debts)
+    count = len(debts)
+    # Compact arrays over the debts still owed, in priority order.
+    balance = _cents(debt.balance for debt in debts)
+    columns = np.flatnonzero(balance > 0)
+    balance = balance[columns]
+    apr2 = 2 * np.array([round(debt.apr * APR_SCALE) for debt in debts], dtype=np.int64)[columns]
+    minimum = _cents(debt.minimum_payment for debt in debts)[columns]
+    surplus_cents = round(surplus * 100)
+    rolled = 0  # minimums freed by debts already cleared
+
+    # Compact per-month rows, scattered into (months, debts) arrays at the end.
+    history: tuple[list[np.ndarray], ...] = ([], [], [], [])
+    previous_total = round(sum(debt.balance for debt in debts) * 100)
+    stagnant_periods = 0
+
+    while len(columns):
+        # Half up: floor((2 * balance * apr + divisor) / (2 * divisor)).
+        interest = (balance * apr2 + INTEREST_DIVISOR) // (2 * INTEREST_DIVISOR)
+        due = balance + interest
+        floor = interest + MINIMUM_PROGRESS_CENTS
+        payment = np.maximum(minimum, floor)
+        pool = surplus_cents + rolled
+        if pool > 0:
+            payment[0] = max(int(minimum[0]) + pool, int(floor[0]))
+            pool = 0
+        remaining = due - payment
+
+        cleared_at = np.flatnonzero(remaining <= 0)
+        if len(cleared_at):
+            # Hand each cleared debt's overpayment on to the next active one.
+            active_count = len(columns)
+            pos = int(cleared_at[0])
+            while pos < active_count:
+                if remaining[pos] <= 0:
+                    pool -= int(remaining[pos])
+                    pos += 1
+                    if pool > 0 and pos < active_count:
+                        payment[pos] = max(int(minimum[pos]) + pool, int(floor[pos]))
+                        remaining[pos] = due[pos] - payment[pos]
+                        pool = 0
+                    continue
+                later = np.flatnonzero(remaining[pos + 1 :] <= 0)
+                if not len(later):
+                    break
+                pos += 1 + int(later[0])
+            cleared = remaining <= 0
+            rolled += int(minimum[cleared].sum())
+            remaining[cleared] = 0
+
+        for rows, values in zip(history, (columns, payment, interest, remaining)):
+            rows.append(values)
+
+        if len(cleared_at):
+            kept = remaining > 0
+            columns, balance = columns[kept], remaining[kept]
+            apr2, minimum = apr2[kept], minimum[kept]
+        else:
+            balance = remaining
 
         # Progress guard: ensure balances continue to decrease to avoid infinite loops
-        total_balance = sum(d["balance"] for d in debt_dicts if d["balance"] > 0)
-        if total_balance >= previous_total_balance - 0.01:
-            stagnant_periods += 1
-        else:
-            stagnant_periods = 0
+        total = int(balance.sum())
+        stagnant_periods = stagnant_periods + 1 if total >= previous_total - 1 else 0
         if stagnant_periods >= 3:
             raise ValueError("Payoff schedule did not converge; payments too low")
-        previous_total_balance = total_balance
-        current_date = _next_month(current_date)
-
-    return payoff_schedule
-
-
-def schedule_summary(schedule: list[dict]) -> tuple[str | None, float, int]:
+        previous_total = total
+
+    months = len(history[0])
+    where = (
+        np.repeat(np.arange(months), [len(row) for row in history[0]]),
+        np.concatenate(history[0]) if months else np.zeros(0, dtype=np.int64),
+    )
+    arrays = []
+    for rows in history[1:]:
+        array = np.zeros((months, count), dtype=np.int64)
+        if months:
+            array[where] = np.concatenate(rows)
+        arrays.append(array)
+    active = np.zeros((months, count), dtype=np.bool_)
+    active[where] = True
+    return PayoffSchedule(
+        ids=tuple(debt.id for debt in debts),
+        start=start or date.today().replace(day=1),
+        payments=arrays[0],
+        interest=arrays[1],
+        balances=arrays[2],
+        active=active,
+    )
+
+
+def _calculate_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> PayoffSchedule:
+    """Simulate ``debts`` in the given order."""
+
+    return simulate_payoff(list(debts), surplus=surplus)
+
+
+def schedule_summary(schedule: Sequence[dict]) -> tuple[str | None, float, int]:
     """Return (payoff_date_iso, total_interest, months)."""
 
+    if isinstance(schedule, PayoffSchedule):
+        return schedule.summary()
     if not schedule:
         return None, 0.0, 0
     payoff_date = schedule[-1].get("date")
@@ -130,18 +405,187 @@ def schedule_summary(schedule: list[dict]) -> tuple[str | None, float, int]:
     return str(payoff_date) if payoff_date else None, total_interest, len(schedule)
 
 
-def snowball_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> list[dict]:
+def _priority_order(debts: Iterable[DebtAccount], strategy: str) -> list[DebtAccount]:
+    """``debts`` in the order ``strategy`` pays them off."""
+
+    if strategy == "snowball":
+        # Sort debts by balance, ascending.
+        return sorted(debts, key=lambda d: d.balance)
+    if strategy == "avalanche":
+        # Sort debts by APR, descending.
+        return sorted(debts, key=lambda d: d.apr, reverse=True)
+    raise ValueError("Invalid debt payoff strategy.")
+
+
+def snowball_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> PayoffSchedule:
     """Return payoff schedule prioritizing smallest balances first."""
-    # Sort debts by balance, ascending.
-    sorted_debts = sorted(debts, key=lambda d: d.balance)
-    return _calculate_schedule(debts=sorted_debts, surplus=surplus)
+    return _calculate_schedule(debts=_priority_order(debts, "snowball"), surplus=surplus)
 
 
-def avalanche_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> list[dict]:
+def avalanche_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> PayoffSchedule:
     """Return payoff schedule prioritizing highest APR first."""
-    # Sort debts by APR, descending.
-    sorted_debts = sorted(debts, key=lambda d: d.apr, reverse=True)
-    return _calculate_schedule(debts=sorted_debts, surplus=surplus)
+    return _calculate_schedule(debts=_priority_order(debts, "avalanche"), surplus=surplus)
+
+
+class SweepCurve(NamedTuple):
+    """One strategy's outcome at each surplus of a sweep, ready to plot."""
+
+    surplus: list[float]
+    months: list[int]
+    interest: list[float]
+
+
+@dataclass(frozen=True, slots=True)
+class PayoffSweep:
+    """Months to payoff and total interest over a grid of monthly surpluses.
+
+    ``months`` and ``interest_cents`` are (strategies x surpluses) arrays;
+    row ``i`` is ``strategies[i]`` and column ``k`` is ``surplus[k]``. Each
+    cell equals the summary of the matching single schedule.
+    """
+
+    surplus: np.ndarray
+    strategies: tuple[str, ...]
+    months: np.ndarray
+    interest_cents: np.ndarray
+    start: date
+
+    def _row(self, strategy: str) -> int:
+        try:
+            return self.strategies.index(strategy)
+        except ValueError:
+            raise ValueError("Invalid debt payoff strategy.") from None
+
+    def interest(self, strategy: str) -> np.ndarray:
+        """Total interest in dollars at each surplus."""
+
+        return self.interest_cents[self._row(strategy)] / 100
+
+    def payoff_date(self, strategy: str, index: int) -> str | None:
+        """ISO date of the final payment at ``surplus[index]``."""
+
+        months = int(self.months[self._row(strategy), index])
+        if not months:
+            return None
+        month = self.start.month - 1 + months - 1
+        return self.start.replace(
+            year=self.start.year + month // 12, month=month % 12 + 1
+        ).isoformat()
+
+    def curve(self, strategy: str) -> SweepCurve:
+        row = self._row(strategy)
+        return SweepCurve(
+            surplus=self.surplus.tolist(),
+            months=self.months[row].tolist(),
+            interest=(self.interest_cents[row] / 100).tolist(),
+        )
+
+
+SWEEP_SURPLUS_MAX = 2_000.0
+SWEEP_SURPLUS_STEP = 25.0
+
+
+def sweep_payoff(
+    debts: Iterable[DebtAccount],
+    *,
+    surpluses: Iterable[float] | None = None,
+    strategies: Sequence[str] = ("snowball", "avalanche"),
+    start: date | None = None,
+) -> PayoffSweep:
+    """Project ``debts`` under every strategy and surplus in one batched run.
+
+    ``surpluses`` defaults to $0 to $2,000 in $25 steps. Every (strategy,
+    surplus) pair is a row of one (scenarios x debts) matrix of integer
+    cents, with each row's columns in its strategy's priority order, and all
+    rows are stepped a month at a time together under the same rules as
+    :func:`simulate_payoff`. Only the totals are kept, not the schedules.
+    """
+
+    debts = list(debts)
+    if surpluses is None:
+        grid = np.arange(0.0, SWEEP_SURPLUS_MAX + SWEEP_SURPLUS_STEP / 2, SWEEP_SURPLUS_STEP)
+    else:
+        grid = np.asarray(list(surpluses), dtype=np.float64)
+    strategies = tuple(strategies)
+    orders = [_priority_order(debts, strategy) for strategy in strategies]
+    width = len(grid)
+
+    # One row per (strategy, surplus); columns in that strategy's priority order.
+    def _matrix(values: Callable[[list[DebtAccount]], np.ndarray]) -> np.ndarray:
+        return np.repeat(np.vstack([values(order) for order in orders]), width, axis=0)
+
+    balance = _matrix(lambda order: _cents(d.balance for d in order))
+    apr2 = _matrix(
+        lambda order: 2 * np.array([round(d.apr * APR_SCALE) for d in order], dtype=np.int64)
+    )
+    minimum = _matrix(lambda order: _cents(d.minimum_payment for d in order))
+    surplus_cents = np.tile(
+        np.array([round(value * 100) for value in grid], dtype=np.int64), len(orders)
+    )
+
+    scenarios = balance.shape[0]
+    rows = np.arange(scenarios)
+    months = np.zeros(scenarios, dtype=np.int64)
+    interest_total = np.zeros(scenarios, dtype=np.int64)
+    rolled = np.zeros(scenarios, dtype=np.int64)
+    previous_total = np.full(scenarios, round(sum(debt.balance for debt in debts) * 100))
+    stagnant_periods = np.zeros(scenarios, dtype=np.int64)
+    active = balance > 0
+
+    while active.any():
+        live = active.any(axis=1)
+        interest = np.where(
+            active, (balance * apr2 + INTEREST_DIVISOR) // (2 * INTEREST_DIVISOR), 0
+        )
+        due = balance + interest
+        floor = interest + MINIMUM_PROGRESS_CENTS
+        payment = np.where(active, np.maximum(minimum, floor), 0)
+        # The extra pool goes to each scenario's first active debt.
+        pool = surplus_cents + rolled
+        boost = live & (pool > 0)
+        at, first = rows[boost], active.argmax(axis=1)[boost]
+        payment[at, first] = np.maximum(minimum[at, first] + pool[boost], floor[at, first])
+        remaining = due - payment
+
+        cleared = active & (remaining <= 0)
+        if cleared.any():
+            # Walk the debts in priority order, handing each cleared debt's
+            # overpayment to the next active one, all scenarios at once.
+            carry = np.where(boost, 0, pool)
+            for column in range(balance.shape[1]):
+                owed = active[:, column]
+                give = owed & (carry > 0)
+                if give.any():
+                    payment[give, column] = np.maximum(
+                        minimum[give, column] + carry[give], floor[give, column]
+                    )
+                    remaining[give, column] = due[give, column] - payment[give, column]
+                    carry[give] = 0
+                done = owed & (remaining[:, column] <= 0)
+                carry[done] -= remaining[done, column]
+            cleared = active & (remaining <= 0)
+            rolled += (minimum * cleared).sum(axis=1)
+            remaining[cleared] = 0
+
+        interest_total += interest.sum(axis=1)
+        months += live
+        balance = remaining
+        active = balance > 0
+
+        # Progress guard, per scenario, as in simulate_payoff.
+        total = balance.sum(axis=1)
+        stagnant_periods = np.where(live & (total >= previous_total - 1), stagnant_periods + 1, 0)
+        if (stagnant_periods >= 3).any():
+            raise ValueError("Payoff schedule did not converge; payments too low")
+        previous_total = total
+
+    return PayoffSweep(
+        surplus=grid,
+        strategies=strategies,
+        months=months.reshape(len(orders), width),
+        interest_cents=interest_total.reshape(len(orders), width),
+        start=start or date.today().replace(day=1),
+    )
 
 
 def persist_projection(
@@ -155,5 +599,6 @@ def persist_projection(
     else:
         raise ValueError("Invalid debt payoff strategy.")
 
+    rows = schedule.rows()
     for debt in debts:
-        writer.write_schedule(debt_id=debt.id, rows=schedule)
+        writer.write_schedule(debt_id=debt.id, rows=rows)
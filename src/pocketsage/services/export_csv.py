@@ -3,11 +3,37 @@
 from __future__ import annotations
 
 import csv
+import time
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
 
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from ..models.account import Account
+from ..models.category import Category
 from ..models.transaction import Transaction
+from .jobs import JobCancelled
+from .ledger_service import LedgerFilters, ledger_filter_clauses
+
+LEDGER_EXPORT_HEADERS = [
+    "id",
+    "occurred_at",
+    "amount",
+    "memo",
+    "external_id",
+    "category_id",
+    "category",
+    "account_id",
+    "account",
+    "currency",
+]
+LEDGER_EXPORT_BATCH_SIZE = 5000
+LEDGER_EXPORT_BUFFER_BYTES = 1 << 20
 
 
 def _serialize_value(value):
@@ -18,6 +44,25 @@ def _serialize_value(value):
     return str(value)
 
 
+EXPORT_HEADERS = ["id", "occurred_at", "amount", "memo", "external_id", "category_id"]
+
+
+def write_transactions_csv(*, transactions: Iterable[object], stream: TextIO) -> int:
+    """Write transaction rows to an already-open text stream and return the row count.
+
+    ``transactions`` may be ORM objects or result rows exposing the
+    ``EXPORT_HEADERS`` attributes, so callers can stream straight from a cursor.
+    """
+
+    writer = csv.writer(stream, quoting=csv.QUOTE_MINIMAL)
+    writer.writerow(EXPORT_HEADERS)
+    written = 0
+    for tx in transactions:
+        writer.writerow([_serialize_value(getattr(tx, name, None)) for name in EXPORT_HEADERS])
+        written += 1
+    return written
+
+
 def export_transactions_csv(*, transactions: Iterable[Transaction], output_path: Path) -> Path:
     """Write transactions to CSV at `output_path`.
 
@@ -25,24 +70,161 @@ def export_transactions_csv(*, transactions: Iterable[Transaction], output_path:
     Returns the path written.
     """
 
-    headers = ["id", "occurred_at", "amount", "memo", "external_id", "category_id"]
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Use newline='' for csv on Windows
     with output_path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(
-            fh, fieldnames=headers, extrasaction="ignore", quoting=csv.QUOTE_MINIMAL
-        )
-        writer.writeheader()
-        for tx in transactions:
-            row = {
-                "id": _serialize_value(getattr(tx, "id", None)),
-                "occurred_at": _serialize_value(getattr(tx, "occurred_at", None)),
-                "amount": _serialize_value(getattr(tx, "amount", None)),
-                "memo": _serialize_value(getattr(tx, "memo", None)),
-                "external_id": _serialize_value(getattr(tx, "external_id", None)),
-                "category_id": _serialize_value(getattr(tx, "category_id", None)),
-            }
-            writer.writerow(row)
+        write_transactions_csv(transactions=transactions, stream=fh)
 
     return output_path
+
+
+@dataclass
+class ExportProgress:
+    """Snapshot of a running ledger export, handed to progress callbacks."""
+
+    rows_written: int
+    total_rows: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        if self.total_rows <= 0:
+            return 1.0
+        return min(self.rows_written / self.total_rows, 1.0)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rows_per_second
+        if rate <= 0:
+            return None
+        return max(self.total_rows - self.rows_written, 0) / rate
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows_written": self.rows_written,
+            "total_rows": self.total_rows,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "eta_seconds": None if self.eta_seconds is None else round(self.eta_seconds, 1),
+        }
+
+
+class ExportCancelled(JobCancelled):
+    """Raised when a ledger export stops early; the partial file is removed."""
+
+    def __init__(self, rows_written: int) -> None:
+        super().__init__(f"Export cancelled after {rows_written} rows")
+        self.rows_written = rows_written
+
+
+def ledger_export_statement(filters: LedgerFilters):
+    """Select the ledger export columns (with category/account names) for ``filters``.
+
+    Result rows expose ``LEDGER_EXPORT_HEADERS`` as attributes, in order.
+    """
+
+    return (
+        select(
+            Transaction.id,
+            Transaction.occurred_at,
+            Transaction.amount,
+            Transaction.memo,
+            Transaction.external_id,
+            Transaction.category_id,
+            Category.name.label("category"),  # type: ignore[attr-defined]
+            Transaction.account_id,
+            Account.name.label("account"),  # type: ignore[attr-defined]
+            Transaction.currency,
+        )
+        .outerjoin(Category, Category.id == Transaction.category_id)  # type: ignore[arg-type]
+        .outerjoin(Account, Account.id == Transaction.account_id)  # type: ignore[arg-type]
+        .where(*ledger_filter_clauses(filters))
+        .order_by(Transaction.occurred_at.desc(), Transaction.id.desc())  # type: ignore[attr-defined]
+    )
+
+
+def iter_ledger_rows(
+    *,
+    session_factory: Callable[[], AbstractContextManager[Session]],
+    filters: LedgerFilters,
+    batch_size: int = LEDGER_EXPORT_BATCH_SIZE,
+) -> Iterator[Any]:
+    """Yield matching ledger rows from a cursor, ``batch_size`` rows in memory at a time."""
+
+    stmt = ledger_export_statement(filters).execution_options(yield_per=batch_size)
+    with session_factory() as session:
+        yield from session.exec(stmt)
+
+
+def write_ledger_csv(
+    *,
+    rows: Iterable[Any],
+    stream: TextIO,
+    total_rows: int = 0,
+    progress: Callable[[ExportProgress], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    batch_size: int = LEDGER_EXPORT_BATCH_SIZE,
+) -> int:
+    """Write ledger rows (``LEDGER_EXPORT_HEADERS`` order) to ``stream`` in batches."""
+
+    started = time.perf_counter()
+    writer = csv.writer(stream, quoting=csv.QUOTE_MINIMAL)
+    writer.writerow(LEDGER_EXPORT_HEADERS)
+    written = 0
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        if should_cancel is not None and should_cancel():
+            raise ExportCancelled(written)
+        writer.writerows([_serialize_value(value) for value in row] for row in batch)
+        written += len(batch)
+        if progress is not None:
+            progress(ExportProgress(written, total_rows, time.perf_counter() - started))
+    return written
+
+
+def export_filtered_ledger(
+    *,
+    session_factory: Callable[[], AbstractContextManager[Session]],
+    filters: LedgerFilters,
+    output_path: Path,
+    progress: Callable[[ExportProgress], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    batch_size: int = LEDGER_EXPORT_BATCH_SIZE,
+) -> int:
+    """Stream every transaction matching ``filters`` to CSV and return the row count.
+
+    Rows come straight from a cursor (``yield_per``) joined with category and
+    account names, so memory stays flat however large the ledger is. The file
+    is written under a ``.part`` name through a large buffer and only moved
+    into place once complete; a cancelled export leaves nothing behind.
+    """
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = output_path.with_name(output_path.name + ".part")
+    try:
+        with session_factory() as session, partial.open(
+            "w", newline="", encoding="utf-8", buffering=LEDGER_EXPORT_BUFFER_BYTES
+        ) as fh:
+            total = session.exec(
+                select(func.count(Transaction.id)).where(*ledger_filter_clauses(filters))
+            ).one()
+            if progress is not None:
+                progress(ExportProgress(0, total, 0.0))
+            stmt = ledger_export_statement(filters).execution_options(yield_per=batch_size)
+            written = write_ledger_csv(
+                rows=session.exec(stmt),
+                stream=fh,
+                total_rows=total,
+                progress=progress,
+                should_cancel=should_cancel,
+                batch_size=batch_size,
+            )
+        partial.replace(output_path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return written
@@ -5,9 +5,10 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Mapping, Optional
+from typing import TYPE_CHECKING, Iterable, Mapping, Optional
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass(slots=True)
@@ -26,11 +27,10 @@ class ColumnMapping:
     transaction_type: str | None = None
 
 
-def normalize_frame(*, file_path: Path, encoding: str = "utf-8") -> pd.DataFrame:
-    """Load a CSV file into a DataFrame with consistent column casing."""
+def normalize_headers(headers: Iterable[str]) -> list[str]:
+    """Return CSV headers lowercased with common aliases mapped to canonical names."""
 
-    frame = pd.read_csv(file_path, encoding=encoding)
-    frame.columns = [c.strip().lower() for c in frame.columns]
+    columns = [str(c).strip().lower() for c in headers]
 
     # Auto-detect common column name variations and normalize them
     column_aliases = {
@@ -44,15 +44,22 @@ def normalize_frame(*, file_path: Path, encoding: str = "utf-8") -> pd.DataFrame
     }
 
     # Memo/description variations -> standardize on memo for downstream mapping
-    if "memo" not in frame.columns:
+    if "memo" not in columns:
         for alias in ("description", "note", "notes", "desc"):
-            if alias in frame.columns:
+            if alias in columns:
                 column_aliases[alias] = "memo"
                 break
 
-    # Rename columns based on aliases
-    frame = frame.rename(columns=column_aliases)
+    return [column_aliases.get(c, c) for c in columns]
 
+
+def normalize_frame(*, file_path: Path, encoding: str = "utf-8") -> pd.DataFrame:
+    """Load a CSV file into a DataFrame with consistent column casing."""
+
+    import pandas as pd
+
+    frame = pd.read_csv(file_path, encoding=encoding)
+    frame.columns = normalize_headers(frame.columns)
     return frame
 
 
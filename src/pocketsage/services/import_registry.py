@@ -0,0 +1,330 @@
+"""Content-hash registry of completed CSV imports.
+
+Every file imported to completion is recorded with its size, the SHA-256 of
+its bytes and the hashes of record-aligned chunks, all computed while the
+import streams the file. Before parsing, ``match_file`` compares the file
+against the size and chunk hashes to decide whether it is byte-identical to
+one already imported (skip it), an append to one (resume after the last
+unchanged chunk), or new. A new file is not read at all before the import.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+from sqlmodel import Session, select
+
+from ..models import ImportRegistryChunk, ImportRegistryEntry
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+REGISTRY_CHUNK_ROWS = 512
+MAX_APPEND_CANDIDATES = 20
+_READ_BLOCK = 1 << 20
+
+
+@dataclass(frozen=True)
+class ChunkDigest:
+    """Hash of the bytes up to ``end_offset``; ``rows`` counts records before it."""
+
+    end_offset: int
+    rows: int
+    sha256: str
+
+
+@dataclass(frozen=True)
+class RegistryMatch:
+    """How a file relates to previously imported content."""
+
+    status: str  # "new" | "identical" | "append"
+    entry: Optional[ImportRegistryEntry] = None
+    offset: int = 0
+    rows: int = 0
+    chunks: tuple[ChunkDigest, ...] = ()
+    # SHA-256 state over the bytes before ``offset``, for ``ChunkHasher.resume``.
+    prefix_digest: Optional["hashlib._Hash"] = field(default=None, compare=False, repr=False)
+
+
+@dataclass
+class ChunkHasher:
+    """Accumulate raw bytes and close a chunk every ``chunk_rows`` whole records.
+
+    Feed every byte read with ``update`` and call ``end_record`` after each
+    complete CSV record, so chunk boundaries never split a quoted field. The
+    first chunk also covers the header line. ``content_sha256`` hashes every
+    byte fed so far (plus the ``prefix`` given to ``resume``).
+    """
+
+    chunk_rows: int = REGISTRY_CHUNK_ROWS
+    rows: int = 0
+    chunks: list[ChunkDigest] = field(default_factory=list)
+    _pending_rows: int = 0
+    _digest: "hashlib._Hash" = field(default_factory=hashlib.sha256, repr=False)
+    _whole: "hashlib._Hash" = field(default_factory=hashlib.sha256, repr=False)
+
+    @classmethod
+    def resume(
+        cls,
+        chunks: Sequence[ChunkDigest],
+        chunk_rows: int = REGISTRY_CHUNK_ROWS,
+        *,
+        prefix: Optional["hashlib._Hash"] = None,
+    ) -> "ChunkHasher":
+        """Continue hashing after verified chunks copied from an earlier import."""
+
+        rows = chunks[-1].rows if chunks else 0
+        hasher = cls(chunk_rows=chunk_rows, rows=rows, chunks=list(chunks))
+        if prefix is not None:
+            hasher._whole = prefix.copy()
+        return hasher
+
+    @property
+    def content_sha256(self) -> str:
+        return self._whole.hexdigest()
+
+    def update(self, raw: bytes) -> None:
+        self._digest.update(raw)
+        self._whole.update(raw)
+
+    def end_record(self, offset: int) -> None:
+        self.rows += 1
+        self._pending_rows += 1
+        if self._pending_rows >= self.chunk_rows:
+            self._close(offset)
+
+    def finish(self, offset: int) -> tuple[ChunkDigest, ...]:
+        if self._pending_rows or (not self.chunks and offset > 0):
+            self._close(offset)
+        return tuple(self.chunks)
+
+    def _close(self, offset: int) -> None:
+        self.chunks.append(
+            ChunkDigest(end_offset=offset, rows=self.rows, sha256=self._digest.hexdigest())
+        )
+        self._digest = hashlib.sha256()
+        self._pending_rows = 0
+
+
+def file_sha256(path: Path) -> str:
+    """Hash a file in large blocks without decoding or parsing it."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(_READ_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_chunks(session: Session, entry_id: int) -> list[ChunkDigest]:
+    rows = session.exec(
+        select(ImportRegistryChunk)
+        .where(ImportRegistryChunk.entry_id == entry_id)
+        .order_by(ImportRegistryChunk.seq)  # type: ignore[arg-type]
+    ).all()
+    return [ChunkDigest(end_offset=r.end_offset, rows=r.rows, sha256=r.sha256) for r in rows]
+
+
+def _matching_prefix(
+    handle, chunks: Iterable[ChunkDigest]
+) -> tuple[list[ChunkDigest], "hashlib._Hash"]:
+    """Return the leading chunks whose byte ranges are unchanged in ``handle``.
+
+    Also returns a SHA-256 over those bytes, so the import can finish the
+    whole-file hash without reading them again.
+    """
+
+    handle.seek(0)
+    matched: list[ChunkDigest] = []
+    prefix = hashlib.sha256()
+    previous = 0
+    for chunk in chunks:
+        data = handle.read(chunk.end_offset - previous)
+        if len(data) != chunk.end_offset - previous:
+            break
+        if hashlib.sha256(data).hexdigest() != chunk.sha256:
+            break
+        prefix.update(data)
+        matched.append(chunk)
+        previous = chunk.end_offset
+    return matched, prefix
+
+
+def match_file(
+    session: Session, csv_path: Path, *, user_id: int, kind: str = "ledger"
+) -> RegistryMatch:
+    """Classify ``csv_path`` against the registry for this user and import kind.
+
+    Only entries of the same size can be identical, and only smaller ones can
+    be extended, so a file with neither is classified without reading it.
+    """
+
+    size = csv_path.stat().st_size
+    scope = (
+        ImportRegistryEntry.user_id == user_id,
+        ImportRegistryEntry.kind == kind,
+    )
+    same_size = session.exec(
+        select(ImportRegistryEntry)
+        .where(*scope, ImportRegistryEntry.file_size == size)
+        .order_by(ImportRegistryEntry.last_seen_at.desc())  # type: ignore[attr-defined]
+        .limit(MAX_APPEND_CANDIDATES)
+    ).all()
+    smaller = session.exec(
+        select(ImportRegistryEntry)
+        .where(*scope, ImportRegistryEntry.file_size < size)
+        .order_by(ImportRegistryEntry.last_seen_at.desc())  # type: ignore[attr-defined]
+        .limit(MAX_APPEND_CANDIDATES)
+    ).all()
+    if not same_size and not smaller:
+        return RegistryMatch(status="new")
+
+    best: RegistryMatch | None = None
+    with csv_path.open("rb") as handle:
+        for entry in (*same_size, *smaller):
+            if entry.id is None:
+                continue
+            chunks = _load_chunks(session, entry.id)
+            if not chunks:
+                # Imports resumed from a checkpoint carry no chunk hashes.
+                if entry.file_size == size and file_sha256(csv_path) == entry.content_sha256:
+                    return RegistryMatch(
+                        status="identical", entry=entry, offset=size, rows=entry.rows
+                    )
+                continue
+            matched, prefix = _matching_prefix(handle, chunks)
+            if not matched:
+                continue
+            if len(matched) == len(chunks) and matched[-1].end_offset == size:
+                return RegistryMatch(
+                    status="identical", entry=entry, offset=size, rows=entry.rows
+                )
+            if best is None or matched[-1].end_offset > best.offset:
+                best = RegistryMatch(
+                    status="append",
+                    entry=entry,
+                    offset=matched[-1].end_offset,
+                    rows=matched[-1].rows,
+                    chunks=tuple(matched),
+                    prefix_digest=prefix,
+                )
+    return best or RegistryMatch(status="new")
+
+
+def touch(session: Session, entry: ImportRegistryEntry) -> None:
+    """Record that an already-registered file was seen again."""
+
+    entry.times_seen += 1
+    entry.last_seen_at = datetime.now(timezone.utc)
+    session.add(entry)
+
+
+def record_import(
+    session: Session,
+    csv_path: Path,
+    *,
+    user_id: int,
+    kind: str,
+    content_sha256: str,
+    file_size: int,
+    chunks: Sequence[ChunkDigest],
+    rows: int,
+    created: int,
+) -> ImportRegistryEntry:
+    """Register a completed import; the caller's transaction commits it.
+
+    ``content_sha256`` and ``file_size`` should describe the bytes that were
+    actually imported (i.e. hashed while reading), not the file as it is now.
+    """
+
+    entry = ImportRegistryEntry(
+        user_id=user_id,
+        kind=kind,
+        source_name=csv_path.name,
+        source_path=str(csv_path.resolve()),
+        content_sha256=content_sha256,
+        file_size=file_size,
+        rows=rows,
+        created=created,
+    )
+    session.add(entry)
+    session.flush()
+    for seq, chunk in enumerate(chunks):
+        session.add(
+            ImportRegistryChunk(
+                entry_id=entry.id,
+                seq=seq,
+                end_offset=chunk.end_offset,
+                rows=chunk.rows,
+                sha256=chunk.sha256,
+            )
+        )
+    return entry
+
+
+def list_entries(
+    session_factory: SessionFactory, *, user_id: int, kind: str | None = None
+) -> list[ImportRegistryEntry]:
+    """Return registry entries for a user, most recently seen first."""
+
+    with session_factory() as session:
+        statement = select(ImportRegistryEntry).where(ImportRegistryEntry.user_id == user_id)
+        if kind is not None:
+            statement = statement.where(ImportRegistryEntry.kind == kind)
+        entries = session.exec(
+            statement.order_by(ImportRegistryEntry.last_seen_at.desc())  # type: ignore[attr-defined]
+        ).all()
+        for entry in entries:
+            session.expunge(entry)
+        return list(entries)
+
+
+def purge_entries(
+    session_factory: SessionFactory,
+    *,
+    user_id: int,
+    entry_ids: Iterable[int] | None = None,
+) -> int:
+    """Forget registered files so they are parsed in full next time.
+
+    With ``entry_ids=None`` every entry for the user is removed. Returns the
+    number of entries deleted.
+    """
+
+    with session_factory() as session:
+        statement = select(ImportRegistryEntry).where(ImportRegistryEntry.user_id == user_id)
+        if entry_ids is not None:
+            statement = statement.where(
+                ImportRegistryEntry.id.in_(list(entry_ids))  # type: ignore[union-attr]
+            )
+        entries = session.exec(statement).all()
+        ids = [entry.id for entry in entries]
+        if not ids:
+            return 0
+        chunks = session.exec(
+            select(ImportRegistryChunk).where(
+                ImportRegistryChunk.entry_id.in_(ids)  # type: ignore[attr-defined]
+            )
+        ).all()
+        for row in (*chunks, *entries):
+            session.delete(row)
+        session.commit()
+        return len(ids)
+
+
+__all__ = [
+    "ChunkDigest",
+    "ChunkHasher",
+    "REGISTRY_CHUNK_ROWS",
+    "RegistryMatch",
+    "file_sha256",
+    "list_entries",
+    "match_file",
+    "purge_entries",
+    "record_import",
+    "touch",
+]
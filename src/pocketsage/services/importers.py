@@ -8,26 +8,38 @@ import hashlib
 import logging
 import math
 import re
-from datetime import datetime
+import time
+from datetime import datetime, timezone
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, ContextManager, Optional, cast
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, ContextManager, Iterator, Optional, cast
 
-from sqlalchemy import func
+from sqlalchemy import func, insert, update
 from sqlmodel import Session, select
 
-from ..models import Account, Category, Transaction
+from ..models import Account, Category, ImportCheckpoint, Transaction
 from ..models.portfolio import Holding
-from .import_csv import ColumnMapping, load_transactions_from_csv, normalize_frame
+from . import import_registry
+from .import_csv import (
+    ColumnMapping,
+    normalize_frame,
+    normalize_headers,
+    upsert_transactions,
+)
+from .jobs import JobCancelled
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 SessionFactory = Callable[[], ContextManager[Session]]
 ACCOUNT_ID_COLUMN = cast(Any, Account.id)
 ACCOUNT_NAME_COLUMN = cast(Any, Account.name)
-HOLDING_ACCOUNT_COLUMN = cast(Any, Holding.account_id)
 
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -36,6 +48,215 @@ class ImportResult:
     created: int
     skipped: int
     errors: list[str]
+    warnings: list[str] = field(default_factory=list)
+
+
+# Header aliases per logical field, in priority order. Matching is done once per
+# file on stripped, lower-cased headers.
+_TRANSACTION_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "date": ("date", "occurred_at", "transaction_date", "transaction date"),
+    "amount": ("amount", "value", "transaction_amount"),
+    "memo": ("memo", "description", "note", "payee"),
+    "external_id": ("external_id", "id", "transaction_id", "reference"),
+    "category": ("category", "category_id", "category_name"),
+    "account": ("account", "account_id", "account_name"),
+}
+
+DATE_FORMATS: tuple[str, ...] = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%m-%d-%Y",
+    "%d-%m-%Y",
+)
+ISO_DATE_FORMAT = "iso"
+DATE_SAMPLE_ROWS = 200
+
+
+def _missing_column(values: list[str]) -> None:
+    return None
+
+
+def _column_getter(indexes: list[int]) -> Callable[[list[str]], Any]:
+    """Build a getter for one logical field from the header positions that matched it."""
+
+    if not indexes:
+        return _missing_column
+    if len(indexes) == 1:
+        return itemgetter(indexes[0])
+
+    first, *rest = indexes
+
+    def _first_filled(values: list[str]) -> Any:
+        value = values[first]
+        if value:
+            return value
+        for idx in rest:
+            value = values[idx]
+            if value:
+                return value
+        return value
+
+    return _first_filled
+
+
+@dataclass(frozen=True)
+class RowMapper:
+    """Header resolution compiled once per file.
+
+    ``getters`` holds one callable per field in ``fields`` order; a plain
+    ``operator.itemgetter`` when a single header matched, a first-non-empty
+    fallback when several aliases are present, and a constant ``None`` when
+    the column is absent.
+    """
+
+    fields: tuple[str, ...]
+    columns: dict[str, tuple[str, ...]]
+    getters: tuple[Callable[[list[str]], Any], ...]
+    width: int
+
+    def __call__(self, values: list[str]) -> list[Any]:
+        if len(values) < self.width:
+            values = values + [""] * (self.width - len(values))
+        return [getter(values) for getter in self.getters]
+
+    def index_of(self, name: str) -> int:
+        return self.fields.index(name)
+
+
+def compile_row_mapper(
+    headers: list[str],
+    aliases: dict[str, tuple[str, ...]] = _TRANSACTION_COLUMN_ALIASES,
+) -> RowMapper:
+    """Resolve header aliases once and return a positional row mapper."""
+
+    normalized = [str(header or "").strip().lower() for header in headers]
+    positions: dict[str, int] = {}
+    for idx, header in enumerate(normalized):
+        positions.setdefault(header, idx)
+
+    getters: list[Callable[[list[str]], Any]] = []
+    columns: dict[str, tuple[str, ...]] = {}
+    for name, candidates in aliases.items():
+        indexes = [positions[alias] for alias in candidates if alias in positions]
+        columns[name] = tuple(headers[idx] for idx in indexes)
+        getters.append(_column_getter(indexes))
+    return RowMapper(
+        fields=tuple(aliases),
+        columns=columns,
+        getters=tuple(getters),
+        width=len(headers),
+    )
+
+
+def _probe_date(value: str) -> Optional[datetime]:
+    """Try every supported format on a single value (slow path)."""
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    if "T" in value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _parses(value: str, fmt: str) -> bool:
+    if fmt == ISO_DATE_FORMAT:
+        try:
+            datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return False
+        return True
+    try:
+        datetime.strptime(value, fmt)
+    except ValueError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class DateFormatDetection:
+    """Outcome of sampling a date column before import."""
+
+    fmt: Optional[str]
+    candidates: tuple[str, ...]
+    mixed: bool
+    sample_size: int
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self.candidates) > 1
+
+    def describe(self) -> list[str]:
+        messages: list[str] = []
+        if self.mixed:
+            messages.append(
+                f"Mixed date formats in the first {self.sample_size} rows; "
+                "falling back to per-row format detection"
+            )
+        elif self.ambiguous:
+            messages.append(
+                "Ambiguous date format: sample matches "
+                + ", ".join(self.candidates)
+                + f"; using {self.fmt}"
+            )
+        return messages
+
+
+def detect_date_format(values: list[str]) -> DateFormatDetection:
+    """Pick the single date format that parses every non-empty sample value.
+
+    Formats are tried in ``DATE_FORMATS`` priority order (ISO datetimes last),
+    matching the order the per-row probe used, so an ambiguous sample such as
+    ``01/02/2024`` resolves the same way it always has.
+    """
+
+    sample = [value.strip() for value in values if value and value.strip()]
+    if not sample:
+        return DateFormatDetection(fmt=None, candidates=(), mixed=False, sample_size=0)
+
+    candidates = tuple(
+        fmt for fmt in DATE_FORMATS if all(_parses(value, fmt) for value in sample)
+    )
+    if not candidates and all(_parses(value, ISO_DATE_FORMAT) for value in sample):
+        candidates = (ISO_DATE_FORMAT,)
+    if candidates:
+        return DateFormatDetection(
+            fmt=candidates[0], candidates=candidates, mixed=False, sample_size=len(sample)
+        )
+    mixed = all(_probe_date(value) is not None for value in sample)
+    return DateFormatDetection(fmt=None, candidates=(), mixed=mixed, sample_size=len(sample))
+
+
+def compile_date_parser(fmt: Optional[str]) -> Callable[[str], Optional[datetime]]:
+    """Return a parser for a detected format that falls back to probing on mismatch."""
+
+    if fmt is None:
+        return _probe_date
+
+    if fmt == ISO_DATE_FORMAT:
+
+        def _parse_iso(value: str) -> Optional[datetime]:
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                return _probe_date(value)
+
+        return _parse_iso
+
+    def _parse_fixed(value: str) -> Optional[datetime]:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            return _probe_date(value)
+
+    return _parse_fixed
 
 
 def import_transactions(
@@ -46,81 +267,69 @@ def import_transactions(
     account_id: int | None = None,
     category_map: dict[str, int] | None = None,
 ) -> ImportResult:
-    """Import transactions from CSV file with robust column detection and logging."""
+    """Import transactions from CSV file with robust column detection and logging.
+
+    Header aliases are resolved once into a ``RowMapper`` and the date format is
+    detected once from the first ``DATE_SAMPLE_ROWS`` rows; ambiguous or mixed
+    date columns are reported in ``ImportResult.warnings``.
+    """
 
     created = 0
     skipped = 0
     errors: list[str] = []
+    warnings: list[str] = []
 
     logger.info(f"Starting transaction import from: {csv_path}")
 
     try:
         with csv_path.open("r", newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
 
-            headers = reader.fieldnames or []
+            headers = next(reader, None) or []
             logger.info(f"CSV headers found: {headers}")
 
             if not headers:
                 errors.append("CSV file has no headers")
                 return ImportResult(created=0, skipped=0, errors=errors)
 
+            mapper = compile_row_mapper(headers)
+            logger.info(f"Resolved columns: {mapper.columns}")
+            date_idx = mapper.index_of("date")
+
+            sample = list(islice(reader, DATE_SAMPLE_ROWS))
+            detection = detect_date_format(
+                [str(mapper(values)[date_idx] or "") for values in sample]
+            )
+            warnings.extend(detection.describe())
+            for message in warnings:
+                logger.warning(message)
+            parse_date = compile_date_parser(detection.fmt)
+
             row_count = 0
-            for row_num, row in enumerate(reader, start=2):
+            for row_num, values in enumerate(chain(sample, reader), start=2):
                 row_count += 1
 
                 if row_num <= 4:
-                    logger.info(f"Row {row_num} data: {dict(row)}")
+                    logger.info(f"Row {row_num} data: {dict(zip(headers, values))}")
 
                 try:
-                    # Extract date with multiple column name support
-                    date_str = (
-                        row.get("date")
-                        or row.get("Date")
-                        or row.get("DATE")
-                        or row.get("occurred_at")
-                        or row.get("transaction_date")
-                        or row.get("Transaction Date")
+                    date_str, amount_str, memo, external_id, category_str, account_str = mapper(
+                        values
                     )
 
                     if not date_str:
-                        errors.append(f"Row {row_num}: No date found. Columns: {list(row.keys())}")
+                        errors.append(f"Row {row_num}: No date found. Columns: {headers}")
                         skipped += 1
                         continue
 
-                    # Parse date with multiple format support
-                    parsed_date = None
                     date_str = date_str.strip()
-
-                    for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%m-%d-%Y", "%d-%m-%Y"]:
-                        try:
-                            parsed_date = datetime.strptime(date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-
-                    if parsed_date is None:
-                        if "T" in date_str:
-                            try:
-                                parsed_date = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                            except Exception:
-                                pass
+                    parsed_date = parse_date(date_str)
 
                     if parsed_date is None:
                         errors.append(f"Row {row_num}: Could not parse date '{date_str}'")
                         skipped += 1
                         continue
 
-                    # Extract amount
-                    amount_str = (
-                        row.get("amount")
-                        or row.get("Amount")
-                        or row.get("AMOUNT")
-                        or row.get("value")
-                        or row.get("Value")
-                        or row.get("transaction_amount")
-                    )
-
                     if not amount_str:
                         errors.append(f"Row {row_num}: No amount found")
                         skipped += 1
@@ -137,30 +346,7 @@ def import_transactions(
                         skipped += 1
                         continue
 
-                    # Extract memo/description
-                    memo = (
-                        row.get("memo")
-                        or row.get("Memo")
-                        or row.get("MEMO")
-                        or row.get("description")
-                        or row.get("Description")
-                        or row.get("DESCRIPTION")
-                        or row.get("note")
-                        or row.get("Note")
-                        or row.get("Payee")
-                        or row.get("payee")
-                        or ""
-                    )
-                    if memo:
-                        memo = str(memo).strip()
-
-                    # Extract or generate external_id
-                    external_id = (
-                        row.get("external_id")
-                        or row.get("id")
-                        or row.get("transaction_id")
-                        or row.get("reference")
-                    )
+                    memo = str(memo).strip() if memo else ""
 
                     if not external_id:
                         # Include row_num and filename in hash for uniqueness
@@ -182,14 +368,6 @@ def import_transactions(
 
                     # Resolve category
                     category_id = None
-                    category_str = (
-                        row.get("category")
-                        or row.get("Category")
-                        or row.get("CATEGORY")
-                        or row.get("category_id")
-                        or row.get("category_name")
-                    )
-
                     if category_str:
                         category_str = str(category_str).strip()
                         if category_map and category_str in category_map:
@@ -216,14 +394,6 @@ def import_transactions(
 
                     # Resolve account
                     resolved_account_id = account_id
-                    account_str = (
-                        row.get("account")
-                        or row.get("Account")
-                        or row.get("ACCOUNT")
-                        or row.get("account_id")
-                        or row.get("account_name")
-                    )
-
                     if account_str and not account_id:
                         account_str = str(account_str).strip()
                         acc = session.exec(
@@ -263,7 +433,7 @@ def import_transactions(
         logger.error(f"Import failed: {file_exc}")
         errors.append(f"File error: {file_exc}")
 
-    return ImportResult(created=created, skipped=skipped, errors=errors)
+    return ImportResult(created=created, skipped=skipped, errors=errors, warnings=warnings)
 
 
 _DEFAULT_LEDGER_MAPPING = ColumnMapping(
@@ -278,97 +448,408 @@ _DEFAULT_LEDGER_MAPPING = ColumnMapping(
 )
 
 
+@dataclass
+class ImportProgress:
+    """Snapshot of a running ledger import, handed to progress callbacks."""
+
+    rows_processed: int
+    rows_created: int
+    bytes_read: int
+    total_bytes: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        if self.total_bytes <= 0:
+            return 1.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimate remaining seconds from byte throughput (None until measurable)."""
+
+        fraction = self.fraction
+        if fraction <= 0 or self.elapsed <= 0:
+            return None
+        return max(self.elapsed / fraction - self.elapsed, 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows_processed": self.rows_processed,
+            "rows_created": self.rows_created,
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+            "rows_per_second": round(self.rows_per_second, 1),
+            "eta_seconds": None if self.eta_seconds is None else round(self.eta_seconds, 1),
+        }
+
+
+class ImportCancelled(JobCancelled):
+    """Raised when an import stops early; rows up to the last checkpoint are kept."""
+
+    def __init__(self, created: int, rows_committed: int) -> None:
+        super().__init__(f"Import cancelled after {rows_committed} rows")
+        self.created = created
+        self.rows_committed = rows_committed
+
+
+ProgressCallback = Callable[[ImportProgress], None]
+
+CHECKPOINT_ROWS = 500
+PROGRESS_EVERY_ROWS = 250
+
+
+class _OffsetLineReader:
+    """Yield decoded lines from a binary file while tracking the byte offset consumed.
+
+    ``csv.reader`` pulls lines lazily, so after each record the offset points
+    just past that record even when quoted fields span several lines.
+    """
+
+    def __init__(
+        self,
+        handle: BinaryIO,
+        encoding: str,
+        sink: Callable[[bytes], None] | None = None,
+    ) -> None:
+        self._handle = handle
+        self._encoding = encoding
+        self._sink = sink
+        self.offset = handle.tell()
+
+    def __iter__(self) -> Iterator[str]:
+        sink = self._sink
+        for raw in self._handle:
+            self.offset += len(raw)
+            if sink is not None:
+                sink(raw)
+            yield raw.decode(self._encoding)
+
+
+def _file_signature(csv_path: Path) -> tuple[int, int]:
+    stat = csv_path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _load_checkpoint(
+    session: Session, *, csv_path: Path, kind: str, user_id: int
+) -> Optional[ImportCheckpoint]:
+    return session.exec(
+        select(ImportCheckpoint).where(
+            ImportCheckpoint.user_id == user_id,
+            ImportCheckpoint.kind == kind,
+            ImportCheckpoint.source_path == str(csv_path.resolve()),
+        )
+    ).first()
+
+
+def _save_checkpoint(
+    session: Session,
+    checkpoint: ImportCheckpoint,
+    *,
+    byte_offset: int,
+    rows_committed: int,
+    created: int,
+    status: str,
+) -> None:
+    checkpoint.byte_offset = byte_offset
+    checkpoint.rows_committed = rows_committed
+    checkpoint.created = created
+    checkpoint.status = status
+    checkpoint.updated_at = datetime.now(timezone.utc)
+    session.add(checkpoint)
+
+
 def import_ledger_transactions(
     *,
     csv_path: Path,
     session_factory: SessionFactory,
     mapping: ColumnMapping | None = None,
     user_id: int,
+    progress: ProgressCallback | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    checkpoint_rows: int | None = CHECKPOINT_ROWS,
+    use_registry: bool = True,
 ) -> int:
-    """Parse a CSV and persist transactions, creating categories/accounts on demand."""
+    """Stream a CSV and persist transactions, creating categories/accounts on demand.
+
+    Rows are committed every ``checkpoint_rows`` rows together with an
+    ``ImportCheckpoint`` recording the byte offset reached, so a re-run after a
+    crash or cancellation on the same unchanged file resumes from there. Pass
+    ``checkpoint_rows=None`` to keep the whole import in the caller's single
+    transaction. ``should_cancel`` is polled between rows; when it returns True
+    the work so far is checkpointed and ``ImportCancelled`` is raised.
+
+    With ``use_registry`` a file byte-identical to one imported before returns 0
+    without being parsed, and a file that extends one imported before (same
+    leading chunks) is only parsed after the last unchanged chunk.
+    """
 
     mapping = mapping or _DEFAULT_LEDGER_MAPPING
-    parsed_rows = load_transactions_from_csv(csv_path=csv_path, mapping=mapping)
-    if not parsed_rows:
-        return 0
+    file_size, mtime_ns = _file_signature(csv_path)
+    started = time.perf_counter()
 
     created = 0
+    rows_processed = 0
     seen_digests: set[str] = set()
-    with session_factory() as session:
-        for row in parsed_rows:
-            occurred_at = _parse_datetime(row.get("occurred_at"))
-            amount = row.get("amount")
-            if occurred_at is None or amount is None:
-                continue
-
-            amount_val = float(amount)
-            memo = str(row.get("memo") or "").strip()
-
-            # Handle transaction type to determine amount sign
-            # Transaction model uses: positive for income, negative for expense
-            transaction_type = str(row.get("transaction_type") or "").strip().lower()
-            if transaction_type:
-                # If type is specified, ensure amount has correct sign
-                if transaction_type in ("expense", "debit", "withdrawal", "payment"):
-                    amount_val = -abs(amount_val)
-                elif transaction_type in ("income", "credit", "deposit"):
-                    amount_val = abs(amount_val)
-                # Otherwise keep amount as-is (might be transfer or other type)
-            # If no type specified, keep amount sign from CSV (existing behavior)
-
-            external_id = str(row.get("external_id") or "").strip()
-            if not external_id:
-                external_id = _row_digest(
-                    occurred_at=occurred_at,
-                    amount=amount_val,
-                    memo=memo,
-                    category=row.get("category"),
-                    account=row.get("account_name"),
+    with session_factory() as session, csv_path.open("rb") as handle:
+        match = None
+        if use_registry:
+            match = import_registry.match_file(session, csv_path, user_id=user_id, kind="ledger")
+            if match.status == "identical" and match.entry is not None:
+                import_registry.touch(session, match.entry)
+                logger.info(
+                    "Skipping %s: identical to an import of %s rows",
+                    csv_path.name,
+                    match.entry.rows,
                 )
-            if external_id and _transaction_exists(session, str(external_id), user_id=user_id):
-                continue
-            if external_id in seen_digests:
-                continue
-            seen_digests.add(external_id)
+                if progress is not None:
+                    progress(
+                        ImportProgress(
+                            rows_processed=match.rows,
+                            rows_created=0,
+                            bytes_read=file_size,
+                            total_bytes=file_size,
+                            elapsed=time.perf_counter() - started,
+                        )
+                    )
+                return 0
+
+        hasher = import_registry.ChunkHasher() if match is not None else None
+        lines = _OffsetLineReader(
+            handle, encoding="utf-8", sink=hasher.update if hasher is not None else None
+        )
+        reader = csv.reader(lines)
+        header_row = next(reader, None)
+        if not header_row:
+            return 0
+        header_row[0] = header_row[0].lstrip("\ufeff")
+        headers = normalize_headers(header_row)
+        data_offset = lines.offset
+
+        checkpoint = None
+        start_offset = data_offset
+        created_before = 0
+        resumed_checkpoint = False
+        if checkpoint_rows:
+            checkpoint = _load_checkpoint(
+                session, csv_path=csv_path, kind="ledger", user_id=user_id
+            )
+            resumable = (
+                checkpoint is not None
+                and checkpoint.status != "completed"
+                and checkpoint.file_size == file_size
+                and checkpoint.file_mtime_ns == mtime_ns
+                and checkpoint.byte_offset > data_offset
+            )
+            if checkpoint is not None and resumable:
+                start_offset = checkpoint.byte_offset
+                rows_processed = checkpoint.rows_committed
+                created_before = checkpoint.created
+                resumed_checkpoint = True
+                # Chunks before the checkpoint were never hashed in this run.
+                hasher = None
+                logger.info(
+                    "Resuming ledger import of %s at byte %s (row %s)",
+                    csv_path.name,
+                    start_offset,
+                    rows_processed,
+                )
+            else:
+                checkpoint = checkpoint or ImportCheckpoint(
+                    user_id=user_id, kind="ledger", source_path=str(csv_path.resolve())
+                )
+                checkpoint.file_size = file_size
+                checkpoint.file_mtime_ns = mtime_ns
+
+        if (
+            not resumed_checkpoint
+            and match is not None
+            and match.status == "append"
+            and match.offset > data_offset
+        ):
+            start_offset = match.offset
+            rows_processed = match.rows
+            hasher = import_registry.ChunkHasher.resume(match.chunks, prefix=match.prefix_digest)
+            logger.info(
+                "%s extends a previous import; skipping %s unchanged rows",
+                csv_path.name,
+                rows_processed,
+            )
 
-            category_id = _resolve_category_id(
+        if checkpoint is not None and not resumed_checkpoint:
+            _save_checkpoint(
                 session,
-                row.get("category_id"),
-                row.get("category"),
-                amount_val,
-                user_id,
+                checkpoint,
+                byte_offset=start_offset,
+                rows_committed=rows_processed,
+                created=0,
+                status="running",
             )
-            account_id = _resolve_account_id(
-                session,
-                row.get("account_id"),
-                row.get("account_name"),
-                user_id,
+        if start_offset != data_offset:
+            handle.seek(start_offset)
+            lines = _OffsetLineReader(
+                handle, encoding="utf-8", sink=hasher.update if hasher is not None else None
             )
-            currency = _sanitize_currency(row.get("currency"))
+            reader = csv.reader(lines)
+        # Offset just past the last *processed* record; the reader may already
+        # have pulled the next one when a cancellation is noticed.
+        consumed_offset = lines.offset
+
+        def _report() -> None:
+            if progress is not None:
+                progress(
+                    ImportProgress(
+                        rows_processed=rows_processed,
+                        rows_created=created,
+                        bytes_read=lines.offset,
+                        total_bytes=file_size,
+                        elapsed=time.perf_counter() - started,
+                    )
+                )
 
-            txn = Transaction(
-                user_id=user_id,
-                occurred_at=occurred_at,
-                amount=amount_val,
-                memo=memo,
-                external_id=str(external_id) if external_id else None,
-                category_id=category_id,
-                account_id=account_id,
-                currency=currency or "USD",
+        def _checkpoint(status: str) -> None:
+            if checkpoint is None:
+                return
+            _save_checkpoint(
+                session,
+                checkpoint,
+                byte_offset=consumed_offset,
+                rows_committed=rows_processed,
+                created=created_before + created,
+                status=status,
             )
-            upserted = upsert_transaction(session, txn, user_id=user_id)
-            if upserted:
-                created += 1
+            session.commit()
+
+        for values in reader:
+            if should_cancel is not None and should_cancel():
+                _checkpoint("cancelled")
+                _report()
+                raise ImportCancelled(created=created, rows_committed=rows_processed)
+
+            rows_processed += 1
+            if values:
+                for row in upsert_transactions(rows=[dict(zip(headers, values))], mapping=mapping):
+                    if _persist_ledger_row(session, row, user_id=user_id, seen=seen_digests):
+                        created += 1
+            consumed_offset = lines.offset
+            if hasher is not None:
+                hasher.end_record(consumed_offset)
+
+            if checkpoint_rows and rows_processed % checkpoint_rows == 0:
+                _checkpoint("running")
+            if rows_processed % PROGRESS_EVERY_ROWS == 0:
+                _report()
 
         session.flush()
+        if match is not None:
+            import_registry.record_import(
+                session,
+                csv_path,
+                user_id=user_id,
+                kind="ledger",
+                # After a checkpoint resume the skipped bytes were never hashed.
+                content_sha256=(
+                    hasher.content_sha256
+                    if hasher is not None
+                    else import_registry.file_sha256(csv_path)
+                ),
+                file_size=file_size,
+                chunks=hasher.finish(consumed_offset) if hasher is not None else (),
+                rows=rows_processed,
+                created=created_before + created,
+            )
+        _checkpoint("completed")
+        _report()
 
     return created
 
 
+def _persist_ledger_row(
+    session: Session, row: dict, *, user_id: int, seen: set[str]
+) -> bool:
+    """Persist one parsed ledger row; returns True when a transaction was created."""
+
+    occurred_at = _parse_datetime(row.get("occurred_at"))
+    amount = row.get("amount")
+    if occurred_at is None or amount is None:
+        return False
+
+    amount_val = float(amount)
+    memo = str(row.get("memo") or "").strip()
+
+    # Handle transaction type to determine amount sign
+    # Transaction model uses: positive for income, negative for expense
+    transaction_type = str(row.get("transaction_type") or "").strip().lower()
+    if transaction_type:
+        # If type is specified, ensure amount has correct sign
+        if transaction_type in ("expense", "debit", "withdrawal", "payment"):
+            amount_val = -abs(amount_val)
+        elif transaction_type in ("income", "credit", "deposit"):
+            amount_val = abs(amount_val)
+        # Otherwise keep amount as-is (might be transfer or other type)
+    # If no type specified, keep amount sign from CSV (existing behavior)
+
+    external_id = str(row.get("external_id") or "").strip()
+    if not external_id:
+        external_id = _row_digest(
+            occurred_at=occurred_at,
+            amount=amount_val,
+            memo=memo,
+            category=row.get("category"),
+            account=row.get("account_name"),
+        )
+    if external_id and _transaction_exists(session, str(external_id), user_id=user_id):
+        return False
+    if external_id in seen:
+        return False
+    seen.add(external_id)
+
+    category_id = _resolve_category_id(
+        session,
+        row.get("category_id"),
+        row.get("category"),
+        amount_val,
+        user_id,
+    )
+    account_id = _resolve_account_id(
+        session,
+        row.get("account_id"),
+        row.get("account_name"),
+        user_id,
+    )
+    currency = _sanitize_currency(row.get("currency"))
+
+    txn = Transaction(
+        user_id=user_id,
+        occurred_at=occurred_at,
+        amount=amount_val,
+        memo=memo,
+        external_id=str(external_id) if external_id else None,
+        category_id=category_id,
+        account_id=account_id,
+        currency=currency or "USD",
+    )
+    return upsert_transaction(session, txn, user_id=user_id)
+
+
 def import_portfolio_holdings(
     *, csv_path: Path, session_factory: SessionFactory, user_id: int
 ) -> int:
-    """Parse a holdings CSV and upsert rows by symbol/account."""
+    """Parse a holdings CSV and upsert rows by symbol/account.
+
+    Columns are cleaned as whole pandas Series, accounts come from one preloaded
+    name map, existing holdings from one query keyed by ``(symbol, account_id)``,
+    and the result is written as one bulk INSERT plus one bulk UPDATE. Exact
+    duplicate rows count once; when a symbol/account pair repeats with
+    different values the last row wins.
+    """
+
+    import pandas as pd
 
     frame = normalize_frame(file_path=csv_path)
     column_aliases = {
@@ -384,64 +865,141 @@ def import_portfolio_holdings(
     if missing:
         raise ValueError(f"Portfolio CSV missing columns: {', '.join(sorted(missing))}")
 
-    processed = 0
-    seen_digests: set[str] = set()
+    rows = _normalize_holdings_frame(frame)
+    if rows.empty:
+        return 0
+
     with session_factory() as session:
-        for _, row in frame.iterrows():
-            symbol = str(row.get("symbol") or "").strip().upper()
-            if not symbol:
-                continue
-
-            quantity = _safe_float(row.get("shares"))
-            avg_price = _safe_float(row.get("price"))
-            if quantity is None or avg_price is None:
-                continue
-
-            account_name = str(row.get("account") or "").strip()
-            account_id = (
-                _resolve_account_id(session, row.get("account_id"), account_name, user_id)
-                if account_name
-                else None
-            )
-            currency = _sanitize_currency(row.get("currency")) or "USD"
-            acquired_at = _parse_datetime(row.get("as_of"))
-            market_price = _safe_float(row.get("market_price")) or 0.0
-            digest = _row_digest(
-                occurred_at=acquired_at or datetime.min,
-                amount=quantity * avg_price,
-                memo=symbol,
-                category=account_name,
-                account=row.get("account_id"),
-            )
-            if digest in seen_digests:
-                continue
-            seen_digests.add(digest)
-
-            existing = _lookup_holding(session, symbol, account_id, user_id)
-            if existing:
-                existing.quantity = quantity
-                existing.avg_price = avg_price
-                existing.acquired_at = acquired_at
-                existing.currency = currency
-                existing.market_price = market_price
+        rows["account_id"] = _resolve_account_ids(session, rows, user_id=user_id)
+
+        # Exact repeats of a lot collapse into one; the count mirrors that.
+        rows = rows.drop_duplicates(subset=["_digest"], keep="first")
+        processed = len(rows)
+        latest = rows.drop_duplicates(subset=["symbol", "account_id"], keep="last")
+
+        existing: dict[tuple[str, Optional[int]], int] = {}
+        for holding_id, symbol, account_id in session.exec(
+            select(Holding.id, Holding.symbol, Holding.account_id)
+            .where(Holding.user_id == user_id)
+            .order_by(Holding.id)  # type: ignore[arg-type]
+        ).all():
+            existing.setdefault((symbol, account_id), holding_id)
+
+        inserts: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        for record in latest.itertuples(index=False):
+            account_id = None if pd.isna(record.account_id) else int(record.account_id)
+            values = {
+                "quantity": float(record.shares),
+                "avg_price": float(record.price),
+                "acquired_at": record.acquired_at,
+                "currency": record.currency,
+                "market_price": float(record.market_price),
+            }
+            holding_id = existing.get((record.symbol, account_id))
+            if holding_id is not None:
+                updates.append({"id": holding_id, **values})
             else:
-                holding = Holding(
-                    user_id=user_id,
-                    symbol=symbol,
-                    quantity=quantity,
-                    avg_price=avg_price,
-                    acquired_at=acquired_at,
-                    account_id=account_id,
-                    currency=currency,
-                    market_price=market_price,
+                inserts.append(
+                    {
+                        "user_id": user_id,
+                        "symbol": record.symbol,
+                        "account_id": account_id,
+                        **values,
+                    }
                 )
-                session.add(holding)
 
-            processed += 1
+        if inserts:
+            session.exec(insert(Holding), params=inserts)  # type: ignore[call-overload]
+        if updates:
+            session.exec(update(Holding), params=updates)  # type: ignore[call-overload]
+
+    return processed
+
+
+def _normalize_holdings_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Clean holdings columns in bulk; rows without symbol, shares or price are dropped."""
+
+    import pandas as pd
 
+    def _text(column: str) -> pd.Series:
+        if column not in frame.columns:
+            return pd.Series("", index=frame.index, dtype=object)
+        return frame[column].fillna("").astype(str).str.strip()
+
+    def _number(column: str) -> pd.Series:
+        if column not in frame.columns:
+            return pd.Series(float("nan"), index=frame.index)
+        return pd.to_numeric(frame[column], errors="coerce")
+
+    rows = pd.DataFrame(
+        {
+            "symbol": _text("symbol").str.upper(),
+            "shares": _number("shares"),
+            "price": _number("price"),
+            "account": _text("account"),
+            "account_ref": _text("account_id"),
+            "currency": _text("currency").str.upper().str[:3].replace("", "USD"),
+            "market_price": _number("market_price").fillna(0.0),
+        }
+    )
+    as_of = _text("as_of")
+    parsed = {value: _parse_datetime(value) for value in as_of.unique()}
+    # Built by hand so missing dates stay None instead of being coerced to NaT.
+    rows["acquired_at"] = pd.Series(
+        [parsed[value] for value in as_of], index=frame.index, dtype=object
+    )
+
+    rows = rows[(rows["symbol"] != "") & rows["shares"].notna() & rows["price"].notna()]
+    if rows.empty:
+        return rows
+
+    acquired_day = rows["acquired_at"].map(
+        lambda value: (value or datetime.min).strftime("%Y-%m-%d")
+    )
+    cost = (rows["shares"] * rows["price"]).map("{:.2f}".format)
+    rows["_digest"] = (
+        acquired_day
+        + "|"
+        + cost
+        + "|"
+        + rows["symbol"].str.lower()
+        + "|"
+        + rows["account"].str.lower()
+        + "|"
+        + rows["account_ref"].str.lower()
+    )
+    return rows
+
+
+def _resolve_account_ids(session: Session, rows: pd.DataFrame, *, user_id: int) -> pd.Series:
+    """Map each row to an account id from one preloaded map, creating missing names."""
+
+    import pandas as pd
+
+    by_id: set[int] = set()
+    by_name: dict[str, int] = {}
+    for account_id, name in session.exec(
+        select(Account.id, Account.name)
+        .where(Account.user_id == user_id)
+        .order_by(ACCOUNT_ID_COLUMN)
+    ).all():
+        by_id.add(account_id)
+        by_name.setdefault(name, account_id)
+
+    named = rows["account"] != ""
+    explicit = pd.to_numeric(rows["account_ref"], errors="coerce")
+    explicit = explicit.where(explicit.isin(by_id))
+    new_names = sorted(set(rows.loc[named & explicit.isna(), "account"]) - set(by_name))
+    if new_names:
+        accounts = [Account(name=name, currency="USD", user_id=user_id) for name in new_names]
+        session.add_all(accounts)
         session.flush()
+        by_name.update({account.name: account.id for account in accounts})  # type: ignore[misc]
 
-    return processed
+    resolved = explicit.fillna(rows["account"].map(by_name))
+    # Matches the per-row path: an account is only attached when a name is given.
+    return resolved.where(named).astype("Int64")
 
 
 def _parse_datetime(raw: object) -> Optional[datetime]:
@@ -589,17 +1147,6 @@ def _resolve_account_id(
     return account.id
 
 
-def _lookup_holding(
-    session: Session, symbol: str, account_id: Optional[int], user_id: int
-) -> Optional[Holding]:
-    statement = select(Holding).where(Holding.symbol == symbol, Holding.user_id == user_id)
-    if account_id is None:
-        statement = statement.where(HOLDING_ACCOUNT_COLUMN.is_(None))
-    else:
-        statement = statement.where(HOLDING_ACCOUNT_COLUMN == account_id)
-    return session.exec(statement).first()
-
-
 def _safe_float(value: object) -> Optional[float]:
     if value in (None, ""):
         return None
@@ -0,0 +1,513 @@
+"""Incremental data exports keyed on the change-log high-water mark.
+
+SQLite triggers (see ``infra.database.install_change_triggers``) keep one
+``change_log`` row per changed key of every user-owned table, stamped with a
+strictly increasing ``seq``. A full export snapshots all of a user's rows and
+records the ``seq`` it covers in ``export_watermark``; an incremental export
+then reads only log entries above that mark, so its cost follows the number of
+changes instead of the size of the history.
+
+Bundles are zip files holding ``manifest.json``, one ``<table>.jsonl`` file per
+table with rows to upsert and, for incrementals, ``tombstones.jsonl`` with the
+primary keys of deleted rows. ``replay_exports`` applies a full bundle
+followed by its chain of incrementals. ``export_rolling`` is the nightly
+policy on top: a fresh full bundle every ``FULL_EXPORT_INTERVAL`` incrementals
+(or whenever the chain on disk no longer reaches the watermark), after which
+chains beyond the retention count are deleted, so no restore ever depends on
+more than one short chain.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import AbstractContextManager
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from io import TextIOWrapper
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from sqlalchemy import and_, delete, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, SQLModel, select
+
+from ..models import (
+    CHANGE_TRACKED_TABLES,
+    Account,
+    Budget,
+    BudgetLine,
+    Category,
+    ChangeLogEntry,
+    ExportWatermark,
+    Habit,
+    HabitEntry,
+    Holding,
+    Liability,
+    Transaction,
+)
+
+SessionFactory = Callable[[], AbstractContextManager[Session]]
+
+EXPORT_FORMAT_VERSION = 1
+EXPORT_BATCH_SIZE = 500
+MANIFEST_NAME = "manifest.json"
+TOMBSTONES_NAME = "tombstones.jsonl"
+# Incrementals written on top of a full bundle before the next full one.
+FULL_EXPORT_INTERVAL = 6
+# Full bundles (each with its incrementals) kept by ``prune_export_chains``.
+EXPORT_CHAIN_RETENTION = 5
+
+_MODELS: dict[str, type[SQLModel]] = {
+    model.__tablename__: model  # type: ignore[misc]
+    for model in (
+        Account,
+        Category,
+        Budget,
+        BudgetLine,
+        Habit,
+        HabitEntry,
+        Liability,
+        Holding,
+        Transaction,
+    )
+}
+# Parents before children so upserts see their references; deletes run reversed.
+_TABLE_ORDER: tuple[str, ...] = tuple(
+    table.name for table in SQLModel.metadata.sorted_tables if table.name in CHANGE_TRACKED_TABLES
+)
+
+
+@dataclass(frozen=True)
+class ExportManifest:
+    """Describes one bundle and where it sits in a replay chain."""
+
+    kind: str
+    user_id: int
+    base_seq: int
+    seq: int
+    created_at: str
+    rows: dict[str, int] = field(default_factory=dict)
+    tombstones: int = 0
+    version: int = EXPORT_FORMAT_VERSION
+
+    @property
+    def changes(self) -> int:
+        return sum(self.rows.values()) + self.tombstones
+
+    @classmethod
+    def from_json(cls, payload: str | bytes) -> "ExportManifest":
+        data = json.loads(payload)
+        if data.get("version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export format version: {data.get('version')}")
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    """Outcome of an export; ``path`` is None when there was nothing to write."""
+
+    path: Optional[Path]
+    manifest: ExportManifest
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    """Totals after replaying a chain of bundles."""
+
+    bundles: int
+    upserted: int
+    deleted: int
+    seq: int
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def current_seq(session: Session) -> int:
+    """Return the newest change ``seq`` (0 for an empty log)."""
+
+    return int(session.exec(select(func.max(ChangeLogEntry.seq))).one() or 0)
+
+
+def get_watermark(session_factory: SessionFactory, user_id: int) -> Optional[ExportWatermark]:
+    """Return the user's export high-water mark, if any export has run."""
+
+    with session_factory() as session:
+        return session.get(ExportWatermark, user_id)
+
+
+def _set_watermark(session: Session, manifest: ExportManifest, path: Path) -> None:
+    mark = session.get(ExportWatermark, manifest.user_id)
+    if mark is None:
+        mark = ExportWatermark(user_id=manifest.user_id)
+    mark.seq = manifest.seq
+    mark.kind = manifest.kind
+    mark.path = str(path)
+    mark.exported_at = _now()
+    session.add(mark)
+
+
+def _key_clause(model: type[SQLModel], key: dict) -> object:
+    table = model.__table__  # type: ignore[attr-defined]
+    clauses = []
+    for column in table.primary_key:
+        value = key[column.name]
+        python_type = column.type.python_type
+        if isinstance(value, str) and python_type is date:
+            value = date.fromisoformat(value)
+        elif isinstance(value, str) and python_type is datetime:
+            value = datetime.fromisoformat(value)
+        clauses.append(column == value)
+    return and_(*clauses)
+
+
+def _log_join(model: type[SQLModel]) -> object:
+    """Join condition matching a table's rows to their ``change_log`` keys."""
+
+    table = model.__table__  # type: ignore[attr-defined]
+    return and_(
+        ChangeLogEntry.entity == table.name,
+        *[
+            column == func.json_extract(ChangeLogEntry.row_key, f"$.{column.name}")
+            for column in table.primary_key
+        ],
+    )
+
+
+def _write_rows(archive: ZipFile, name: str, rows: Iterable[SQLModel]) -> int:
+    count = 0
+    with archive.open(name, "w") as raw, TextIOWrapper(raw, encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(row.model_dump(mode="json"), separators=(",", ":")))
+            fh.write("\n")
+            count += 1
+    return count
+
+
+def _bundle_path(output_dir: Path, manifest: ExportManifest) -> Path:
+    if manifest.kind == "full":
+        name = f"pocketsage_full_u{manifest.user_id}_{manifest.seq:010d}.zip"
+    else:
+        name = (
+            f"pocketsage_incr_u{manifest.user_id}_"
+            f"{manifest.base_seq:010d}-{manifest.seq:010d}.zip"
+        )
+    return output_dir / name
+
+
+def _export(
+    output_dir: Path,
+    *,
+    session_factory: SessionFactory,
+    user_id: int,
+    base_seq: Optional[int],
+) -> ExportResult:
+    """Write a full (``base_seq`` None) or incremental bundle and advance the mark."""
+
+    kind = "full" if base_seq is None else "incremental"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with session_factory() as session:
+        # Read the mark first: anything that changes while rows are streamed is
+        # exported again next time, and replay is idempotent.
+        seq = current_seq(session)
+        start = base_seq or 0
+        in_range = and_(
+            ChangeLogEntry.user_id == user_id,
+            ChangeLogEntry.seq > start,
+            ChangeLogEntry.seq <= seq,
+        )
+        if kind == "incremental":
+            pending = session.exec(select(func.count(ChangeLogEntry.seq)).where(in_range)).one()
+            if not pending:
+                created_at = _now().isoformat()
+                manifest = ExportManifest(
+                    kind=kind, user_id=user_id, base_seq=start, seq=start, created_at=created_at
+                )
+                return ExportResult(path=None, manifest=manifest)
+
+        draft = ExportManifest(
+            kind=kind, user_id=user_id, base_seq=start, seq=seq, created_at=_now().isoformat()
+        )
+        path = _bundle_path(output_dir, draft)
+        tmp_path = path.with_suffix(".part")
+        counts: dict[str, int] = {}
+        tombstones = 0
+        with ZipFile(tmp_path, "w", compression=ZIP_DEFLATED) as archive:
+            for table_name in _TABLE_ORDER:
+                model = _MODELS[table_name]
+                if kind == "full":
+                    stmt = select(model).where(model.user_id == user_id)  # type: ignore[attr-defined]
+                else:
+                    stmt = (
+                        select(model)
+                        .join(ChangeLogEntry, _log_join(model))
+                        .where(in_range, ChangeLogEntry.op == "upsert")
+                    )
+                stmt = stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+                written = _write_rows(archive, f"{table_name}.jsonl", session.exec(stmt))
+                if written:
+                    counts[table_name] = written
+            if kind == "incremental":
+                deleted = session.exec(
+                    select(ChangeLogEntry.entity, ChangeLogEntry.row_key)
+                    .where(in_range, ChangeLogEntry.op == "delete")
+                    .order_by(ChangeLogEntry.seq)
+                )
+                with archive.open(TOMBSTONES_NAME, "w") as raw, TextIOWrapper(
+                    raw, encoding="utf-8"
+                ) as fh:
+                    for entity, row_key in deleted:
+                        fh.write(json.dumps({"table": entity, "key": json.loads(row_key)}))
+                        fh.write("\n")
+                        tombstones += 1
+            manifest = ExportManifest(
+                kind=kind,
+                user_id=user_id,
+                base_seq=start,
+                seq=seq,
+                created_at=draft.created_at,
+                rows=counts,
+                tombstones=tombstones,
+            )
+            archive.writestr(MANIFEST_NAME, json.dumps(asdict(manifest), indent=2))
+        tmp_path.replace(path)
+        _set_watermark(session, manifest, path)
+    return ExportResult(path=path, manifest=manifest)
+
+
+def export_full(
+    output_dir: Path, *, session_factory: SessionFactory, user_id: int
+) -> ExportResult:
+    """Snapshot every tracked row of ``user_id`` and reset the high-water mark."""
+
+    return _export(output_dir, session_factory=session_factory, user_id=user_id, base_seq=None)
+
+
+def export_incremental(
+    output_dir: Path,
+    *,
+    session_factory: SessionFactory,
+    user_id: int,
+    force_full: bool = False,
+) -> ExportResult:
+    """Export changes since the user's last export.
+
+    Falls back to a full export when no watermark exists (or ``force_full``).
+    When nothing changed no bundle is written and ``path`` is None.
+    """
+
+    mark = None if force_full else get_watermark(session_factory, user_id)
+    base_seq = mark.seq if mark is not None else None
+    return _export(output_dir, session_factory=session_factory, user_id=user_id, base_seq=base_seq)
+
+
+def read_manifest(path: Path) -> ExportManifest:
+    """Read the manifest of an export bundle."""
+
+    with ZipFile(path) as archive:
+        return ExportManifest.from_json(archive.read(MANIFEST_NAME))
+
+
+def find_export_chain(directory: Path, user_id: int) -> list[Path]:
+    """Return the newest full bundle for ``user_id`` plus the incrementals after it."""
+
+    manifests = _read_manifests(directory, user_id)
+    fulls = [item for item in manifests if item[0].kind == "full"]
+    if not fulls:
+        return []
+    base, base_path = max(fulls, key=lambda item: item[0].seq)
+    by_base = {
+        item[0].base_seq: item
+        for item in manifests
+        if item[0].kind == "incremental" and item[0].base_seq >= base.seq
+    }
+    chain = [base_path]
+    seq = base.seq
+    while seq in by_base:
+        manifest, path = by_base.pop(seq)
+        chain.append(path)
+        seq = manifest.seq
+    return chain
+
+
+def _read_manifests(directory: Path, user_id: int) -> list[tuple[ExportManifest, Path]]:
+    manifests: list[tuple[ExportManifest, Path]] = []
+    for path in Path(directory).glob(f"pocketsage_*_u{user_id}_*.zip"):
+        try:
+            manifests.append((read_manifest(path), path))
+        except (KeyError, ValueError, OSError):
+            continue
+    return manifests
+
+
+def prune_export_chains(
+    directory: Path, user_id: int, *, keep: int = EXPORT_CHAIN_RETENTION
+) -> list[Path]:
+    """Delete the bundles of chains older than the newest ``keep`` full bundles.
+
+    Returns the deleted paths. Unreadable bundles are left alone.
+    """
+
+    keep = max(keep, 1)  # never the chain a restore would use
+    manifests = _read_manifests(directory, user_id)
+    fulls = sorted((m.seq for m, _ in manifests if m.kind == "full"), reverse=True)
+    if len(fulls) <= keep:
+        return []
+    oldest_kept = fulls[keep - 1]
+    removed: list[Path] = []
+    for manifest, path in manifests:
+        start = manifest.seq if manifest.kind == "full" else manifest.base_seq
+        if start >= oldest_kept:
+            continue
+        try:
+            path.unlink()
+        except OSError:  # pragma: no cover - best-effort cleanup
+            continue
+        removed.append(path)
+    return removed
+
+
+def export_rolling(
+    output_dir: Path,
+    *,
+    session_factory: SessionFactory,
+    user_id: int,
+    full_every: int = FULL_EXPORT_INTERVAL,
+    keep: int = EXPORT_CHAIN_RETENTION,
+) -> ExportResult:
+    """Export incrementally, starting a new chain every ``full_every`` bundles.
+
+    A full bundle is also taken when the newest chain in ``output_dir`` does
+    not end at the user's watermark (a bundle was lost, or the mark was
+    advanced by an export elsewhere). Once a full bundle is written, chains
+    older than the newest ``keep`` fulls are deleted.
+    """
+
+    chain = find_export_chain(output_dir, user_id)
+    mark = get_watermark(session_factory, user_id)
+    force_full = (
+        not chain
+        or mark is None
+        or len(chain) - 1 >= full_every
+        or read_manifest(chain[-1]).seq != mark.seq
+    )
+    result = export_incremental(
+        output_dir, session_factory=session_factory, user_id=user_id, force_full=force_full
+    )
+    if result.path is not None and result.manifest.kind == "full":
+        prune_export_chains(output_dir, user_id, keep=keep)
+    return result
+
+
+def _iter_jsonl(archive: ZipFile, name: str) -> Iterator[dict]:
+    if name not in archive.namelist():
+        return
+    with archive.open(name) as raw:
+        for line in TextIOWrapper(raw, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _upsert(session: Session, model: type[SQLModel], rows: Iterable[dict]) -> int:
+    table = model.__table__  # type: ignore[attr-defined]
+    keys = [column.name for column in table.primary_key]
+    stmt = sqlite_insert(table)
+    updates = {
+        column.name: stmt.excluded[column.name]
+        for column in table.columns
+        if column.name not in keys
+    }
+    stmt = (
+        stmt.on_conflict_do_update(index_elements=keys, set_=updates)
+        if updates
+        else stmt.on_conflict_do_nothing(index_elements=keys)
+    )
+    total = 0
+    for batch in _batched(rows, EXPORT_BATCH_SIZE):
+        params = [model.model_validate(row).model_dump() for row in batch]
+        session.exec(stmt, params=params)  # type: ignore[call-overload]
+        total += len(params)
+    return total
+
+
+def replay_exports(paths: Sequence[Path], *, session_factory: SessionFactory) -> ReplayResult:
+    """Apply a full bundle and the incrementals that follow it, in order.
+
+    Each bundle is applied in its own transaction. The chain is validated up
+    front: it must start with a full export and every incremental must begin
+    at the previous bundle's ``seq``. Primary keys are preserved, so replay
+    into the database (or a fresh copy of it) the bundles were taken from.
+    """
+
+    manifests = [read_manifest(Path(path)) for path in paths]
+    if not manifests:
+        raise ValueError("No export bundles to replay")
+    if manifests[0].kind != "full":
+        raise ValueError("Replay must start with a full export")
+    for previous, manifest in zip(manifests, manifests[1:]):
+        if manifest.kind != "incremental" or manifest.user_id != previous.user_id:
+            raise ValueError(f"Unexpected bundle in chain: {manifest.kind} for {manifest.user_id}")
+        if manifest.base_seq != previous.seq:
+            raise ValueError(
+                f"Broken export chain: bundle starts at {manifest.base_seq}, "
+                f"expected {previous.seq}"
+            )
+
+    upserted = deleted = 0
+    for path, manifest in zip(paths, manifests):
+        with ZipFile(path) as archive, session_factory() as session:
+            if manifest.kind == "full":
+                for table_name in reversed(_TABLE_ORDER):
+                    model = _MODELS[table_name]
+                    result = session.exec(  # type: ignore[call-overload]
+                        delete(model).where(model.user_id == manifest.user_id)  # type: ignore[attr-defined]
+                    )
+                    deleted += result.rowcount or 0
+            tombstones: dict[str, list[dict]] = {}
+            for item in _iter_jsonl(archive, TOMBSTONES_NAME):
+                tombstones.setdefault(item["table"], []).append(item["key"])
+            for table_name in reversed(_TABLE_ORDER):
+                model = _MODELS[table_name]
+                for key in tombstones.get(table_name, []):
+                    result = session.exec(delete(model).where(_key_clause(model, key)))  # type: ignore[call-overload]
+                    deleted += result.rowcount or 0
+            for table_name in _TABLE_ORDER:
+                upserted += _upsert(
+                    session, _MODELS[table_name], _iter_jsonl(archive, f"{table_name}.jsonl")
+                )
+    return ReplayResult(
+        bundles=len(manifests), upserted=upserted, deleted=deleted, seq=manifests[-1].seq
+    )
+
+
+__all__ = [
+    "EXPORT_CHAIN_RETENTION",
+    "EXPORT_FORMAT_VERSION",
+    "ExportManifest",
+    "ExportResult",
+    "ReplayResult",
+    "current_seq",
+    "export_full",
+    "FULL_EXPORT_INTERVAL",
+    "export_incremental",
+    "export_rolling",
+    "find_export_chain",
+    "get_watermark",
+    "prune_export_chains",
+    "read_manifest",
+    "replay_exports",
+]
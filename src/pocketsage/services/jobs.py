@@ -4,12 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from threading import Lock, Thread
+from threading import Event, Lock, Thread
 from typing import Any, Callable, Dict, Iterable, Optional
 from uuid import uuid4
 
 __all__ = [
     "Job",
+    "JobCancelled",
+    "cancel_job",
     "enqueue",
     "get_job",
     "list_jobs",
@@ -18,6 +20,10 @@ __all__ = [
 ]
 
 
+class JobCancelled(Exception):
+    """Raised by job targets that stop early because cancellation was requested."""
+
+
 @dataclass
 class Job:
     """Simple in-memory representation of a background job."""
@@ -30,6 +36,31 @@ class Job:
     finished_at: Optional[datetime] = None
     error: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    progress: Dict[str, Any] = field(default_factory=dict)
+    _cancel_event: Event = field(default_factory=Event, repr=False, compare=False)
+    _done_event: Event = field(default_factory=Event, repr=False, compare=False)
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Return True once :meth:`cancel` has been called."""
+
+        return self._cancel_event.is_set()
+
+    def cancel(self) -> None:
+        """Ask the running target to stop at its next cancellation check."""
+
+        self._cancel_event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job has finished; False if ``timeout`` ran out first."""
+
+        return self._done_event.wait(timeout)
+
+    def report_progress(self, **values: Any) -> None:
+        """Merge progress counters (rows, rate, ETA, ...) into the job snapshot."""
+
+        with _LOCK:
+            self.progress.update(values)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -41,6 +72,8 @@ class Job:
             "finished_at": self.finished_at.isoformat() if self.finished_at else None,
             "error": self.error,
             "metadata": self.metadata,
+            "progress": dict(self.progress),
+            "cancel_requested": self.cancel_requested,
         }
 
 
@@ -85,9 +118,15 @@ def enqueue(
     target: Callable[..., Any],
     *,
     metadata: Optional[Dict[str, Any]] = None,
+    pass_job: bool = False,
     **kwargs: Any,
 ) -> Job:
-    """Schedule ``target`` for execution and return the tracked job."""
+    """Schedule ``target`` for execution and return the tracked job.
+
+    When ``pass_job`` is True the job itself is handed to ``target`` as the
+    ``job`` keyword so long-running work can report progress and poll for
+    cancellation. Targets signal an honoured cancel by raising ``JobCancelled``.
+    """
 
     job = Job(
         id=uuid4().hex,
@@ -97,12 +136,17 @@ def enqueue(
         metadata=metadata or {},
     )
     _store_job(job)
+    if pass_job:
+        kwargs["job"] = job
 
     def runner() -> None:
         job.status = "running"
         job.started_at = datetime.now(timezone.utc)
         try:
             target(**kwargs)
+        except JobCancelled as exc:
+            job.status = "cancelled"
+            job.error = str(exc) or None
         except Exception as exc:  # pragma: no cover - surfaced via job status checks
             job.status = "failed"
             job.error = str(exc)
@@ -110,6 +154,7 @@ def enqueue(
             job.status = "succeeded"
         finally:
             job.finished_at = datetime.now(timezone.utc)
+            job._done_event.set()
 
     if _RUN_ASYNC:
         thread = Thread(target=runner, name=f"PocketSageJob-{job.id}", daemon=True)
@@ -120,6 +165,17 @@ def enqueue(
     return job
 
 
+def cancel_job(job_id: str) -> bool:
+    """Request cancellation of ``job_id``; returns False when the job is unknown or done."""
+
+    with _LOCK:
+        job = _JOBS.get(job_id)
+    if job is None or job.status not in {"queued", "running"}:
+        return False
+    job.cancel()
+    return True
+
+
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
     """Return job metadata for ``job_id`` (or ``None`` if unknown)."""
 
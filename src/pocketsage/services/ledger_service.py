@@ -45,6 +45,25 @@ def normalize_category_value(raw_value: Optional[str]) -> Optional[int]:
         return None
 
 
+def ledger_filter_clauses(filters: LedgerFilters) -> list:
+    """Translate ``filters`` into SQL WHERE clauses matching ``filtered_transactions``."""
+
+    clauses = [Transaction.user_id == filters.user_id]
+    if filters.start_date:
+        clauses.append(Transaction.occurred_at >= filters.start_date)
+    if filters.end_date:
+        clauses.append(Transaction.occurred_at <= filters.end_date)
+    if filters.category_id:
+        clauses.append(Transaction.category_id == filters.category_id)
+    if filters.text:
+        clauses.append(Transaction.memo.contains(filters.text))  # type: ignore[attr-defined]
+    if filters.txn_type == "income":
+        clauses.append(Transaction.amount >= 0)
+    elif filters.txn_type == "expense":
+        clauses.append(Transaction.amount < 0)
+    return clauses
+
+
 def filtered_transactions(
     repo: SQLModelTransactionRepository, filters: LedgerFilters
 ) -> list[Transaction]:
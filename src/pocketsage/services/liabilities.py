@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
-from typing import Iterable
+from itertools import islice
+from typing import Iterable, Iterator
 
 from ..models.liability import Liability
 from ..models.transaction import Transaction
@@ -49,6 +51,104 @@ def _normalize_currency(amount: float) -> float:
     return round(amount + 1e-9, 2)
 
 
+@dataclass(slots=True)
+class PayoffSummary:
+    """When a liability is paid off and what it costs in interest.
+
+    ``months`` and ``payoff_date`` always match the full schedule. When the
+    annuity formula produced the summary, ``final_payment`` and
+    ``total_interest`` are within ``tolerance`` dollars of the schedule's
+    (``0.0`` means they are exact); iterate the schedule for exact figures.
+    """
+
+    months: int
+    total_interest: float
+    final_payment: float
+    payoff_date: date
+    tolerance: float = 0.0
+
+
+@dataclass(slots=True)
+class _Terms:
+    balance: float
+    monthly_rate: float
+    minimum_payment: float
+    due_day: int
+
+
+def _terms(liability: Liability) -> _Terms | None:
+    """The inputs a schedule depends on, or ``None`` when nothing is owed."""
+
+    if liability.balance is None or liability.balance <= 0:
+        return None
+    return _Terms(
+        balance=max(float(liability.balance), 0.0),
+        monthly_rate=max(float(liability.apr or 0.0), 0.0) / 100.0 / 12.0,
+        minimum_payment=max(float(liability.minimum_payment or 0.0), 0.0),
+        due_day=getattr(liability, "due_day", 1) or 1,
+    )
+
+
+def _step(balance: float, terms: _Terms) -> tuple[float, float, float]:
+    """One month on ``balance``: ``(payment, interest, remaining_balance)``.
+
+    These are the schedule's rounding rules; every row, stepped or projected,
+    goes through here.
+    """
+
+    interest = _normalize_currency(balance * terms.monthly_rate)
+    # Ensure we always reduce the balance even when minimum payment is low.
+    suggested_payment = max(terms.minimum_payment, interest + 1.0)
+    total_due = _normalize_currency(balance + interest)
+    payment = _normalize_currency(min(suggested_payment, total_due))
+
+    balance = _normalize_currency(balance + interest - payment)
+    if balance < 0.01:
+        balance = 0.0
+    return payment, interest, balance
+
+
+def _payment_row(balance: float, terms: _Terms, due_date: date) -> PaymentProjection:
+    """One month's payment on ``balance`` as a schedule row."""
+
+    payment, interest, balance = _step(balance, terms)
+    return PaymentProjection(
+        due_date=due_date,
+        payment=payment,
+        principal=_normalize_currency(payment - interest),
+        interest=interest,
+        remaining_balance=balance,
+    )
+
+
+def _nth_due_date(first: date, month: int, due_day: int) -> date:
+    """The due date ``month`` months after ``first`` (``0`` is ``first``)."""
+
+    month_index = first.month - 1 + month
+    return date(first.year + month_index // 12, month_index % 12 + 1, due_day)
+
+
+def iter_payment_schedule(
+    *, liability: Liability, today: date | None = None
+) -> Iterator[PaymentProjection]:
+    """Yield the rows of :func:`generate_payment_schedule` one month at a time.
+
+    Nothing is computed past the rows the caller consumes, so
+    ``islice(iter_payment_schedule(...), 12)`` only steps a year ahead.
+    """
+
+    terms = _terms(liability)
+    if terms is None:
+        return
+    next_due = _initial_due_date(today=today or date.today(), due_day=terms.due_day)
+    balance = terms.balance
+    while balance > 0:
+        row = _payment_row(balance, terms, next_due)
+        yield row
+        balance = row.remaining_balance
+        next_due = _advance_due_date(next_due, terms.due_day)
+
+
 def generate_payment_schedule(
     *, liability: Liability, months: int | None = None, today: date | None = None
 ) -> list[PaymentProjection]:
@@ -62,50 +162,193 @@ def generate_payment_schedule(
     is returned.
     """
 
-    if liability.balance is None or liability.balance <= 0:
+    if months is not None and months <= 0:
         return []
+    return list(islice(iter_payment_schedule(liability=liability, today=today), months))
 
-    current_date = today or date.today()
-    balance = max(float(liability.balance), 0.0)
-    monthly_rate = max(float(liability.apr or 0.0), 0.0) / 100.0 / 12.0
-    minimum_payment = max(float(liability.minimum_payment or 0.0), 0.0)
-    due_day = getattr(liability, "due_day", 1) or 1
 
-    schedule: list[PaymentProjection] = []
-    next_due = _initial_due_date(today=current_date, due_day=due_day)
+def _fixed_payment(terms: _Terms) -> float | None:
+    """The monthly payment when it is the same every month but the last.
 
-    if months is not None and months <= 0:
-        return schedule
-
-    iterations = 0
-    while balance > 0 and (months is None or iterations < months):
-        iterations += 1
-
-        interest = _normalize_currency(balance * monthly_rate)
-        # Ensure we always reduce the balance even when minimum payment is low.
-        suggested_payment = max(minimum_payment, interest + 1.0)
-        total_due = _normalize_currency(balance + interest)
-        payment = _normalize_currency(min(suggested_payment, total_due))
-        principal = _normalize_currency(payment - interest)
-
-        balance = _normalize_currency(balance + interest - payment)
-        if balance < 0.01:
-            balance = 0.0
-
-        schedule.append(
-            PaymentProjection(
-                due_date=next_due,
-                payment=payment,
-                principal=principal,
-                interest=interest,
-                remaining_balance=balance,
-            )
+    That holds once the minimum covers the first month's interest plus the
+    $1 of principal every row retires: the interest only falls from there.
+    """
+
+    first_interest = _normalize_currency(terms.balance * terms.monthly_rate)
+    if terms.minimum_payment < first_interest + 1.0:
+        return None
+    return terms.minimum_payment
+
+
+def _annuity_balance(terms: _Terms, payment: float, months: int) -> float:
+    """Balance left after ``months`` payments of ``payment`` (annuity formula)."""
+
+    rate = terms.monthly_rate
+    if rate == 0:
+        return terms.balance - payment * months
+    growth = (1.0 + rate) ** months
+    return terms.balance * growth - payment * (growth - 1.0) / rate
+
+
+def _annuity_drift(terms: _Terms, months: int) -> float:
+    """Largest gap between the schedule's balance after ``months`` rows and the formula's.
+
+    Each row rounds its interest to the cent, an error of at most half a cent
+    that then compounds with the balance; nothing else in a row is inexact.
+    """
+
+    rate = terms.monthly_rate
+    if rate == 0:
+        return 0.0
+    return 0.005 * ((1.0 + rate) ** months - 1.0) / rate
+
+
+# Rows before payoff that are stepped with the schedule's rules instead of
+# taken from the formula.
+ANNUITY_TAIL_MONTHS = 3
+# The formula is only used while its worst-case error stays within this
+# fraction of the monthly payment.
+ANNUITY_MAX_TOLERANCE = 0.01
+
+
+@dataclass(slots=True)
+class _AnnuityTail:
+    """The last rows of a fixed-payment schedule, from the annuity formula."""
+
+    months: int
+    rows: list[PaymentProjection]
+    # Bound on how far the rows' amounts are from the iterated schedule's.
+    tolerance: float
+
+
+def _annuity_tail(terms: _Terms, payment: float, first_due: date) -> _AnnuityTail | None:
+    """Month count and last rows of a fixed-payment schedule.
+
+    The annuity formula gives the balance a few months before payoff and the
+    final rows are stepped from there with :func:`_payment_row`. The formula
+    misses the per-row interest rounding, so every stepped balance carries
+    an error bound; the month count is only returned when it holds for any
+    balance within that bound, and the amounts only while the bound stays
+    within ``ANNUITY_MAX_TOLERANCE`` of the payment. Otherwise ``None``:
+    only iterating the rows can tell.
+    """
+
+    rate = terms.monthly_rate
+    if rate == 0:
+        periods = terms.balance / payment
+    else:
+        periods = -math.log1p(-rate * terms.balance / payment) / math.log1p(rate)
+    start = max(math.ceil(periods) - ANNUITY_TAIL_MONTHS, 0)
+    balance = max(_normalize_currency(_annuity_balance(terms, payment, start)), 0.0)
+    # The formula's balance is exact at 0% APR, where it is a whole number of cents.
+    error = _annuity_drift(terms, start) + 0.005 if rate > 0 and start > 0 else 0.0
+
+    rows: list[PaymentProjection] = []
+    before_last, last_error = balance, error
+    while balance > 0:
+        before_last, last_error = balance, error
+        row = _payment_row(
+            balance, terms, _nth_due_date(first_due, start + len(rows), terms.due_day)
         )
+        rows.append(row)
+        # Two balances ``error`` apart round their interest at most a cent apart.
+        if error > 0:
+            error = error * (1.0 + rate) + 0.01
+        balance = row.remaining_balance
+    if not rows:
+        return None
+    # The true balance before the last row must survive the previous row (more
+    # than a cent) and be paid off by this one, wherever it is in the bound.
+    if last_error > 0 and (
+        before_last - last_error < 0.02
+        or (before_last + last_error) * (1.0 + rate) + 0.01 >= payment
+    ):
+        return None
+    tolerance = last_error * (1.0 + rate) + 0.01 if last_error > 0 else 0.0
+    if tolerance > ANNUITY_MAX_TOLERANCE * payment:
+        return None
+    return _AnnuityTail(
+        months=start + len(rows), rows=rows, tolerance=math.ceil(tolerance * 100) / 100
+    )
+
 
-        # Prepare the next due date and break once the balance is cleared.
-        next_due = _advance_due_date(next_due, due_day)
+def payment_schedule_summary(
+    *, liability: Liability, today: date | None = None
+) -> PayoffSummary | None:
+    """Months to payoff, total interest and final payment without the rows.
+
+    For a fixed payment (see :func:`_fixed_payment`) the annuity formula
+    jumps to a few months before payoff and the last rows are stepped by the
+    schedule's own rules (see :func:`_annuity_tail`). The month count and
+    payoff date match :func:`generate_payment_schedule`; the final payment
+    and ``total_interest`` are approximate, within the summary's
+    ``tolerance`` (a worst case in which every month's interest rounding
+    goes the same way). Other liabilities, and loans the formula cannot
+    settle, step the balance month by month with the same rules, exactly
+    but without building rows. Returns ``None`` when nothing is owed.
+    """
 
-    return schedule
+    terms = _terms(liability)
+    if terms is None:
+        return None
+    first_due = _initial_due_date(today=today or date.today(), due_day=terms.due_day)
+    payment = _fixed_payment(terms)
+    tail = _annuity_tail(terms, payment, first_due) if payment is not None else None
+    if payment is None or tail is None:
+        # Step the balance alone, without building the rows.
+        balance, months, total_interest = terms.balance, 0, 0.0
+        while balance > 0:
+            final_payment, interest, balance = _step(balance, terms)
+            months += 1
+            total_interest += interest
+        return PayoffSummary(
+            months=months,
+            total_interest=_normalize_currency(total_interest),
+            final_payment=final_payment,
+            payoff_date=_nth_due_date(first_due, months - 1, terms.due_day),
+        )
+
+    # Every row but the last pays exactly ``payment``.
+    paid = payment * (tail.months - 1) + tail.rows[-1].payment
+    return PayoffSummary(
+        months=tail.months,
+        total_interest=_normalize_currency(paid - terms.balance),
+        final_payment=tail.rows[-1].payment,
+        payoff_date=tail.rows[-1].due_date,
+        tolerance=tail.tolerance,
+    )
+
+
+def projected_payment(
+    *, liability: Liability, month: int, today: date | None = None
+) -> PaymentProjection | None:
+    """Row ``month`` (``0`` is the next due date) of the payment schedule.
+
+    Fixed-payment liabilities jump straight to the balance owed that month
+    with the annuity formula, then apply the usual row rounding, so the row
+    can differ from the iterated one by the schedule's accumulated interest
+    rounding, at most the ``tolerance`` of :func:`payment_schedule_summary`;
+    the last few rows come from :func:`_annuity_tail`. Others, and loans the
+    formula cannot settle, step there with :func:`iter_payment_schedule`.
+    Returns ``None`` once the liability is paid off.
+    """
+
+    terms = _terms(liability)
+    if terms is None or month < 0:
+        return None
+    first_due = _initial_due_date(today=today or date.today(), due_day=terms.due_day)
+    payment = _fixed_payment(terms)
+    tail = _annuity_tail(terms, payment, first_due) if payment is not None else None
+    if payment is None or tail is None:
+        return next(
+            islice(iter_payment_schedule(liability=liability, today=today), month, None), None
+        )
+    if month >= tail.months:
+        return None
+    if month >= tail.months - len(tail.rows):
+        return tail.rows[month - (tail.months - len(tail.rows))]
+    balance = max(_normalize_currency(_annuity_balance(terms, payment, month)), 0.0)
+    return _payment_row(balance, terms, _nth_due_date(first_due, month, terms.due_day))
 
 
 def flatten_schedules(
@@ -148,4 +391,12 @@ def build_payment_transaction(
     )
 
 
-__all__ = ["PaymentProjection", "generate_payment_schedule", "flatten_schedules"]
+__all__ = [
+    "PaymentProjection",
+    "PayoffSummary",
+    "flatten_schedules",
+    "generate_payment_schedule",
+    "iter_payment_schedule",
+    "payment_schedule_summary",
+    "projected_payment",
+]
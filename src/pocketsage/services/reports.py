@@ -1,15 +1,31 @@
-"""Reporting utilities for PocketSage."""
+"""Reporting utilities for PocketSage.
+
+matplotlib is imported on first use rather than with this module: the
+desktop views only need ``spending_totals`` and draw their charts with
+native Flet controls, so they should not pay matplotlib's import cost.
+"""
 
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable, Protocol
-
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Mapping, Protocol
 
 from ..models.transaction import Transaction
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+def pyplot():
+    """Import pyplot on the headless Agg backend (safe off the main thread)."""
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
 
 class ReportRenderer(Protocol):
     """Protocol describing renderer behavior."""
@@ -18,16 +34,47 @@ class ReportRenderer(Protocol):
         ...
 
 
+def spending_totals(transactions: Iterable[Transaction]) -> dict[object, float]:
+    """Sum absolute expense amounts (negative transactions) per category_id."""
+
+    totals: dict[object, float] = {}
+    for tx in transactions:
+        cid = getattr(tx, "category_id", "uncategorized") or "uncategorized"
+        amt = float(getattr(tx, "amount", 0) or 0)
+        if amt >= 0:
+            continue
+        totals[cid] = totals.get(cid, 0) + abs(amt)
+    return totals
+
+
 def build_spending_chart(
     *,
     transactions: Iterable[Transaction],
     category_lookup: dict[object, str] | None = None,
+) -> Figure:
+    """Draw the spending donut from raw transactions.
+
+    Adapter over ``build_spending_chart_from_totals``: negative amounts are
+    summed per category_id by ``spending_totals`` first. Callers that can
+    aggregate in SQL should pass the totals directly instead.
+    """
+
+    return build_spending_chart_from_totals(
+        totals=spending_totals(transactions), category_lookup=category_lookup
+    )
+
+
+def build_spending_chart_from_totals(
+    *,
+    totals: Mapping[object, float],
+    category_lookup: dict[object, str] | None = None,
 ) -> Figure:
     """Create an enhanced matplotlib donut chart representing spending by category.
 
-    Transactions with negative amounts are considered expenses and aggregated by category_id.
-    Labels are resolved via ``category_lookup`` when provided for readability/accessibility.
-    
+    ``totals`` maps a category (id or name) to the amount spent, e.g. from a
+    SQL ``GROUP BY``. Labels are resolved via ``category_lookup`` when
+    provided for readability/accessibility.
+
     Enhanced features:
     - Center total display
     - Legend with amounts and percentages
@@ -35,17 +82,7 @@ def build_spending_chart(
     - Currency formatting
     """
 
-    totals: dict = {}
-    grand_total = 0.0
-
-    for tx in transactions:
-        cid = getattr(tx, "category_id", "uncategorized") or "uncategorized"
-        amt = float(getattr(tx, "amount", 0) or 0)
-        if amt >= 0:
-            continue
-        abs_amt = abs(amt)
-        totals[cid] = totals.get(cid, 0) + abs_amt
-        grand_total += abs_amt
+    grand_total = float(sum(totals.values()))
 
     # Sort by amount descending for better visualization
     sorted_items = sorted(totals.items(), key=lambda x: x[1], reverse=True)
@@ -59,6 +96,7 @@ def build_spending_chart(
     # Calculate percentages
     percentages = [(s / grand_total * 100) if grand_total > 0 else 0 for s in sizes]
 
+    plt = pyplot()
     fig, ax = plt.subplots(figsize=(10, 7))
 
     if sizes:
@@ -158,11 +196,27 @@ def export_spending_png(
 ) -> Path:
     """Render spending chart to PNG and return the path."""
 
-    fig = build_spending_chart(transactions=transactions)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    if renderer is not None:
-        renderer.render(fig, output_path=output_path)
-    else:
-        fig.savefig(output_path, bbox_inches="tight", dpi=120)
-    plt.close(fig)
+    if renderer is None:
+        with output_path.open("wb") as handle:
+            write_spending_png(totals=spending_totals(transactions), output=handle)
+        return output_path
+    fig = build_spending_chart(transactions=transactions)
+    renderer.render(fig, output_path=output_path)
+    pyplot().close(fig)
     return output_path
+
+
+def write_spending_png(
+    *,
+    totals: Mapping[object, float],
+    output: BinaryIO,
+    category_lookup: dict[object, str] | None = None,
+) -> None:
+    """Render the spending chart from aggregated totals into an open binary stream."""
+
+    fig = build_spending_chart_from_totals(totals=totals, category_lookup=category_lookup)
+    try:
+        fig.savefig(output, format="png", bbox_inches="tight", dpi=120)
+    finally:
+        pyplot().close(fig)
@@ -1,10 +1,30 @@
-"""Optional watchdog-based CSV folder ingestion."""
+"""Optional watchdog-based CSV folder ingestion.
+
+Filesystem events are only hints: editors and bank exporters emit bursts of
+created/modified/moved events while a file is still being written. The
+``WatcherIngestionService`` therefore coalesces events per path, waits until a
+file's size and mtime stop changing, and hands stable files to a single worker
+that imports them in batches through a bounded queue. Ledger batches run as
+jobs (see ``services.jobs``), like manual imports.
+"""
 
 from __future__ import annotations
 
 import importlib
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Protocol
+from typing import Callable, ContextManager, Mapping, Optional, Protocol, Sequence
+
+from sqlmodel import Session
+
+from . import importers, jobs
+
+logger = logging.getLogger(__name__)
 
 
 class CSVImporter(Protocol):
@@ -14,38 +34,392 @@ class CSVImporter(Protocol):
         ...
 
 
+class BatchImporter(Protocol):
+    """Import several ready files, returning rows created per path."""
+
+    def __call__(
+        self, paths: Sequence[Path], *, should_cancel: Callable[[], bool] | None = None
+    ) -> Mapping[Path, int]:  # pragma: no cover - interface
+        ...
+
+
+class BatchImportError(Exception):
+    """Some files of a batch failed or were cancelled; the others were imported."""
+
+    def __init__(self, created: Mapping[Path, int], errors: Mapping[Path, Exception]) -> None:
+        super().__init__(f"{len(errors)} of {len(created) + len(errors)} files not imported")
+        self.created = dict(created)
+        self.errors = dict(errors)
+
+
+@dataclass
+class _PendingFile:
+    last_event: float
+    signature: Optional[tuple[int, int]] = None
+    stable_polls: int = 0
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one worker batch."""
+
+    paths: tuple[Path, ...]
+    created: dict[Path, int] = field(default_factory=dict)
+    errors: dict[Path, Exception] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def total_created(self) -> int:
+        return sum(self.created.values())
+
+
+class WatcherIngestionService:
+    """Debounced, batched ingestion of CSV files dropped into a folder.
+
+    ``notify`` records an event for a path (repeated events only push back its
+    quiet period). ``poll_once`` promotes files that have been quiet for
+    ``debounce_seconds`` and whose ``(size, mtime)`` held for ``stable_polls``
+    consecutive polls onto a queue of at most ``max_queue`` paths; when the
+    queue is full files simply stay pending. The worker takes up to
+    ``max_batch`` paths at a time and passes them to ``batch_importer`` in one
+    call. ``start``/``stop`` run the watchdog observer plus the poll and worker
+    threads; the individual steps can also be driven directly.
+    """
+
+    def __init__(
+        self,
+        *,
+        folder: Path,
+        batch_importer: BatchImporter,
+        allowed_filename: str | None = None,
+        debounce_seconds: float = 1.0,
+        stable_polls: int = 2,
+        poll_interval: float = 0.5,
+        max_queue: int = 16,
+        max_batch: int = 8,
+        on_batch: Callable[[BatchResult], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.folder = Path(folder)
+        self.allowed_filename = allowed_filename
+        self.debounce_seconds = debounce_seconds
+        self.stable_polls = max(stable_polls, 1)
+        self.poll_interval = poll_interval
+        self.max_batch = max(max_batch, 1)
+        self._batch_importer = batch_importer
+        self._on_batch = on_batch
+        self._clock = clock
+        self._pending: dict[Path, _PendingFile] = {}
+        self._queued: set[Path] = set()
+        self._queue: queue.Queue[Path] = queue.Queue(maxsize=max(max_queue, 1))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self.observer = None
+
+    # Event intake -----------------------------------------------------------------
+    def accepts(self, path: Path) -> bool:
+        if self.allowed_filename:
+            return path.name == self.allowed_filename
+        return path.suffix.lower() == ".csv"
+
+    def notify(self, path: Path | str) -> None:
+        """Record a filesystem event for ``path``; bursts collapse into one entry."""
+
+        candidate = Path(path)
+        if not self.accepts(candidate):
+            return
+        now = self._clock()
+        with self._lock:
+            state = self._pending.get(candidate)
+            if state is None:
+                self._pending[candidate] = _PendingFile(last_event=now)
+            else:
+                state.last_event = now
+                state.stable_polls = 0
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    @property
+    def queued_count(self) -> int:
+        return self._queue.qsize()
+
+    # Stability detection ----------------------------------------------------------
+    def poll_once(self) -> list[Path]:
+        """Move files that are quiet and stable onto the work queue."""
+
+        now = self._clock()
+        ready: list[Path] = []
+        with self._lock:
+            for path, state in list(self._pending.items()):
+                if path in self._queued or now - state.last_event < self.debounce_seconds:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    # Moved away or deleted before it settled.
+                    del self._pending[path]
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if signature != state.signature or stat.st_size == 0:
+                    state.signature = signature
+                    state.stable_polls = 0
+                    continue
+                state.stable_polls += 1
+                if state.stable_polls < self.stable_polls:
+                    continue
+                try:
+                    self._queue.put_nowait(path)
+                except queue.Full:
+                    logger.debug("Watcher queue full; %s stays pending", path.name)
+                    break
+                del self._pending[path]
+                self._queued.add(path)
+                ready.append(path)
+        return ready
+
+    # Worker -----------------------------------------------------------------------
+    def next_batch(self, timeout: float | None = None) -> list[Path]:
+        """Block for the next ready file, then take whatever else is queued."""
+
+        try:
+            first = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return []
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def process_batch(self, paths: Sequence[Path]) -> BatchResult:
+        """Import ``paths`` together, retrying one by one if the batch fails.
+
+        A ``BatchImportError`` already says which files failed, so nothing is
+        retried then.
+        """
+
+        started = time.perf_counter()
+        created: dict[Path, int] = {}
+        errors: dict[Path, Exception] = {}
+        try:
+            created.update(self._batch_importer(paths, should_cancel=self._stop_event.is_set))
+        except BatchImportError as exc:
+            created.update(exc.created)
+            errors.update(exc.errors)
+        except Exception as exc:
+            if len(paths) == 1 or self._stop_event.is_set():
+                errors.update({path: exc for path in paths})
+            else:
+                logger.warning("Watcher batch failed (%s); retrying files individually", exc)
+                for path in paths:
+                    try:
+                        created.update(
+                            self._batch_importer([path], should_cancel=self._stop_event.is_set)
+                        )
+                    except Exception as file_exc:
+                        errors[path] = file_exc
+        finally:
+            with self._lock:
+                self._queued.difference_update(paths)
+
+        for path, exc in errors.items():
+            logger.warning("Watcher import of %s failed: %s", path.name, exc)
+        result = BatchResult(
+            paths=tuple(paths),
+            created=created,
+            errors=errors,
+            elapsed=time.perf_counter() - started,
+        )
+        if self._on_batch is not None:
+            self._on_batch(result)
+        return result
+
+    # Lifecycle --------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> "WatcherIngestionService":
+        """Start the watchdog observer and the poll/worker threads."""
+
+        try:
+            events_mod = importlib.import_module("watchdog.events")
+            observers_mod = importlib.import_module("watchdog.observers")
+            FileSystemEventHandler = getattr(events_mod, "FileSystemEventHandler")
+            Observer = getattr(observers_mod, "Observer")
+        except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "watchdog not installed; install extras to enable watched folder"
+            ) from exc
+
+        service = self
+
+        class _Handler(FileSystemEventHandler):  # type: ignore[misc]
+            def _handle(self, event, attr: str = "src_path") -> None:
+                if getattr(event, "is_directory", False):
+                    return
+                service.notify(getattr(event, attr))
+
+            def on_created(self, event) -> None:
+                self._handle(event)
+
+            def on_modified(self, event) -> None:
+                self._handle(event)
+
+            def on_moved(self, event) -> None:
+                # Exporters often write a temp file and rename it into place.
+                self._handle(event, "dest_path")
+
+        self._stop_event.clear()
+        observer = Observer()
+        observer.schedule(_Handler(), path=str(self.folder), recursive=False)
+        observer.start()
+        self.observer = observer
+        self._threads = [
+            threading.Thread(target=self._poll_loop, name="watcher-poll", daemon=True),
+            threading.Thread(target=self._work_loop, name="watcher-import", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting events and wait for the threads to exit.
+
+        A batch in progress is cancelled and rolled back; files still pending
+        are dropped and will be picked up by the next event for them.
+        """
+
+        self._stop_event.set()
+        if self.observer is not None:
+            try:
+                self.observer.stop()
+                self.observer.join(timeout)
+            except Exception:  # pragma: no cover - defensive shutdown
+                logger.debug("Watcher observer did not stop cleanly", exc_info=True)
+            self.observer = None
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        with self._lock:
+            self._pending.clear()
+
+    def _poll_loop(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll_once()
+            except Exception:  # pragma: no cover - keep the poller alive
+                logger.exception("Watcher poll failed")
+
+    def _work_loop(self) -> None:
+        while not self._stop_event.is_set():
+            batch = self.next_batch(timeout=self.poll_interval)
+            if batch and not self._stop_event.is_set():
+                self.process_batch(batch)
+
+
+WATCH_IMPORT_JOB = "watched-import"
+
+
+def make_ledger_batch_importer(
+    *,
+    session_factory: Callable[[], ContextManager[Session]],
+    user_id: int,
+    progress: Callable[[Path, "importers.ImportProgress"], None] | None = None,
+) -> BatchImporter:
+    """Build a batch importer that runs each batch as one ledger import job.
+
+    The job reports live progress and can be cancelled through
+    ``services.jobs`` like a manual import. Files are imported one after the
+    other with the importer's default checkpointing, so a cancelled or
+    failed file keeps its committed rows and resumes from its checkpoint
+    when it is picked up again, without undoing the rest of the batch.
+    Files that did not finish are reported with ``BatchImportError``.
+    """
+
+    def _import(
+        paths: Sequence[Path], *, should_cancel: Callable[[], bool] | None = None
+    ) -> dict[Path, int]:
+        created: dict[Path, int] = {}
+        errors: dict[Path, Exception] = {}
+
+        def _on_progress(
+            job: jobs.Job, index: int, path: Path, snapshot: importers.ImportProgress
+        ) -> None:
+            job.report_progress(
+                file=path.name, files_done=index, files=len(paths), **snapshot.to_dict()
+            )
+            if progress is not None:
+                progress(path, snapshot)
+
+        def _run(*, job: jobs.Job) -> None:
+            def _cancelled() -> bool:
+                return job.cancel_requested or (should_cancel is not None and should_cancel())
+
+            for index, path in enumerate(paths):
+                try:
+                    created[path] = importers.import_ledger_transactions(
+                        csv_path=path,
+                        session_factory=session_factory,
+                        user_id=user_id,
+                        progress=partial(_on_progress, job, index, path),
+                        should_cancel=_cancelled,
+                    )
+                except jobs.JobCancelled as exc:
+                    # The rest of the batch waits until the files are picked up again.
+                    errors.update({pending: exc for pending in paths[index:]})
+                    raise
+                except Exception as exc:
+                    errors[path] = exc
+            if errors:
+                raise BatchImportError(created, errors)
+
+        job = jobs.enqueue(
+            WATCH_IMPORT_JOB,
+            _run,
+            metadata={"paths": [str(path) for path in paths], "mode": "ledger"},
+            pass_job=True,
+        )
+        job.wait()
+        if errors:
+            raise BatchImportError(created, errors)
+        return created
+
+    return _import
+
+
 def start_watcher(*, folder: Path, importer: CSVImporter, allowed_filename: str | None = None):
-    """Start a watchdog observer for the provided folder.
+    """Start a debounced watcher for the provided folder.
 
     When allowed_filename is provided, only matching files will be processed.
+    The per-file ``importer`` is called from the single worker thread; the
+    returned service's ``stop()`` shuts everything down.
     """
 
-    try:
-        events_mod = importlib.import_module("watchdog.events")
-        observers_mod = importlib.import_module("watchdog.observers")
-        FileSystemEventHandler = getattr(events_mod, "FileSystemEventHandler")
-        Observer = getattr(observers_mod, "Observer")
-    except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
-        raise RuntimeError(
-            "watchdog not installed; install extras to enable watched folder"
-        ) from exc
-
-    class _Handler(FileSystemEventHandler):  # type: ignore[misc]
-        def __init__(self, *, importer: CSVImporter) -> None:
-            self.importer = importer
-
-        def on_created(self, event) -> None:  # pragma: no cover - integration path
-            if getattr(event, "is_directory", False):
-                return
-            candidate = Path(event.src_path)
-            if allowed_filename and candidate.name != allowed_filename:
-                return
-            # TODO(@teammate): debounce rapid duplicate events and batch processing.
-            self.importer(csv_path=candidate)
-
-    observer = Observer()
-    handler = _Handler(importer=importer)
-    observer.schedule(handler, path=str(folder), recursive=False)
-    observer.start()
-    # TODO(@ops-team): surface observer lifecycle hooks + shutdown in app factory.
-    return observer
+    def _per_file(
+        paths: Sequence[Path], *, should_cancel: Callable[[], bool] | None = None
+    ) -> dict[Path, int]:
+        return {path: importer(csv_path=path) for path in paths}
+
+    service = WatcherIngestionService(
+        folder=folder, batch_importer=_per_file, allowed_filename=allowed_filename
+    )
+    return service.start()
+
+
+__all__ = [
+    "BatchImportError",
+    "BatchImporter",
+    "BatchResult",
+    "CSVImporter",
+    "WATCH_IMPORT_JOB",
+    "WatcherIngestionService",
+    "make_ledger_batch_importer",
+    "start_watcher",
+]
@@ -77,3 +77,124 @@ def test_backup_and_restore_round_trip(tmp_path: Path, monkeypatch: pytest.Monke
 
     restored_db = admin_tasks.restore_database(backup_path, config=config)
     assert restored_db.exists()
+
+
+def test_backup_is_online_and_includes_wal(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import sqlite3
+    import threading
+
+    from pocketsage.services.jobs import JobCancelled
+
+    data_dir = tmp_path / "instance"
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(data_dir))
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{data_dir/'pocketsage.db'}")
+    config = BaseConfig()
+    engine = create_db_engine(config)
+    init_database(engine)
+
+    def factory():
+        return session_scope(engine)
+
+    user = auth.ensure_local_user(factory)
+    admin_tasks.run_demo_seed(session_factory=factory, user_id=user.id)
+
+    # Keep a writer connection open in WAL mode so committed rows stay in the
+    # -wal file; a raw file copy would miss them.
+    db_path = data_dir / "pocketsage.db"
+    writer = sqlite3.connect(db_path, check_same_thread=False)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("PRAGMA wal_autocheckpoint=0")
+    writer.execute("CREATE TABLE wal_probe (id INTEGER PRIMARY KEY, note TEXT)")
+    writer.executemany(
+        "INSERT INTO wal_probe (note) VALUES (?)", [("x" * 200,) for _ in range(2000)]
+    )
+    writer.commit()
+
+    stop = threading.Event()
+    writes: list[int] = []
+
+    def _keep_writing():
+        while not stop.is_set():
+            writer.execute("INSERT INTO wal_probe (note) VALUES ('during')")
+            writer.commit()
+            writes.append(1)
+            stop.wait(0.002)
+
+    thread = threading.Thread(target=_keep_writing)
+    thread.start()
+    updates: list[admin_tasks.BackupProgress] = []
+    try:
+        backup_path = admin_tasks.backup_database(
+            data_dir / "backups", config=config, progress=updates.append, pages_per_step=8
+        )
+    finally:
+        stop.set()
+        thread.join()
+
+    assert writes, "writers should not be blocked by the backup"
+    assert updates and updates[-1].fraction == 1.0
+    assert not list((data_dir / "backups").glob("*.part"))
+    with sqlite3.connect(backup_path) as copy:
+        assert copy.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        assert copy.execute("SELECT count(*) FROM wal_probe").fetchone()[0] >= 2000
+
+    with pytest.raises(JobCancelled):
+        admin_tasks.backup_database(
+            data_dir / "cancelled", config=config, should_cancel=lambda: True, pages_per_step=8
+        )
+    assert not list((data_dir / "cancelled").iterdir())
+    writer.close()
+
+
+def test_restore_swaps_atomically_and_reloads_context(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    import sqlite3
+    from datetime import datetime
+
+    from pocketsage.desktop import controllers
+    from pocketsage.desktop.context import create_app_context
+    from pocketsage.models import Transaction
+
+    data_dir = tmp_path / "instance"
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(data_dir))
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{data_dir/'pocketsage.db'}")
+    ctx = create_app_context()
+    uid = ctx.require_user_id()
+    ctx.transaction_repo.create(
+        Transaction(user_id=uid, occurred_at=datetime(2024, 1, 1), amount=-5.0, memo="kept"),
+        user_id=uid,
+    )
+    backup_path = admin_tasks.backup_database(data_dir / "backups", config=ctx.config)
+
+    # Later edits sit in the live database's WAL when the restore happens.
+    with ctx.engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    ctx.transaction_repo.create(
+        Transaction(user_id=uid, occurred_at=datetime(2024, 2, 1), amount=-7.0, memo="dropped"),
+        user_id=uid,
+    )
+    old_engine = ctx.engine
+
+    target = controllers.restore_database_and_reload(ctx, backup_path)
+
+    assert ctx.engine is not old_engine
+    assert ctx.current_user is not None and ctx.current_user.id == uid
+    memos = {tx.memo for tx in ctx.transaction_repo.list_all(user_id=uid)}
+    assert memos == {"kept"}
+    assert not list(data_dir.glob("*.restore-*"))
+    with sqlite3.connect(target) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+    # A broken or foreign file is rejected before the live database is touched.
+    garbage = tmp_path / "garbage.db"
+    garbage.write_bytes(b"SQLite format 3\x00" + b"\x00" * 4000)
+    foreign = tmp_path / "foreign.db"
+    with sqlite3.connect(foreign) as conn:
+        conn.execute('CREATE TABLE "user" (id INTEGER PRIMARY KEY)')
+        conn.execute('CREATE TABLE "transaction" (id INTEGER PRIMARY KEY)')
+    for bad, message in ((garbage, "Backup"), (foreign, "schema is incompatible")):
+        with pytest.raises(ValueError, match=message):
+            controllers.restore_database_and_reload(ctx, bad)
+    assert {tx.memo for tx in ctx.transaction_repo.list_all(user_id=uid)} == {"kept"}
+    assert not list(data_dir.glob("*.restore-*"))
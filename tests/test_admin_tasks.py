@@ -88,6 +88,24 @@ def test_run_export_creates_zip_and_prunes_old(session_factory, tmp_path: Path):
     assert created in archives
 
 
+def test_run_export_failure_leaves_no_partial_archive(
+    session_factory, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    factory, engine, user = session_factory
+    run_demo_seed(session_factory=factory, user_id=user.id)
+    exports_dir = tmp_path / "exports"
+
+    def fail_midway(*, transactions, stream):
+        stream.write("id,date\n")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("pocketsage.services.admin_tasks.write_transactions_csv", fail_midway)
+    with pytest.raises(RuntimeError):
+        run_export(exports_dir, session_factory=factory, user_id=user.id)
+
+    assert list(exports_dir.iterdir()) == []
+
+
 def test_reset_demo_database_restores_seed(session_factory):
     factory, engine, user = session_factory
 
@@ -114,9 +114,12 @@ def _find_image_sources(root: ft.Control) -> list[str]:
             continue
         seen.add(id(control))
         if isinstance(control, ft.Image):
-            src = getattr(control, "src", "") or ""
+            src = getattr(control, "src", "") or getattr(control, "src_base64", "") or ""
             if src:
                 images.append(src)
+        elif isinstance(control, (ft.PieChart, ft.LineChart, ft.BarChart)):
+            # On-screen charts are native Flet controls rather than images.
+            images.append(type(control).__name__)
         for attr in ("controls", "content", "actions"):
             child = getattr(control, attr, None)
             if child is None:
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pocketsage.config import BaseConfig
+from pocketsage.infra.database import create_db_engine, init_database, session_scope
+from pocketsage.models import Transaction
+from pocketsage.services import admin_tasks, auth
+from pocketsage.services.backup_store import BackupStore, RetentionPolicy, select_retained
+from sqlalchemy import insert
+
+
+def test_select_retained_keeps_daily_weekly_monthly():
+    start = datetime(2024, 1, 1, 3)
+    # Two snapshots a day for 120 days.
+    items = [(f"s{idx}", start + timedelta(hours=12 * idx)) for idx in range(240)]
+    keep = select_retained(items, RetentionPolicy(daily=7, weekly=4, monthly=3))
+
+    newest = items[-1]
+    days = {when.date() for key, when in items if key in keep}
+    assert newest[0] in keep
+    # 7 days + up to 4 older week representatives + up to 3 month representatives
+    assert 7 <= len(keep) <= 14
+    assert len(days) == len(keep)
+    assert {when.month for key, when in items if key in keep} >= {2, 3, 4}
+
+    assert select_retained(items, RetentionPolicy(last=3, daily=0, weekly=0, monthly=0)) == {
+        "s237",
+        "s238",
+        "s239",
+    }
+    assert select_retained([], RetentionPolicy()) == set()
+
+
+def _make_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    data_dir = tmp_path / "instance"
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(data_dir))
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{data_dir/'pocketsage.db'}")
+    config = BaseConfig()
+    engine = create_db_engine(config)
+    init_database(engine)
+
+    def factory():
+        return session_scope(engine)
+
+    user = auth.ensure_local_user(factory)
+    return config, engine, factory, user
+
+
+def _add_rows(factory, user_id: int, start: int, count: int) -> None:
+    with factory() as session:
+        session.exec(
+            insert(Transaction),
+            params=[
+                {
+                    "user_id": user_id,
+                    "occurred_at": datetime(2024, 1, 1 + idx % 28),
+                    "amount": -1.0 - idx % 50,
+                    "memo": f"Snapshot row {idx} " + "x" * 80,
+                    "currency": "USD",
+                }
+                for idx in range(start, start + count)
+            ],
+        )
+
+
+def test_snapshots_deduplicate_and_restore(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    config, engine, factory, user = _make_db(tmp_path, monkeypatch)
+    _add_rows(factory, user.id, 0, 20_000)
+    store = BackupStore(tmp_path / "repo", chunk_pages=16)
+    keep_all = RetentionPolicy(last=100)
+
+    first = admin_tasks.snapshot_database(config, store=store, policy=keep_all)
+    assert first.reused_chunks == 0 and first.new_chunks == len(first.manifest.chunks)
+    after_first = store.stored_bytes()
+
+    _add_rows(factory, user.id, 20_000, 50)
+    second = admin_tasks.snapshot_database(config, store=store, policy=keep_all)
+    assert second.manifest.sha256 != first.manifest.sha256
+    # Appending a few rows rewrites only the touched pages (table tail,
+    # scattered index leaves), not the whole file.
+    assert second.new_chunks < len(second.manifest.chunks) / 2
+    assert store.stored_bytes() - after_first < after_first / 2
+    unchanged = admin_tasks.snapshot_database(config, store=store, policy=keep_all)
+    assert unchanged.new_chunks <= 1
+    # Chunked straight from the in-memory backup: nothing was staged on disk.
+    assert not list(store.root.glob("staging/*"))
+
+    restored = store.restore_to(first.manifest.id, tmp_path / "first.db")
+    with sqlite3.connect(restored) as conn:
+        assert conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        assert conn.execute('SELECT count(*) FROM "transaction"').fetchone()[0] == 20_000
+
+    engine.dispose()
+    target = admin_tasks.restore_snapshot(second.manifest.id, config=config, store=store)
+    with sqlite3.connect(target) as conn:
+        assert conn.execute('SELECT count(*) FROM "transaction"').fetchone()[0] == 20_050
+
+    # Dropping the older snapshot frees only the chunks nobody else uses.
+    removed = store.apply_retention(RetentionPolicy(last=2, daily=0, weekly=0, monthly=0))
+    assert removed == [first.manifest.id]
+    report = store.collect_garbage()
+    still_used = set(second.manifest.chunks) | set(unchanged.manifest.chunks)
+    assert report.chunks_removed == len(set(first.manifest.chunks) - still_used)
+    assert [snap.id for snap in store.list_snapshots()] == [
+        second.manifest.id,
+        unchanged.manifest.id,
+    ]
+    assert store.restore_to(second.manifest.id, tmp_path / "again.db").exists()
+
+
+def test_large_databases_are_staged_on_disk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    config, _engine, factory, user = _make_db(tmp_path, monkeypatch)
+    _add_rows(factory, user.id, 0, 2_000)
+    store = BackupStore(tmp_path / "repo", chunk_pages=16)
+    keep_all = RetentionPolicy(last=100)
+
+    in_memory = admin_tasks.snapshot_database(config, store=store, policy=keep_all)
+    config.BACKUP_IN_MEMORY_MAX_BYTES = 0
+    staged = admin_tasks.snapshot_database(config, store=store, policy=keep_all)
+
+    assert staged.manifest.size == in_memory.manifest.size
+    # Only the header page (change counter) may differ between the two copies.
+    assert staged.new_chunks <= 1
+    assert not list((store.root / "staging").iterdir())
+    restored = store.restore_to(staged.manifest.id, tmp_path / "staged.db")
+    with sqlite3.connect(restored) as conn:
+        assert conn.execute('SELECT count(*) FROM "transaction"').fetchone()[0] == 2_000
+
+
+def test_restore_detects_corrupt_chunk(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    config, _engine, factory, user = _make_db(tmp_path, monkeypatch)
+    _add_rows(factory, user.id, 0, 500)
+    store = BackupStore(tmp_path / "repo")
+    result = admin_tasks.snapshot_database(config, store=store)
+
+    digest = result.manifest.chunks[0]
+    (store.chunks_dir / digest[:2] / digest).write_bytes(b"not zlib")
+    with pytest.raises(ValueError, match="corrupt"):
+        store.restore_to(result.manifest.id, tmp_path / "broken.db")
+    assert not (tmp_path / "broken.db").exists()
+    assert not (tmp_path / "broken.db.part").exists()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from pocketsage.desktop.charts.batch import TEMPLATES, BatchChartRenderer, batch_renderer
+from pocketsage.desktop.charts.data import (
+    CashflowSeries,
+    CategorySeries,
+    PayoffSeries,
+    StackedSeries,
+)
+
+PNG_MAGIC = b"\x89PNG"
+
+SAMPLES = {
+    "spending": [
+        CategorySeries.from_totals({"Rent": 900.0, "Food": 240.0, "Fun": 60.0}),
+        CategorySeries.from_totals({f"Cat {i}": 10.0 + i for i in range(15)}),
+    ],
+    "allocation": [
+        CategorySeries.from_totals({"AAPL": 1200.0, "VTI": 800.0}),
+        CategorySeries.from_totals({"BND": 50.0}),
+    ],
+    "cashflow": [
+        CashflowSeries(("2025-01", "2025-02"), (900.0, 1000.0), (400.0, 1200.0)),
+        CashflowSeries(
+            tuple(f"m{i}" for i in range(300)),
+            tuple(1000.0 + i for i in range(300)),
+            tuple(900.0 + (i * 7) % 300 for i in range(300)),
+        ),
+    ],
+    "category_trend": [
+        StackedSeries(("2025-01", "2025-02"), (("Food", (40.0, 10.0)), ("Rent", (900.0, 900.0)))),
+        StackedSeries(("2025-03",), (("Fun", (25.0,)),)),
+    ],
+    "account_cashflow": [
+        CategorySeries.from_totals({"Checking": 1200.0, "Card": -300.0}),
+        CategorySeries.from_totals({"Savings": 50.0}),
+    ],
+    "debt_payoff": [
+        PayoffSeries(("2025-01", "2025-02", "2025-03"), (600.0, 300.0, 0.0)),
+        PayoffSeries(tuple(f"m{i}" for i in range(400)), tuple(400.0 - i for i in range(400))),
+    ],
+}
+
+
+@pytest.mark.parametrize("kind", sorted(TEMPLATES))
+def test_templates_leave_nothing_behind_between_renders(kind: str):
+    renderer = BatchChartRenderer()
+    first, second = SAMPLES[kind]
+    empty = type(first)()
+
+    a = renderer.render(kind, first)
+    b = renderer.render(kind, second)
+    placeholder = renderer.render(kind, empty)
+    again = renderer.render(kind, first)
+
+    assert a.startswith(PNG_MAGIC) and b.startswith(PNG_MAGIC)
+    assert a != b and placeholder not in (a, b)
+    # Same input, same pixels: nothing from the charts in between survived.
+    assert again == a
+    assert BatchChartRenderer().render(kind, first) == a
+
+
+def test_render_many_reuses_one_figure():
+    renderer = BatchChartRenderer()
+    months = StackedSeries(
+        ("2025-01", "2025-02", "2025-03"),
+        (("Food", (40.0, 0.0, 12.0)), ("Rent", (900.0, 900.0, 0.0))),
+    )
+    pngs = list(renderer.render_many("spending", (months.at(i) for i in range(len(months)))))
+    assert len(pngs) == 3 and len(set(pngs)) == 3
+    assert months.at(1) == CategorySeries(("Rent",), (900.0,))
+    assert renderer.template("spending") is renderer.template("spending")
+    with pytest.raises(ValueError):
+        renderer.render("radar", months)
+
+
+def test_threads_get_their_own_templates():
+    expected = BatchChartRenderer().render("cashflow", SAMPLES["cashflow"][1])
+    results: dict[str, object] = {}
+
+    def _work(name: str) -> None:
+        renderer = batch_renderer()
+        for _ in range(3):
+            png = renderer.cashflow(SAMPLES["cashflow"][1])
+            renderer.spending(SAMPLES["spending"][0])
+        results[name] = (renderer, png)
+
+    threads = [threading.Thread(target=_work, args=(f"t{i}",)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    renderers = {id(renderer) for renderer, _ in results.values()}
+    assert len(renderers) == 3
+    assert all(png == expected for _, png in results.values())
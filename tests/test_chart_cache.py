@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from pocketsage.desktop.chart_cache import ChartCache, series_digest
+from pocketsage.desktop.charts import spending_png_bytes
+
+
+def test_chart_cache_stores_and_returns_pngs(tmp_path: Path):
+    cache = ChartCache(tmp_path / "charts")
+    png = spending_png_bytes({"Groceries": 120.0, "Rent": 900.0})
+
+    assert cache.get("spending") is None
+    path = cache.put("spending", png)
+    assert path.read_bytes().startswith(b"\x89PNG")
+    assert cache.get("spending") == path
+    assert cache.total_bytes() == len(png)
+
+    cache.clear()
+    assert cache.get("spending") is None and not path.exists()
+    assert series_digest({"b": 1, "a": 2.0}) == series_digest({"a": 2.0, "b": 1})
+
+
+def test_chart_cache_hits_skip_rendering(tmp_path: Path):
+    cache = ChartCache(tmp_path / "charts")
+    renders: list[dict] = []
+    totals = {"Groceries": 120.0, "Rent": 900.0}
+
+    def render(data):
+        renders.append(data)
+        return spending_png_bytes(data)
+
+    first = cache.get_or_render("spending", series=lambda: totals, render=render, params={"u": 1})
+    assert first.read_bytes().startswith(b"\x89PNG")
+
+    started = time.perf_counter()
+    second = cache.get_or_render("spending", series=lambda: totals, render=render, params={"u": 1})
+    assert time.perf_counter() - started < 0.05
+    assert second == first
+    assert len(renders) == 1
+
+    changed = cache.get_or_render(
+        "spending", series=lambda: {**totals, "Rent": 950.0}, render=render, params={"u": 1}
+    )
+    assert changed != first
+    assert len(renders) == 2
+    assert cache.stats.hits == 1 and cache.stats.misses == 2
+    assert cache.stats.to_dict()["hit_ratio"] == round(1 / 3, 3)
+
+
+def test_chart_cache_generation_skips_series(tmp_path: Path):
+    cache = ChartCache(tmp_path / "charts")
+    calls = {"series": 0}
+
+    def series():
+        calls["series"] += 1
+        return [1, 2, 3]
+
+    for _ in range(3):
+        cache.get_or_render("trend", series=series, render=lambda _: b"png", generation=7)
+    assert calls["series"] == 1
+    assert cache.peek("trend", generation=7) is not None
+    assert cache.peek("trend", generation=8) is None
+
+    cache.get_or_render("trend", series=series, render=lambda _: b"png", generation=8)
+    assert calls["series"] == 2
+    # Same data at the new generation: served from the content key.
+    assert cache.stats.misses == 1
+
+
+def test_chart_cache_lookup_and_store_share_keys_with_get_or_render(tmp_path: Path):
+    cache = ChartCache(tmp_path / "charts")
+    key = cache.key_for("trend", series=[1, 2, 3], params={"u": 1})
+
+    assert cache.lookup(key) is None
+    cache.store(key, b"png", render_seconds=0.25)
+    path = cache.get_or_render(
+        "trend", series=lambda: [1, 2, 3], render=lambda _: b"other", params={"u": 1}
+    )
+    assert path.read_bytes() == b"png"
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    assert cache.stats.avg_render_ms == 250.0
+
+
+def test_chart_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ChartCache(tmp_path / "charts", max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(name, b"x" * 100)
+    assert cache.stats.evictions == 1
+    assert cache.total_bytes() == 200
+    assert len(list((tmp_path / "charts").glob("*.png"))) == 2
+
+    # A fresh instance picks up the surviving entries from disk.
+    reopened = ChartCache(tmp_path / "charts", max_bytes=250)
+    assert reopened.total_bytes() == 200
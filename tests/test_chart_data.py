@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from pocketsage.desktop.chart_cache import series_digest
+from pocketsage.desktop.charts import data
+from pocketsage.infra.database import create_db_engine, init_database, session_scope
+from pocketsage.models import Account, Category, Holding, Transaction
+from pocketsage.services.auth import create_user
+
+
+@pytest.fixture()
+def seeded(tmp_path: Path):
+    from pocketsage.config import BaseConfig
+
+    cfg = BaseConfig()
+    cfg.DATA_DIR = tmp_path
+    cfg.DATABASE_URL = f"sqlite:///{tmp_path/'charts.db'}"
+    engine = create_db_engine(cfg)
+    init_database(engine)
+
+    def factory():
+        return session_scope(engine)
+
+    user = create_user(username="charts", password="x", session_factory=factory)
+    with factory() as session:
+        food = Category(name="Food", slug="food", category_type="expense", user_id=user.id)
+        rent = Category(name="Rent", slug="rent", category_type="expense", user_id=user.id)
+        checking = Account(name="Checking", user_id=user.id)
+        session.add_all([food, rent, checking])
+        session.flush()
+        rows = []
+        for idx in range(240):
+            rows.append(
+                Transaction(
+                    user_id=user.id,
+                    occurred_at=datetime(2024, 1 + idx % 12, 1 + idx % 28, 12),
+                    amount=(-(idx % 17) - 1.5) if idx % 4 else 900.0 + idx,
+                    memo=f"row {idx}",
+                    category_id=(food.id, rent.id, None)[idx % 3],
+                    account_id=checking.id if idx % 5 else None,
+                    currency="USD",
+                )
+            )
+        session.add_all(rows)
+        session.add_all(
+            [
+                Holding(user_id=user.id, symbol="AAA", quantity=10, avg_price=5, market_price=7),
+                Holding(user_id=user.id, symbol="AAA", quantity=2, avg_price=5, market_price=0),
+                Holding(user_id=user.id, symbol="BBB", quantity=0, avg_price=9, market_price=9),
+            ]
+        )
+        session.commit()
+        lookups = {
+            "categories": {food.id: "Food", rent.id: "Rent"},
+            "accounts": {checking.id: "Checking"},
+        }
+    with factory() as session:
+        txs = list(session.exec(Transaction.__table__.select()).mappings())
+        holdings = list(session.exec(Holding.__table__.select()).mappings())
+
+    def as_obj(row):
+        return type("Row", (), dict(row))
+
+    return (
+        factory,
+        user.id,
+        [as_obj(r) for r in txs],
+        [as_obj(r) for r in holdings],
+        lookups,
+    )
+
+
+def _close(a: data.CategorySeries, b: data.CategorySeries) -> None:
+    assert set(a.labels) == set(b.labels)
+    for label, value in a.as_dict().items():
+        assert b.as_dict()[label] == pytest.approx(value)
+
+
+def test_sql_aggregates_match_in_memory_series(seeded):
+    factory, uid, txs, holdings, lookups = seeded
+    today = date(2024, 12, 15)
+    start, end = datetime(2024, 3, 1), datetime(2024, 4, 1)
+
+    month = [t for t in txs if start <= t.occurred_at < end]
+    _close(
+        data.spending_by_category(factory, user_id=uid, start=start, end=end),
+        data.spending_from_transactions(month, category_lookup=lookups["categories"]),
+    )
+
+    sql_cash = data.monthly_cashflow(factory, user_id=uid, months=12, today=today)
+    py_cash = data.cashflow_from_transactions(txs, months=12, today=today)
+    assert sql_cash.months == py_cash.months
+    assert sql_cash.income == pytest.approx(py_cash.income)
+    assert sql_cash.expense == pytest.approx(py_cash.expense)
+
+    sql_trend = data.category_trend(factory, user_id=uid, months=6, today=today).as_dict()
+    py_trend = data.category_trend_from_transactions(
+        txs, category_lookup=lookups["categories"], months=6, today=today
+    ).as_dict()
+    assert sql_trend.keys() == py_trend.keys()
+    for name, values in py_trend.items():
+        assert sql_trend[name] == pytest.approx(values)
+
+    _close(
+        data.cashflow_by_account(factory, user_id=uid),
+        data.account_cashflow_from_transactions(txs, account_lookup=lookups["accounts"]),
+    )
+    _close(data.allocation_by_symbol(factory, user_id=uid), data.allocation_from_holdings(holdings))
+    assert data.allocation_by_symbol(factory, user_id=uid).as_dict() == {"AAA": 80.0}
+
+
+def test_series_are_compact_and_hash_stably(seeded):
+    factory, uid, *_ = seeded
+    series = data.monthly_cashflow(factory, user_id=uid, months=6, today=date(2024, 12, 1))
+    assert len(series) == 6
+    again = data.monthly_cashflow(factory, user_id=uid, months=6, today=date(2024, 12, 1))
+    assert series_digest(series) == series_digest(again)
+    other = data.monthly_cashflow(factory, user_id=uid, months=6, today=date(2024, 11, 1))
+    assert series_digest(series) != series_digest(other)
+
+    assert data.monthly_cashflow(factory, user_id=uid + 1) == data.CashflowSeries()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pocketsage.desktop.chart_loader import ChartLoad, ChartLoader
+
+
+def test_chart_loader_drops_stale_loads():
+    executor = ThreadPoolExecutor(max_workers=1)
+    loader = ChartLoader(executor=executor)
+    release = threading.Event()
+    started = threading.Event()
+    ran: list[str] = []
+    ready: list[ChartLoad] = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        ran.append("slow")
+        return Path("slow.png")
+
+    def queued():
+        ran.append("queued")
+        return Path("queued.png")
+
+    running = loader.submit("slow", slow, ready.append)
+    loader.submit("queued", queued, ready.append)
+    assert started.wait(5)
+    # The user navigated away: the queued load never starts and the running
+    # one finishes without reaching the view.
+    assert loader.cancel() == 1
+    release.set()
+    running.result(5)
+
+    fresh = loader.submit("fresh", lambda: Path("fresh.png"), ready.append)
+    fresh.result(5)
+    executor.shutdown()
+
+    assert ran == ["slow"]
+    assert [load.name for load in ready] == ["fresh"]
+    assert ready[0].value == Path("fresh.png") and ready[0].seconds >= 0
+
+
+def test_chart_loader_reports_errors_inline():
+    loader = ChartLoader()
+    ready: list[ChartLoad] = []
+
+    def broken():
+        raise RuntimeError("no data source")
+
+    assert loader.submit("broken", broken, ready.append, background=False) is None
+    assert ready[0].value is None and ready[0].error == "no data source"
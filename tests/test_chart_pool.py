@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+from zipfile import ZipFile
+
+import flet as ft
+import pytest
+from pocketsage.desktop import chart_pool, charts, controllers
+from pocketsage.desktop.context import create_app_context
+from pocketsage.desktop.views import reports
+from pocketsage.models import Liability, Transaction
+from pocketsage.services import auth
+
+PNG_MAGIC = b"\x89PNG"
+
+
+def _sample_transactions() -> list[Transaction]:
+    today = date.today()
+    return [
+        Transaction(
+            user_id=1,
+            occurred_at=datetime(today.year, today.month, 1 + idx % 27),
+            amount=(-(idx % 40) - 1.0) if idx % 5 else 250.0,
+            category_id=idx % 4 + 1,
+            account_id=idx % 3 + 1,
+            memo=f"row {idx}",
+        )
+        for idx in range(200)
+    ]
+
+
+def _jobs() -> list[chart_pool.ChartJob]:
+    txs = _sample_transactions()
+    labels, trend = charts.category_trend_series(txs, category_lookup={1: "Food"})
+    schedule = [
+        {"date": f"2025-{month:02d}", "payments": {1: {"remaining_balance": 1200 - month * 100}}}
+        for month in range(1, 13)
+    ]
+    timeline, remaining = charts.debt_payoff_series(schedule)
+    return [
+        chart_pool.ChartJob(
+            "spending.png", charts.spending_png_bytes, {"totals": {1: 40.0, 2: 12.5}}
+        ),
+        chart_pool.ChartJob(
+            "trend.png", charts.category_trend_png_bytes, {"labels": labels, "totals": trend}
+        ),
+        chart_pool.ChartJob(
+            "cashflow.png",
+            charts.cashflow_by_account_png_bytes,
+            {"totals": charts.account_cashflow_totals(txs)},
+        ),
+        chart_pool.ChartJob(
+            "debt.png", charts.debt_payoff_png_bytes, {"timeline": timeline, "totals": remaining}
+        ),
+    ]
+
+
+def test_render_charts_streams_results_from_pool():
+    seen: list[str] = []
+    try:
+        results = chart_pool.render_charts(
+            _jobs(), on_result=lambda result: seen.append(result.name), max_workers=2
+        )
+    finally:
+        chart_pool.shutdown_chart_pool()
+
+    assert sorted(seen) == ["cashflow.png", "debt.png", "spending.png", "trend.png"]
+    assert [result.name for result in results] == seen
+    for result in results:
+        assert result.error is None
+        assert result.png.startswith(PNG_MAGIC)
+        assert result.seconds > 0
+        assert result.mode in {"process", "serial"}
+    assert "spending.png" in chart_pool.format_render_times(results)
+
+
+def test_render_charts_falls_back_to_serial(monkeypatch: pytest.MonkeyPatch):
+    def _no_pool(max_workers: int):
+        raise OSError("sem_open not available")
+
+    monkeypatch.setattr(chart_pool, "_get_pool", _no_pool)
+    jobs = _jobs()[:2] + [
+        chart_pool.ChartJob("broken.png", charts.category_trend_png_bytes, {"labels": []})
+    ]
+
+    results = chart_pool.render_charts(jobs)
+
+    assert {result.mode for result in results} == {"serial"}
+    by_name = {result.name: result for result in results}
+    assert by_name["spending.png"].png.startswith(PNG_MAGIC)
+    assert by_name["broken.png"].error
+    assert by_name["broken.png"].png == b""
+
+
+def test_combined_bundle_contains_every_chart(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{tmp_path / 'bundle.db'}")
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(tmp_path / "data"))
+    ctx = create_app_context()
+    ctx.current_user = auth.create_user(
+        username="bundle", password="password", role="admin", session_factory=ctx.session_factory
+    )
+    uid = ctx.current_user.id
+    with ctx.session_factory() as session:
+        for tx in _sample_transactions():
+            tx.user_id = uid
+            session.add(tx)
+        session.add(
+            Liability(user_id=uid, name="Card", balance=900.0, apr=19.9, minimum_payment=60.0)
+        )
+
+    bundle = tmp_path / "reports_bundle.zip"
+    monkeypatch.setattr(
+        controllers,
+        "pick_export_destination",
+        lambda ctx, page, *, on_path_selected, suggested_name: on_path_selected(bundle),
+    )
+
+    class _Page:
+        overlay: list = []
+        snack_bar = None
+        route = ""
+
+        def update(self):
+            return None
+
+        def go(self, route: str):
+            self.route = route
+
+    page = _Page()
+    view = reports.build_reports_view(ctx, page)  # type: ignore[arg-type]
+
+    def _find_bundle_button(control):
+        stack = [control]
+        found_title = False
+        while stack:
+            current = stack.pop(0)
+            if isinstance(current, ft.Text) and current.value == "Combined bundle":
+                found_title = True
+            if found_title and isinstance(current, ft.FilledTonalButton):
+                return current
+            for attr in ("controls", "content"):
+                child = getattr(current, attr, None)
+                if isinstance(child, list):
+                    stack[0:0] = child
+                elif child is not None:
+                    stack.insert(0, child)
+        return None
+
+    button = _find_bundle_button(view)
+    assert button is not None
+    try:
+        button.on_click(None)
+    finally:
+        chart_pool.shutdown_chart_pool()
+
+    assert "Reports bundle saved" in page.snack_bar.content.value
+    assert "0 cached" in page.snack_bar.content.value
+    first = ZipFile(bundle).read("category_trend.png")
+
+    # Unchanged data: every chart is copied from DATA_DIR/cache/charts.
+    button.on_click(None)
+    assert "no charts rendered; 16 cached" in page.snack_bar.content.value
+    assert list((tmp_path / "data" / "cache" / "charts").glob("*.png"))
+    with ZipFile(bundle) as archive:
+        assert archive.read("category_trend.png") == first
+
+        names = set(archive.namelist())
+        assert {
+            "transactions.csv",
+            "ytd_summary.csv",
+            "debt_payoff.csv",
+            "spending.png",
+            "category_trend.png",
+            "cashflow_by_account.png",
+            "debt_payoff.png",
+        } <= names
+        assert sum(name.startswith("spending/") for name in names) == 12
+        for name in names:
+            if name.endswith(".png"):
+                assert archive.read(name).startswith(PNG_MAGIC)
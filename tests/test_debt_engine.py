@@ -0,0 +1,298 @@
+"""The array payoff engine against the Decimal loop it replaced."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import asdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Iterable
+
+import numpy as np
+import pytest
+from pocketsage.desktop.charts.data import payoff_from_schedule
+from pocketsage.services.debts import (
+    DebtAccount,
+    PayoffSchedule,
+    avalanche_schedule,
+    schedule_summary,
+    simulate_payoff,
+    snowball_schedule,
+    sweep_payoff,
+)
+
+
+def legacy_schedule(*, debts: Iterable[DebtAccount], surplus: float) -> list[dict]:
+    """The original month-by-month, debt-by-debt loop, kept as the oracle."""
+
+    debt_dicts: list[dict[str, Any]] = [asdict(d) for d in debts]
+    payoff_schedule: list[dict] = []
+    current_date = date.today().replace(day=1)
+    rolled_minimums = 0.0
+
+    def _next_month(value: date) -> date:
+        month = value.month + 1
+        year = value.year + (month - 1) // 12
+        month = ((month - 1) % 12) + 1
+        return value.replace(year=year, month=month, day=1)
+
+    previous_total_balance = sum(d["balance"] for d in debt_dicts)
+    stagnant_periods = 0
+
+    while any(d["balance"] > 0 for d in debt_dicts):
+        extra_pool = surplus + rolled_minimums
+        row = {"date": current_date.isoformat(), "payments": {}}
+
+        for debt in debt_dicts:
+            if debt["balance"] <= 0:
+                continue
+
+            monthly_interest = Decimal(debt["balance"]) * Decimal(debt["apr"]) / Decimal(1200)
+            monthly_interest_float = float(
+                monthly_interest.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            )
+
+            payment = debt["minimum_payment"]
+            if extra_pool > 0:
+                payment += extra_pool
+                extra_pool = 0.0
+
+            minimum_progress = monthly_interest_float + 1.0
+            if payment < minimum_progress:
+                payment = minimum_progress
+
+            new_balance = debt["balance"] + monthly_interest_float - payment
+
+            if new_balance <= 0:
+                payment_to_apply = debt["balance"] + monthly_interest_float
+                leftover = payment - payment_to_apply
+                debt["balance"] = 0.0
+                extra_pool += max(leftover, 0.0)
+                rolled_minimums += debt["minimum_payment"]
+            else:
+                debt["balance"] = new_balance
+
+            row["payments"][f"debt_{debt['id']}"] = {
+                "payment_amount": payment,
+                "interest_paid": monthly_interest_float,
+                "remaining_balance": debt["balance"],
+            }
+
+        payoff_schedule.append(row)
+
+        total_balance = sum(d["balance"] for d in debt_dicts if d["balance"] > 0)
+        if total_balance >= previous_total_balance - 0.01:
+            stagnant_periods += 1
+        else:
+            stagnant_periods = 0
+        if stagnant_periods >= 3:
+            raise ValueError("Payoff schedule did not converge; payments too low")
+        previous_total_balance = total_balance
+        current_date = _next_month(current_date)
+
+    return payoff_schedule
+
+
+def legacy_snowball(debts: list[DebtAccount], surplus: float) -> list[dict]:
+    return legacy_schedule(debts=sorted(debts, key=lambda d: d.balance), surplus=surplus)
+
+
+def legacy_avalanche(debts: list[DebtAccount], surplus: float) -> list[dict]:
+    return legacy_schedule(debts=sorted(debts, key=lambda d: d.apr, reverse=True), surplus=surplus)
+
+
+def household(rng: random.Random, count: int) -> list[DebtAccount]:
+    """Cards, loans and the odd mortgage with cent-precision inputs."""
+
+    debts = []
+    for debt_id in range(1, count + 1):
+        kind = rng.random()
+        if kind < 0.1:
+            balance, apr = rng.uniform(80_000, 400_000), rng.uniform(2.5, 7.5)
+        elif kind < 0.5:
+            balance, apr = rng.uniform(2_000, 40_000), rng.uniform(3.0, 12.0)
+        else:
+            balance, apr = rng.uniform(50, 9_000), rng.uniform(12.0, 29.99)
+        # Enough to cover the interest with a little principal, sometimes less.
+        minimum = balance * (apr / 1200 + rng.uniform(0.0005, 0.02))
+        debts.append(
+            DebtAccount(
+                id=debt_id,
+                balance=round(balance, 2),
+                apr=round(apr, 2),
+                minimum_payment=round(minimum, 2),
+                statement_due_day=rng.randint(1, 28),
+            )
+        )
+    return debts
+
+
+def assert_same_schedule(actual: list[dict], expected: list[dict]) -> None:
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got["date"] == want["date"]
+        assert list(got["payments"]) == list(want["payments"])
+        for key, values in want["payments"].items():
+            for field, value in values.items():
+                # The legacy loop carries float drift; the engine is exact to the cent.
+                assert got["payments"][key][field] == pytest.approx(value, abs=0.011), (
+                    got["date"],
+                    key,
+                    field,
+                )
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_engine_matches_legacy_loop(seed: int):
+    rng = random.Random(seed)
+    debts = household(rng, rng.randint(1, 12))
+    surplus = rng.choice([0.0, 25.0, 150.0, 733.33])
+
+    assert_same_schedule(
+        snowball_schedule(debts=debts, surplus=surplus), legacy_snowball(debts, surplus)
+    )
+    assert_same_schedule(
+        avalanche_schedule(debts=debts, surplus=surplus), legacy_avalanche(debts, surplus)
+    )
+
+
+def test_overpayment_cascades_through_several_debts_in_one_month():
+    debts = [
+        DebtAccount(id=1, balance=40.0, apr=20.0, minimum_payment=25.0, statement_due_day=1),
+        DebtAccount(id=2, balance=60.0, apr=18.0, minimum_payment=25.0, statement_due_day=1),
+        DebtAccount(id=3, balance=5_000.0, apr=9.0, minimum_payment=100.0, statement_due_day=1),
+    ]
+    schedule = snowball_schedule(debts=debts, surplus=500.0)
+    assert_same_schedule(schedule, legacy_snowball(debts, 500.0))
+
+    first = schedule[0]["payments"]
+    assert first["debt_1"]["remaining_balance"] == 0.0
+    assert first["debt_2"]["remaining_balance"] == 0.0
+    # 500 + 25 covers debt 1 (40.67), the rest pays debt 2 off and reaches debt 3.
+    assert first["debt_3"]["payment_amount"] > 100.0
+
+
+def test_paid_off_and_negative_balances_are_skipped():
+    debts = [
+        DebtAccount(id=1, balance=0.0, apr=10.0, minimum_payment=50.0, statement_due_day=1),
+        DebtAccount(id=2, balance=-20.0, apr=10.0, minimum_payment=50.0, statement_due_day=1),
+        DebtAccount(id=3, balance=300.0, apr=10.0, minimum_payment=50.0, statement_due_day=1),
+    ]
+    schedule = snowball_schedule(debts=debts, surplus=-30.0)
+    assert_same_schedule(schedule, legacy_snowball(debts, -30.0))
+    assert all(list(row["payments"]) == ["debt_3"] for row in schedule)
+
+
+def test_simulation_arrays_are_integer_cents():
+    debts = [
+        DebtAccount(id=7, balance=1_000.0, apr=12.0, minimum_payment=100.0, statement_due_day=1),
+        DebtAccount(id=9, balance=250.5, apr=24.99, minimum_payment=30.0, statement_due_day=1),
+    ]
+    run = simulate_payoff(debts, surplus=0.0, start=date(2025, 11, 1))
+
+    assert run.ids == (7, 9)
+    assert run.payments.dtype == np.int64 and run.payments.shape == (run.months, 2)
+    assert run.interest[0].tolist() == [1000, 522]  # 250.50 * 24.99% / 12 = 5.2166 -> 5.22
+    assert run.dates()[:3] == ["2025-11-01", "2025-12-01", "2026-01-01"]
+    assert (run.balances[-1] == 0).all()
+    # Until a debt clears, each month is exactly balance + interest - payment.
+    previous = np.array([100_000, 25_050])
+    for payments, interest, balances in zip(run.payments, run.interest, run.balances):
+        still_owed = balances > 0
+        expected = previous + interest - payments
+        assert (balances[still_owed] == expected[still_owed]).all()
+        previous = balances
+
+
+def test_schedule_is_a_lazy_sequence_of_legacy_rows():
+    debts = household(random.Random(3), 6)
+    schedule = avalanche_schedule(debts=debts, surplus=150.0)
+    rows = schedule.rows()
+
+    assert isinstance(schedule, PayoffSchedule)
+    assert len(schedule) == len(rows) == schedule.months
+    assert schedule[0] == rows[0] and schedule[-1] == rows[-1]
+    assert schedule[2:5] == rows[2:5]
+    assert list(schedule) == rows
+    assert schedule == rows and schedule == avalanche_schedule(debts=debts, surplus=150.0)
+    assert schedule != snowball_schedule(debts=debts, surplus=150.0)
+    with pytest.raises(IndexError):
+        schedule[len(rows)]
+
+    empty = snowball_schedule(debts=[], surplus=0.0)
+    assert empty == [] and not empty and PayoffSchedule.empty() == []
+    assert schedule_summary(empty) == (None, 0.0, 0)
+
+
+def test_totals_match_summing_the_rows():
+    debts = household(random.Random(8), 9)
+    schedule = snowball_schedule(debts=debts, surplus=25.0)
+    rows = schedule.rows()
+
+    def _sum(row: dict, field: str) -> float:
+        return sum(p[field] for p in row["payments"].values())
+
+    for index in (0, 1, len(rows) // 2, -1):
+        month = schedule.month(index)
+        assert month.date == rows[index]["date"]
+        assert month.payment == pytest.approx(_sum(rows[index], "payment_amount"))
+        assert month.interest == pytest.approx(_sum(rows[index], "interest_paid"))
+        assert month.remaining == pytest.approx(_sum(rows[index], "remaining_balance"))
+    assert list(schedule.monthly()) == [schedule.month(i) for i in range(len(schedule))]
+
+    for debt in debts:
+        mine = [
+            row["payments"][f"debt_{debt.id}"]
+            for row in rows
+            if f"debt_{debt.id}" in row["payments"]
+        ]
+        totals = schedule.debt(debt.id)
+        assert totals.months == len(mine)
+        assert totals.payment == pytest.approx(sum(p["payment_amount"] for p in mine))
+        assert totals.interest == pytest.approx(sum(p["interest_paid"] for p in mine))
+
+    payoff, interest, months = schedule_summary(schedule)
+    assert (payoff, months) == schedule_summary(rows)[::2]
+    assert interest == pytest.approx(schedule_summary(rows)[1])
+    assert schedule.total_interest == interest
+    fast, summed = payoff_from_schedule(schedule), payoff_from_schedule(rows)
+    assert fast.months == summed.months
+    assert fast.remaining == pytest.approx(summed.remaining)
+
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_surplus_sweep_matches_single_schedules(seed: int):
+    rng = random.Random(seed)
+    debts = household(rng, rng.randint(1, 10))
+    surpluses = [-30.0, 0.0, 25.0, 150.0, 733.33, 1999.99]
+    sweep = sweep_payoff(debts, surpluses=surpluses)
+
+    for strategy, project in (("snowball", snowball_schedule), ("avalanche", avalanche_schedule)):
+        curve = sweep.curve(strategy)
+        assert curve.surplus == surpluses
+        for index, surplus in enumerate(surpluses):
+            schedule = project(debts=debts, surplus=surplus)
+            assert curve.months[index] == schedule.months
+            assert curve.interest[index] == pytest.approx(schedule.total_interest)
+            assert sweep.payoff_date(strategy, index) == schedule.payoff_date
+
+
+def test_surplus_sweep_defaults_and_edges():
+    debts = household(random.Random(2), 4)
+    sweep = sweep_payoff(debts, start=date(2026, 1, 1))
+
+    assert sweep.surplus[0] == 0.0 and sweep.surplus[-1] == 2_000.0
+    assert sweep.months.shape == sweep.interest_cents.shape == (2, 81)
+    # More surplus never means a later payoff or more interest.
+    assert (np.diff(sweep.months, axis=1) <= 0).all()
+    assert (np.diff(sweep.interest_cents, axis=1) <= 0).all()
+    assert sweep.months[0, 80] == 21 and sweep.payoff_date("snowball", 80) == "2027-09-01"
+
+    empty = sweep_payoff([], surpluses=[0.0, 50.0])
+    assert empty.months.tolist() == [[0, 0], [0, 0]]
+    assert empty.payoff_date("snowball", 0) is None
+    with pytest.raises(ValueError):
+        sweep_payoff(debts, strategies=("minimum",))
+    with pytest.raises(ValueError):
+        sweep.curve("minimum")
@@ -28,3 +28,30 @@ def test_debt_payoff_chart_creates_image(tmp_path: Path) -> None:
     # Ensure we can move the file (mimicking export behavior)
     target = tmp_path / "out.png"
     target.write_bytes(chart_path.read_bytes())
+
+
+def test_chart_paths_use_managed_scratch_dir(tmp_path: Path) -> None:
+    from pocketsage.desktop import charts
+
+    charts.cleanup_chart_scratch()
+    schedule = [
+        {"date": "2024-01-01", "payments": {"d": {"remaining_balance": 500.0}}},
+        {"date": "2024-02-01", "payments": {"d": {"remaining_balance": 250.0}}},
+    ]
+    first = charts.debt_payoff_chart_png(schedule)
+    again = charts.debt_payoff_chart_png(schedule)
+    scratch_root = first.parent
+    # Same chart, same content-addressed file: no pile-up in the temp dir.
+    assert again == first
+    assert len(list(scratch_root.glob("*.png"))) == 1
+
+    exported = charts.debt_payoff_chart_png(schedule, output_path=tmp_path / "exports" / "debt.png")
+    assert exported == tmp_path / "exports" / "debt.png"
+    assert exported.read_bytes() == first.read_bytes()
+    assert len(list(scratch_root.glob("*.png"))) == 1
+
+    png = charts.debt_payoff_png_bytes(*charts.debt_payoff_series(schedule))
+    assert charts.chart_image_base64(png).startswith("iVBOR")
+
+    charts.cleanup_chart_scratch()
+    assert not scratch_root.exists()
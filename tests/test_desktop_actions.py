@@ -9,7 +9,7 @@ import pytest
 from pocketsage.config import BaseConfig
 from pocketsage.desktop import controllers
 from pocketsage.infra.database import create_db_engine, init_database, session_scope
-from pocketsage.services import auth
+from pocketsage.services import auth, jobs
 
 
 class _PageSpy:
@@ -34,6 +34,13 @@ class _PickerSpy:
         self.called_with = kwargs
 
 
+@pytest.fixture()
+def sync_jobs():
+    jobs.set_async_execution(False)
+    yield
+    jobs.set_async_execution(True)
+
+
 @pytest.fixture()
 def session_factory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     db_path = tmp_path / "desktop-actions.db"
@@ -89,11 +96,19 @@ def test_start_ledger_import_invokes_picker() -> None:
     assert ctx.file_picker.called_with["allowed_extensions"] == ["csv"]
 
 
-def test_file_picker_result_triggers_ledger_import(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+def test_file_picker_result_triggers_ledger_import(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, sync_jobs
+):
     calls: dict[str, Path] = {}
 
     def fake_import_ledger_transactions(
-        *, csv_path: Path, session_factory, mapping=None, user_id: int
+        *,
+        csv_path: Path,
+        session_factory,
+        mapping=None,
+        user_id: int,
+        progress=None,
+        should_cancel=None,
     ):
         calls["ledger"] = csv_path
         return 2
@@ -126,7 +141,7 @@ def test_file_picker_result_triggers_ledger_import(monkeypatch: pytest.MonkeyPat
 
 
 def test_file_picker_result_triggers_portfolio_import(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, sync_jobs
 ):
     calls: dict[str, Path] = {}
 
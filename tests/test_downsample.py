@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from pocketsage.desktop.downsample import downsample_indices, lttb_indices, tick_step
+
+
+def test_lttb_keeps_endpoints_and_shape():
+    y = [math.sin(i / 20) * 100 + (500 if i == 733 else 0) for i in range(2000)]
+    kept = lttb_indices(y, 100)
+
+    assert len(kept) == 100
+    assert kept[0] == 0 and kept[-1] == 1999
+    assert np.all(np.diff(kept) > 0)
+    # A single spike is the largest triangle in its bucket.
+    assert 733 in kept
+
+    assert lttb_indices(y[:50], 100).tolist() == list(range(50))
+
+
+def test_downsample_indices_keeps_extremes_of_every_series():
+    income = [100.0] * 600
+    expense = [80.0] * 600
+    income[17] = 5_000.0
+    expense[402] = -40.0
+
+    kept = downsample_indices(income, expense, max_points=60)
+    assert {0, 17, 402, 599} <= set(kept.tolist())
+    assert len(kept) <= 60 + 6
+    assert downsample_indices(income, max_points=None).tolist() == list(range(600))
+    assert tick_step(360) == 30 and tick_step(6) == 1
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import csv
+from datetime import datetime
 from types import SimpleNamespace
 from pathlib import Path
 
+import pytest
 from pocketsage.services import export_csv
+from pocketsage.services.ledger_service import LedgerFilters
 from pocketsage.models.transaction import Transaction
 
 
@@ -29,3 +32,63 @@ def test_export_transactions_csv_creates_file(tmp_path, transaction_factory, ses
     assert len(rows) == 2
     memos = {row["memo"] for row in rows}
     assert {"Groceries", "Salary"} == memos
+
+
+def test_export_filtered_ledger_streams_all_matching_rows(
+    tmp_path, transaction_factory, category_factory, account_factory, session_factory, user
+):
+    """Filtered exports include every match (no page cap) with joined names."""
+
+    food = category_factory(name="Food")
+    checking = account_factory(name="Checking")
+    for idx in range(150):
+        transaction_factory(
+            amount=-(idx + 1.0),
+            memo=f"coffee {idx}",
+            occurred_at=datetime(2024, 1, 1 + idx % 28),
+            category_id=food.id,
+            account_id=checking.id,
+        )
+    transaction_factory(amount=900.0, memo="salary", occurred_at=datetime(2024, 1, 15))
+    transaction_factory(amount=-5.0, memo="coffee late", occurred_at=datetime(2024, 3, 1))
+
+    updates: list[export_csv.ExportProgress] = []
+    output = tmp_path / "ledger.csv"
+    written = export_csv.export_filtered_ledger(
+        session_factory=session_factory,
+        filters=LedgerFilters(
+            user_id=user.id,
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 31),
+            text="coffee",
+            txn_type="expense",
+        ),
+        output_path=output,
+        progress=updates.append,
+        batch_size=40,
+    )
+
+    assert written == 150
+    with output.open(newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert len(rows) == 150
+    assert list(rows[0]) == list(export_csv.LEDGER_EXPORT_HEADERS)
+    assert {row["category"] for row in rows} == {"Food"}
+    assert {row["account"] for row in rows} == {"Checking"}
+    assert rows[0]["occurred_at"] >= rows[-1]["occurred_at"]
+    assert not output.with_name("ledger.csv.part").exists()
+    assert [update.rows_written for update in updates] == [0, 40, 80, 120, 150]
+    assert updates[-1].total_rows == 150 and updates[-1].fraction == 1.0
+
+    cancelled = tmp_path / "cancelled.csv"
+    with pytest.raises(export_csv.ExportCancelled):
+        export_csv.export_filtered_ledger(
+            session_factory=session_factory,
+            filters=LedgerFilters(user_id=user.id),
+            output_path=cancelled,
+            should_cancel=lambda: bool(updates),
+            progress=updates.append,
+            batch_size=40,
+        )
+    assert not cancelled.exists()
+    assert not cancelled.with_name("cancelled.csv.part").exists()
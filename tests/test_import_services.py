@@ -1,13 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 from pathlib import Path
 
 import pandas as pd
 import pytest
 from pocketsage.config import BaseConfig
 from pocketsage.infra.database import create_db_engine, init_database, session_scope
-from pocketsage.models import Account, Holding, Transaction
-from pocketsage.services import auth, importers
+from pocketsage.models import Account, Holding, ImportCheckpoint, Transaction
+from pocketsage.services import auth, import_registry, importers, jobs
 from sqlmodel import select
 
 
@@ -104,3 +105,255 @@ def test_import_portfolio_updates_existing(session_factory, tmp_path: Path):
     assert holdings[0].quantity == 12
     assert holdings[0].avg_price == 155
     assert len(accounts) == 1
+
+
+def _write_ledger_csv(path: Path, rows: int) -> Path:
+    lines = ["date,amount,memo,category,account,transaction_id"]
+    for idx in range(rows):
+        lines.append(f"2024-02-01,-{idx + 1}.00,Row {idx},Groceries,Checking,chk-{idx}")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_import_ledger_resumes_from_checkpoint_after_crash(session_factory, tmp_path: Path):
+    factory, engine, user = session_factory
+    csv_path = _write_ledger_csv(tmp_path / "big.csv", rows=1200)
+
+    def _crash(progress: importers.ImportProgress) -> None:
+        if progress.rows_processed >= 750:
+            raise RuntimeError("simulated crash")
+
+    with pytest.raises(RuntimeError):
+        importers.import_ledger_transactions(
+            csv_path=csv_path,
+            session_factory=factory,
+            user_id=user.id,
+            progress=_crash,
+            checkpoint_rows=200,
+        )
+
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 600
+        checkpoint = session.exec(select(ImportCheckpoint)).one()
+        assert checkpoint.rows_committed == 600
+        assert checkpoint.status == "running"
+
+    resumed = importers.import_ledger_transactions(
+        csv_path=csv_path, session_factory=factory, user_id=user.id, checkpoint_rows=200
+    )
+
+    with session_scope(engine) as session:
+        txns = session.exec(select(Transaction)).all()
+        checkpoint = session.exec(select(ImportCheckpoint)).one()
+
+    assert resumed == 600
+    assert len(txns) == 1200
+    assert len({t.external_id for t in txns}) == 1200
+    assert checkpoint.status == "completed"
+    assert checkpoint.created == 1200
+
+
+def test_import_ledger_cancel_keeps_progress_and_reports(session_factory, tmp_path: Path):
+    factory, engine, user = session_factory
+    csv_path = _write_ledger_csv(tmp_path / "cancel.csv", rows=900)
+    seen: list[importers.ImportProgress] = []
+    polls = {"count": 0}
+
+    def _should_cancel() -> bool:
+        polls["count"] += 1
+        return polls["count"] > 450
+
+    jobs.set_async_execution(False)
+    try:
+        job = jobs.enqueue(
+            "ledger-import",
+            lambda job: importers.import_ledger_transactions(
+                csv_path=csv_path,
+                session_factory=factory,
+                user_id=user.id,
+                progress=seen.append,
+                should_cancel=_should_cancel,
+            ),
+            pass_job=True,
+        )
+    finally:
+        jobs.set_async_execution(True)
+
+    assert job.status == "cancelled"
+    assert seen and seen[-1].rows_processed == 450
+    assert seen[-1].rows_per_second > 0
+    assert 0 < seen[-1].fraction < 1
+
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 450
+
+    remaining = importers.import_ledger_transactions(
+        csv_path=csv_path, session_factory=factory, user_id=user.id
+    )
+    assert remaining == 450
+
+
+def test_import_transactions_resolves_aliases_once(session_factory, tmp_path: Path):
+    factory, engine, user = session_factory
+    csv_path = tmp_path / "bank.csv"
+    csv_path.write_text(
+        "\n".join(
+            [
+                "Transaction Date,Description,Payee,AMOUNT,Reference",
+                "13/01/2024,,Corner Shop,$12.50,ref-1",
+                "14/01/2024,Salary,,\"1,000.00\",ref-2",
+                "15/01/2024,Refund,,(3.00),",
+            ]
+        ),
+        encoding="utf-8-sig",
+    )
+
+    with session_scope(engine) as session:
+        result = importers.import_transactions(csv_path, session, user.id)
+
+    with session_scope(engine) as session:
+        txns = session.exec(select(Transaction).order_by(Transaction.occurred_at)).all()
+
+    assert result.created == 3
+    assert result.errors == []
+    assert result.warnings == []
+    assert [t.occurred_at.day for t in txns] == [13, 14, 15]
+    assert [t.memo for t in txns] == ["Corner Shop", "Salary", "Refund"]
+    assert [t.amount for t in txns] == [12.5, 1000.0, -3.0]
+    assert txns[0].external_id == "ref-1"
+
+
+def test_detect_date_format_reports_ambiguous_and_mixed():
+    iso = importers.detect_date_format(["2024-01-02", "2024-12-31"])
+    assert iso.fmt == "%Y-%m-%d"
+    assert not iso.ambiguous and not iso.mixed
+
+    ambiguous = importers.detect_date_format(["01/02/2024", "03/04/2024"])
+    assert ambiguous.fmt == "%m/%d/%Y"
+    assert ambiguous.candidates == ("%m/%d/%Y", "%d/%m/%Y")
+    assert "Ambiguous date format" in ambiguous.describe()[0]
+
+    mixed = importers.detect_date_format(["2024-01-02", "31/12/2024"])
+    assert mixed.fmt is None
+    assert mixed.mixed
+    assert "Mixed date formats" in mixed.describe()[0]
+
+    parse = importers.compile_date_parser(mixed.fmt)
+    assert parse("31/12/2024").month == 12
+    assert importers.compile_date_parser("%Y-%m-%d")("12/31/2024").day == 31
+
+
+def test_import_registry_skips_identical_and_resumes_appended(
+    session_factory, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    factory, engine, user = session_factory
+    csv_path = _write_ledger_csv(tmp_path / "rolling.csv", rows=1100)
+
+    assert (
+        importers.import_ledger_transactions(
+            csv_path=csv_path, session_factory=factory, user_id=user.id
+        )
+        == 1100
+    )
+
+    parsed: list[dict] = []
+    original = importers._persist_ledger_row
+
+    def _spy(session, row, **kwargs):
+        parsed.append(row)
+        return original(session, row, **kwargs)
+
+    monkeypatch.setattr(importers, "_persist_ledger_row", _spy)
+
+    # Identity comes from the size and chunk hashes; the whole-file hash is
+    # taken during the import pass, never by a separate read.
+    def _no_full_read(path):
+        raise AssertionError(f"{path} was hashed outside the import pass")
+
+    monkeypatch.setattr(import_registry, "file_sha256", _no_full_read)
+
+    # Byte-identical file: nothing is parsed.
+    assert (
+        importers.import_ledger_transactions(
+            csv_path=csv_path, session_factory=factory, user_id=user.id
+        )
+        == 0
+    )
+    assert parsed == []
+
+    # Rolling export: same leading rows plus new ones at the end.
+    with csv_path.open("a") as handle:
+        for idx in range(1100, 1130):
+            handle.write(f"2024-03-01,-{idx}.00,Row {idx},Groceries,Checking,chk-{idx}\n")
+
+    created = importers.import_ledger_transactions(
+        csv_path=csv_path, session_factory=factory, user_id=user.id
+    )
+    assert created == 30
+    assert len(parsed) == 30
+
+    entries = import_registry.list_entries(factory, user_id=user.id)
+    assert [entry.rows for entry in entries] == [1130, 1100]
+    assert entries[0].content_sha256 == hashlib.sha256(csv_path.read_bytes()).hexdigest()
+    assert entries[1].times_seen == 2
+
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 1130
+
+    # Once forgotten, the file is parsed in full again (and deduplicated by id).
+    assert import_registry.purge_entries(factory, user_id=user.id) == 2
+    parsed.clear()
+    assert (
+        importers.import_ledger_transactions(
+            csv_path=csv_path, session_factory=factory, user_id=user.id
+        )
+        == 0
+    )
+    assert len(parsed) == 1130
+    assert len(import_registry.list_entries(factory, user_id=user.id)) == 1
+
+
+def test_import_portfolio_bulk_semantics(session_factory, tmp_path: Path):
+    factory, engine, user = session_factory
+    with session_scope(engine) as session:
+        ira = Account(name="IRA", currency="USD", user_id=user.id)
+        session.add(ira)
+        session.flush()
+        ira_id = ira.id
+        session.add(
+            Holding(user_id=user.id, symbol="VTI", quantity=1, avg_price=100, account_id=ira_id)
+        )
+
+    csv_path = tmp_path / "lots.csv"
+    csv_path.write_text(
+        "\n".join(
+            [
+                "account,account_id,symbol,quantity,avg_price,currency,as_of",
+                f"Renamed,{ira_id},vti,5,210,usd,2024-02-01",
+                "Brokerage,,AAPL,10,150,,2024-01-15",
+                "Brokerage,,AAPL,10,150,,2024-01-15",
+                "Brokerage,,AAPL,12,155,,2024-01-16",
+                ",,CASH,100,1,,",
+                "Brokerage,,,3,10,,",
+                "Brokerage,,MSFT,n/a,300,,",
+            ]
+        )
+    )
+
+    processed = importers.import_portfolio_holdings(
+        csv_path=csv_path, session_factory=factory, user_id=user.id
+    )
+
+    with session_scope(engine) as session:
+        holdings = {h.symbol: h for h in session.exec(select(Holding)).all()}
+        accounts = {a.name: a.id for a in session.exec(select(Account)).all()}
+
+    assert processed == 4  # exact duplicate AAPL lot counted once; invalid rows dropped
+    assert set(holdings) == {"VTI", "AAPL", "CASH"}
+    assert holdings["VTI"].account_id == ira_id  # explicit id wins over the name
+    assert holdings["VTI"].quantity == 5 and holdings["VTI"].currency == "USD"
+    assert holdings["AAPL"].quantity == 12 and holdings["AAPL"].avg_price == 155
+    assert holdings["AAPL"].account_id == accounts["Brokerage"]
+    assert holdings["CASH"].account_id is None
+    assert holdings["CASH"].acquired_at is None
+    assert "Renamed" not in accounts
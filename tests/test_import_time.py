@@ -0,0 +1,74 @@
+"""Cold-start import budget, measured with ``python -X importtime``.
+
+Each entry point is imported in a fresh interpreter. The heavy optional
+stacks (pandas, matplotlib) and, for the desktop app, the view modules must
+stay out of the startup path. The cumulative time is a coarse backstop for
+regressions that add up slowly; wall-clock time swings with machine load, so
+that budget only runs with ``POCKETSAGE_IMPORT_BUDGET=1``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# (entry point, cumulative budget in ms, top-level packages that must not load)
+BUDGETS = [
+    ("pocketsage.desktop.app", 3500, ("pandas", "matplotlib", "numpy")),
+    ("pocketsage.services.importers", 1500, ("pandas", "matplotlib", "flet")),
+    ("pocketsage.services.reports", 1500, ("pandas", "matplotlib", "flet")),
+    ("pocketsage.services.liabilities", 1500, ("pandas", "matplotlib", "flet")),
+]
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module name."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    timings: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+@pytest.mark.parametrize(
+    ("module", "forbidden"), [(module, forbidden) for module, _, forbidden in BUDGETS]
+)
+def test_startup_skips_heavy_imports(module: str, forbidden: tuple[str, ...]):
+    timings = _importtime(module)
+
+    loaded = {name.split(".")[0] for name in timings}
+    assert not loaded & set(forbidden), f"{module} imports {sorted(loaded & set(forbidden))}"
+
+
+@pytest.mark.performance
+@pytest.mark.skipif(
+    not os.environ.get("POCKETSAGE_IMPORT_BUDGET"),
+    reason="wall-clock budget; set POCKETSAGE_IMPORT_BUDGET=1 to run",
+)
+@pytest.mark.parametrize(("module", "budget_ms"), [(module, ms) for module, ms, _ in BUDGETS])
+def test_startup_import_budget(module: str, budget_ms: int):
+    timings = _importtime(module)
+
+    total_ms = timings[module] / 1000 if module in timings else 0.0
+    total_ms = max(total_ms, timings.get("pocketsage", 0) / 1000)
+    assert total_ms < budget_ms, f"{module} took {total_ms:.0f}ms (budget {budget_ms}ms)"
+
+
+def test_desktop_views_load_on_first_navigation():
+    timings = _importtime("pocketsage.desktop.app")
+    views = sorted(name for name in timings if name.startswith("pocketsage.desktop.views."))
+    assert views == []
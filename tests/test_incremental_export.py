@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from pocketsage.config import BaseConfig
+from pocketsage.infra.database import create_db_engine, init_database, session_scope
+from pocketsage.models import Category, Habit, HabitEntry, Transaction
+from pocketsage.services import auth, incremental_export
+from sqlmodel import select
+
+
+def _make_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, name: str):
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{tmp_path / name}")
+    engine = create_db_engine(BaseConfig())
+    init_database(engine)
+
+    def factory():
+        return session_scope(engine)
+
+    user = auth.create_user(
+        username="exporter", password="password", role="admin", session_factory=factory
+    )
+    return factory, user
+
+
+def _snapshot(factory, user_id: int):
+    with factory() as session:
+        txs = {
+            (tx.id, tx.amount, tx.memo, tx.category_id)
+            for tx in session.exec(select(Transaction).where(Transaction.user_id == user_id))
+        }
+        entries = {
+            (entry.habit_id, entry.occurred_on, entry.value)
+            for entry in session.exec(select(HabitEntry).where(HabitEntry.user_id == user_id))
+        }
+    return txs, entries
+
+
+def test_full_then_incrementals_replay_to_same_state(tmp_path: Path, monkeypatch):
+    factory, user = _make_env(tmp_path, monkeypatch, "source.db")
+    exports = tmp_path / "exports"
+    with factory() as session:
+        food = Category(user_id=user.id, name="Food", slug="food", category_type="expense")
+        habit = Habit(user_id=user.id, name="Walk")
+        session.add(food)
+        session.add(habit)
+        session.flush()
+        for idx in range(5):
+            session.add(
+                Transaction(
+                    user_id=user.id,
+                    occurred_at=datetime(2024, 3, idx + 1),
+                    amount=-(idx + 1.0),
+                    memo=f"tx {idx}",
+                    category_id=food.id,
+                )
+            )
+            session.add(
+                HabitEntry(
+                    user_id=user.id, habit_id=habit.id, occurred_on=date(2024, 3, idx + 1), value=1
+                )
+            )
+        habit_id = habit.id
+
+    full = incremental_export.export_full(exports, session_factory=factory, user_id=user.id)
+    assert full.path is not None and full.manifest.kind == "full"
+    assert full.manifest.rows["transaction"] == 5
+    assert full.manifest.rows["habit_entry"] == 5
+
+    unchanged = incremental_export.export_incremental(
+        exports, session_factory=factory, user_id=user.id
+    )
+    assert unchanged.path is None
+
+    with factory() as session:
+        txs = session.exec(select(Transaction).order_by(Transaction.id)).all()
+        txs[0].memo = "edited"
+        session.add(txs[0])
+        session.delete(txs[1])
+        session.add(
+            Transaction(user_id=user.id, occurred_at=datetime(2024, 4, 1), amount=12.5, memo="new")
+        )
+        entry = session.get(HabitEntry, (habit_id, date(2024, 3, 2)))
+        session.delete(entry)
+
+    first = incremental_export.export_incremental(exports, session_factory=factory, user_id=user.id)
+    assert first.manifest.base_seq == full.manifest.seq
+    assert first.manifest.rows == {"transaction": 2}
+    assert first.manifest.tombstones == 2
+
+    with factory() as session:
+        tx = session.exec(select(Transaction).where(Transaction.memo == "new")).one()
+        tx.amount = 13.0
+        session.add(tx)
+
+    second = incremental_export.export_incremental(
+        exports, session_factory=factory, user_id=user.id
+    )
+    assert second.manifest.rows == {"transaction": 1}
+    assert second.manifest.tombstones == 0
+    mark = incremental_export.get_watermark(factory, user.id)
+    assert mark is not None and mark.seq == second.manifest.seq
+
+    chain = incremental_export.find_export_chain(exports, user.id)
+    assert chain == [full.path, first.path, second.path]
+
+    target, target_user = _make_env(tmp_path, monkeypatch, "restored.db")
+    assert target_user.id == user.id
+    with target() as session:
+        session.add(Transaction(user_id=user.id, occurred_at=datetime(2020, 1, 1), amount=-99.0))
+    result = incremental_export.replay_exports(chain, session_factory=target)
+
+    assert result.bundles == 3
+    assert result.seq == second.manifest.seq
+    assert _snapshot(target, user.id) == _snapshot(factory, user.id)
+
+
+def test_replay_rejects_broken_chain(tmp_path: Path, monkeypatch):
+    factory, user = _make_env(tmp_path, monkeypatch, "chain.db")
+    exports = tmp_path / "exports"
+    full = incremental_export.export_full(exports, session_factory=factory, user_id=user.id)
+    with factory() as session:
+        session.add(Transaction(user_id=user.id, occurred_at=datetime(2024, 1, 1), amount=-1.0))
+    first = incremental_export.export_incremental(exports, session_factory=factory, user_id=user.id)
+    with factory() as session:
+        session.add(Transaction(user_id=user.id, occurred_at=datetime(2024, 1, 2), amount=-2.0))
+    second = incremental_export.export_incremental(
+        exports, session_factory=factory, user_id=user.id
+    )
+
+    with pytest.raises(ValueError, match="Broken export chain"):
+        incremental_export.replay_exports([full.path, second.path], session_factory=factory)
+    with pytest.raises(ValueError, match="full export"):
+        incremental_export.replay_exports([first.path, second.path], session_factory=factory)
+
+
+def test_rolling_exports_start_new_chains_and_prune_old_ones(tmp_path: Path, monkeypatch):
+    factory, user = _make_env(tmp_path, monkeypatch, "rolling.db")
+    exports = tmp_path / "exports"
+    kinds = []
+    for night in range(12):
+        with factory() as session:
+            session.add(
+                Transaction(user_id=user.id, occurred_at=datetime(2024, 5, night + 1), amount=-1.0)
+            )
+        result = incremental_export.export_rolling(
+            exports, session_factory=factory, user_id=user.id, full_every=3, keep=2
+        )
+        kinds.append(result.manifest.kind)
+
+    assert kinds == (["full"] + ["incremental"] * 3) * 3
+    bundles = sorted(exports.glob("*.zip"))
+    manifests = [incremental_export.read_manifest(path) for path in bundles]
+    # Two chains of a full bundle and three incrementals; the first chain is gone.
+    assert [m.kind for m in manifests].count("full") == 2
+    assert len(bundles) == 8
+
+    chain = incremental_export.find_export_chain(exports, user.id)
+    assert len(chain) == 4
+    target, _ = _make_env(tmp_path, monkeypatch, "rolling-restore.db")
+    incremental_export.replay_exports(chain, session_factory=target)
+    assert _snapshot(target, user.id) == _snapshot(factory, user.id)
+
+
+def test_rolling_export_restarts_a_chain_with_a_missing_bundle(tmp_path: Path, monkeypatch):
+    factory, user = _make_env(tmp_path, monkeypatch, "gap.db")
+    exports = tmp_path / "exports"
+    for night in range(3):
+        with factory() as session:
+            session.add(
+                Transaction(user_id=user.id, occurred_at=datetime(2024, 6, night + 1), amount=-1.0)
+            )
+        last = incremental_export.export_rolling(exports, session_factory=factory, user_id=user.id)
+    assert last.path is not None and last.manifest.kind == "incremental"
+    last.path.unlink()
+
+    with factory() as session:
+        session.add(Transaction(user_id=user.id, occurred_at=datetime(2024, 6, 9), amount=-1.0))
+    result = incremental_export.export_rolling(exports, session_factory=factory, user_id=user.id)
+
+    assert result.manifest.kind == "full"
+    assert incremental_export.find_export_chain(exports, user.id) == [result.path]
@@ -0,0 +1,190 @@
+"""Lazy and closed-form liability schedules against the original loop."""
+
+from __future__ import annotations
+
+import random
+from datetime import date
+from itertools import islice
+
+import pytest
+from pocketsage.models.liability import Liability
+from pocketsage.services.liabilities import (
+    PaymentProjection,
+    _advance_due_date,
+    _initial_due_date,
+    _normalize_currency,
+    generate_payment_schedule,
+    iter_payment_schedule,
+    payment_schedule_summary,
+    projected_payment,
+)
+
+TODAY = date(2026, 3, 15)
+
+
+def legacy_payment_schedule(
+    *, liability: Liability, months: int | None = None, today: date
+) -> list[PaymentProjection]:
+    """The month-by-month loop ``generate_payment_schedule`` used to run."""
+
+    if liability.balance is None or liability.balance <= 0:
+        return []
+    balance = max(float(liability.balance), 0.0)
+    monthly_rate = max(float(liability.apr or 0.0), 0.0) / 100.0 / 12.0
+    minimum_payment = max(float(liability.minimum_payment or 0.0), 0.0)
+    due_day = liability.due_day or 1
+    schedule: list[PaymentProjection] = []
+    next_due = _initial_due_date(today=today, due_day=due_day)
+    if months is not None and months <= 0:
+        return schedule
+    while balance > 0 and (months is None or len(schedule) < months):
+        interest = _normalize_currency(balance * monthly_rate)
+        suggested_payment = max(minimum_payment, interest + 1.0)
+        total_due = _normalize_currency(balance + interest)
+        payment = _normalize_currency(min(suggested_payment, total_due))
+        principal = _normalize_currency(payment - interest)
+        balance = _normalize_currency(balance + interest - payment)
+        if balance < 0.01:
+            balance = 0.0
+        schedule.append(PaymentProjection(next_due, payment, principal, interest, balance))
+        next_due = _advance_due_date(next_due, due_day)
+    return schedule
+
+
+def loan(rng: random.Random, *, kind: str = "fixed") -> Liability:
+    """A liability whose minimum is ``kind``:
+
+    * ``fixed`` - comfortably above the first month's interest plus $1;
+    * ``annuity`` - the level payment that retires the loan in 5 to 30
+      years, nudged by a few cents either way;
+    * ``floor`` - within a few dollars of the interest plus $1 floor;
+    * ``low`` - below the interest, so each row retires just the $1 floor.
+    """
+
+    if kind == "low":
+        balance = rng.uniform(50, 600)
+        apr = round(rng.uniform(12.0, 29.99), 2)
+        minimum = balance * apr / 1200 * rng.uniform(0.0, 0.9)
+    elif kind == "floor":
+        balance = rng.uniform(50, 30_000)
+        apr = round(rng.uniform(3.0, 29.99), 2)
+        interest = _normalize_currency(balance * apr / 1200)
+        minimum = interest + 1.0 + rng.choice([0.0, 0.01, rng.uniform(0.0, 3.0)])
+    else:
+        balance = rng.choice([rng.uniform(100, 9_000), rng.uniform(80_000, 400_000)])
+        apr = round(rng.choice([0.0, rng.uniform(2.5, 29.99)]), 2)
+        rate = apr / 1200
+        if kind == "annuity":
+            term = rng.randint(60, 360)
+            level = balance / term if rate == 0 else balance * rate / (1 - (1 + rate) ** -term)
+            minimum = max(level + rng.choice([0.0, 0.005, -0.005, rng.uniform(-0.5, 0.5)]), 1.0)
+        else:
+            minimum = _normalize_currency(balance * rate) + 1.0 + balance * rng.uniform(0.002, 0.05)
+    return Liability(
+        name="Loan",
+        balance=round(balance, 2),
+        apr=apr,
+        minimum_payment=round(minimum, 2),
+        due_day=rng.randint(1, 28),
+    )
+
+
+KINDS = ("fixed", "annuity", "floor", "low")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_lazy_schedule_matches_legacy_loop(seed: int):
+    liability = loan(random.Random(seed), kind=KINDS[seed % 4])
+    legacy = legacy_payment_schedule(liability=liability, today=TODAY)
+
+    assert generate_payment_schedule(liability=liability, today=TODAY) == legacy
+    assert generate_payment_schedule(liability=liability, months=6, today=TODAY) == legacy[:6]
+    assert list(islice(iter_payment_schedule(liability=liability, today=TODAY), 3)) == legacy[:3]
+    assert generate_payment_schedule(liability=liability, months=0, today=TODAY) == []
+
+
+@pytest.mark.parametrize("kind", KINDS[:3])
+@pytest.mark.parametrize("seed", range(60))
+def test_closed_form_summary_matches_iterated_schedule(seed: int, kind: str):
+    liability = loan(random.Random(seed), kind=kind)
+    legacy = legacy_payment_schedule(liability=liability, today=TODAY)
+    summary = payment_schedule_summary(liability=liability, today=TODAY)
+
+    assert summary is not None
+    assert summary.months == len(legacy)
+    assert summary.payoff_date == legacy[-1].due_date
+    # Only the per-month interest rounding separates the formula from the loop.
+    iterated = _normalize_currency(sum(row.interest for row in legacy))
+    assert abs(summary.total_interest - iterated) <= summary.tolerance + 1e-9
+    assert abs(summary.final_payment - legacy[-1].payment) <= summary.tolerance + 1e-9
+    if liability.apr == 0:
+        assert summary.tolerance == 0.0
+    if summary.tolerance == 0.0:
+        assert (summary.total_interest, summary.final_payment) == (
+            iterated,
+            legacy[-1].payment,
+        )
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("seed", range(15))
+def test_projected_payment_jumps_to_one_month(seed: int, kind: str):
+    liability = loan(random.Random(seed), kind=kind)
+    legacy = legacy_payment_schedule(liability=liability, today=TODAY)
+    tolerance = payment_schedule_summary(liability=liability, today=TODAY).tolerance
+
+    for month in (0, 1, len(legacy) // 2, len(legacy) - 2, len(legacy) - 1):
+        row = projected_payment(liability=liability, month=max(month, 0), today=TODAY)
+        want = legacy[max(month, 0)]
+        assert row is not None and row.due_date == want.due_date
+        for field in ("payment", "interest", "principal", "remaining_balance"):
+            assert abs(getattr(row, field) - getattr(want, field)) <= tolerance + 1e-9
+    assert projected_payment(liability=liability, month=0, today=TODAY) == legacy[0]
+    last = projected_payment(liability=liability, month=len(legacy) - 1, today=TODAY)
+    assert last is not None and last.remaining_balance == 0.0
+    assert projected_payment(liability=liability, month=len(legacy), today=TODAY) is None
+    assert projected_payment(liability=liability, month=-1, today=TODAY) is None
+
+
+@pytest.mark.parametrize(
+    ("balance", "apr", "payment", "months", "final"),
+    [
+        # The formula's balance leaves 6 cents for a 181st month; the rows do not.
+        (46_312.13, 10.97, 525.51, 180, 525.28),
+        # Barely above the interest: rounding drift adds a 514th month.
+        (10_134.52, 10.55, 90.11, 514, 3.30),
+    ],
+)
+def test_payoff_month_survives_rounding_drift(
+    balance: float, apr: float, payment: float, months: int, final: float
+):
+    liability = Liability(name="Loan", balance=balance, apr=apr, minimum_payment=payment, due_day=7)
+    legacy = legacy_payment_schedule(liability=liability, today=TODAY)
+    summary = payment_schedule_summary(liability=liability, today=TODAY)
+
+    assert len(legacy) == summary.months == months
+    assert legacy[-1].payment == final
+    assert abs(summary.final_payment - final) <= summary.tolerance + 1e-9
+    last = projected_payment(liability=liability, month=months - 1, today=TODAY)
+    assert abs(last.payment - final) <= summary.tolerance + 1e-9
+    assert projected_payment(liability=liability, month=months, today=TODAY) is None
+
+
+def test_final_payment_rounding_follows_the_schedule():
+    # 1000 at 0% and 250/month: four even payments, no stub month.
+    even = Liability(name="Even", balance=1_000.0, apr=0.0, minimum_payment=250.0, due_day=1)
+    summary = payment_schedule_summary(liability=even, today=TODAY)
+    assert (summary.months, summary.final_payment, summary.total_interest) == (4, 250.0, 0.0)
+    assert summary.payoff_date == date(2026, 7, 1)
+
+    # 1000 at 12% and 100/month leaves a partial final payment with its own interest.
+    card = Liability(name="Card", balance=1_000.0, apr=12.0, minimum_payment=100.0, due_day=20)
+    legacy = legacy_payment_schedule(liability=card, today=TODAY)
+    summary = payment_schedule_summary(liability=card, today=TODAY)
+    assert summary.months == len(legacy) == 11
+    assert summary.final_payment == legacy[-1].payment < 100.0
+    assert summary.total_interest == pytest.approx(sum(row.interest for row in legacy), abs=0.02)
+
+    paid = Liability(name="Paid", balance=0.0, apr=10.0, minimum_payment=50.0, due_day=1)
+    assert payment_schedule_summary(liability=paid, today=TODAY) is None
+    assert list(iter_payment_schedule(liability=paid, today=TODAY)) == []
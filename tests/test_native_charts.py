@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import flet as ft
+from pocketsage.desktop.charts import MatplotlibChartRenderer
+from pocketsage.desktop.charts.data import (
+    CashflowSeries,
+    CategorySeries,
+    PayoffSeries,
+    StackedSeries,
+    payoff_from_schedule,
+)
+from pocketsage.desktop.charts.native import FletChartRenderer
+
+
+def _find(root: ft.Control, kind: type) -> ft.Control | None:
+    stack = [root]
+    while stack:
+        control = stack.pop()
+        if isinstance(control, kind):
+            return control
+        for attr in ("controls", "content"):
+            child = getattr(control, attr, None)
+            if isinstance(child, list):
+                stack.extend(child)
+            elif isinstance(child, ft.Control):
+                stack.append(child)
+    return None
+
+
+SPENDING = CategorySeries.from_totals({f"Cat {i}": 10.0 * (i + 1) for i in range(11)})
+CASHFLOW = CashflowSeries(
+    ("2025-01", "2025-02", "2025-03"), (900.0, 1000.0, 950.0), (400.0, 0.0, 700.0)
+)
+TREND = StackedSeries(("2025-01", "2025-02"), (("Food", (40.0, 0.0)), ("Rent", (900.0, 900.0))))
+ACCOUNTS = CategorySeries.from_totals({"Checking": 1200.0, "Card": -300.0})
+PAYOFF = payoff_from_schedule(
+    [
+        {"date": f"2025-{m:02d}", "payments": {1: {"remaining_balance": 600 - m * 100}}}
+        for m in range(1, 7)
+    ]
+)
+
+
+def test_native_renderer_builds_flet_charts():
+    renderer = FletChartRenderer(height=200)
+
+    pie = _find(renderer.spending(SPENDING), ft.PieChart)
+    assert pie is not None
+    # Small slices fold into "Other" so the donut stays legible.
+    assert len(pie.sections) == 9
+    assert sum(section.value for section in pie.sections) == sum(SPENDING.values)
+
+    line = _find(renderer.cashflow(CASHFLOW), ft.LineChart)
+    assert [len(series.data_points) for series in line.data_series] == [3, 3]
+    assert line.data_series[1].data_points[2].y == 700.0
+
+    bars = _find(renderer.category_trend(TREND), ft.BarChart)
+    assert [group.bar_rods[0].to_y for group in bars.bar_groups] == [940.0, 900.0]
+
+    accounts = renderer.account_cashflow(ACCOUNTS)
+    assert [rod.from_y for group in accounts.bar_groups for rod in group.bar_rods] == [0.0, -300.0]
+
+    payoff = renderer.debt_payoff(PAYOFF)
+    assert payoff.data_series[0].data_points[-1].y == 0.0
+    assert _find(renderer.allocation(CategorySeries()), ft.PieChart) is None
+    assert _find(renderer.debt_payoff(PayoffSeries()), ft.LineChart) is None
+
+
+def test_native_line_charts_are_downsampled():
+    months = tuple(f"m{i}" for i in range(1_000))
+    long = PayoffSeries(months, tuple(float(1_000 - i) for i in range(1_000)))
+    chart = FletChartRenderer(max_points=100).debt_payoff(long)
+    assert len(chart.data_series[0].data_points) <= 110
+
+
+def test_export_backend_draws_the_same_series():
+    renderer = MatplotlibChartRenderer()
+    for png in (
+        renderer.spending(SPENDING),
+        renderer.cashflow(CASHFLOW),
+        renderer.category_trend(TREND),
+        renderer.account_cashflow(ACCOUNTS),
+        renderer.allocation(SPENDING),
+        renderer.debt_payoff(PAYOFF),
+    ):
+        assert png.startswith(b"\x89PNG")
+
+
+def test_views_do_not_import_matplotlib():
+    code = (
+        "import sys\n"
+        "import pocketsage.desktop.app\n"
+        "from pocketsage.desktop.views import dashboard, debts, ledger, portfolio, reports\n"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib imported by views'\n"
+        "from pocketsage.desktop import charts\n"
+        "charts.spending_png_bytes\n"
+        "assert 'matplotlib' in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+from pocketsage.desktop.context import create_app_context
+from pocketsage.desktop.payoff_cache import PayoffCache, payoff_cache_for
+from pocketsage.desktop.views.debts import project_payoff_schedule
+from pocketsage.models.liability import Liability
+from pocketsage.services import auth
+from pocketsage.services.debts import DebtAccount, snowball_schedule
+
+DEBTS = [
+    DebtAccount(id=1, balance=1_200.0, apr=19.99, minimum_payment=45.0, statement_due_day=5),
+    DebtAccount(id=2, balance=8_500.0, apr=6.5, minimum_payment=180.0, statement_due_day=12),
+]
+
+
+def test_payoff_cache_hits_skip_simulation():
+    cache = PayoffCache()
+
+    first = cache.schedule(DEBTS, strategy="snowball", surplus=50.0, user_id=1)
+    assert first == snowball_schedule(debts=DEBTS, surplus=50.0)
+    assert cache.schedule(DEBTS, strategy="snowball", surplus=50.0, user_id=1) is first
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+    # Strategy, surplus, user and every debt input are part of the key.
+    cache.schedule(DEBTS, strategy="avalanche", surplus=50.0, user_id=1)
+    cache.schedule(DEBTS, strategy="snowball", surplus=150.0, user_id=1)
+    cache.schedule(DEBTS, strategy="snowball", surplus=50.0, user_id=2)
+    edited = [DEBTS[0], replace(DEBTS[1], apr=7.0)]
+    assert cache.schedule(edited, strategy="snowball", surplus=50.0, user_id=1) != first
+    assert cache.stats.misses == 5
+
+    with pytest.raises(ValueError):
+        first.payments[0, 0] = 0
+    with pytest.raises(ValueError):
+        cache.schedule(DEBTS, strategy="minimum")
+
+
+def test_payoff_cache_evicts_and_invalidates_per_user():
+    cache = PayoffCache(max_entries=2)
+    for surplus in (0.0, 25.0, 50.0):
+        cache.schedule(DEBTS, surplus=surplus, user_id=1)
+    assert len(cache) == 2 and cache.stats.evictions == 1
+
+    cache.schedule(DEBTS, surplus=50.0, user_id=2)
+    cache.invalidate(1)
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert isinstance(payoff_cache_for(object()), PayoffCache)
+
+
+def test_liability_writes_drop_cached_projections(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(tmp_path / "instance"))
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
+    ctx = create_app_context()
+    uid = auth.ensure_local_user(ctx.session_factory).id
+    card = ctx.liability_repo.create(
+        Liability(name="Card", balance=2_000.0, apr=21.0, minimum_payment=60.0, due_day=3),
+        user_id=uid,
+    )
+
+    def project():
+        liabilities = ctx.liability_repo.list_all(user_id=uid)
+        return project_payoff_schedule(liabilities, cache=ctx.payoff_cache, user_id=uid)[0]
+
+    first = project()
+    assert project() is first
+    assert ctx.payoff_cache.stats.hits == 1
+
+    card.balance = 1_500.0
+    ctx.liability_repo.update(card, user_id=uid)
+    assert len(ctx.payoff_cache) == 0
+    assert project().months < first.months
+
+    ctx.reload_database()
+    project()
+    ctx.liability_repo.delete(card.id, user_id=uid)
+    assert len(ctx.payoff_cache) == 0
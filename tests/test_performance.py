@@ -1,4 +1,6 @@
+import csv
 import time
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -112,3 +114,636 @@ def test_pagination_cost(tmp_path: Path):
     elapsed = time.perf_counter() - start
     # Guardrail: ensure we can iterate through 20k rows in slices reasonably fast
     assert elapsed < 10.0
+
+
+def _legacy_extract(row: dict) -> tuple:
+    """Reference copy of the per-row alias probing import_transactions used to do."""
+
+    date_str = (
+        row.get("date")
+        or row.get("Date")
+        or row.get("DATE")
+        or row.get("occurred_at")
+        or row.get("transaction_date")
+        or row.get("Transaction Date")
+    )
+    parsed = None
+    for fmt in ["%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%Y/%m/%d", "%m-%d-%Y", "%d-%m-%Y"]:
+        try:
+            parsed = datetime.strptime(date_str.strip(), fmt)
+            break
+        except ValueError:
+            continue
+    amount = (
+        row.get("amount")
+        or row.get("Amount")
+        or row.get("AMOUNT")
+        or row.get("value")
+        or row.get("Value")
+        or row.get("transaction_amount")
+    )
+    memo = (
+        row.get("memo")
+        or row.get("Memo")
+        or row.get("MEMO")
+        or row.get("description")
+        or row.get("Description")
+        or row.get("DESCRIPTION")
+        or row.get("note")
+        or row.get("Note")
+        or row.get("Payee")
+        or row.get("payee")
+        or ""
+    )
+    external_id = (
+        row.get("external_id") or row.get("id") or row.get("transaction_id") or row.get("reference")
+    )
+    category = (
+        row.get("category")
+        or row.get("Category")
+        or row.get("CATEGORY")
+        or row.get("category_id")
+        or row.get("category_name")
+    )
+    account = (
+        row.get("account")
+        or row.get("Account")
+        or row.get("ACCOUNT")
+        or row.get("account_id")
+        or row.get("account_name")
+    )
+    return parsed, amount, memo, external_id, category, account
+
+
+@pytest.mark.performance
+def test_compiled_row_mapper_beats_per_row_probing(tmp_path: Path):
+    """Header resolution and date detection once per file should beat per-row probing."""
+
+    path = tmp_path / "bank.csv"
+    with path.open("w", encoding="utf-8", newline="") as f:
+        f.write("Transaction Date,Description,Amount,Account,Category,reference\n")
+        # Days >= 13 keep the legacy probe unambiguous; it walks five formats per row.
+        for idx in range(20000):
+            f.write(f"{idx % 16 + 13}-03-2024,Shop {idx},-{idx % 90}.25,Checking,Food,r{idx}\n")
+
+    with path.open(newline="", encoding="utf-8") as f:
+        start = time.perf_counter()
+        legacy = [_legacy_extract(row) for row in csv.DictReader(f)]
+        legacy_elapsed = time.perf_counter() - start
+
+    with path.open(newline="", encoding="utf-8") as f:
+        start = time.perf_counter()
+        reader = csv.reader(f)
+        mapper = importers.compile_row_mapper(next(reader))
+        rows = [mapper(values) for values in reader]
+        detection = importers.detect_date_format(
+            [row[0] for row in rows[: importers.DATE_SAMPLE_ROWS]]
+        )
+        parse_date = importers.compile_date_parser(detection.fmt)
+        compiled = [(parse_date(row[0].strip()), *row[1:]) for row in rows]
+        compiled_elapsed = time.perf_counter() - start
+
+    assert detection.fmt == "%d-%m-%Y"
+    assert compiled == legacy
+    assert compiled_elapsed < legacy_elapsed
+
+
+@pytest.mark.performance
+def test_portfolio_import_uses_constant_statements(tmp_path: Path):
+    """Holdings import should not issue per-row queries, however many lots there are."""
+
+    from sqlalchemy import event
+
+    engine = _make_temp_engine(tmp_path)
+
+    def session_factory():
+        return session_scope(engine)
+
+    user: User = create_user(username="perf3", password="test", session_factory=session_factory)
+    path = tmp_path / "lots.csv"
+    with path.open("w", encoding="utf-8") as f:
+        f.write("account,symbol,shares,price,as_of\n")
+        for idx in range(5000):
+            f.write(f"Broker {idx % 7},SYM{idx},{idx % 50 + 1},{idx % 300 + 1}.5,2024-01-02\n")
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        start = time.perf_counter()
+        first = importers.import_portfolio_holdings(
+            csv_path=path, session_factory=session_factory, user_id=user.id
+        )
+        inserted_with = len(statements)
+        second = importers.import_portfolio_holdings(
+            csv_path=path, session_factory=session_factory, user_id=user.id
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert first == second == 5000
+    assert inserted_with < 40
+    assert len(statements) - inserted_with < 20
+    assert elapsed < 10.0
+
+
+@pytest.mark.performance
+def test_run_export_streams_rows(tmp_path: Path):
+    """Export memory should stay flat instead of materialising the whole ledger."""
+
+    import io
+    import tracemalloc
+    import zipfile
+
+    from pocketsage.services.admin_tasks import run_export
+    from sqlalchemy import insert
+
+    engine = _make_temp_engine(tmp_path)
+
+    def session_factory():
+        return session_scope(engine)
+
+    user: User = create_user(username="perf4", password="test", session_factory=session_factory)
+    rows = 40_000
+    with session_factory() as session:
+        session.exec(
+            insert(Transaction),
+            params=[
+                {
+                    "user_id": user.id,
+                    "occurred_at": datetime(2024, 1, 1 + idx % 28),
+                    "amount": -(idx % 90 + 1) * 1.25,
+                    "memo": f"Streamed export row {idx}",
+                    "external_id": f"exp-{idx}",
+                    "currency": "USD",
+                }
+                for idx in range(rows)
+            ],
+        )
+
+    # Reference: what the old implementation held in memory before writing.
+    tracemalloc.start()
+    with session_factory() as session:
+        materialised = session.exec(select(Transaction).where(Transaction.user_id == user.id)).all()
+        assert len(materialised) == rows
+    _, legacy_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del materialised
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    deflated = run_export(tmp_path / "deflated", session_factory=session_factory, user_id=user.id)
+    elapsed = time.perf_counter() - start
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"export {elapsed:.2f}s, peak {streaming_peak / 1e6:.1f}MB "
+        f"vs materialised {legacy_peak / 1e6:.1f}MB"
+    )
+
+    stored = run_export(
+        tmp_path / "stored", session_factory=session_factory, user_id=user.id, compresslevel=0
+    )
+
+    with zipfile.ZipFile(deflated) as archive:
+        names = sorted(archive.namelist())
+        assert [name.split("-")[0] for name in names] == ["spending", "transactions"]
+        csv_name = next(name for name in names if name.endswith(".csv"))
+        with archive.open(csv_name) as raw:
+            reader = csv.reader(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+            header = next(reader)
+            assert header[:3] == ["id", "occurred_at", "amount"]
+            assert sum(1 for _ in reader) == rows
+        png_name = next(name for name in names if name.endswith(".png"))
+        assert archive.read(png_name).startswith(b"\x89PNG")
+
+    assert deflated.stat().st_size < stored.stat().st_size
+    # tracemalloc peak is the in-process proxy for RSS growth. Wall-clock time
+    # is only reported: it depends on how loaded the machine is.
+    assert streaming_peak < legacy_peak / 2
+
+
+@pytest.mark.performance
+def test_filtered_ledger_export_streams(tmp_path: Path):
+    """Ledger CSV export should stream every match with flat memory."""
+
+    import tracemalloc
+
+    from pocketsage.services.export_csv import export_filtered_ledger
+    from pocketsage.services.ledger_service import LedgerFilters
+    from sqlalchemy import insert
+
+    engine = _make_temp_engine(tmp_path)
+
+    def session_factory():
+        return session_scope(engine)
+
+    user: User = create_user(username="perf6", password="test", session_factory=session_factory)
+    rows = 60_000
+    with session_factory() as session:
+        session.exec(
+            insert(Transaction),
+            params=[
+                {
+                    "user_id": user.id,
+                    "occurred_at": datetime(2024, 1 + idx % 12, 1 + idx % 28),
+                    "amount": -(idx % 90 + 1) * 1.25 if idx % 3 else 40.0,
+                    "memo": f"Ledger export row {idx}",
+                    "currency": "USD",
+                }
+                for idx in range(rows)
+            ],
+        )
+
+    tracemalloc.start()
+    with session_factory() as session:
+        materialised = session.exec(select(Transaction).where(Transaction.user_id == user.id)).all()
+        assert len(materialised) == rows
+    _, legacy_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del materialised
+
+    output = tmp_path / "ledger.csv"
+    tracemalloc.start()
+    start = time.perf_counter()
+    written = export_filtered_ledger(
+        session_factory=session_factory,
+        filters=LedgerFilters(user_id=user.id, txn_type="expense"),
+        output_path=output,
+    )
+    elapsed = time.perf_counter() - start
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert written == rows - rows // 3
+    with output.open(newline="", encoding="utf-8") as fh:
+        assert sum(1 for _ in fh) == written + 1
+    assert streaming_peak < legacy_peak / 2
+    assert elapsed < 30.0
+
+
+@pytest.mark.performance
+def test_incremental_export_scales_with_changes(tmp_path: Path):
+    """A nightly incremental export should cost O(changes), not O(history)."""
+
+    from pocketsage.services import incremental_export
+    from sqlalchemy import insert
+
+    engine = _make_temp_engine(tmp_path)
+
+    def session_factory():
+        return session_scope(engine)
+
+    user: User = create_user(username="perf5", password="test", session_factory=session_factory)
+    with session_factory() as session:
+        session.exec(
+            insert(Transaction),
+            params=[
+                {
+                    "user_id": user.id,
+                    "occurred_at": datetime(2023, 1 + idx % 12, 1 + idx % 28),
+                    "amount": -(idx % 50 + 1) * 1.0,
+                    "memo": f"History {idx}",
+                    "currency": "USD",
+                }
+                for idx in range(30_000)
+            ],
+        )
+
+    exports = tmp_path / "exports"
+    start = time.perf_counter()
+    full = incremental_export.export_full(exports, session_factory=session_factory, user_id=user.id)
+    full_elapsed = time.perf_counter() - start
+    assert full.manifest.rows["transaction"] == 30_000
+
+    with session_factory() as session:
+        rows = session.exec(select(Transaction).where(Transaction.id <= 20)).all()
+        for tx in rows[:10]:
+            tx.memo = f"{tx.memo} (edited)"
+            session.add(tx)
+        for tx in rows[10:]:
+            session.delete(tx)
+
+    start = time.perf_counter()
+    nightly = incremental_export.export_incremental(
+        exports, session_factory=session_factory, user_id=user.id
+    )
+    incremental_elapsed = time.perf_counter() - start
+
+    assert nightly.manifest.rows == {"transaction": 10}
+    assert nightly.manifest.tombstones == 10
+    assert nightly.path is not None
+    assert nightly.path.stat().st_size < full.path.stat().st_size / 50
+    assert incremental_elapsed < full_elapsed / 5
+
+
+@pytest.mark.performance
+def test_long_series_charts_downsample():
+    """30-year payoff and 10-year cashflow charts render faster once downsampled."""
+
+    from pocketsage.desktop.charts import cashflow_trend_png_bytes, debt_payoff_png_bytes
+
+    months = 360
+    timeline = [f"{2025 + i // 12}-{i % 12 + 1:02d}" for i in range(months)]
+    remaining = [250_000 * (1 - i / months) ** 1.3 for i in range(months)]
+    income = [5_000 + (i % 12) * 40.0 for i in range(120)]
+    expense = [4_200 + ((i * 7) % 13) * 55.0 for i in range(120)]
+
+    def _timed(render):
+        start = time.perf_counter()
+        png = render()
+        return time.perf_counter() - start, png
+
+    full_debt, _ = _timed(lambda: debt_payoff_png_bytes(timeline, remaining, max_points=None))
+    fast_debt, png = _timed(lambda: debt_payoff_png_bytes(timeline, remaining))
+    assert png.startswith(b"\x89PNG")
+
+    full_cash, _ = _timed(
+        lambda: cashflow_trend_png_bytes(timeline[:120], income, expense, max_points=None)
+    )
+    fast_cash, _ = _timed(lambda: cashflow_trend_png_bytes(timeline[:120], income, expense))
+    print(
+        f"payoff {full_debt * 1000:.0f}ms -> {fast_debt * 1000:.0f}ms, "
+        f"cashflow {full_cash * 1000:.0f}ms -> {fast_cash * 1000:.0f}ms"
+    )
+    # Capping value labels removes ~200 text artists from the cashflow chart.
+    assert fast_cash < full_cash
+
+
+@pytest.mark.performance
+def test_chart_series_aggregate_in_sql(tmp_path: Path):
+    """Chart inputs come from GROUP BY queries, not hydrated transactions."""
+
+    from pocketsage.desktop.charts import cashflow_trend_series
+    from pocketsage.desktop.charts.data import category_trend, monthly_cashflow
+    from sqlalchemy import insert
+
+    engine = _make_temp_engine(tmp_path)
+
+    def session_factory():
+        return session_scope(engine)
+
+    user: User = create_user(username="perf8", password="test", session_factory=session_factory)
+    rows = 60_000
+    with session_factory() as session:
+        session.exec(
+            insert(Transaction),
+            params=[
+                {
+                    "user_id": user.id,
+                    "occurred_at": datetime(2024, 1 + idx % 12, 1 + idx % 28),
+                    "amount": -(idx % 90 + 1) * 1.25 if idx % 3 else 40.0,
+                    "memo": f"Chart row {idx}",
+                    "currency": "USD",
+                }
+                for idx in range(rows)
+            ],
+        )
+    today = datetime(2024, 12, 31).date()
+
+    start = time.perf_counter()
+    with session_factory() as session:
+        txs = session.exec(select(Transaction).where(Transaction.user_id == user.id)).all()
+        legacy = cashflow_trend_series(txs, months=12, today=today)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    series = monthly_cashflow(session_factory, user_id=user.id, months=12, today=today)
+    trend = category_trend(session_factory, user_id=user.id, months=12, today=today)
+    sql_elapsed = time.perf_counter() - start
+
+    assert list(series.income) == pytest.approx(legacy[1])
+    assert list(series.expense) == pytest.approx(legacy[2])
+    assert len(series) == 12 and len(trend.stacks) == 1
+    assert sql_elapsed < legacy_elapsed / 3
+
+
+@pytest.mark.performance
+def test_native_charts_render_in_milliseconds():
+    """On-screen charts are Flet controls, far cheaper than rasterising with matplotlib."""
+
+    from pocketsage.desktop.charts import MatplotlibChartRenderer
+    from pocketsage.desktop.charts.data import CashflowSeries, CategorySeries
+    from pocketsage.desktop.charts.native import FletChartRenderer
+
+    months = tuple(f"{2015 + i // 12}-{i % 12 + 1:02d}" for i in range(120))
+    cashflow = CashflowSeries(
+        months,
+        tuple(5_000 + (i % 12) * 40.0 for i in range(120)),
+        tuple(4_200 + ((i * 7) % 13) * 55.0 for i in range(120)),
+    )
+    spending = CategorySeries.from_totals({f"Category {i}": 50.0 + i * 10 for i in range(15)})
+    native, exports = FletChartRenderer(), MatplotlibChartRenderer()
+
+    start = time.perf_counter()
+    native.cashflow(cashflow)
+    native.spending(spending)
+    native_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exports.cashflow(cashflow)
+    exports.spending(spending)
+    png_elapsed = time.perf_counter() - start
+
+    print(f"native {native_elapsed * 1000:.1f}ms vs png {png_elapsed * 1000:.0f}ms")
+    assert native_elapsed < 0.1
+    assert native_elapsed < png_elapsed / 5
+
+
+def test_batch_renderer_reuses_figures():
+    """A bundle's twelve monthly donuts redraw one figure instead of building twelve."""
+
+    from pocketsage.desktop.charts import spending_png_bytes
+    from pocketsage.desktop.charts.batch import BatchChartRenderer
+    from pocketsage.desktop.charts.data import CategorySeries
+
+    months = [
+        CategorySeries.from_totals({f"Category {i}": 40.0 + (i * m) % 90 for i in range(10)})
+        for m in range(1, 13)
+    ]
+    renderer = BatchChartRenderer()
+    renderer.render("spending", CategorySeries())  # build the template outside the timing
+
+    start = time.perf_counter()
+    for series in months:
+        spending_png_bytes(series.as_dict())
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pngs = list(renderer.render_many("spending", months))
+    batch_elapsed = time.perf_counter() - start
+
+    print(f"batch {batch_elapsed * 1000:.0f}ms vs per-figure {legacy_elapsed * 1000:.0f}ms")
+    assert len(pngs) == 12
+    assert batch_elapsed < legacy_elapsed * 0.8
+
+
+@pytest.mark.performance
+def test_array_debt_engine_beats_decimal_loop():
+    """Twenty liabilities including a 30-year mortgage, stepped as integer-cent arrays."""
+
+    import random
+
+    from pocketsage.services.debts import DebtAccount, simulate_payoff, snowball_schedule
+    from tests.test_debt_engine import assert_same_schedule, household, legacy_snowball
+
+    debts = household(random.Random(5), 18)
+    debts += [
+        DebtAccount(id=98, balance=12_000.0, apr=3.1, minimum_payment=40.0, statement_due_day=1),
+        DebtAccount(
+            id=99, balance=350_000.0, apr=6.5, minimum_payment=2212.24, statement_due_day=1
+        ),
+    ]
+    ordered = sorted(debts, key=lambda d: d.balance)
+
+    def _best(fn) -> float:
+        timings = []
+        for _ in range(7):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy_elapsed = _best(lambda: legacy_snowball(debts, 0.0))
+    engine_elapsed = _best(lambda: simulate_payoff(ordered, surplus=0.0))
+    rows_elapsed = _best(lambda: snowball_schedule(debts=debts, surplus=0.0).rows())
+
+    print(
+        f"legacy {legacy_elapsed * 1000:.1f}ms, arrays {engine_elapsed * 1000:.1f}ms, "
+        f"arrays + dict rows {rows_elapsed * 1000:.1f}ms"
+    )
+    assert_same_schedule(snowball_schedule(debts=debts, surplus=0.0), legacy_snowball(debts, 0.0))
+    assert engine_elapsed < legacy_elapsed * 0.7
+
+
+@pytest.mark.performance
+def test_payoff_schedule_totals_skip_dict_rows():
+    """Summary, chart series and CSV totals read the arrays instead of re-summing dicts."""
+
+    import random
+
+    from pocketsage.desktop.charts.data import payoff_from_schedule
+    from pocketsage.services.debts import DebtAccount, schedule_summary, snowball_schedule
+    from tests.test_debt_engine import household
+
+    debts = household(random.Random(11), 9) + [
+        DebtAccount(
+            id=99, balance=300_000.0, apr=6.0, minimum_payment=1798.65, statement_due_day=1
+        )
+    ]
+    schedule = snowball_schedule(debts=debts, surplus=0.0)
+    rows = schedule.rows()
+
+    def _consume(source) -> tuple:
+        summary = schedule_summary(source)
+        series = payoff_from_schedule(source)
+        if hasattr(source, "monthly"):
+            totals = [(month.payment, month.remaining) for month in source.monthly()]
+        else:
+            totals = [
+                (
+                    sum(p["payment_amount"] for p in row["payments"].values()),
+                    sum(p["remaining_balance"] for p in row["payments"].values()),
+                )
+                for row in source
+            ]
+        return summary, series, totals
+
+    _consume(schedule)  # warm up the one-off imports and cached dates
+    start = time.perf_counter()
+    _consume(rows)
+    rows_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    summary, series, totals = _consume(schedule)
+    arrays_elapsed = time.perf_counter() - start
+
+    print(
+        f"{len(schedule)} months: arrays {arrays_elapsed * 1000:.2f}ms, "
+        f"rows {rows_elapsed * 1000:.2f}ms"
+    )
+    assert summary[2] == len(rows) and len(series) == len(totals) == len(rows)
+    assert arrays_elapsed < rows_elapsed / 3
+
+
+@pytest.mark.performance
+def test_surplus_sweep_is_one_batched_simulation():
+    """162 (strategy, surplus) scenarios, $0-$2,000 in $25 steps, including a mortgage."""
+
+    import random
+
+    from pocketsage.services.debts import (
+        DebtAccount,
+        avalanche_schedule,
+        snowball_schedule,
+        sweep_payoff,
+    )
+    from tests.test_debt_engine import household
+
+    debts = household(random.Random(5), 12) + [
+        DebtAccount(
+            id=99, balance=350_000.0, apr=6.5, minimum_payment=2212.24, statement_due_day=1
+        )
+    ]
+
+    start = time.perf_counter()
+    sweep = sweep_payoff(debts)
+    sweep_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for surplus in sweep.surplus.tolist():
+        snowball_schedule(debts=debts, surplus=surplus)
+        avalanche_schedule(debts=debts, surplus=surplus)
+    loop_elapsed = time.perf_counter() - start
+
+    print(f"sweep {sweep_elapsed * 1000:.0f}ms vs one schedule each {loop_elapsed * 1000:.0f}ms")
+    assert sweep.months.shape == (2, 81)
+    assert sweep_elapsed < 0.5
+    assert sweep_elapsed < loop_elapsed * 0.5
+
+
+@pytest.mark.performance
+def test_liability_summary_skips_the_rows():
+    """Payoff month and interest of a car loan and a mortgage from the annuity formula."""
+
+    from pocketsage.models.liability import Liability
+    from pocketsage.services.liabilities import (
+        generate_payment_schedule,
+        payment_schedule_summary,
+        projected_payment,
+    )
+
+    car = Liability(name="Car", balance=28_000.0, apr=6.9, minimum_payment=553.12, due_day=1)
+    mortgage = Liability(
+        name="Mortgage", balance=350_000.0, apr=6.5, minimum_payment=2213.0, due_day=1
+    )
+
+    def _best(fn) -> float:
+        timings = []
+        for _ in range(7):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    rows_elapsed = _best(lambda: generate_payment_schedule(liability=car))
+    summary_elapsed = _best(lambda: payment_schedule_summary(liability=car))
+    month_elapsed = _best(lambda: projected_payment(liability=car, month=40))
+    mortgage_rows = _best(lambda: generate_payment_schedule(liability=mortgage))
+    mortgage_summary = _best(lambda: payment_schedule_summary(liability=mortgage))
+
+    print(
+        f"car: rows {rows_elapsed * 1e6:.0f}us, summary {summary_elapsed * 1e6:.0f}us, "
+        f"month 40 {month_elapsed * 1e6:.0f}us; mortgage: rows {mortgage_rows * 1e6:.0f}us, "
+        f"summary {mortgage_summary * 1e6:.0f}us"
+    )
+    assert payment_schedule_summary(liability=car).months == 60
+    assert payment_schedule_summary(liability=mortgage).months == 360
+    assert payment_schedule_summary(liability=mortgage).tolerance > 0
+    assert summary_elapsed < rows_elapsed / 4
+    assert month_elapsed < rows_elapsed / 4
+    assert mortgage_summary < mortgage_rows / 4
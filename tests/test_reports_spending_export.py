@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import flet as ft
+import pytest
+from pocketsage.desktop import controllers
+from pocketsage.desktop.context import create_app_context
+from pocketsage.desktop.views import reports
+from pocketsage.models import Category, Transaction
+from pocketsage.services import auth
+
+
+def _download_button(view: ft.Control, title: str) -> ft.FilledTonalButton | None:
+    stack: list = [view]
+    found_title = False
+    while stack:
+        current = stack.pop(0)
+        if isinstance(current, ft.Text) and current.value == title:
+            found_title = True
+        if found_title and isinstance(current, ft.FilledTonalButton):
+            return current
+        for attr in ("controls", "content"):
+            child = getattr(current, attr, None)
+            if isinstance(child, list):
+                stack[0:0] = child
+            elif child is not None:
+                stack.insert(0, child)
+    return None
+
+
+def test_monthly_spending_export_aggregates_in_sql(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{tmp_path / 'spending.db'}")
+    monkeypatch.setenv("POCKETSAGE_DATA_DIR", str(tmp_path / "data"))
+    ctx = create_app_context()
+    ctx.current_user = auth.create_user(
+        username="spender", password="password", role="admin", session_factory=ctx.session_factory
+    )
+    uid = ctx.current_user.id
+    month = ctx.current_month
+    with ctx.session_factory() as session:
+        food = Category(user_id=uid, name="Food", slug="food", category_type="expense")
+        session.add(food)
+        session.flush()
+        for day in range(1, 21):
+            session.add(
+                Transaction(
+                    user_id=uid,
+                    occurred_at=datetime(month.year, month.month, day),
+                    amount=-12.5,
+                    category_id=food.id if day % 2 else None,
+                    memo=f"day {day}",
+                )
+            )
+
+    output = tmp_path / "spending.png"
+    monkeypatch.setattr(
+        controllers,
+        "pick_export_destination",
+        lambda ctx, page, *, on_path_selected, suggested_name: on_path_selected(output),
+    )
+
+    class _Page:
+        overlay: list = []
+        snack_bar = None
+        route = ""
+
+        def update(self):
+            return None
+
+    page = _Page()
+    view = reports.build_reports_view(ctx, page)  # type: ignore[arg-type]
+
+    def _no_row_search(*_args, **_kwargs):
+        raise AssertionError("spending export should not load transactions")
+
+    monkeypatch.setattr(ctx.transaction_repo, "search", _no_row_search)
+    button = _download_button(view, "Monthly spending report")
+    assert button is not None
+    button.on_click(None)
+
+    assert page.snack_bar.content.value == f"Monthly spending saved to {output}"
+    assert output.read_bytes().startswith(b"\x89PNG")
@@ -91,8 +91,24 @@ def _set_dropdown(root: ft.Control, label: str, value: str) -> ft.Dropdown:
     return dd  # type: ignore[return-value]
 
 
-def _all_images(root: ft.Control) -> list[ft.Image]:
-    images: list[ft.Image] = []
+NATIVE_CHARTS = (ft.PieChart, ft.LineChart, ft.BarChart)
+
+
+def _has_chart_data(control: ft.Control) -> bool:
+    if isinstance(control, ft.Image):
+        return bool(getattr(control, "src", "") or getattr(control, "src_base64", ""))
+    if isinstance(control, ft.PieChart):
+        return bool(control.sections)
+    if isinstance(control, ft.LineChart):
+        return any(series.data_points for series in control.data_series)
+    if isinstance(control, ft.BarChart):
+        return bool(control.bar_groups)
+    return False
+
+
+def _all_images(root: ft.Control) -> list[ft.Control]:
+    """Images and native chart controls under ``root``."""
+    images: list[ft.Control] = []
     stack = [root]
     seen: set[int] = set()
     while stack:
@@ -100,7 +116,7 @@ def _all_images(root: ft.Control) -> list[ft.Image]:
         if id(control) in seen:
             continue
         seen.add(id(control))
-        if isinstance(control, ft.Image):
+        if isinstance(control, (ft.Image, *NATIVE_CHARTS)):
             images.append(control)
         for attr in ("controls", "content", "actions"):
             child = getattr(control, attr, None)
@@ -151,8 +167,8 @@ def test_add_flows_populate_charts(monkeypatch: pytest.MonkeyPatch, tmp_path) ->
     ledger_view = ledger.build_ledger_view(ctx, page)
     txs = ctx.transaction_repo.list_all(user_id=user.id)
     assert any(t.memo == "Groceries run" for t in txs)
-    ledger_chart = _find_control(ledger_view, lambda c: isinstance(c, ft.Image))
-    assert ledger_chart is not None and getattr(ledger_chart, "src", "") != ""
+    ledger_chart = _find_control(ledger_view, _has_chart_data)
+    assert ledger_chart is not None
 
     # Budgets: create budget + line directly and ensure view renders
     today = date.today()
@@ -202,8 +218,8 @@ def test_add_flows_populate_charts(monkeypatch: pytest.MonkeyPatch, tmp_path) ->
     )
     debts_view = debts.build_debts_view(ctx, page)
     assert ctx.liability_repo.list_all(user_id=user.id)
-    debt_chart = _find_control(debts_view, lambda c: isinstance(c, ft.Image))
-    assert debt_chart is not None and getattr(debt_chart, "src", "") != ""
+    debt_chart = _find_control(debts_view, _has_chart_data)
+    assert debt_chart is not None
 
     # Portfolio: add holding and ensure allocation chart renders
     brokerage = ctx.account_repo.create(
@@ -222,14 +238,14 @@ def test_add_flows_populate_charts(monkeypatch: pytest.MonkeyPatch, tmp_path) ->
     )
     portfolio_view = portfolio.build_portfolio_view(ctx, page)
     assert ctx.holding_repo.list_all(user_id=user.id)
-    alloc_chart = _find_control(portfolio_view, lambda c: isinstance(c, ft.Image))
-    assert alloc_chart is not None and getattr(alloc_chart, "src", "") != ""
+    alloc_chart = _find_control(portfolio_view, _has_chart_data)
+    assert alloc_chart is not None
 
     # Reports and dashboard should pick up new data for their charts
     reports_view = reports.build_reports_view(ctx, page)
-    report_images = [img for img in _all_images(reports_view) if getattr(img, "src", "")]
+    report_images = [img for img in _all_images(reports_view) if _has_chart_data(img)]
     assert len(report_images) >= 2
 
     dashboard_view = dashboard.build_dashboard_view(ctx, page)
-    dashboard_images = [img for img in _all_images(dashboard_view) if getattr(img, "src", "")]
+    dashboard_images = [img for img in _all_images(dashboard_view) if _has_chart_data(img)]
     assert dashboard_images
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+from pocketsage.config import BaseConfig
+from pocketsage.infra.database import create_db_engine, init_database, session_scope
+from pocketsage.models import Transaction
+from pocketsage.services import auth, jobs, watcher
+from sqlmodel import select
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def ledger_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    db_path = tmp_path / "watcher.db"
+    monkeypatch.setenv("POCKETSAGE_DATABASE_URL", f"sqlite:///{db_path}")
+    engine = create_db_engine(BaseConfig())
+    init_database(engine)
+
+    def factory():
+        return session_scope(engine)
+
+    user = auth.create_user(
+        username="watcher", password="password", role="admin", session_factory=factory
+    )
+    return factory, engine, user
+
+
+def _write(path: Path, start: int, rows: int) -> Path:
+    lines = ["date,amount,memo,category,account,transaction_id"]
+    for idx in range(start, start + rows):
+        lines.append(f"2024-05-01,-{idx + 1}.00,Row {idx},Groceries,Checking,w-{idx}")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _drain_polls(service: watcher.WatcherIngestionService, clock: _Clock, polls: int) -> list[Path]:
+    ready: list[Path] = []
+    for _ in range(polls):
+        clock.now += 0.5
+        ready.extend(service.poll_once())
+    return ready
+
+
+def test_events_coalesce_and_wait_for_stable_file(tmp_path: Path):
+    clock = _Clock()
+    service = watcher.WatcherIngestionService(
+        folder=tmp_path,
+        batch_importer=lambda paths, should_cancel=None: {},
+        debounce_seconds=1.0,
+        stable_polls=2,
+        clock=clock,
+    )
+    csv_path = tmp_path / "bank.csv"
+    csv_path.write_text("date,amount\n")
+
+    for _ in range(5):
+        service.notify(csv_path)
+    service.notify(tmp_path / "notes.txt")
+    assert service.pending_count == 1
+
+    # Still inside the quiet period.
+    assert service.poll_once() == []
+
+    # Quiet long enough, but the file keeps growing between polls.
+    clock.now += 1.0
+    assert service.poll_once() == []
+    with csv_path.open("a") as handle:
+        handle.write("2024-01-01,-1\n")
+    assert _drain_polls(service, clock, 1) == []
+
+    assert _drain_polls(service, clock, 3) == [csv_path]
+    assert service.pending_count == 0
+    assert service.queued_count == 1
+
+
+def test_bounded_queue_keeps_extra_files_pending(tmp_path: Path):
+    clock = _Clock()
+    service = watcher.WatcherIngestionService(
+        folder=tmp_path,
+        batch_importer=lambda paths, should_cancel=None: {path: 0 for path in paths},
+        debounce_seconds=0.0,
+        stable_polls=1,
+        max_queue=2,
+        clock=clock,
+    )
+    paths = [_write(tmp_path / f"f{idx}.csv", idx * 10, 2) for idx in range(3)]
+    for path in paths:
+        service.notify(path)
+
+    ready = _drain_polls(service, clock, 3)
+    assert len(ready) == 2
+    assert service.pending_count == 1
+
+    batch = service.next_batch(timeout=0)
+    assert sorted(batch) == sorted(ready)
+    service.process_batch(batch)
+    assert _drain_polls(service, clock, 2) == sorted(set(paths) - set(ready))
+
+
+def test_ledger_batch_runs_as_one_import_job(ledger_env, tmp_path: Path):
+    factory, engine, user = ledger_env
+    jobs.clear_jobs()
+    clock = _Clock()
+    results: list[watcher.BatchResult] = []
+    service = watcher.WatcherIngestionService(
+        folder=tmp_path,
+        batch_importer=watcher.make_ledger_batch_importer(
+            session_factory=factory, user_id=user.id
+        ),
+        debounce_seconds=0.0,
+        stable_polls=1,
+        on_batch=results.append,
+        clock=clock,
+    )
+    first = _write(tmp_path / "a.csv", 0, 3)
+    second = _write(tmp_path / "b.csv", 3, 4)
+    broken = tmp_path / "c.csv"
+    broken.write_text("date,amount\n2024-05-01,-1\n")
+    for path in (first, second, broken):
+        service.notify(path)
+    _drain_polls(service, clock, 2)
+
+    # A file vanishing mid-batch fails on its own; the others are committed.
+    broken.unlink()
+    result = service.process_batch(service.next_batch(timeout=0))
+
+    assert result.created == {first: 3, second: 4}
+    assert list(result.errors) == [broken]
+    assert results == [result]
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 7
+    [job] = jobs.list_jobs()
+    assert job["name"] == watcher.WATCH_IMPORT_JOB and job["status"] == "failed"
+    assert job["progress"]["file"] == "b.csv" and job["progress"]["rows_processed"] == 4
+
+
+def test_cancelled_batch_job_resumes_from_checkpoint(ledger_env, tmp_path: Path):
+    factory, engine, user = ledger_env
+    jobs.clear_jobs()
+    clock = _Clock()
+
+    def cancel_midway(path: Path, progress) -> None:
+        if progress.rows_processed == 750:
+            [running] = [job for job in jobs.list_jobs() if job["status"] == "running"]
+            jobs.cancel_job(running["id"])
+
+    service = watcher.WatcherIngestionService(
+        folder=tmp_path,
+        batch_importer=watcher.make_ledger_batch_importer(
+            session_factory=factory, user_id=user.id, progress=cancel_midway
+        ),
+        debounce_seconds=0.0,
+        stable_polls=1,
+        clock=clock,
+    )
+    big = _write(tmp_path / "big.csv", 0, 1200)
+    service.notify(big)
+    _drain_polls(service, clock, 2)
+
+    cancelled = service.process_batch(service.next_batch(timeout=0))
+    assert cancelled.created == {}
+    assert isinstance(cancelled.errors[big], jobs.JobCancelled)
+    assert jobs.list_jobs()[0]["status"] == "cancelled"
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 750
+
+    resumed = service.process_batch([big])
+    assert resumed.created == {big: 450} and not resumed.errors
+    with session_scope(engine) as session:
+        assert len(session.exec(select(Transaction)).all()) == 1200
+
+
+def test_start_watcher_processes_created_and_moved_files(tmp_path: Path):
+    seen: list[Path] = []
+    service = watcher.start_watcher(
+        folder=tmp_path, importer=lambda *, csv_path: seen.append(csv_path) or 1
+    )
+    service.debounce_seconds = 0.1
+    service.poll_interval = 0.05
+    try:
+        staged = tmp_path / "export.tmp"
+        staged.write_text("date,amount\n2024-01-01,-1\n")
+        staged.rename(tmp_path / "export.csv")
+        deadline = time.monotonic() + 10
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        service.stop()
+
+    assert seen == [tmp_path / "export.csv"]
+    assert not service.running